@@ -1,11 +1,25 @@
 """
 베팅 관련 API 엔드포인트
 """
-from fastapi import APIRouter, Query
-from typing import Optional, List
+import asyncio
+import csv
+import io
+import json
+from datetime import date, datetime
+from typing import AsyncIterator, List, Optional
 
-from ..models.schemas import BettingHistory, BettingResultList, BettingModelStats
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+
+from ..models.schemas import (
+    BettingHistory,
+    BettingResultList,
+    BettingModelStats,
+    BulkBettingRequest,
+    BulkBettingResponse,
+)
 from ..services.betting_service import BettingService
+from .predictions import prediction_service
 
 router = APIRouter()
 betting_service = BettingService()
@@ -15,29 +29,59 @@ betting_service = BettingService()
 async def get_betting_results(
     model: Optional[str] = Query(None, description="베팅 모델 (하이리턴, 스탠다드, 로우리스크)"),
     period: Optional[str] = Query(None, description="기간 (7일, 30일, 3개월, 6개월, 1년, 전체)"),
-    limit: int = Query(50, ge=1, le=100, description="조회할 결과 수")
+    limit: int = Query(50, ge=1, le=100, description="조회할 결과 수"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor")
 ):
     """
     베팅 결과 조회
+    
+    다음 페이지는 응답의 next_cursor를 cursor로 넘겨 조회
     """
-    results = betting_service.get_betting_results(
-        betting_model=model,
-        period=period,
-        limit=limit
-    )
+    try:
+        page = await betting_service.get_betting_results(
+            betting_model=model,
+            period=period,
+            limit=limit,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
-        "results": results,
-        "total": len(results)
+        "results": page["results"],
+        "total": len(page["results"]),
+        "next_cursor": page["next_cursor"]
     }
 
 
+@router.get("/results/export")
+async def export_betting_results(
+    model: Optional[str] = Query(None, description="베팅 모델 (하이리턴, 스탠다드, 로우리스크)"),
+    period: Optional[str] = Query(None, description="기간 (7일, 30일, 3개월, 6개월, 1년, 전체)"),
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson, csv)")
+):
+    """
+    베팅 결과 전체 내보내기 (스트리밍)
+    
+    DB에서 나눠 읽은 행을 바로 내보내므로 내역 크기와 무관하게 메모리 사용량이 일정하다.
+    """
+    results = betting_service.stream_betting_results(betting_model=model, period=period)
+    
+    if format == "csv":
+        return StreamingResponse(
+            _csv_chunks(results),
+            media_type="text/csv; charset=utf-8",
+            headers={"Content-Disposition": "attachment; filename=betting_results.csv"},
+        )
+    return StreamingResponse(_ndjson_chunks(results), media_type="application/x-ndjson")
+
+
 @router.get("/models/stats", response_model=List[BettingModelStats])
 async def get_all_betting_models_stats():
     """
     모든 베팅 모델 통계 조회
     """
-    stats = betting_service.get_all_betting_models_stats()
+    stats = await betting_service.get_all_betting_models_stats()
     return stats
 
 
@@ -46,7 +90,7 @@ async def get_betting_model_stats(model_name: str):
     """
     특정 베팅 모델 통계 조회
     """
-    stats = betting_service.get_betting_model_stats(model_name)
+    stats = await betting_service.get_betting_model_stats(model_name)
     return stats
 
 
@@ -67,3 +111,79 @@ async def get_betting_recommendation(
     return recommendation
 
 
+@router.post("/recommend/bulk", response_model=BulkBettingResponse)
+async def get_bulk_betting_recommendations(request: BulkBettingRequest):
+    """
+    하루 경기 전체 일괄 베팅 추천
+    
+    경기 예측을 한 번의 배치로 생성한 뒤 모든 베팅 모델의 기대값/켈리 비율/베팅 여부를
+    한 번에 계산해 컬럼 형태로 반환한다.
+    """
+    slate = [item.model_dump() for item in request.slate]
+    match_ids = [item["match_id"] for item in slate]
+    
+    try:
+        await prediction_service.prefetch_matches(match_ids)
+        predictions = await asyncio.to_thread(
+            prediction_service.generate_predictions, match_ids, request.model_name
+        )
+        return betting_service.recommend_slate(
+            predictions, slate, request.betting_models, request.bankroll
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+    except RuntimeError as e:
+        # 활성 모델이 로드되지 않음
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
+
+# ========================================
+# 내보내기 직렬화
+# ========================================
+
+# 한 번에 내보내는 행 수
+EXPORT_ROWS_PER_CHUNK = 500
+
+EXPORT_FIELDS = [
+    "id", "match_id", "match_date", "home_team", "away_team", "betting_model", "bet_on",
+    "betting_amount", "odds", "expected_profit", "actual_result", "actual_profit", "bet_placed_at",
+]
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"직렬화할 수 없는 값입니다: {value!r}")
+
+
+async def _ndjson_chunks(results: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """한 줄에 결과 하나씩 (JSON Lines)"""
+    lines = []
+    async for result in results:
+        row = {field: result[field] for field in EXPORT_FIELDS}
+        lines.append(json.dumps(row, ensure_ascii=False, default=_json_default))
+        if len(lines) >= EXPORT_ROWS_PER_CHUNK:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+async def _csv_chunks(results: AsyncIterator[dict]) -> AsyncIterator[str]:
+    """헤더 + 결과 행 (엑셀 호환을 위해 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_FIELDS, extrasaction="ignore")
+    buffer.write("\ufeff")
+    writer.writeheader()
+
+    rows = 0
+    async for result in results:
+        writer.writerow(result)
+        rows += 1
+        if rows % EXPORT_ROWS_PER_CHUNK == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
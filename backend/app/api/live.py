@@ -0,0 +1,105 @@
+"""
+실시간 피드 API 엔드포인트 (SSE / WebSocket)
+"""
+import asyncio
+from typing import List, Optional
+
+from fastapi import APIRouter, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+
+from ..services.live_feed import LIVE_HEARTBEAT_SECONDS, LiveFeedHub
+
+router = APIRouter()
+live_hub = LiveFeedHub()
+
+
+def _connect(topics: Optional[List[str]], match_ids: Optional[List[int]]):
+    try:
+        return live_hub.connect(topics, match_ids)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/stream")
+async def stream(
+    request: Request,
+    topics: Optional[List[str]] = Query(None, description="받을 토픽 (match.completed, odds.updated, recommendations.updated)"),
+    match_ids: Optional[List[int]] = Query(None, description="받을 경기 ID (기본: 전체)"),
+):
+    """
+    실시간 피드 구독 (Server-Sent Events)
+
+    경기 종료/배당률/베팅 추천 변경을 push한다. resync 이벤트를 받으면 클라이언트가
+    밀린 메시지를 버린 것이므로 REST API로 다시 조회해야 한다.
+    """
+    client = _connect(topics, match_ids)
+
+    async def events():
+        try:
+            yield b"retry: 3000\n\n"
+            while not await request.is_disconnected():
+                message = await live_hub.next_message(client, LIVE_HEARTBEAT_SECONDS)
+                yield message.sse() if message is not None else b": heartbeat\n\n"
+        finally:
+            live_hub.disconnect(client)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.websocket("/ws")
+async def websocket_feed(
+    websocket: WebSocket,
+    topics: Optional[List[str]] = Query(None),
+    match_ids: Optional[List[int]] = Query(None),
+):
+    """
+    실시간 피드 구독 (WebSocket)
+
+    메시지 형식: {"id", "topic", "data"}. 클라이언트가 보내는 메시지는 무시한다.
+    """
+    try:
+        client = live_hub.connect(topics, match_ids)
+    except ValueError as e:
+        await websocket.close(code=1008, reason=str(e))
+        return
+
+    await websocket.accept()
+    # 연결 종료는 receive 쪽에서만 알 수 있으므로 따로 대기
+    closed = asyncio.ensure_future(_wait_closed(websocket))
+    try:
+        while not closed.done():
+            next_message = asyncio.ensure_future(live_hub.next_message(client, LIVE_HEARTBEAT_SECONDS))
+            await asyncio.wait({next_message, closed}, return_when=asyncio.FIRST_COMPLETED)
+            if closed.done():
+                next_message.cancel()
+                break
+            message = next_message.result()
+            if message is None:
+                await websocket.send_text('{"topic":"heartbeat"}')
+            else:
+                await websocket.send_text(f'{{"id":{message.id},"topic":"{message.topic}","data":{message.data}}}')
+    except WebSocketDisconnect:
+        pass
+    finally:
+        closed.cancel()
+        live_hub.disconnect(client)
+
+
+async def _wait_closed(websocket: WebSocket) -> None:
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/metrics")
+async def get_live_metrics():
+    """
+    실시간 피드 지표 조회 (연결 수, 발행/전달/버린 메시지 수)
+    """
+    return live_hub.metrics()
@@ -5,27 +5,25 @@ from fastapi import APIRouter, Query, HTTPException
 from datetime import date
 from typing import Optional
 
-from ..models.schemas import Match, MatchList
+from ..events import event_bus
+from ..models.schemas import Match, MatchList, MatchResult
 from ..services.match_service import MatchService
 
 router = APIRouter()
-match_service = MatchService()
+match_service = MatchService(events=event_bus)
 
 
 @router.get("/", response_model=MatchList)
 async def get_matches(
     start_date: Optional[date] = Query(None, description="시작 날짜"),
     end_date: Optional[date] = Query(None, description="종료 날짜"),
+    page: int = Query(1, ge=1, description="페이지 번호"),
+    size: Optional[int] = Query(None, ge=1, le=200, description="페이지 크기 (미지정 시 전체)"),
 ):
     """
     경기 목록 조회
     """
-    matches = match_service.get_matches_by_date_range(start_date, end_date)
-    
-    return {
-        "matches": matches,
-        "total": len(matches)
-    }
+    return await match_service.get_matches_by_date_range(start_date, end_date, page, size)
 
 
 @router.get("/upcoming", response_model=MatchList)
@@ -35,7 +33,7 @@ async def get_upcoming_matches(
     """
     예정된 경기 조회
     """
-    matches = match_service.get_upcoming_matches(limit=limit)
+    matches = await match_service.get_upcoming_matches(limit=limit)
     
     return {
         "matches": matches,
@@ -50,7 +48,7 @@ async def get_recent_matches(
     """
     최근 경기 결과 조회
     """
-    matches = match_service.get_recent_matches(limit=limit)
+    matches = await match_service.get_recent_matches(limit=limit)
     
     return {
         "matches": matches,
@@ -63,7 +61,25 @@ async def get_match(match_id: int):
     """
     특정 경기 조회
     """
-    match = match_service.get_match_by_id(match_id)
+    match = await match_service.get_match_by_id(match_id)
+    
+    if not match:
+        raise HTTPException(status_code=404, detail="경기를 찾을 수 없습니다")
+    
+    return match
+
+
+@router.post("/{match_id}/result", response_model=Match)
+async def record_match_result(match_id: int, result: MatchResult):
+    """
+    경기 결과 기록 (경기 종료)
+    
+    특성 저장소와 모델 성능 집계가 이 경기만큼 증분 갱신된다.
+    """
+    if result.home_score == result.away_score:
+        raise HTTPException(status_code=400, detail="무승부는 기록할 수 없습니다")
+    
+    match = await match_service.record_result(match_id, result.home_score, result.away_score)
     
     if not match:
         raise HTTPException(status_code=404, detail="경기를 찾을 수 없습니다")
@@ -0,0 +1,31 @@
+"""
+배당률 수집 관련 API 엔드포인트
+"""
+from fastapi import APIRouter
+
+from ..events import event_bus
+from ..models.schemas import OddsIngestRequest, OddsIngestResult
+from ..services.odds_ingestion import OddsIngestionService
+
+router = APIRouter()
+odds_ingestion_service = OddsIngestionService(events=event_bus)
+
+
+@router.post("/ingest", response_model=OddsIngestResult)
+async def ingest_odds(request: OddsIngestRequest):
+    """
+    배당률 스냅샷 일괄 수집
+    
+    변동 이력에 모두 추가하고 경기/제공처별 최신 배당률을 갱신한 뒤 odds.updated 이벤트를 발행한다.
+    """
+    return await odds_ingestion_service.ingest(
+        snapshot.model_dump() for snapshot in request.snapshots
+    )
+
+
+@router.get("/ingestion/metrics")
+async def get_ingestion_metrics():
+    """
+    배당률 수집 처리량 조회 (누적 행 수, 초당 행 수, 최근 실행)
+    """
+    return odds_ingestion_service.metrics()
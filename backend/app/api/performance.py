@@ -1,12 +1,13 @@
 """
 성능 분석 관련 API 엔드포인트
 """
-from fastapi import APIRouter, Query
+from fastapi import APIRouter, HTTPException, Query
 from datetime import date
 from typing import Optional, List
 
-from ..models.schemas import ModelPerformance, ProfitAnalysis, ChartData
+from ..models.schemas import ModelPerformance, ProfitAnalysis, ChartData, BacktestResult
 from ..services.performance_service import PerformanceService
+from ..services.roi_series import DEFAULT_CHART_POINTS
 
 router = APIRouter()
 performance_service = PerformanceService()
@@ -20,7 +21,7 @@ async def get_model_performance(
     """
     모델 성능 지표 조회
     """
-    performance = performance_service.get_model_performance(model_name, period)
+    performance = await performance_service.get_model_performance(model_name, period)
     return performance
 
 
@@ -31,31 +32,52 @@ async def compare_models(
     """
     모델 성능 비교
     """
-    performances = performance_service.compare_models(period)
+    performances = await performance_service.compare_models(period)
     return performances
 
 
 @router.get("/profit", response_model=ProfitAnalysis)
 async def get_profit_analysis(
     start_date: Optional[date] = Query(None, description="시작 날짜"),
-    end_date: Optional[date] = Query(None, description="종료 날짜")
+    end_date: Optional[date] = Query(None, description="종료 날짜"),
+    initial_bankroll: float = Query(1_000_000, gt=0, description="기간 시작 자금 (최대 낙폭 기준)")
 ):
     """
-    수익 분석 데이터 조회
+    수익 분석 데이터 조회 (직전 같은 길이 기간 ROI 포함)
     """
-    analysis = performance_service.get_profit_analysis(start_date, end_date)
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=400, detail="start_date가 end_date보다 늦습니다")
+    analysis = await performance_service.get_profit_analysis(start_date, end_date, initial_bankroll)
     return analysis
 
 
 @router.get("/chart", response_model=ChartData)
 async def get_chart_data(
     start_date: Optional[date] = Query(None, description="시작 날짜"),
-    end_date: Optional[date] = Query(None, description="종료 날짜")
+    end_date: Optional[date] = Query(None, description="종료 날짜"),
+    points: int = Query(DEFAULT_CHART_POINTS, ge=3, le=2000, description="최대 점 수")
 ):
     """
-    ROI 추이 차트 데이터 조회
+    ROI 추이 차트 데이터 조회 (기간 내 누적 ROI를 points개 이하로 다운샘플링)
     """
-    chart_data = performance_service.get_chart_data(start_date, end_date)
+    chart_data = await performance_service.get_chart_data(start_date, end_date, points)
     return chart_data
 
 
+@router.get("/backtest", response_model=List[BacktestResult])
+async def run_backtest(
+    model_name: str = Query("ensemble_v1", description="예측 모델명"),
+    betting_models: Optional[List[str]] = Query(None, description="베팅 모델 (기본: 전체)"),
+    initial_bankroll: float = Query(1_000_000, gt=0, description="시작 자금")
+):
+    """
+    베팅 모델 워크포워드 백테스트
+    
+    저장된 예측과 배당률을 시즌 순서대로 재생해 켈리 베팅 자금 변화를 시뮬레이션한다.
+    """
+    try:
+        return await performance_service.run_backtest(model_name, betting_models, initial_bankroll)
+    except KeyError as e:
+        raise HTTPException(status_code=400, detail=str(e.args[0]))
+
+
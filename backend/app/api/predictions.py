@@ -1,32 +1,155 @@
 """
 예측 관련 API 엔드포인트
 """
-from fastapi import APIRouter, Query, HTTPException
+import asyncio
+
+from fastapi import APIRouter, Depends, Query, HTTPException
 from typing import List
 
-from ..models.schemas import Prediction, PredictionRequest
+from ..models.schemas import Prediction, PredictionRequest, BulkPredictionRequest, BulkPredictionResponse
 from ..services.prediction_service import PredictionService
+from ..services.prediction_batcher import PredictionBatcher
+from ..services.rescoring import RecommendationRescorer
+from ..events import event_bus
+from ..startup import startup
+from .matches import match_service
 
 router = APIRouter()
-prediction_service = PredictionService()
+prediction_service = PredictionService(match_service=match_service)
+prediction_batcher = PredictionBatcher(prediction_service)
+recommendation_rescorer = RecommendationRescorer(
+    prediction_service.probabilities,
+    prediction_service.repository,
+    events=event_bus,
+)
+
+
+async def models_ready() -> None:
+    """
+    워밍업 중이면 모델 로드가 끝날 때까지 대기 (WARMUP_WAIT_SECONDS를 넘으면 503)
+    
+    로드 전에 요청을 받으면 모의 예측이 나가므로 추론 경로 앞에서 기다린다.
+    """
+    if not await startup.wait_for("models"):
+        raise HTTPException(status_code=503, detail="모델을 불러오는 중입니다", headers={"Retry-After": "5"})
 
 
-@router.post("/generate", response_model=Prediction)
+@router.post("/generate", response_model=Prediction, dependencies=[Depends(models_ready)])
 async def generate_prediction(request: PredictionRequest):
     """
     경기 예측 생성
     """
+    # 없는 경기는 배치에 넣기 전에 거절 (같은 배치의 다른 요청에 영향 없음)
+    if await prediction_service.prefetch_matches([request.match_id]):
+        raise HTTPException(status_code=404, detail=f"경기를 찾을 수 없습니다: {request.match_id}")
     try:
-        prediction = prediction_service.generate_prediction(
+        # 동시 요청은 배처가 모아 한 번의 배치 추론으로 처리
+        prediction = await prediction_batcher.submit(
             request.match_id,
             request.model_name
         )
         return prediction
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except RuntimeError as e:
+        # 활성 모델이 로드되지 않음
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/{match_id}", response_model=Prediction)
+@router.post("/bulk", response_model=BulkPredictionResponse, dependencies=[Depends(models_ready)])
+async def generate_bulk_predictions(request: BulkPredictionRequest):
+    """
+    여러 경기의 모든 모델 예측 일괄 생성
+    
+    match_ids 또는 날짜 범위(start_date, end_date)로 경기를 지정한다.
+    """
+    match_ids = request.match_ids
+    matches = None
+    if match_ids is None:
+        if request.start_date is None and request.end_date is None:
+            raise HTTPException(status_code=400, detail="match_ids 또는 날짜 범위를 지정해야 합니다")
+        result = await match_service.get_matches_by_date_range(request.start_date, request.end_date)
+        matches = {m["id"]: m for m in result["matches"]}
+        match_ids = list(matches)
+    else:
+        missing = await prediction_service.prefetch_matches(match_ids)
+        if missing:
+            raise HTTPException(status_code=404, detail=f"경기를 찾을 수 없습니다: {missing}")
+    
+    try:
+        results = await asyncio.to_thread(
+            prediction_service.generate_bulk_predictions,
+            match_ids,
+            request.model_names,
+            matches,
+        )
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    return {
+        "results": results,
+        "total": len(results)
+    }
+
+
+@router.get("/batching/metrics")
+async def get_batching_metrics():
+    """
+    예측 배칭 지표 조회 (큐 길이, 배치 크기, 대기 시간)
+    """
+    return prediction_batcher.metrics()
+
+
+@router.get("/ensemble/metrics")
+async def get_ensemble_metrics():
+    """
+    앙상블 멤버별 소요 시간 및 멤버 출력 캐시 상태 조회
+    """
+    return prediction_service.ensemble_metrics()
+
+
+@router.get("/rescoring/metrics")
+async def get_rescoring_metrics():
+    """
+    배당률 변경 시 베팅 추천 재계산 지표 조회
+    """
+    return recommendation_rescorer.metrics()
+
+
+@router.get("/models")
+async def get_model_status():
+    """
+    활성 모델 버전 및 캐시 상태 조회
+    """
+    return prediction_service.model_manager.status()
+
+
+@router.post("/models/{model_name}/activate")
+async def activate_model_version(
+    model_name: str,
+    version: int = Query(..., ge=1, description="활성화할 버전")
+):
+    """
+    모델 버전 교체 (백그라운드 로드 후 교체)
+    """
+    try:
+        prediction_service.model_manager.activate(model_name, version)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        # 드리프트 기준 미달 양자화 버전
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    return {"model_name": model_name, "version": version, "status": "loading"}
+
+
+@router.get("/{match_id}", response_model=Prediction, dependencies=[Depends(models_ready)])
 async def get_prediction(
     match_id: int,
     model_name: str = Query("lstm_v1", description="모델명")
@@ -34,7 +157,12 @@ async def get_prediction(
     """
     경기 예측 조회
     """
-    prediction = prediction_service.get_prediction(match_id, model_name)
+    try:
+        prediction = await prediction_service.get_prediction(match_id, model_name)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
     
     if not prediction:
         raise HTTPException(status_code=404, detail="예측 결과를 찾을 수 없습니다")
@@ -42,12 +170,16 @@ async def get_prediction(
     return prediction
 
 
-@router.get("/{match_id}/all", response_model=List[Prediction])
+@router.get("/{match_id}/all", response_model=List[Prediction], dependencies=[Depends(models_ready)])
 async def get_all_predictions(match_id: int):
     """
     경기의 모든 모델 예측 조회
     """
-    predictions = prediction_service.get_predictions_by_match(match_id)
-    return predictions
+    try:
+        return await prediction_service.get_predictions_by_match(match_id)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
 
 
@@ -0,0 +1,319 @@
+"""
+GET 응답 캐시
+
+대부분의 조회 결과는 경기가 끝나거나 배당률이 들어올 때만 바뀌므로, 라우터 앞단의 ASGI
+미들웨어에서 응답 본문을 통째로 캐시한다.
+
+- 키: 경로 + 정렬된 쿼리 파라미터
+- 경로 규칙별 태그 (match:{id}, matches, predictions, betting, performance)를 붙여 저장하고
+  이벤트가 오면 해당 태그 항목만 삭제
+- ETag를 붙여 If-None-Match가 같으면 본문 없이 304 반환
+- 태그별 세대 번호: 요청 처리 중에 태그가 삭제되면 그 응답은 저장하지 않음 (이전 데이터 재저장 방지)
+- 백엔드: 프로세스 내 TTL/LRU (기본) 또는 Redis 호환 서버
+"""
+import hashlib
+import json
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode
+
+from .events import MATCH_COMPLETED, ODDS_UPDATED, RECOMMENDATIONS_UPDATED, EventBus
+
+# 캐시 백엔드 (memory, redis, none)
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory")
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# 경로 규칙 -> 태그 (먼저 맞는 규칙 사용, 규칙에 없는 경로는 캐시하지 않음)
+# 지표/상태 조회와 스트리밍 내보내기는 매번 새로 계산해야 하므로 제외
+CACHE_RULES: List[Tuple[re.Pattern, Tuple[str, ...]]] = [
+    (re.compile(r"^/api/matches/(?P<match_id>\d+)$"), ("match:{match_id}",)),
+    (re.compile(r"^/api/matches/(upcoming|recent)?$"), ("matches",)),
+    (re.compile(r"^/api/predictions/(?P<match_id>\d+)(/all)?$"), ("match:{match_id}", "predictions")),
+    (re.compile(r"^/api/betting/results$"), ("betting",)),
+    (re.compile(r"^/api/betting/models(/[^/]+)?/stats$"), ("betting",)),
+    (re.compile(r"^/api/performance/(model|model/compare|profit|chart|backtest)$"), ("performance",)),
+]
+
+
+def route_tags(path: str) -> Optional[List[str]]:
+    """
+    경로 -> 캐시 태그 (캐시 대상이 아니면 None)
+    """
+    for pattern, tags in CACHE_RULES:
+        match = pattern.match(path)
+        if match:
+            return [tag.format(**match.groupdict()) for tag in tags]
+    return None
+
+
+def cache_key(path: str, query_string: bytes) -> str:
+    """경로 + 정렬된 쿼리 파라미터 (파라미터 순서가 달라도 같은 키)"""
+    params = sorted(parse_qsl(query_string.decode("latin-1"), keep_blank_values=True))
+    return f"{path}?{urlencode(params)}"
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+# ========================================
+# 백엔드
+# ========================================
+
+class MemoryCache:
+    """
+    프로세스 내 TTL + LRU 캐시
+
+    항목: key -> (만료 시각, 응답 dict, 태그). 태그 -> 키 역색인으로 태그 삭제는 해당 항목 수에 비례
+    태그 세대 번호는 삭제할 때마다 1씩 증가
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        max_entries: int = CACHE_MAX_ENTRIES,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, dict, Tuple[str, ...]]]" = OrderedDict()
+        self._tag_keys: Dict[str, set] = {}
+        self._generations: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tag_keys.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tag_keys[tag]
+
+    async def get(self, key: str) -> Optional[dict]:
+        item = self._entries.get(key)
+        if item is None:
+            return None
+        if item[0] <= self._clock():
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return item[1]
+
+    async def set(self, key: str, entry: dict, tags: Iterable[str]) -> None:
+        if key in self._entries:
+            self._drop(key)
+        tags = tuple(tags)
+        self._entries[key] = (self._clock() + self.ttl_seconds, entry, tags)
+        for tag in tags:
+            self._tag_keys.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._drop(next(iter(self._entries)))
+
+    async def generations(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        """태그별 세대 번호 (삭제된 적 없으면 0)"""
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        """태그가 붙은 항목 삭제 (삭제 수 반환)"""
+        keys = set()
+        for tag in tags:
+            self._generations[tag] = self._generations.get(tag, 0) + 1
+            keys |= self._tag_keys.get(tag, set())
+        for key in keys:
+            self._drop(key)
+        return len(keys)
+
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tag_keys.clear()
+
+
+class RedisCache:
+    """
+    Redis 호환 서버 캐시 (워커 여러 개가 캐시를 공유할 때)
+
+    응답은 해시(status, headers, body, etag)로, 태그는 키 집합(SET)으로 저장한다.
+    만료는 서버 TTL에 맡긴다. 태그 세대 번호는 워커가 공유하도록 INCR 키로 둔다.
+    """
+
+    def __init__(
+        self,
+        url: str = REDIS_URL,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        prefix: str = "kbo:cache:",
+        client=None,
+    ):
+        if client is None:
+            # redis 패키지는 이 백엔드를 쓸 때만 필요
+            import redis.asyncio as redis
+            client = redis.from_url(url)
+        self.client = client
+        self.ttl_seconds = ttl_seconds
+        self.prefix = prefix
+
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+
+    def _generation_key(self, tag: str) -> str:
+        return f"{self.prefix}gen:{tag}"
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self.client.hgetall(self.prefix + key)
+        if not raw:
+            return None
+        return {
+            "status": int(raw[b"status"]),
+            "headers": [tuple(h.encode("latin-1") for h in pair) for pair in json.loads(raw[b"headers"])],
+            "body": raw[b"body"],
+            "etag": raw[b"etag"].decode(),
+        }
+
+    async def set(self, key: str, entry: dict, tags: Iterable[str]) -> None:
+        headers = [[k.decode("latin-1"), v.decode("latin-1")] for k, v in entry["headers"]]
+        async with self.client.pipeline(transaction=True) as pipe:
+            pipe.hset(self.prefix + key, mapping={
+                "status": entry["status"],
+                "headers": json.dumps(headers),
+                "body": entry["body"],
+                "etag": entry["etag"],
+            })
+            pipe.expire(self.prefix + key, self.ttl_seconds)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), key)
+                pipe.expire(self._tag_key(tag), self.ttl_seconds)
+            await pipe.execute()
+
+    async def generations(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        values = await self.client.mget([self._generation_key(tag) for tag in tags])
+        return tuple(int(value or 0) for value in values)
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        tags = list(tags)
+        async with self.client.pipeline(transaction=False) as pipe:
+            for tag in tags:
+                pipe.incr(self._generation_key(tag))
+            await pipe.execute()
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        keys = set()
+        for tag_key in tag_keys:
+            keys |= {k.decode() for k in await self.client.smembers(tag_key)}
+        if keys or tag_keys:
+            await self.client.delete(*(self.prefix + k for k in keys), *tag_keys)
+        return len(keys)
+
+    async def clear(self) -> None:
+        async for key in self.client.scan_iter(match=self.prefix + "*"):
+            await self.client.delete(key)
+
+
+def create_cache(backend: str = CACHE_BACKEND):
+    """환경 설정에 맞는 캐시 백엔드 (none이면 None)"""
+    if backend == "redis":
+        return RedisCache()
+    if backend == "memory":
+        return MemoryCache()
+    return None
+
+
+# ========================================
+# 미들웨어
+# ========================================
+
+class ResponseCacheMiddleware:
+    """
+    GET 응답 캐시 ASGI 미들웨어
+
+    200 응답만 저장한다. 응답에는 ETag와 X-Cache(HIT/MISS) 헤더를 붙인다.
+    """
+
+    def __init__(self, app, cache=None):
+        self.app = app
+        self.cache = cache
+
+    async def __call__(self, scope, receive, send):
+        if self.cache is None or scope["type"] != "http" or scope["method"] != "GET":
+            await self.app(scope, receive, send)
+            return
+
+        tags = route_tags(scope["path"])
+        if tags is None:
+            await self.app(scope, receive, send)
+            return
+
+        key = cache_key(scope["path"], scope.get("query_string", b""))
+        if_none_match = dict(scope["headers"]).get(b"if-none-match", b"").decode("latin-1")
+
+        entry = await self.cache.get(key)
+        if entry is not None:
+            await self._send_entry(send, entry, if_none_match, b"HIT")
+            return
+
+        # 응답 전체를 모은 뒤 ETag를 붙여 보냄
+        generations = await self.cache.generations(tags)
+        start, chunks = {}, []
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start.update(message)
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        body = b"".join(chunks)
+        headers = [(k, v) for k, v in start.get("headers", []) if k.lower() != b"etag"]
+        entry = {"status": start.get("status", 500), "headers": headers, "body": body, "etag": make_etag(body)}
+        # 처리 중에 태그가 삭제됐으면 이전 데이터일 수 있으므로 저장하지 않음
+        if entry["status"] == 200 and await self.cache.generations(tags) == generations:
+            await self.cache.set(key, entry, tags)
+        await self._send_entry(send, entry, if_none_match, b"MISS")
+
+    @staticmethod
+    async def _send_entry(send, entry: dict, if_none_match: str, cache_status: bytes) -> None:
+        extra = [(b"etag", entry["etag"].encode()), (b"x-cache", cache_status)]
+        if entry["status"] == 200 and if_none_match == entry["etag"]:
+            headers = [(k, v) for k, v in entry["headers"] if k.lower() not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers + extra})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        await send({"type": "http.response.start", "status": entry["status"], "headers": entry["headers"] + extra})
+        await send({"type": "http.response.body", "body": entry["body"]})
+
+
+# ========================================
+# 이벤트 -> 태그 삭제
+# ========================================
+
+def register_invalidation(events: EventBus, cache) -> None:
+    """
+    데이터 변경 이벤트 구독
+
+    - 경기 종료: 그 경기/예측, 경기 목록, 베팅 결과, 성능 지표
+    - 배당률 수집: 해당 경기/예측
+    - 베팅 추천 재계산: 해당 경기/예측 (재계산이 DB에 반영된 뒤 다시 삭제)
+    """
+    if cache is None:
+        return
+
+    async def on_match_completed(match: dict) -> None:
+        await cache.invalidate([f"match:{match['id']}", "matches", "betting", "performance"])
+
+    async def on_odds_updated(payload: dict) -> None:
+        await cache.invalidate([f"match:{match_id}" for match_id in payload["match_ids"]])
+
+    events.subscribe(MATCH_COMPLETED, on_match_completed)
+    events.subscribe(ODDS_UPDATED, on_odds_updated)
+    events.subscribe(RECOMMENDATIONS_UPDATED, on_odds_updated)
+
+
+# 앱 전역 응답 캐시
+response_cache = create_cache()
@@ -2,9 +2,10 @@
 데이터베이스 연결 및 세션 관리
 """
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 import os
 from dotenv import load_dotenv
 
@@ -21,39 +22,141 @@ DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 # MySQL 연결 URL
 DATABASE_URL = f"mysql+pymysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4"
 
-# SQLAlchemy 엔진 생성
-engine = create_engine(
-    DATABASE_URL,
-    pool_pre_ping=True,  # 연결 유효성 체크
-    pool_recycle=3600,   # 1시간마다 연결 재생성
-    echo=False,          # SQL 로그 출력 (개발 시 True로 설정 가능)
+# 비동기 연결 URL (테스트 시 sqlite+aiosqlite:///... 로 대체 가능)
+ASYNC_DATABASE_URL = os.getenv(
+    "ASYNC_DATABASE_URL",
+    f"mysql+aiomysql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}?charset=utf8mb4",
 )
 
-# 세션 팩토리
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# 데이터 소스 (mock: 모의 데이터, db: 비동기 DB 리포지토리)
+DATA_SOURCE = os.getenv("DATA_SOURCE", "mock")
+
+# 비동기 커넥션 풀 설정
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
 
 # Base 클래스
 Base = declarative_base()
 
+# 동기 엔진/세션 팩토리 (init_db.py 등 스크립트용). API 프로세스는 비동기 엔진만 쓰므로
+# PyMySQL import와 엔진 생성을 첫 사용 시점으로 미룸
+_engine = None
+_SessionLocal = None
+
+
+def get_sync_engine():
+    """
+    동기 SQLAlchemy 엔진 (첫 사용 시 생성)
+    """
+    global _engine, _SessionLocal
+    if _engine is None:
+        _engine = create_engine(
+            DATABASE_URL,
+            pool_pre_ping=True,  # 연결 유효성 체크
+            pool_recycle=3600,   # 1시간마다 연결 재생성
+            echo=False,          # SQL 로그 출력 (개발 시 True로 설정 가능)
+        )
+        _SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    return _engine
+
+
+def __getattr__(name: str):
+    # 기존 `from app.database import engine, SessionLocal` 호환
+    if name == "engine":
+        return get_sync_engine()
+    if name == "SessionLocal":
+        get_sync_engine()
+        return _SessionLocal
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 def get_db() -> Generator:
     """
     데이터베이스 세션 의존성
     FastAPI 엔드포인트에서 사용
     """
-    db = SessionLocal()
+    get_sync_engine()
+    db = _SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
 
+def create_async_db_engine(url: str = ASYNC_DATABASE_URL, **kwargs) -> AsyncEngine:
+    """
+    비동기 엔진 생성
+    
+    MySQL은 커넥션 풀을 튜닝하고, SQLite(aiosqlite)는 드라이버 기본 풀을 사용
+    """
+    if not url.startswith("sqlite"):
+        kwargs.setdefault("pool_size", DB_POOL_SIZE)
+        kwargs.setdefault("max_overflow", DB_MAX_OVERFLOW)
+        kwargs.setdefault("pool_timeout", DB_POOL_TIMEOUT)
+        kwargs.setdefault("pool_recycle", 3600)
+        kwargs.setdefault("pool_pre_ping", True)
+    return create_async_engine(url, echo=False, **kwargs)
+
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """
+    비동기 세션 팩토리 (첫 사용 시 엔진 생성)
+    """
+    global _async_engine, _async_session_factory
+    if _async_session_factory is None:
+        _async_engine = create_async_db_engine()
+        _async_session_factory = async_sessionmaker(_async_engine, expire_on_commit=False)
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    비동기 데이터베이스 세션 의존성
+    """
+    async with get_async_session_factory()() as session:
+        yield session
+
+
+async def init_async_db(engine: Optional[AsyncEngine] = None) -> None:
+    """
+    비동기 엔진으로 테이블 생성
+    
+    SQLite는 인덱스 이름이 DB 전체에서 유일해야 하므로(idx_match 등이 여러 테이블에 있음)
+    로컬 대체 DB에서는 테이블만 만들고 인덱스는 생략한다.
+    """
+    from sqlalchemy.schema import CreateTable
+    from .models import db_models  # noqa: F401  (테이블 메타데이터 등록)
+    
+    if engine is None:
+        get_async_session_factory()
+        engine = _async_engine
+    async with engine.begin() as conn:
+        if engine.dialect.name == "sqlite":
+            for table in Base.metadata.sorted_tables:
+                await conn.execute(CreateTable(table, if_not_exists=True))
+        else:
+            await conn.run_sync(Base.metadata.create_all)
+
+
+async def dispose_async_engine() -> None:
+    """
+    비동기 엔진 커넥션 풀 정리 (앱 종료 시)
+    """
+    if _async_engine is not None:
+        await _async_engine.dispose()
+
+
 def init_db():
     """
     데이터베이스 초기화
     모든 테이블 생성
     """
-    Base.metadata.create_all(bind=engine)
+    Base.metadata.create_all(bind=get_sync_engine())
     print("✅ 데이터베이스 테이블이 생성되었습니다.")
 
 
@@ -62,7 +165,8 @@ def check_db_connection():
     데이터베이스 연결 확인
     """
     try:
-        db = SessionLocal()
+        get_sync_engine()
+        db = _SessionLocal()
         db.execute("SELECT 1")
         db.close()
         print("✅ 데이터베이스 연결 성공")
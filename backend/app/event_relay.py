@@ -0,0 +1,136 @@
+"""
+워커 간 이벤트 중계 (Redis pub/sub)
+
+멀티 워커 서빙(run.py --workers N)에서는 경기 인덱스, 성능 집계, 누적 손익 시계열, 팀 특성
+저장소, 실시간 피드 구독자가 워커마다 따로 있다. 한 워커가 발행한 이벤트를 채널로 보내고,
+다른 워커는 받은 이벤트를 자기 이벤트 버스의 remote 구독자에게 전달해 같은 상태를 유지한다.
+
+- 페이로드는 JSON (date/datetime/Decimal은 타입을 붙여 보내고 받는 쪽에서 복원)
+- 자기가 보낸 이벤트는 무시 (발행한 워커는 이미 로컬에서 처리)
+- 연결이 끊기면 RELAY_RETRY_SECONDS 후 다시 구독 (끊긴 동안의 이벤트는 유실)
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Optional, Tuple
+
+from .cache import REDIS_URL
+from .events import EventBus
+
+# 이벤트 중계 방식 (none, redis). run.py --workers N이 redis로 설정
+EVENT_RELAY = os.getenv("EVENT_RELAY", "none")
+EVENT_RELAY_CHANNEL = os.getenv("EVENT_RELAY_CHANNEL", "kbo:events")
+RELAY_RETRY_SECONDS = 1.0
+
+
+def _encode_value(value):
+    if isinstance(value, datetime):
+        return {"__datetime__": value.isoformat()}
+    if isinstance(value, date):
+        return {"__date__": value.isoformat()}
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"직렬화할 수 없는 값입니다: {type(value).__name__}")
+
+
+def _decode_value(obj: dict):
+    if "__datetime__" in obj:
+        return datetime.fromisoformat(obj["__datetime__"])
+    if "__date__" in obj:
+        return date.fromisoformat(obj["__date__"])
+    return obj
+
+
+def encode_event(origin: str, topic: str, payload) -> str:
+    return json.dumps({"origin": origin, "topic": topic, "payload": payload}, default=_encode_value)
+
+
+def decode_event(data) -> Tuple[str, str, object]:
+    message = json.loads(data, object_hook=_decode_value)
+    return message["origin"], message["topic"], message["payload"]
+
+
+class RedisEventRelay:
+    """
+    EventBus <-> Redis 채널
+
+    - send(): 로컬에서 발행한 이벤트를 채널로 보냄 (EventBus.publish가 호출)
+    - start()/stop(): 채널 구독 태스크 (다른 워커 이벤트를 events.dispatch(remote=True)로 전달)
+    """
+
+    def __init__(
+        self,
+        events: EventBus,
+        url: str = REDIS_URL,
+        channel: str = EVENT_RELAY_CHANNEL,
+        client=None,
+    ):
+        if client is None:
+            # redis 패키지는 멀티 워커 서빙에서만 필요
+            import redis.asyncio as redis
+            client = redis.from_url(url)
+        self.events = events
+        self.client = client
+        self.channel = channel
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._task: Optional[asyncio.Task] = None
+        self._subscribed = asyncio.Event()
+        self.metrics = {"sent": 0, "received": 0, "failed": 0}
+
+    async def send(self, topic: str, payload) -> None:
+        await self.client.publish(self.channel, encode_event(self.origin, topic, payload))
+        self.metrics["sent"] += 1
+
+    def start(self) -> None:
+        """구독 태스크 시작 (이벤트 버스에 연결)"""
+        self.events.relay = self
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_subscribed(self, timeout: float = 5.0) -> None:
+        await asyncio.wait_for(self._subscribed.wait(), timeout)
+
+    async def stop(self) -> None:
+        if self.events.relay is self:
+            self.events.relay = None
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                self._subscribed.clear()
+                print(f"⚠️  이벤트 중계 연결 오류, {RELAY_RETRY_SECONDS}초 후 다시 구독합니다: {exc}")
+                await asyncio.sleep(RELAY_RETRY_SECONDS)
+
+    async def _listen(self) -> None:
+        pubsub = self.client.pubsub()
+        await pubsub.subscribe(self.channel)
+        try:
+            self._subscribed.set()
+            async for message in pubsub.listen():
+                if message.get("type") != "message":
+                    continue
+                origin, topic, payload = decode_event(message["data"])
+                if origin == self.origin:
+                    continue
+                self.metrics["received"] += 1
+                try:
+                    await self.events.dispatch(topic, payload, remote=True)
+                except Exception as exc:
+                    self.metrics["failed"] += 1
+                    print(f"⚠️  중계된 이벤트 처리 실패 ({topic}): {exc}")
+        finally:
+            await pubsub.unsubscribe(self.channel)
@@ -0,0 +1,66 @@
+"""
+앱 내부 이벤트 버스
+
+데이터가 바뀌는 지점(경기 결과 기록, 배당률 수집)에서 발행하고, 성능 집계/응답 캐시 등
+파생 상태를 가진 쪽이 구독해 필요한 부분만 갱신한다.
+"""
+import inspect
+from collections import defaultdict
+from typing import Callable, Dict, List, Tuple
+
+# 경기 종료 (payload: 갱신된 match dict)
+MATCH_COMPLETED = "match.completed"
+
+# 배당률 수집 (payload: {"match_ids": [...]})
+ODDS_UPDATED = "odds.updated"
+
+# 베팅 추천 재계산 (payload: {"match_ids": [...], "recommendations": [...]})
+RECOMMENDATIONS_UPDATED = "recommendations.updated"
+
+
+class EventBus:
+    """
+    토픽별 구독자 목록 (구독자는 동기/비동기 함수 모두 가능)
+
+    relay가 있으면 (멀티 워커) 발행한 이벤트를 다른 워커에도 보내고, 다른 워커에서 온 이벤트는
+    remote=True로 구독한 핸들러(프로세스 내 파생 상태 갱신)만 호출한다.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[str, List[Tuple[Callable, bool]]] = defaultdict(list)
+        self.relay = None
+
+    def subscribe(self, topic: str, handler: Callable, remote: bool = True) -> None:
+        """
+        토픽 구독
+
+        Args:
+            remote: 다른 워커가 발행한 이벤트도 받을지 여부 (DB 쓰기처럼 한 번만 해야 하는 처리는 False)
+        """
+        self._subscribers[topic].append((handler, remote))
+
+    async def publish(self, topic: str, payload) -> None:
+        """
+        구독자를 등록 순서대로 호출 (비동기 구독자는 끝날 때까지 기다림) 후 다른 워커로 중계
+        """
+        await self.dispatch(topic, payload)
+        if self.relay is not None:
+            await self.relay.send(topic, payload)
+
+    async def dispatch(self, topic: str, payload, remote: bool = False) -> None:
+        """
+        이 프로세스의 구독자만 호출
+
+        Args:
+            remote: 다른 워커에서 온 이벤트 (remote=True 구독자만 호출)
+        """
+        for handler, receives_remote in list(self._subscribers[topic]):
+            if remote and not receives_remote:
+                continue
+            result = handler(payload)
+            if inspect.isawaitable(result):
+                await result
+
+
+# 앱 전역 이벤트 버스 (라우터의 서비스와 main.py 구독이 공유)
+event_bus = EventBus()
@@ -1,18 +1,94 @@
 """
 FastAPI 메인 애플리케이션
 """
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+
+from .api import matches, predictions, betting, performance, odds, live
+from .cache import ResponseCacheMiddleware, register_invalidation, response_cache
+from .database import dispose_async_engine
+from .event_relay import EVENT_RELAY, RedisEventRelay
+from .events import ODDS_UPDATED, event_bus
+from .startup import WARMUP_IN_BACKGROUND, startup
+
+
+async def _warm_up_models() -> dict:
+    # 팀 특성 저장소와 활성 모델 로드 (스레드 풀) 후 경기 종료 시 특성 증분 갱신
+    warmed = await asyncio.to_thread(predictions.prediction_service.warm_up)
+    matches.match_service.add_result_listener(predictions.prediction_service.on_match_completed)
+    if warmed:
+        print(f"✅ 모델 로드 완료: {warmed}")
+    return warmed
+
+
+async def _warm_up_performance() -> list:
+    # 집계 구축과 리스너 등록 사이에 await가 없어 경기 종료가 두 번 반영되지 않음
+    aggregated = await performance.performance_service.warm_up()
+    matches.match_service.add_result_listener(performance.performance_service.on_match_completed)
+    if aggregated:
+        print(f"✅ 성능 집계 완료: {aggregated}")
+    return aggregated
+
+
+async def _clear_response_cache() -> None:
+    # 워밍업 중 캐시된 (집계 전) 응답 삭제
+    if response_cache is not None:
+        await response_cache.clear()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 처리
+    
+    이벤트 구독만 하고 바로 요청을 받는다. 모델 로드/성능 집계는 백그라운드에서 진행하며
+    준비 여부는 /health/ready로 확인한다.
+    """
+    # 경기 종료/배당률 수집 시 관련 캐시 응답만 삭제
+    register_invalidation(event_bus, response_cache)
+    
+    # 변경 사항을 실시간 피드 구독 클라이언트에 push (캐시 삭제 뒤에 전달)
+    live.live_hub.attach(event_bus)
+    
+    # 배당률 수집 시 해당 경기 베팅 추천만 재계산 (재계산 결과도 피드로 push)
+    # DB에 쓰므로 수집한 워커에서만 실행 (결과 이벤트가 다른 워커로 중계됨)
+    event_bus.subscribe(ODDS_UPDATED, predictions.recommendation_rescorer.on_odds_updated, remote=False)
+    
+    # 멀티 워커: 다른 워커가 발행한 이벤트로 이 워커의 인덱스/집계/특성/피드 갱신
+    relay = RedisEventRelay(event_bus) if EVENT_RELAY == "redis" else None
+    if relay is not None:
+        relay.start()
+    
+    startup.add_step("models", _warm_up_models)
+    startup.add_step("performance", _warm_up_performance)
+    startup.add_step("response_cache", _clear_response_cache)
+    if WARMUP_IN_BACKGROUND:
+        startup.start()
+    else:
+        await startup.run()
+    yield
+    await startup.stop()
+    if relay is not None:
+        await relay.stop()
+    await predictions.prediction_batcher.stop()
+    await dispose_async_engine()
 
-from .api import matches, predictions, betting, performance
 
 # FastAPI 애플리케이션 생성
 app = FastAPI(
     title="KBO 경기 예측 AI 베팅 시스템 API",
     description="KBO 경기 예측 및 베팅 시뮬레이션 API",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
+# GET 응답 캐시 (CORS 미들웨어 안쪽에서 동작)
+app.add_middleware(ResponseCacheMiddleware, cache=response_cache)
+
 # CORS 설정
 app.add_middleware(
     CORSMiddleware,
@@ -30,6 +106,8 @@ app.include_router(matches.router, prefix="/api/matches", tags=["경기"])
 app.include_router(predictions.router, prefix="/api/predictions", tags=["예측"])
 app.include_router(betting.router, prefix="/api/betting", tags=["베팅"])
 app.include_router(performance.router, prefix="/api/performance", tags=["성능"])
+app.include_router(odds.router, prefix="/api/odds", tags=["배당률"])
+app.include_router(live.router, prefix="/api/live", tags=["실시간"])
 
 
 @app.get("/")
@@ -47,9 +125,26 @@ async def root():
 @app.get("/health")
 async def health_check():
     """
-    헬스 체크
+    헬스 체크 (프로세스 생존 여부 + 준비 상태)
+    """
+    return {"status": "healthy", "ready": startup.ready}
+
+
+@app.get("/health/live")
+async def liveness():
+    """
+    liveness: 이벤트 루프가 응답하면 200
+    """
+    return {"status": "alive"}
+
+
+@app.get("/health/ready")
+async def readiness():
+    """
+    readiness: 워밍업(모델 로드, 성능 집계)이 끝나기 전에는 503
     """
-    return {"status": "healthy"}
+    status = startup.status()
+    return JSONResponse(status, status_code=200 if status["ready"] else 503)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,3 @@
+"""
+ML 모델 및 특성 엔지니어링
+"""
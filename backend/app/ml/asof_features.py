@@ -0,0 +1,142 @@
+"""
+시점 정합(point-in-time) 팀 특성
+
+각 경기의 팀 특성을 해당 경기 날짜 이전(match_date 미만)에 끝난 경기만으로
+계산한다. 팀별 롤링 상태를 한 번 만들고, 날짜 정렬 인덱스 위의 as-of merge로
+모든 (경기, 팀) 쌍에 한 번에 붙이므로 학습과 백테스트 모두 미래 결과가 섞이지 않는다.
+"""
+import numpy as np
+import pandas as pd
+
+from .sequence_builder import SEQUENCE_FEATURES, assemble_windows, rolling_team_stats
+
+
+ASOF_FEATURES = ("recent_wins", "recent_losses", "avg_score", "avg_allowed", "win_rate")
+
+
+def _match_dates(matches: pd.DataFrame) -> np.ndarray:
+    # ORM 행/read_sql/mock_data의 datetime.date(object)는 merge_asof 키로 쓸 수 없으므로 datetime64로 변환
+    return pd.to_datetime(matches["match_date"]).to_numpy()
+
+
+def team_state_history(matches: pd.DataFrame, n_games: int = 10) -> pd.DataFrame:
+    """
+    경기 종료 후 팀 상태 이력
+
+    Args:
+        matches: 경기 DataFrame (match_date, 팀, 점수, winner 포함)
+        n_games: 최근 N경기
+
+    Returns:
+        DataFrame: team_id, match_date, ASOF_FEATURES
+                   (match_date 기준 정렬, 같은 날짜는 경기 순서 유지)
+    """
+    completed = matches[matches["winner"].notna()]
+    completed = completed.sort_values("match_date", kind="mergesort").reset_index(drop=True)
+
+    stats = rolling_team_stats(completed, n_games)
+    wins = stats["wins"]
+    games = stats["games"]
+
+    history = pd.DataFrame({
+        "team_id": stats["team_id"],
+        "match_date": _match_dates(completed)[stats["match_pos"]],
+        "_order": stats["match_pos"],
+        "recent_wins": wins,
+        "recent_losses": games - wins,
+        "avg_score": stats["runs_for"] / games,
+        "avg_allowed": stats["runs_against"] / games,
+        "win_rate": wins / n_games,
+    })
+
+    # 같은 날짜 더블헤더는 나중 경기 상태가 마지막에 오도록 정렬
+    history = history.sort_values(["match_date", "_order"], kind="mergesort")
+    return history.drop(columns="_order").reset_index(drop=True)
+
+
+def asof_team_features(matches: pd.DataFrame, n_games: int = 10) -> pd.DataFrame:
+    """
+    모든 (경기, 팀) 쌍의 경기 직전 특성
+
+    Args:
+        matches: 경기 DataFrame (id, match_date, home_team_id, away_team_id, ...)
+        n_games: 최근 N경기
+
+    Returns:
+        DataFrame: match_id, team_id, side(home/away), match_date, ASOF_FEATURES
+                   (이전 경기가 없는 팀은 0)
+    """
+    history = team_state_history(matches, n_games)
+
+    pairs = pd.concat([
+        pd.DataFrame({
+            "match_id": matches["id"].to_numpy(),
+            "team_id": matches[f"{side}_team_id"].to_numpy(dtype=np.int64),
+            "side": side,
+            "match_date": _match_dates(matches),
+        })
+        for side in ("home", "away")
+    ], ignore_index=True)
+    pairs = pairs.sort_values("match_date", kind="mergesort")
+
+    # match_date 미만인 마지막 상태 (같은 날 경기 결과는 제외)
+    features = pd.merge_asof(
+        pairs,
+        history,
+        on="match_date",
+        by="team_id",
+        direction="backward",
+        allow_exact_matches=False,
+    )
+    features[list(ASOF_FEATURES)] = features[list(ASOF_FEATURES)].fillna(0)
+    return features.reset_index(drop=True)
+
+
+def asof_match_features(matches: pd.DataFrame, n_games: int = 10) -> pd.DataFrame:
+    """
+    경기별 홈/원정 직전 특성 (wide format, 입력 경기 순서 유지)
+
+    Returns:
+        DataFrame: match_id, home_<특성>, away_<특성>
+    """
+    long = asof_team_features(matches, n_games)
+    columns = ["match_id", *ASOF_FEATURES]
+
+    home = long.loc[long["side"] == "home", columns].set_index("match_id").add_prefix("home_")
+    away = long.loc[long["side"] == "away", columns].set_index("match_id").add_prefix("away_")
+
+    wide = home.join(away).reindex(matches["id"].to_numpy())
+    return wide.rename_axis("match_id").reset_index()
+
+
+def build_asof_sequence_tensor(
+    matches: pd.DataFrame,
+    window_size: int = 10,
+    n_games: int = 10,
+    dtype=np.float32,
+):
+    """
+    시점 정합 시퀀스 텐서
+
+    build_sequence_tensor와 같은 모양이지만, 윈도우의 각 경기 특성은
+    그 경기 날짜 이전 결과만으로 계산된다.
+
+    Args:
+        matches: 경기 DataFrame (시간순)
+        window_size: 시퀀스 윈도우 크기
+        n_games: 최근 N경기
+
+    Returns:
+        X: (samples, window_size, 5) 텐서
+        y: 다음 경기 홈팀 승리 여부 (samples,)
+    """
+    wide = asof_match_features(matches, n_games)
+
+    per_match = np.empty((len(matches), len(SEQUENCE_FEATURES)), dtype=dtype)
+    per_match[:, 0] = wide["home_win_rate"].to_numpy()
+    per_match[:, 1] = wide["home_avg_score"].to_numpy()
+    per_match[:, 2] = wide["away_win_rate"].to_numpy()
+    per_match[:, 3] = wide["away_avg_score"].to_numpy()
+    per_match[:, 4] = 1
+
+    return assemble_windows(per_match, matches["winner"].to_numpy(), window_size)
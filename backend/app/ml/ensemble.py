@@ -0,0 +1,181 @@
+"""
+멤버 출력 재사용 앙상블
+
+멤버 모델 출력을 (경기, 모델 버전, 특성 해시) 키로 캐시해 두고, 앙상블은 캐시된
+출력의 가중 평균으로 계산한다. 캐시에 없는 멤버만 스레드 풀에서 병렬로 추론한다.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Hashable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def feature_hash(x: np.ndarray) -> str:
+    """입력 시퀀스 1건의 해시 (같은 경기라도 특성이 바뀌면 다른 키)"""
+    return hashlib.blake2b(np.ascontiguousarray(x).tobytes(), digest_size=8).hexdigest()
+
+
+class MemberOutputCache:
+    """(경기 키, 멤버 버전, 특성 해시) -> 홈팀 승률 LRU 캐시"""
+
+    def __init__(self, max_size: int = 50000):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[Hashable, str, str], float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get_many(self, keys: List[Tuple[Hashable, str, str]]) -> List[Optional[float]]:
+        with self._lock:
+            values = []
+            for key in keys:
+                value = self._items.get(key)
+                if value is None:
+                    self.misses += 1
+                else:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                values.append(value)
+            return values
+
+    def put_many(self, items: Dict[Tuple[Hashable, str, str], float]) -> None:
+        with self._lock:
+            for key, value in items.items():
+                self._items[key] = value
+                self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def stats(self) -> dict:
+        return {"size": len(self._items), "hits": self.hits, "misses": self.misses}
+
+
+def _is_keras(model) -> bool:
+    """Keras 모델 여부 (TensorFlow를 import하지 않고 모듈 이름으로 판별)"""
+    return type(model).__module__.startswith(("keras", "tensorflow", "tf_keras"))
+
+
+def model_predict(model, X: np.ndarray) -> np.ndarray:
+    """
+    모델 predict 호출 (Keras 모델에만 verbose=0 전달, sklearn 등은 predict(X))
+    """
+    if _is_keras(model):
+        return model.predict(X, verbose=0)
+    return model.predict(X)
+
+
+def cached_member_predict(
+    model,
+    member_key: str,
+    X: np.ndarray,
+    keys: Optional[Sequence[Hashable]],
+    cache: Optional[MemberOutputCache],
+) -> Tuple[np.ndarray, int]:
+    """
+    멤버 모델 1개의 예측 (캐시 미스 행만 추론)
+
+    Args:
+        model: predict(X)를 가진 모델
+        member_key: 멤버 식별자 (모델명:버전)
+        X: (batch, window, features) 입력
+        keys: 행별 경기 키. None이면 캐시를 쓰지 않음
+        cache: 멤버 출력 캐시
+
+    Returns:
+        (batch,) 확률, 실제로 추론한 행 수
+    """
+    if cache is None or keys is None:
+        return np.asarray(model_predict(model, X), dtype=np.float64).reshape(-1), len(X)
+
+    cache_keys = [(key, member_key, feature_hash(x)) for key, x in zip(keys, X)]
+    cached = cache.get_many(cache_keys)
+    output = np.array([np.nan if v is None else v for v in cached], dtype=np.float64)
+
+    missing = np.flatnonzero(np.isnan(output))
+    if len(missing):
+        computed = np.asarray(model_predict(model, X[missing]), dtype=np.float64).reshape(-1)
+        output[missing] = computed
+        cache.put_many({cache_keys[i]: float(p) for i, p in zip(missing, computed)})
+    return output, len(missing)
+
+
+class EnsembleModel:
+    """
+    여러 모델의 앙상블
+
+    - predict(X, keys): 캐시에 없는 멤버 출력만 병렬 추론 후 가중 평균
+    - predict_from_outputs(): 이미 계산된 멤버 출력으로 가중 평균만 계산
+    - last_timings: 마지막 predict의 멤버별 소요 시간(ms)과 추론 행 수
+    - 멤버 병렬 추론 스레드 풀은 인스턴스마다 하나를 재사용 (close()로 종료)
+    """
+
+    def __init__(
+        self,
+        models: Union[Dict[str, object], List[object]],
+        weights: Optional[Sequence[float]] = None,
+        cache: Optional[MemberOutputCache] = None,
+        max_workers: Optional[int] = None,
+    ):
+        if not isinstance(models, dict):
+            models = {f"member_{i}": model for i, model in enumerate(models)}
+        self.models = models
+        self.weights = list(weights) if weights else [1.0 / len(models)] * len(models)
+        self.cache = cache
+        self.max_workers = max_workers or len(models)
+        self.last_timings: Dict[str, dict] = {}
+        self._executor: Optional[ThreadPoolExecutor] = None
+        if len(models) > 1:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="ensemble")
+
+    def close(self) -> None:
+        """멤버 추론 스레드 풀 종료 (진행 중인 predict는 끝까지 실행)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def predict_from_outputs(self, member_outputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """멤버 출력 (member_key -> (batch,)) 의 가중 평균"""
+        outputs = np.stack([np.asarray(member_outputs[key]).reshape(-1) for key in self.models])
+        return np.average(outputs, axis=0, weights=self.weights)
+
+    def predict(self, X: np.ndarray, keys: Optional[Sequence[Hashable]] = None) -> np.ndarray:
+        """
+        앙상블 예측
+
+        Args:
+            X: 입력 데이터
+            keys: 행별 경기 키 (주어지면 멤버 출력 캐시 사용)
+
+        Returns:
+            (batch, 1) 가중 평균된 예측
+        """
+        def run(member_key: str):
+            started = time.perf_counter()
+            output, computed = cached_member_predict(
+                self.models[member_key], member_key, X, keys, self.cache
+            )
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            return member_key, output, {"ms": round(elapsed_ms, 3), "computed_rows": computed}
+
+        futures = None
+        if self._executor is not None:
+            try:
+                futures = [self._executor.submit(run, key) for key in self.models]
+            except RuntimeError:
+                # 모델 교체로 close()된 앙상블을 아직 쓰는 요청은 순차 추론
+                futures = None
+        if futures is None:
+            results = [run(key) for key in self.models]
+        else:
+            results = [future.result() for future in futures]
+
+        self.last_timings = {key: timing for key, _, timing in results}
+        member_outputs = {key: output for key, output, _ in results}
+        return self.predict_from_outputs(member_outputs).reshape(-1, 1)
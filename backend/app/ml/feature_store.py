@@ -0,0 +1,386 @@
+"""
+팀별 롤링 특성 저장소
+
+경기가 끝날 때마다 팀별 최근 N경기 기록(승/패, 득점, 실점)을 링 버퍼에
+O(1)로 갱신하고, 각 경기 직전 시점의 특성을 (team_id, match_id) 키로 보관한다.
+학습용 시퀀스 생성과 온라인 예측이 모두 이 저장소를 읽는다.
+"""
+import pickle
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+
+FEATURE_NAMES = ("recent_wins", "recent_losses", "avg_score", "avg_allowed", "win_rate")
+
+
+class _TeamRingBuffer:
+    """팀 한 곳의 최근 N경기 링 버퍼 (합계를 함께 유지)"""
+
+    __slots__ = ("wins", "runs_for", "runs_against", "head", "count",
+                 "sum_wins", "sum_for", "sum_against")
+
+    def __init__(self, n_games: int):
+        self.wins = np.zeros(n_games, dtype=np.int8)
+        self.runs_for = np.zeros(n_games, dtype=np.int32)
+        self.runs_against = np.zeros(n_games, dtype=np.int32)
+        self.head = 0
+        self.count = 0
+        self.sum_wins = 0
+        self.sum_for = 0
+        self.sum_against = 0
+
+    def push(self, win: int, scored: int, allowed: int) -> None:
+        """가장 오래된 기록을 밀어내고 새 경기 기록 추가"""
+        n_games = len(self.wins)
+        slot = self.head
+
+        if self.count == n_games:
+            self.sum_wins -= int(self.wins[slot])
+            self.sum_for -= int(self.runs_for[slot])
+            self.sum_against -= int(self.runs_against[slot])
+        else:
+            self.count += 1
+
+        self.wins[slot] = win
+        self.runs_for[slot] = scored
+        self.runs_against[slot] = allowed
+        self.sum_wins += win
+        self.sum_for += scored
+        self.sum_against += allowed
+        self.head = (slot + 1) % n_games
+
+    def snapshot(self, n_games: int) -> Tuple[float, ...]:
+        """현재 상태를 FEATURE_NAMES 순서의 튜플로 반환"""
+        if self.count == 0:
+            return (0, 0, 0.0, 0.0, 0.0)
+
+        return (
+            self.sum_wins,
+            self.count - self.sum_wins,
+            self.sum_for / self.count,
+            self.sum_against / self.count,
+            self.sum_wins / n_games,
+        )
+
+
+class TeamFeatureStore:
+    """
+    증분 갱신되는 팀 특성 저장소
+
+    - update(): 완료된 경기 1건 반영 (O(1))
+    - get_features(): 팀의 현재 특성 또는 특정 경기 직전 시점 특성 조회
+    - save()/load(): 디스크에 저장해 재시작 시 전체 재계산 없이 복원
+    """
+
+    def __init__(self, n_games: int = 10):
+        self.n_games = n_games
+        self._buffers: Dict[int, _TeamRingBuffer] = {}
+        self._snapshots: Dict[Tuple[int, int], Tuple[float, ...]] = {}
+        self._applied_matches = set()
+        # from_arrays로 붙은 읽기 전용 스냅샷 (정렬된 키, 워커 간 공유). 이후 갱신은 위 dict에 쌓음
+        self._frozen_keys = np.empty(0, dtype=np.int64)
+        self._frozen_values = np.empty((0, len(FEATURE_NAMES)), dtype=np.float64)
+        self._frozen_matches = np.empty(0, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self._applied_matches) + len(self._frozen_matches)
+
+    def __setstate__(self, state: dict) -> None:
+        # 읽기 전용 스냅샷이 생기기 전에 저장된 pickle 호환
+        self.__init__(state["n_games"])
+        self.__dict__.update(state)
+
+    def _is_applied(self, match_id: int) -> bool:
+        if match_id in self._applied_matches:
+            return True
+        i = np.searchsorted(self._frozen_matches, match_id)
+        return i < len(self._frozen_matches) and self._frozen_matches[i] == match_id
+
+    def _snapshot(self, team_id: int, match_id: int) -> Optional[Tuple[float, ...]]:
+        values = self._snapshots.get((team_id, match_id))
+        if values is None and len(self._frozen_keys):
+            key = _snapshot_key(team_id, match_id)
+            i = np.searchsorted(self._frozen_keys, key)
+            if i < len(self._frozen_keys) and self._frozen_keys[i] == key:
+                values = tuple(self._frozen_values[i].tolist())
+        return values
+
+    def _buffer(self, team_id: int) -> _TeamRingBuffer:
+        buffer = self._buffers.get(team_id)
+        if buffer is None:
+            buffer = _TeamRingBuffer(self.n_games)
+            self._buffers[team_id] = buffer
+        return buffer
+
+    def update(self, match) -> bool:
+        """
+        완료된 경기 결과 반영
+
+        Args:
+            match: 경기 정보 (dict, pandas Series, namedtuple 모두 가능)
+
+        Returns:
+            반영 여부 (미완료 경기나 이미 반영된 경기는 False)
+        """
+        match_id = _get(match, "id")
+        winner = _get(match, "winner")
+        home_score = _get(match, "home_score")
+        away_score = _get(match, "away_score")
+
+        if winner is None or home_score is None or away_score is None:
+            return False
+        if match_id is not None and self._is_applied(match_id):
+            return False
+
+        home_team_id = int(_get(match, "home_team_id"))
+        away_team_id = int(_get(match, "away_team_id"))
+        home = self._buffer(home_team_id)
+        away = self._buffer(away_team_id)
+
+        # 경기 직전 시점 특성 기록
+        if match_id is not None:
+            self._snapshots[(home_team_id, match_id)] = home.snapshot(self.n_games)
+            self._snapshots[(away_team_id, match_id)] = away.snapshot(self.n_games)
+            self._applied_matches.add(match_id)
+
+        home_score = int(home_score)
+        away_score = int(away_score)
+        home.push(int(winner == "home"), home_score, away_score)
+        away.push(int(winner == "away"), away_score, home_score)
+        return True
+
+    def ingest(self, matches) -> int:
+        """
+        여러 경기를 순서대로 반영
+
+        Args:
+            matches: 경기 DataFrame 또는 경기 dict 목록 (시간순)
+
+        Returns:
+            반영된 경기 수
+        """
+        if hasattr(matches, "itertuples"):
+            rows: Iterable = matches.itertuples(index=False)
+        else:
+            rows = matches
+
+        return sum(1 for match in rows if self.update(match))
+
+    @classmethod
+    def from_matches(cls, matches, n_games: int = 10) -> "TeamFeatureStore":
+        """
+        완료 경기 DataFrame으로 한 번에 구축 (빈 저장소에 ingest한 것과 같은 상태)
+
+        팀별 롤링 통계를 그룹 누적합으로 계산해 경기 직전 스냅샷과 링 버퍼를 배열로 만든다.
+        경기 이력 저장소(MatchHistoryStore.to_frame)를 행 단위 루프 없이 읽을 때 사용한다.
+
+        Args:
+            matches: 경기 DataFrame (id, 팀, 점수, winner, 시간순)
+            n_games: 최근 N경기
+        """
+        # sequence_builder가 이 모듈을 import하므로 호출 시점에 import
+        from .sequence_builder import rolling_team_stats
+
+        completed = matches[
+            matches["winner"].notna() & matches["home_score"].notna() & matches["away_score"].notna()
+        ]
+        if completed.empty:
+            return cls(n_games)
+
+        stats = rolling_team_stats(completed, n_games)
+        team_id = stats["team_id"]
+        pos = stats["match_pos"]
+        is_home = stats["is_home"]
+        n_rows = len(team_id)
+
+        # 팀 관점 경기 기록 (팀 -> 경기순)
+        home_scores = completed["home_score"].to_numpy(dtype=np.int64)
+        away_scores = completed["away_score"].to_numpy(dtype=np.int64)
+        home_won = (completed["winner"] == "home").to_numpy()
+        away_won = (completed["winner"] == "away").to_numpy()
+        win = np.where(is_home, home_won[pos], away_won[pos]).astype(np.int8)
+        scored = np.where(is_home, home_scores[pos], away_scores[pos])
+        allowed = np.where(is_home, away_scores[pos], home_scores[pos])
+
+        # 경기 직전 스냅샷 = 같은 팀 직전 경기까지의 롤링 통계 (첫 경기는 0)
+        first = np.ones(n_rows, dtype=bool)
+        first[1:] = team_id[1:] != team_id[:-1]
+        prev = np.maximum(np.arange(n_rows) - 1, 0)
+        games = np.where(first, 0, stats["games"][prev]).astype(np.float64)
+        wins = np.where(first, 0, stats["wins"][prev]).astype(np.float64)
+        runs_for = np.where(first, 0, stats["runs_for"][prev])
+        runs_against = np.where(first, 0, stats["runs_against"][prev])
+        safe_games = np.maximum(games, 1)
+        values = np.column_stack([
+            wins,
+            games - wins,
+            np.where(games > 0, runs_for / safe_games, 0.0),
+            np.where(games > 0, runs_against / safe_games, 0.0),
+            wins / n_games,
+        ])
+        match_ids = completed["id"].to_numpy(dtype=np.int64)[pos]
+        keys = (team_id.astype(np.int64) << 32) | match_ids
+        order = np.argsort(keys, kind="stable")
+
+        # 링 버퍼: 팀별 마지막 n_games 경기를 (팀 내 경기 번호 % n_games) 칸에
+        starts = np.flatnonzero(first)
+        totals = np.diff(np.r_[starts, n_rows])
+        team_index = np.cumsum(first) - 1
+        game_number = np.arange(n_rows) - starts[team_index]
+        recent = game_number >= totals[team_index] - n_games
+        rows, slots = team_index[recent], game_number[recent] % n_games
+
+        shape = (len(starts), n_games)
+        buffer_wins = np.zeros(shape, dtype=np.int8)
+        buffer_for = np.zeros(shape, dtype=np.int32)
+        buffer_against = np.zeros(shape, dtype=np.int32)
+        buffer_wins[rows, slots] = win[recent]
+        buffer_for[rows, slots] = scored[recent]
+        buffer_against[rows, slots] = allowed[recent]
+
+        return cls.from_arrays({
+            "team_ids": team_id[starts].astype(np.int64),
+            "wins": buffer_wins,
+            "runs_for": buffer_for,
+            "runs_against": buffer_against,
+            "buffer_state": np.column_stack([
+                totals % n_games,
+                np.minimum(totals, n_games),
+                buffer_wins.sum(axis=1, dtype=np.int64),
+                buffer_for.sum(axis=1, dtype=np.int64),
+                buffer_against.sum(axis=1, dtype=np.int64),
+            ]).astype(np.int64),
+            "snapshot_keys": keys[order],
+            "snapshot_values": values[order],
+            "applied_matches": np.sort(completed["id"].to_numpy(dtype=np.int64)),
+        }, {"n_games": n_games})
+
+    def get_features(self, team_id: int, as_of_match: Optional[int] = None) -> dict:
+        """
+        팀 특성 조회
+
+        Args:
+            team_id: 팀 ID
+            as_of_match: 경기 ID. 해당 경기 직전 시점 특성을 반환하며,
+                아직 반영되지 않은 경기(예정 경기)면 현재 특성을 반환
+
+        Returns:
+            dict: extract_team_features와 같은 키의 특성 딕셔너리
+        """
+        values = None
+        if as_of_match is not None:
+            values = self._snapshot(team_id, as_of_match)
+            if values is None and self._is_applied(as_of_match):
+                raise KeyError(f"팀 {team_id}은(는) 경기 {as_of_match}에 출전하지 않았습니다")
+
+        if values is None:
+            buffer = self._buffers.get(team_id)
+            values = buffer.snapshot(self.n_games) if buffer else (0, 0, 0.0, 0.0, 0.0)
+
+        return dict(zip(FEATURE_NAMES, values))
+
+    def match_feature_vector(self, match, as_of_match: Optional[int] = None) -> list:
+        """
+        경기 1건의 모델 입력 특성 벡터
+
+        prepare_sequence_data와 같은 순서:
+        [홈 승률, 홈 평균 득점, 원정 승률, 원정 평균 득점, 홈/원정]
+        """
+        home = self.get_features(int(_get(match, "home_team_id")), as_of_match)
+        away = self.get_features(int(_get(match, "away_team_id")), as_of_match)
+        return [
+            home["win_rate"],
+            home["avg_score"],
+            away["win_rate"],
+            away["avg_score"],
+            1,
+        ]
+
+    def save(self, path: Union[str, Path]) -> None:
+        """저장소 상태를 파일로 저장"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "TeamFeatureStore":
+        """파일에서 저장소 복원"""
+        with open(path, "rb") as f:
+            store = pickle.load(f)
+        if not isinstance(store, cls):
+            raise TypeError(f"{path}은(는) TeamFeatureStore 파일이 아닙니다")
+        return store
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], dict]:
+        """
+        저장소 상태를 배열 묶음으로 변환 (멀티 워커 공유용, shared_arrays.publish_object)
+        """
+        team_ids = sorted(self._buffers)
+        buffers = [self._buffers[team_id] for team_id in team_ids]
+
+        keys = [_snapshot_key(team_id, match_id) for team_id, match_id in self._snapshots]
+        values = list(self._snapshots.values())
+        keys = np.concatenate([self._frozen_keys, np.array(keys, dtype=np.int64)])
+        values = np.concatenate([
+            self._frozen_values, np.array(values, dtype=np.float64).reshape(-1, len(FEATURE_NAMES)),
+        ])
+        order = np.argsort(keys, kind="stable")
+        matches = np.concatenate([self._frozen_matches, np.array(sorted(self._applied_matches), dtype=np.int64)])
+
+        shape = (len(team_ids), self.n_games)
+        return {
+            "team_ids": np.array(team_ids, dtype=np.int64),
+            "wins": np.array([b.wins for b in buffers], dtype=np.int8).reshape(shape),
+            "runs_for": np.array([b.runs_for for b in buffers], dtype=np.int32).reshape(shape),
+            "runs_against": np.array([b.runs_against for b in buffers], dtype=np.int32).reshape(shape),
+            "buffer_state": np.array(
+                [(b.head, b.count, b.sum_wins, b.sum_for, b.sum_against) for b in buffers], dtype=np.int64,
+            ).reshape(-1, 5),
+            "snapshot_keys": keys[order],
+            "snapshot_values": values[order],
+            "applied_matches": np.sort(matches),
+        }, {"n_games": self.n_games}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: dict) -> "TeamFeatureStore":
+        """
+        배열 묶음에서 복원
+
+        경기 직전 스냅샷은 배열(메모리 매핑 가능)을 복사하지 않고 그대로 읽고,
+        팀별 링 버퍼(팀 수 x N경기)만 쓰기 가능한 복사본을 만든다.
+        """
+        store = cls(int(meta["n_games"]))
+        for i, team_id in enumerate(arrays["team_ids"].tolist()):
+            buffer = store._buffer(team_id)
+            buffer.wins[:] = arrays["wins"][i]
+            buffer.runs_for[:] = arrays["runs_for"][i]
+            buffer.runs_against[:] = arrays["runs_against"][i]
+            buffer.head, buffer.count, buffer.sum_wins, buffer.sum_for, buffer.sum_against = (
+                arrays["buffer_state"][i].tolist()
+            )
+        store._frozen_keys = arrays["snapshot_keys"]
+        store._frozen_values = arrays["snapshot_values"]
+        store._frozen_matches = arrays["applied_matches"]
+        return store
+
+
+def _snapshot_key(team_id: int, match_id: int) -> int:
+    """(팀, 경기) -> 정렬 가능한 정수 키"""
+    return (int(team_id) << 32) | int(match_id)
+
+
+def _get(match, key: str):
+    """dict/Series/namedtuple 공통 필드 접근 (NaN은 None으로 취급)"""
+    if isinstance(match, dict):
+        value = match.get(key)
+    elif hasattr(match, "get") and not hasattr(match, "_fields"):
+        value = match.get(key)
+    else:
+        value = getattr(match, key, None)
+
+    if isinstance(value, float) and np.isnan(value):
+        return None
+    return value
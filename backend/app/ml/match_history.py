@@ -0,0 +1,316 @@
+"""
+경기 이력 컬럼 저장소 (메모리 매핑 .npy)
+
+완료된 경기의 ID, 날짜, 시즌, 팀, 점수, 승자를 컬럼별 .npy 배열로 (날짜, ID) 순서로 저장한다.
+학습 데이터 준비, 백테스트, 팀 특성 저장소 구축이 MySQL 조회나 행 단위 파이썬 객체 없이
+메모리 매핑 배열을 그대로 읽는다.
+
+- 경기 종료 시 여유 용량을 두고 미리 할당한 배열 끝에 이어 쓰고, 포인터의 유효 길이만 갱신
+- 날짜 인덱스: 날짜 컬럼이 정렬되어 있으므로 이진 탐색으로 기간 조회
+- 과거 날짜 경기가 늦게 들어오거나 결과가 정정되면 새 묶음을 만들어 교체
+
+저장 구조는 shared_arrays 묶음과 같다 (root/history.json 포인터 + root/history-<token>/*.npy).
+쓰기는 파일 잠금(POSIX flock, Windows msvcrt.locking)으로 프로세스 간 직렬화하고,
+읽는 쪽은 포인터가 바뀌면 다시 붙는다.
+"""
+import os
+import time
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from .shared_arrays import attach_arrays, publish_arrays, update_meta
+
+# 경기 이력 저장소 디렉토리
+MATCH_HISTORY_DIR = os.getenv("MATCH_HISTORY_DIR", "models/match_history")
+
+# winner 컬럼 코드 (저장소에는 완료 경기만 있으므로 WINNER_NONE은 쓰지 않음)
+WINNER_NONE = 0
+WINNER_HOME = 1
+WINNER_AWAY = 2
+WINNER_CODES = {"home": WINNER_HOME, "away": WINNER_AWAY}
+
+# 컬럼 -> dtype
+COLUMNS = {
+    "id": np.int64,
+    "match_date": "datetime64[D]",
+    "season": np.int16,
+    "home_team_id": np.int32,
+    "away_team_id": np.int32,
+    "home_score": np.int16,
+    "away_score": np.int16,
+    "winner": np.int8,
+}
+
+_BUNDLE = "history"
+
+try:
+    import fcntl
+except ImportError:  # Windows (start_backend.bat)
+    fcntl = None
+    import msvcrt
+
+
+@contextmanager
+def _exclusive_lock(path: Path):
+    """프로세스 간 배타 잠금 (잠금 파일 첫 바이트)"""
+    with open(path, "a+b") as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock, fcntl.LOCK_UN)
+            return
+
+        lock.seek(0)
+        # LK_LOCK은 약 10초 재시도 후 OSError이므로 잡힐 때까지 반복
+        while True:
+            try:
+                msvcrt.locking(lock.fileno(), msvcrt.LK_LOCK, 1)
+                break
+            except OSError:
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            lock.seek(0)
+            msvcrt.locking(lock.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class MatchHistoryStore:
+    """
+    완료 경기 컬럼 저장소
+
+    - append(): 완료 경기 추가/정정 (미완료 경기는 무시)
+    - columns(): 컬럼 배열 (메모리 매핑 뷰, 복사 없음), 날짜 범위 지정 가능
+    - positions(): 경기 ID -> 행 위치
+    - to_frame(): prepare_sequence_data 입력 DataFrame
+    """
+
+    def __init__(self, root: Union[str, Path] = MATCH_HISTORY_DIR, initial_capacity: int = 4096):
+        self.root = Path(root)
+        self.initial_capacity = initial_capacity
+        self._arrays: Dict[str, np.ndarray] = {}
+        self._length = 0
+        self._stamp = None
+        self._id_order: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        self.refresh()
+        return self._length
+
+    @property
+    def stamp(self):
+        """포인터 파일 상태 (어느 프로세스든 쓰면 바뀜, 저장소가 없으면 None)"""
+        self.refresh()
+        return self._stamp
+
+    def refresh(self) -> bool:
+        """
+        다른 프로세스가 쓴 내용 반영 (포인터 파일이 바뀌었을 때만 다시 붙음)
+
+        Returns:
+            다시 붙었는지 여부
+        """
+        try:
+            stat = (self.root / f"{_BUNDLE}.json").stat()
+        except FileNotFoundError:
+            return False
+        stamp = (stat.st_ino, stat.st_mtime_ns)
+        if stamp == self._stamp:
+            return False
+
+        attached = attach_arrays(self.root, _BUNDLE)
+        if attached is None:
+            return False
+        self._arrays, meta = attached
+        self._length = int(meta["length"])
+        self._stamp = stamp
+        self._id_order = None
+        return True
+
+    # ========================================
+    # 읽기
+    # ========================================
+
+    def date_slice(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> slice:
+        """
+        날짜 범위(양 끝 포함)의 행 범위
+
+        Args:
+            start_date: 시작 날짜 (None이면 처음부터)
+            end_date: 종료 날짜 (None이면 끝까지)
+        """
+        self.refresh()
+        if not self._length:
+            return slice(0, 0)
+        dates = self._arrays["match_date"][:self._length]
+        start = 0 if start_date is None else int(np.searchsorted(dates, np.datetime64(start_date, "D"), "left"))
+        end = self._length if end_date is None else int(np.searchsorted(dates, np.datetime64(end_date, "D"), "right"))
+        return slice(start, max(start, end))
+
+    def columns(self, start_date: Optional[date] = None, end_date: Optional[date] = None) -> Dict[str, np.ndarray]:
+        """
+        컬럼 배열 (날짜, ID 순)
+
+        메모리 매핑 배열의 읽기 전용 뷰를 그대로 반환한다.
+        """
+        rows = self.date_slice(start_date, end_date)
+        if not self._arrays:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return {name: self._arrays[name][rows] for name in COLUMNS}
+
+    def positions(self, match_ids) -> np.ndarray:
+        """
+        경기 ID -> 행 위치 (없는 경기는 -1)
+        """
+        match_ids = np.asarray(match_ids, dtype=np.int64)
+        self.refresh()
+        if not self._length:
+            return np.full(len(match_ids), -1, dtype=np.int64)
+
+        ids = self._arrays["id"][:self._length]
+        if self._id_order is None:
+            self._id_order = np.argsort(ids, kind="stable")
+        sorted_ids = ids[self._id_order]
+        i = np.minimum(np.searchsorted(sorted_ids, match_ids), self._length - 1)
+        return np.where(sorted_ids[i] == match_ids, self._id_order[i], -1)
+
+    def to_frame(self, start_date: Optional[date] = None, end_date: Optional[date] = None):
+        """
+        경기 DataFrame (prepare_sequence_data / build_asof_sequence_tensor 입력)
+
+        winner는 codes만 가진 Categorical("home"/"away")이라 행마다 문자열을 만들지 않는다.
+        """
+        import pandas as pd
+
+        columns = self.columns(start_date, end_date)
+        return pd.DataFrame({
+            "id": columns["id"],
+            "match_date": columns["match_date"].astype("datetime64[ns]"),
+            "season": columns["season"],
+            "home_team_id": columns["home_team_id"],
+            "away_team_id": columns["away_team_id"],
+            "home_score": columns["home_score"],
+            "away_score": columns["away_score"],
+            "winner": pd.Categorical.from_codes(columns["winner"].astype(np.int8) - 1, categories=["home", "away"]),
+        })
+
+    # ========================================
+    # 쓰기
+    # ========================================
+
+    def append(self, matches) -> int:
+        """
+        완료 경기 추가 (이미 있는 경기는 값이 바뀐 경우만 정정)
+
+        시간순으로 들어오는 새 경기는 배열 끝에 이어 쓰고, 과거 날짜 경기나 정정이 섞이면
+        전체를 (날짜, ID) 순으로 다시 써서 묶음을 교체한다.
+
+        Args:
+            matches: 경기 dict 목록 또는 DataFrame (미완료 경기는 건너뜀)
+
+        Returns:
+            추가/정정된 경기 수
+        """
+        new = _to_columns(matches)
+        if not len(new["id"]):
+            return 0
+
+        self.root.mkdir(parents=True, exist_ok=True)
+        with _exclusive_lock(self.root / ".lock"):
+            self.refresh()
+
+            positions = self.positions(new["id"])
+            exists = positions >= 0
+            if exists.any():
+                # 값이 같은 경기(같은 결과의 중복 이벤트)는 제외
+                same = np.ones(int(exists.sum()), dtype=bool)
+                for name in COLUMNS:
+                    same &= self._arrays[name][positions[exists]] == new[name][exists]
+                changed = np.ones(len(positions), dtype=bool)
+                changed[np.flatnonzero(exists)[same]] = False
+                new = {name: values[changed] for name, values in new.items()}
+                exists = exists[changed]
+                if not len(new["id"]):
+                    return 0
+
+            n = self._length
+            capacity = len(self._arrays["id"]) if self._arrays else 0
+            in_order = n == 0 or (
+                (new["match_date"][0], new["id"][0]) > (self._arrays["match_date"][n - 1], self._arrays["id"][n - 1])
+            )
+            if exists.any() or not in_order or n + len(new["id"]) > capacity:
+                self._rewrite(new)
+            else:
+                self._append_in_place(new)
+            self.refresh()
+        return len(new["id"])
+
+    def _append_in_place(self, new: Dict[str, np.ndarray]) -> None:
+        n = self._length
+        k = len(new["id"])
+        for name in COLUMNS:
+            writable = np.load(self._arrays[name].filename, mmap_mode="r+")
+            writable[n:n + k] = new[name]
+            writable.flush()
+            del writable
+        update_meta(self.root, _BUNDLE, {"length": n + k})
+
+    def _rewrite(self, new: Dict[str, np.ndarray]) -> None:
+        n = self._length
+        if n:
+            keep = ~np.isin(self._arrays["id"][:n], new["id"])
+            merged = {name: np.concatenate([self._arrays[name][:n][keep], new[name]]) for name in COLUMNS}
+        else:
+            merged = new
+        order = np.lexsort((merged["id"], merged["match_date"]))
+        length = len(order)
+
+        # 이어 쓰기용 여유 용량 (길이의 2배)
+        capacity = max(self.initial_capacity, 2 * length)
+        arrays = {}
+        for name, dtype in COLUMNS.items():
+            array = np.zeros(capacity, dtype=dtype)
+            array[:length] = merged[name][order]
+            arrays[name] = array
+        publish_arrays(self.root, _BUNDLE, arrays, {"length": length})
+
+
+def _to_columns(matches) -> Dict[str, np.ndarray]:
+    """
+    경기 목록 -> 완료 경기 컬럼 배열 ((날짜, ID) 순, 같은 ID는 마지막 값)
+    """
+    if hasattr(matches, "to_dict") and not isinstance(matches, dict):
+        rows: Iterable = matches.to_dict("records")
+    else:
+        rows = matches
+    rows = [
+        row for row in rows
+        if row.get("winner") in WINNER_CODES and _present(row.get("home_score")) and _present(row.get("away_score"))
+    ]
+
+    columns = {
+        "id": np.array([row["id"] for row in rows], dtype=np.int64),
+        "match_date": np.array([np.datetime64(row["match_date"], "D") for row in rows], dtype="datetime64[D]"),
+        "season": np.array([row["season"] for row in rows], dtype=np.int16),
+        "home_team_id": np.array([row["home_team_id"] for row in rows], dtype=np.int32),
+        "away_team_id": np.array([row["away_team_id"] for row in rows], dtype=np.int32),
+        "home_score": np.array([row["home_score"] for row in rows], dtype=np.int16),
+        "away_score": np.array([row["away_score"] for row in rows], dtype=np.int16),
+        "winner": np.array([WINNER_CODES[row["winner"]] for row in rows], dtype=np.int8),
+    }
+
+    # 같은 ID는 마지막 값만 남기고 (날짜, ID) 순 정렬
+    _, last = np.unique(columns["id"][::-1], return_index=True)
+    keep = len(rows) - 1 - last
+    order = keep[np.lexsort((columns["id"][keep], columns["match_date"][keep]))]
+    return {name: values[order] for name, values in columns.items()}
+
+
+def _present(value) -> bool:
+    return value is not None and not (isinstance(value, float) and np.isnan(value))
@@ -0,0 +1,388 @@
+"""
+NumPy LSTM/GRU 추론 런타임
+
+build_lstm_model / build_gru_model(docs/model_structure_example.py)로 학습한 Keras 모델의
+가중치를 .npz로 내보내고, API 서버는 TensorFlow 없이 NumPy 배치 순전파로 예측한다.
+
+지원 레이어 (Keras 기본 설정 기준):
+    LSTM, GRU (reset_after True/False), Bidirectional(merge_mode="concat"), Dense, Dropout(추론 시 무시)
+
+- 시점별 입력 변환(x @ W)은 전체 시퀀스를 한 번에 계산하고, 순환 부분(h @ U)만 시점마다 계산
+- to_arrays()/from_arrays()를 구현해 멀티 워커 서빙에서 가중치를 공유 배열로 올림
+- quantize()로 kernel/recurrent_kernel을 float16 또는 출력 채널별 스케일의 int8로 저장
+  (상주 메모리 절감, 계산은 순전파 시 self.dtype으로 복원해 수행)
+
+.npz 구조:
+    spec                 레이어 구성 JSON 문자열
+    <레이어 번호>.<이름>   가중치 배열 (kernel, recurrent_kernel, bias, 양방향은 forward_/backward_ 접두사)
+                         int8이면 <이름>_scale에 출력 채널별 스케일
+"""
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+# 활성화 함수 (Keras 이름 -> 구현)
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 0.5 * (np.tanh(0.5 * x) + 1.0),
+    "relu": lambda x: np.maximum(x, 0.0),
+    "linear": lambda x: x,
+}
+
+_RECURRENT_PARAMS = ("kernel", "recurrent_kernel", "bias")
+
+# 양자화 방식 (None은 원래 dtype 그대로)
+QUANTIZATION_MODES = ("float16", "int8")
+
+_SCALE_SUFFIX = "_scale"
+
+
+# ========================================
+# 레이어 순전파
+# ========================================
+
+def _lstm(X: np.ndarray, w: Dict[str, np.ndarray], spec: dict, reverse: bool = False) -> np.ndarray:
+    """
+    LSTM (게이트 순서 i, f, c, o)
+
+    Args:
+        X: (배치, 시점, 입력 차원)
+        reverse: 시퀀스를 뒤에서부터 처리 (Bidirectional의 backward)
+
+    Returns:
+        return_sequences면 (배치, 시점, units), 아니면 마지막 상태 (배치, units)
+    """
+    units = spec["units"]
+    activation = ACTIVATIONS[spec["activation"]]
+    recurrent_activation = ACTIVATIONS[spec["recurrent_activation"]]
+    n, steps, _ = X.shape
+
+    projected = X @ _matrix(w, "kernel", X.dtype) + w["bias"]
+    U = _matrix(w, "recurrent_kernel", X.dtype)
+    h = np.zeros((n, units), dtype=X.dtype)
+    c = np.zeros((n, units), dtype=X.dtype)
+    outputs = np.empty((n, steps, units), dtype=X.dtype) if spec["return_sequences"] else None
+
+    order = range(steps - 1, -1, -1) if reverse else range(steps)
+    for t in order:
+        z = projected[:, t] + h @ U
+        i = recurrent_activation(z[:, :units])
+        f = recurrent_activation(z[:, units:2 * units])
+        g = activation(z[:, 2 * units:3 * units])
+        o = recurrent_activation(z[:, 3 * units:])
+        c = f * c + i * g
+        h = o * activation(c)
+        if outputs is not None:
+            outputs[:, t] = h
+    return outputs if outputs is not None else h
+
+
+def _gru(X: np.ndarray, w: Dict[str, np.ndarray], spec: dict, reverse: bool = False) -> np.ndarray:
+    """
+    GRU (게이트 순서 z, r, h)
+
+    reset_after=True(TF2 기본)면 bias가 (2, 3*units)로 입력/순환 bias가 따로 있고,
+    리셋 게이트를 순환 변환 뒤에 곱한다.
+    """
+    units = spec["units"]
+    activation = ACTIVATIONS[spec["activation"]]
+    recurrent_activation = ACTIVATIONS[spec["recurrent_activation"]]
+    reset_after = spec["reset_after"]
+    n, steps, _ = X.shape
+
+    bias = w["bias"]
+    if reset_after:
+        input_bias, recurrent_bias = bias[0], bias[1]
+    else:
+        input_bias, recurrent_bias = bias, np.zeros_like(bias)
+    projected = X @ _matrix(w, "kernel", X.dtype) + input_bias
+    U = _matrix(w, "recurrent_kernel", X.dtype)
+    h = np.zeros((n, units), dtype=X.dtype)
+    outputs = np.empty((n, steps, units), dtype=X.dtype) if spec["return_sequences"] else None
+
+    order = range(steps - 1, -1, -1) if reverse else range(steps)
+    for t in order:
+        x = projected[:, t]
+        if reset_after:
+            recurrent = h @ U + recurrent_bias
+            z = recurrent_activation(x[:, :units] + recurrent[:, :units])
+            r = recurrent_activation(x[:, units:2 * units] + recurrent[:, units:2 * units])
+            candidate = activation(x[:, 2 * units:] + r * recurrent[:, 2 * units:])
+        else:
+            recurrent = h @ U[:, :2 * units]
+            z = recurrent_activation(x[:, :units] + recurrent[:, :units])
+            r = recurrent_activation(x[:, units:2 * units] + recurrent[:, units:])
+            candidate = activation(x[:, 2 * units:] + (r * h) @ U[:, 2 * units:])
+        h = z * h + (1.0 - z) * candidate
+        if outputs is not None:
+            outputs[:, t] = h
+    return outputs if outputs is not None else h
+
+
+_RECURRENT_LAYERS = {"lstm": _lstm, "gru": _gru}
+
+
+def _forward(X: np.ndarray, layers: List[dict], weights: List[Dict[str, np.ndarray]]) -> np.ndarray:
+    for spec, w in zip(layers, weights):
+        kind = spec["type"]
+        if kind == "dense":
+            X = ACTIVATIONS[spec["activation"]](X @ _matrix(w, "kernel", X.dtype) + w["bias"])
+        elif kind == "bidirectional":
+            # backward 출력은 원래 시점 순서로 저장되므로 그대로 이어 붙임
+            cell = _RECURRENT_LAYERS[spec["layer"]["type"]]
+            forward = cell(X, _prefixed(w, "forward_"), spec["layer"])
+            backward = cell(X, _prefixed(w, "backward_"), spec["layer"], reverse=True)
+            X = np.concatenate([forward, backward], axis=-1)
+        else:
+            X = _RECURRENT_LAYERS[kind](X, w, spec)
+    return X
+
+
+def _prefixed(weights: Dict[str, np.ndarray], prefix: str) -> Dict[str, np.ndarray]:
+    return {name[len(prefix):]: value for name, value in weights.items() if name.startswith(prefix)}
+
+
+def _matrix(weights: Dict[str, np.ndarray], name: str, dtype) -> np.ndarray:
+    """
+    계산용 가중치 행렬
+
+    양자화된 가중치는 호출마다 계산 dtype으로 복원한다 (순전파 1회당 레이어별 1번,
+    순환 루프 밖). 복원본은 순전파가 끝나면 버려지므로 상주 메모리는 저장 dtype 크기.
+    """
+    value = weights[name]
+    scale = weights.get(name + _SCALE_SUFFIX)
+    if scale is not None:
+        return value.astype(dtype) * scale
+    return value.astype(dtype, copy=False)
+
+
+# ========================================
+# 양자화
+# ========================================
+
+def _is_matrix(name: str) -> bool:
+    # kernel, recurrent_kernel, forward_kernel, ... (bias는 크기가 작아 원래 dtype 유지)
+    return name.endswith("kernel")
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    출력 채널(열)별 대칭 int8 양자화
+
+    Returns:
+        (int8 행렬, 열별 스케일). matrix ≈ q * scale
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    scale = np.abs(matrix).max(axis=0) / 127.0
+    scale[scale == 0] = 1.0  # 전부 0인 열
+    q = np.clip(np.rint(matrix / scale), -127, 127).astype(np.int8)
+    return q, scale.astype(np.float32)
+
+
+def _quantize_weights(weights: Dict[str, np.ndarray], mode: str) -> Dict[str, np.ndarray]:
+    quantized = {}
+    for name, value in weights.items():
+        if not _is_matrix(name):
+            quantized[name] = value
+        elif mode == "float16":
+            quantized[name] = np.ascontiguousarray(value, dtype=np.float16)
+        else:
+            quantized[name], quantized[name + _SCALE_SUFFIX] = quantize_int8(value)
+    return quantized
+
+
+# ========================================
+# 모델
+# ========================================
+
+class NumpySequenceModel:
+    """
+    Keras Sequential 순환 모델의 NumPy 추론 버전
+
+    predict()는 Keras model.predict와 같은 (배치, 출력 차원) 배열을 반환한다.
+    """
+
+    def __init__(
+        self,
+        layers: List[dict],
+        weights: List[Dict[str, np.ndarray]],
+        dtype=np.float32,
+        quantization: Optional[str] = None,
+    ):
+        self.layers = layers
+        self.weights = weights
+        self.dtype = np.dtype(dtype)
+        self.quantization = quantization
+
+    @property
+    def num_parameters(self) -> int:
+        return sum(
+            int(value.size) for w in self.weights
+            for name, value in w.items() if not name.endswith(_SCALE_SUFFIX)
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """가중치 상주 메모리 (양자화 스케일 포함)"""
+        return sum(int(value.nbytes) for w in self.weights for value in w.values())
+
+    def quantize(self, mode: str) -> "NumpySequenceModel":
+        """
+        kernel/recurrent_kernel을 양자화한 새 모델 (bias는 그대로)
+
+        Args:
+            mode: "float16" 또는 "int8"(출력 채널별 스케일)
+
+        Raises:
+            ValueError: 지원하지 않는 방식이거나 이미 양자화된 모델
+        """
+        if mode not in QUANTIZATION_MODES:
+            raise ValueError(f"지원하지 않는 양자화 방식입니다: {mode} ({', '.join(QUANTIZATION_MODES)})")
+        if self.quantization is not None:
+            raise ValueError(f"이미 {self.quantization}로 양자화된 모델입니다")
+        weights = [_quantize_weights(w, mode) for w in self.weights]
+        return NumpySequenceModel(self.layers, weights, dtype=self.dtype, quantization=mode)
+
+    def predict(self, X: np.ndarray, verbose=0, batch_size: int = 4096) -> np.ndarray:
+        """
+        배치 순전파
+
+        Args:
+            X: (배치, 시점, 특성) 입력 (스케일러 적용 후)
+            batch_size: 한 번에 계산하는 샘플 수 (중간 배열 메모리 상한)
+        """
+        X = np.asarray(X, dtype=self.dtype)
+        if len(X) <= batch_size:
+            return _forward(X, self.layers, self.weights)
+        return np.concatenate([
+            _forward(X[start:start + batch_size], self.layers, self.weights)
+            for start in range(0, len(X), batch_size)
+        ])
+
+    # ========================================
+    # 저장/복원
+    # ========================================
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], dict]:
+        """레이어별 가중치 배열과 레이어 구성 (shared_arrays.publish_object, save에서 사용)"""
+        arrays = {
+            f"{index}.{name}": value
+            for index, w in enumerate(self.weights)
+            for name, value in w.items()
+        }
+        return arrays, {"layers": self.layers, "dtype": self.dtype.name, "quantization": self.quantization}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: dict) -> "NumpySequenceModel":
+        """배열을 복사하지 않고 그대로 사용 (메모리 매핑 배열 가능)"""
+        weights: List[Dict[str, np.ndarray]] = [{} for _ in meta["layers"]]
+        for key, value in arrays.items():
+            index, name = key.split(".", 1)
+            weights[int(index)][name] = value
+        return cls(
+            meta["layers"], weights,
+            dtype=meta.get("dtype", "float32"),
+            quantization=meta.get("quantization"),
+        )
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """.npz로 저장 (pickle 없이 배열과 JSON 구성만 기록)"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        arrays, meta = self.to_arrays()
+        with open(path, "wb") as f:
+            np.savez(f, spec=np.array(json.dumps(meta)), **arrays)
+        return path
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "NumpySequenceModel":
+        """.npz에서 복원"""
+        with np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["spec"]))
+            arrays = {key: data[key] for key in data.files if key != "spec"}
+        return cls.from_arrays(arrays, meta)
+
+
+# ========================================
+# Keras -> NumPy 변환
+# ========================================
+
+def _activation_name(layer, attribute: str) -> str:
+    name = getattr(getattr(layer, attribute), "__name__", None)
+    if name not in ACTIVATIONS:
+        raise ValueError(f"{layer.name}: 지원하지 않는 활성화 함수입니다 ({attribute}={name})")
+    return name
+
+
+def _recurrent_spec(layer, backward: bool = False) -> Tuple[dict, Dict[str, np.ndarray]]:
+    kind = type(layer).__name__.lower()
+    # Bidirectional의 backward 레이어만 go_backwards=True
+    if bool(getattr(layer, "go_backwards", False)) != backward or getattr(layer, "stateful", False):
+        raise ValueError(f"{layer.name}: go_backwards/stateful 순환 레이어는 지원하지 않습니다")
+
+    spec = {
+        "type": kind,
+        "units": int(layer.units),
+        "activation": _activation_name(layer, "activation"),
+        "recurrent_activation": _activation_name(layer, "recurrent_activation"),
+        "return_sequences": bool(layer.return_sequences),
+    }
+    if kind == "gru":
+        spec["reset_after"] = bool(layer.reset_after)
+
+    values = layer.get_weights()
+    weights = dict(zip(_RECURRENT_PARAMS, values))
+    if not layer.use_bias:
+        bias_shape = (2, 3 * layer.units) if spec.get("reset_after") else values[0].shape[1:]
+        weights["bias"] = np.zeros(bias_shape, dtype=values[0].dtype)
+    return spec, weights
+
+
+def from_keras(model, dtype=np.float32) -> NumpySequenceModel:
+    """
+    Keras Sequential 모델 변환
+
+    Raises:
+        ValueError: 지원하지 않는 레이어/설정
+    """
+    layers: List[dict] = []
+    weights: List[Dict[str, np.ndarray]] = []
+    for layer in model.layers:
+        kind = type(layer).__name__
+        if kind in ("Dropout", "InputLayer"):
+            continue
+        if kind == "Dense":
+            kernel, *bias = layer.get_weights()
+            layers.append({"type": "dense", "activation": _activation_name(layer, "activation")})
+            weights.append({"kernel": kernel, "bias": bias[0] if bias else np.zeros(kernel.shape[1], kernel.dtype)})
+        elif kind in ("LSTM", "GRU"):
+            spec, w = _recurrent_spec(layer)
+            layers.append(spec)
+            weights.append(w)
+        elif kind == "Bidirectional":
+            if layer.merge_mode != "concat":
+                raise ValueError(f"{layer.name}: merge_mode={layer.merge_mode}는 지원하지 않습니다 (concat만 지원)")
+            forward_spec, forward = _recurrent_spec(layer.forward_layer)
+            _, backward = _recurrent_spec(layer.backward_layer, backward=True)
+            layers.append({"type": "bidirectional", "layer": forward_spec})
+            w = {f"forward_{name}": value for name, value in forward.items()}
+            w.update({f"backward_{name}": value for name, value in backward.items()})
+            weights.append(w)
+        else:
+            raise ValueError(f"지원하지 않는 레이어입니다: {kind} ({layer.name})")
+
+    dtype = np.dtype(dtype)
+    weights = [{name: np.ascontiguousarray(value, dtype=dtype) for name, value in w.items()} for w in weights]
+    return NumpySequenceModel(layers, weights, dtype=dtype)
+
+
+def export_keras_model(model, path: Union[str, Path], dtype=np.float32) -> Path:
+    """
+    학습된 Keras 모델을 NumPy 런타임용 .npz로 내보냄
+
+    Returns:
+        저장 경로 (ModelRegistry.register의 artifact_path로 등록)
+    """
+    return from_keras(model, dtype=dtype).save(path)
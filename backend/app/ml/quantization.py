@@ -0,0 +1,82 @@
+"""
+양자화 모델 정확도 드리프트 리포트
+
+NumpySequenceModel.quantize()로 만든 float16/int8 버전을 원본과 같은 보류(held-out) 데이터로
+평가해 log loss, Brier score 변화량을 기록한다. 리포트는 레지스트리 버전 정보의
+"quantization" 항목에 저장되고, 기준을 넘은 버전은 ModelRegistry.set_active가 활성화를 거부한다.
+"""
+import os
+from typing import Optional
+
+import numpy as np
+
+# 승격 기준 (양자화 - 원본, 보류 데이터 기준 허용 증가량)
+QUANTIZATION_MAX_LOG_LOSS_DELTA = float(os.getenv("QUANTIZATION_MAX_LOG_LOSS_DELTA", "0.002"))
+QUANTIZATION_MAX_BRIER_DELTA = float(os.getenv("QUANTIZATION_MAX_BRIER_DELTA", "0.001"))
+
+_EPS = 1e-15
+
+
+def _scores(p: np.ndarray, y: np.ndarray) -> dict:
+    p = np.clip(p, _EPS, 1 - _EPS)
+    return {
+        "log_loss": float(np.mean(-(y * np.log(p) + (1 - y) * np.log(1 - p)))),
+        "brier_score": float(np.mean((p - y) ** 2)),
+    }
+
+
+def drift_report(
+    reference,
+    candidate,
+    X: np.ndarray,
+    y: np.ndarray,
+    max_log_loss_delta: Optional[float] = None,
+    max_brier_delta: Optional[float] = None,
+) -> dict:
+    """
+    원본 대비 양자화 모델의 정확도 변화
+
+    Args:
+        reference: 원본 모델 (predict(X) -> (N, 1) 홈팀 승리 확률)
+        candidate: 양자화 모델
+        X: 보류 데이터 입력 (스케일러 적용 후)
+        y: 홈팀 승리 여부 (N,)
+        max_log_loss_delta: log loss 허용 증가량 (없으면 QUANTIZATION_MAX_LOG_LOSS_DELTA)
+        max_brier_delta: Brier score 허용 증가량 (없으면 QUANTIZATION_MAX_BRIER_DELTA)
+
+    Returns:
+        samples, reference/candidate 지표, log_loss_delta, brier_delta,
+        max_abs_diff(확률 최대 차이), 가중치 바이트 수, 기준, passed (JSON 직렬화 가능)
+
+    Raises:
+        ValueError: 보류 데이터가 비어 있음
+    """
+    if len(X) == 0:
+        raise ValueError("보류 데이터가 비어 있습니다")
+    if max_log_loss_delta is None:
+        max_log_loss_delta = QUANTIZATION_MAX_LOG_LOSS_DELTA
+    if max_brier_delta is None:
+        max_brier_delta = QUANTIZATION_MAX_BRIER_DELTA
+
+    y = np.asarray(y, dtype=np.float64).reshape(-1)
+    p_reference = np.asarray(reference.predict(X), dtype=np.float64).reshape(-1)
+    p_candidate = np.asarray(candidate.predict(X), dtype=np.float64).reshape(-1)
+
+    before = _scores(p_reference, y)
+    after = _scores(p_candidate, y)
+    log_loss_delta = after["log_loss"] - before["log_loss"]
+    brier_delta = after["brier_score"] - before["brier_score"]
+
+    return {
+        "samples": int(len(y)),
+        "reference": before,
+        "candidate": after,
+        "log_loss_delta": log_loss_delta,
+        "brier_delta": brier_delta,
+        "max_abs_diff": float(np.abs(p_candidate - p_reference).max()),
+        "reference_bytes": int(getattr(reference, "nbytes", 0)),
+        "candidate_bytes": int(getattr(candidate, "nbytes", 0)),
+        "max_log_loss_delta": max_log_loss_delta,
+        "max_brier_delta": max_brier_delta,
+        "passed": bool(log_loss_delta <= max_log_loss_delta and brier_delta <= max_brier_delta),
+    }
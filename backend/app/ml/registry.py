@@ -0,0 +1,502 @@
+"""
+모델 레지스트리 및 프로세스 내 모델 캐시
+
+- ModelRegistry: 모델 아티팩트를 버전, 특성 스키마, 평가 지표와 함께 registry.json에 기록
+  (양자화 버전은 드리프트 리포트가 기준을 통과해야 활성화 가능)
+- ModelCache: 로드된 모델/스케일러를 LRU로 보관
+- ModelManager: 시작 시 활성 버전을 미리 로드하고, 새 버전 활성화는 백그라운드에서
+  로드를 끝낸 뒤 참조만 교체 (요청 경로에서 역직렬화하지 않음)
+"""
+import json
+import os
+import pickle
+import shutil
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple, Union
+
+from .shared_arrays import attach_object, publish_object, shareable, supports_arrays
+
+
+# ========================================
+# 아티팩트 로더
+# ========================================
+
+def _load_keras(path: Path):
+    # TensorFlow는 무거우므로 실제 로드 시점에만 import
+    from tensorflow.keras.models import load_model
+    return load_model(path, compile=False)
+
+
+def _load_numpy_rnn(path: Path):
+    # export_keras_model로 내보낸 가중치 (TensorFlow 없이 NumPy로 추론)
+    from .numpy_rnn import NumpySequenceModel
+    return NumpySequenceModel.load(path)
+
+
+def _load_pickle(path: Path):
+    try:
+        import joblib
+        return joblib.load(path)
+    except ImportError:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+
+# 확장자별 로더 (새 형식은 여기에 추가)
+ARTIFACT_LOADERS: Dict[str, Callable[[Path], object]] = {
+    ".h5": _load_keras,
+    ".keras": _load_keras,
+    ".npz": _load_numpy_rnn,
+    ".pkl": _load_pickle,
+    ".joblib": _load_pickle,
+}
+
+
+def load_artifact(path: Union[str, Path]):
+    """확장자에 맞는 로더로 아티팩트 로드"""
+    path = Path(path)
+    loader = ARTIFACT_LOADERS.get(path.suffix.lower())
+    if loader is None:
+        raise ValueError(f"지원하지 않는 모델 파일 형식입니다: {path.suffix}")
+    return loader(path)
+
+
+# ========================================
+# 레지스트리
+# ========================================
+
+class ModelRegistry:
+    """
+    모델 버전 레지스트리
+
+    root/registry.json 구조:
+    {
+        "models": {
+            "lstm_v1": {
+                "active_version": 2,
+                "versions": [
+                    {"version": 1, "artifact": "lstm_v1/1/lstm_model.h5",
+                     "scaler": "lstm_v1/1/scaler.pkl", "feature_schema": [...],
+                     "metrics": {...}, "created_at": "..."},
+                    {"version": 3, "artifact": "lstm_v1/3/lstm_model-int8.npz", ...,
+                     "quantization": {"mode": "int8", "source_version": 2,
+                                      "report": {..., "passed": true}}},
+                    ...
+                ]
+            }
+        }
+    }
+    """
+
+    def __init__(self, root: Union[str, Path] = "models"):
+        self.root = Path(root)
+        self.index_path = self.root / "registry.json"
+        self._lock = threading.Lock()
+        self._data = self._read()
+
+    def _read(self) -> dict:
+        if not self.index_path.exists():
+            return {"models": {}}
+        with open(self.index_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write(self) -> None:
+        # 임시 파일에 쓴 뒤 교체해 다른 프로세스가 반쯤 쓴 파일을 읽지 않게 함
+        self.root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def reload(self) -> None:
+        """디스크의 registry.json 다시 읽기"""
+        with self._lock:
+            self._data = self._read()
+
+    def register(
+        self,
+        model_name: str,
+        artifact_path: Union[str, Path],
+        scaler_path: Optional[Union[str, Path]] = None,
+        feature_schema: Optional[List[str]] = None,
+        metrics: Optional[dict] = None,
+        activate: bool = True,
+        quantization: Optional[dict] = None,
+    ) -> dict:
+        """
+        새 모델 버전 등록
+
+        아티팩트와 스케일러를 root/<model_name>/<version>/ 으로 복사한다.
+
+        Args:
+            model_name: 모델명 (lstm_v1 등)
+            artifact_path: 학습된 모델 파일
+            scaler_path: 입력 스케일러 파일
+            feature_schema: 입력 특성 이름 목록
+            metrics: 평가 지표 (accuracy, log_loss, brier_score 등)
+            activate: 등록 후 바로 활성 버전으로 지정할지 여부
+            quantization: 양자화 버전 정보 (mode, source_version, report=quantization.drift_report)
+
+        Returns:
+            등록된 버전 정보
+
+        Raises:
+            ValueError: activate=True인데 양자화 드리프트 기준을 통과하지 못함
+        """
+        with self._lock:
+            model = self._data["models"].setdefault(
+                model_name, {"active_version": None, "versions": []}
+            )
+            version = max((v["version"] for v in model["versions"]), default=0) + 1
+            if quantization is not None and activate:
+                _check_promotable(model_name, {"version": version, "quantization": quantization})
+            version_dir = self.root / model_name / str(version)
+            version_dir.mkdir(parents=True, exist_ok=True)
+
+            artifact_path = Path(artifact_path)
+            shutil.copy2(artifact_path, version_dir / artifact_path.name)
+            entry = {
+                "version": version,
+                "artifact": f"{model_name}/{version}/{artifact_path.name}",
+                "scaler": None,
+                "feature_schema": list(feature_schema) if feature_schema else None,
+                "metrics": {k: float(v) for k, v in (metrics or {}).items()},
+                "created_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            if scaler_path is not None:
+                scaler_path = Path(scaler_path)
+                shutil.copy2(scaler_path, version_dir / scaler_path.name)
+                entry["scaler"] = f"{model_name}/{version}/{scaler_path.name}"
+            if quantization is not None:
+                entry["quantization"] = quantization
+
+            model["versions"].append(entry)
+            if activate:
+                model["active_version"] = version
+            self._write()
+            return dict(entry)
+
+    def set_active(self, model_name: str, version: int, force: bool = False) -> dict:
+        """
+        활성 버전 변경
+
+        Args:
+            force: 양자화 드리프트 기준을 통과하지 못한 버전도 활성화
+
+        Raises:
+            KeyError: 없는 모델/버전
+            ValueError: 드리프트 기준 미달 양자화 버전 (force=False)
+        """
+        with self._lock:
+            entry = self._find(model_name, version)
+            if not force:
+                _check_promotable(model_name, entry)
+            self._data["models"][model_name]["active_version"] = version
+            self._write()
+            return dict(entry)
+
+    def check_activation(self, model_name: str, version: int, force: bool = False) -> dict:
+        """
+        활성화 가능 여부만 확인 (활성 버전은 바꾸지 않음)
+
+        Raises:
+            KeyError: 없는 모델/버전
+            ValueError: 드리프트 기준 미달 양자화 버전 (force=False)
+        """
+        with self._lock:
+            entry = self._find(model_name, version)
+            if not force:
+                _check_promotable(model_name, entry)
+            return dict(entry)
+
+    def _find(self, model_name: str, version: int) -> dict:
+        model = self._data["models"].get(model_name)
+        if model is None:
+            raise KeyError(f"등록되지 않은 모델입니다: {model_name}")
+        for entry in model["versions"]:
+            if entry["version"] == version:
+                return entry
+        raise KeyError(f"{model_name}에 버전 {version}이(가) 없습니다")
+
+    def get_version(self, model_name: str, version: Optional[int] = None) -> Optional[dict]:
+        """버전 정보 조회 (version이 없으면 활성 버전)"""
+        model = self._data["models"].get(model_name)
+        if model is None:
+            return None
+        if version is None:
+            version = model["active_version"]
+            if version is None:
+                return None
+        return dict(self._find(model_name, version))
+
+    def list_versions(self, model_name: str) -> List[dict]:
+        """모델의 모든 버전 정보"""
+        model = self._data["models"].get(model_name, {"versions": []})
+        return [dict(v) for v in model["versions"]]
+
+    def active_models(self) -> Dict[str, int]:
+        """모델명 -> 활성 버전"""
+        return {
+            name: model["active_version"]
+            for name, model in self._data["models"].items()
+            if model["active_version"] is not None
+        }
+
+    def resolve(self, relative_path: Optional[str]) -> Optional[Path]:
+        """레지스트리 기준 상대 경로를 절대 경로로 변환"""
+        return self.root / relative_path if relative_path else None
+
+
+def _check_promotable(model_name: str, entry: dict) -> None:
+    # 양자화 버전은 드리프트 리포트가 있어야 하고 기준을 통과해야 함
+    quantization = entry.get("quantization")
+    if quantization is None:
+        return
+    report = quantization.get("report") or {}
+    if not report.get("passed"):
+        raise ValueError(
+            f"{model_name} v{entry['version']}: {quantization.get('mode')} 양자화 드리프트 기준 미달 "
+            f"(log loss {report.get('log_loss_delta', float('nan')):+.4f}, "
+            f"Brier {report.get('brier_delta', float('nan')):+.4f})"
+        )
+
+
+# ========================================
+# 로드된 모델 캐시
+# ========================================
+
+class LoadedModel:
+    """메모리에 올라간 모델 한 버전"""
+
+    __slots__ = ("name", "version", "model", "scaler", "entry")
+
+    def __init__(self, name: str, version: int, model, scaler, entry: dict):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.scaler = scaler
+        self.entry = entry
+
+
+class ModelCache:
+    """
+    (모델명, 버전) -> LoadedModel LRU 캐시
+
+    고정(pin)된 키(서비스 중인 활성 버전)는 섀도/후보 버전이 많이 올라와도 밀려나지 않는다.
+    """
+
+    def __init__(self, max_size: int = 8):
+        self.max_size = max_size
+        self._items: "OrderedDict[Tuple[str, int], LoadedModel]" = OrderedDict()
+        self._pinned: Set[Tuple[str, int]] = set()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: Tuple[str, int]) -> Optional[LoadedModel]:
+        with self._lock:
+            loaded = self._items.get(key)
+            if loaded is not None:
+                self._items.move_to_end(key)
+            return loaded
+
+    def put(self, loaded: LoadedModel) -> None:
+        with self._lock:
+            key = (loaded.name, loaded.version)
+            self._items[key] = loaded
+            self._items.move_to_end(key)
+            self._evict()
+
+    def pin(self, key: Tuple[str, int]) -> None:
+        """키를 LRU 제거 대상에서 제외"""
+        with self._lock:
+            self._pinned.add(key)
+
+    def unpin(self, key: Tuple[str, int]) -> None:
+        """고정 해제 (크기를 넘으면 바로 정리)"""
+        with self._lock:
+            self._pinned.discard(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        # 오래된 것부터 고정되지 않은 항목 제거 (고정 항목만 남으면 크기를 넘어도 유지)
+        excess = len(self._items) - self.max_size
+        if excess <= 0:
+            return
+        for key in [key for key in self._items if key not in self._pinned][:excess]:
+            del self._items[key]
+
+    def keys(self) -> List[Tuple[str, int]]:
+        with self._lock:
+            return list(self._items)
+
+
+class ModelManager:
+    """
+    API 프로세스용 모델 관리자
+
+    - warm_up(): 레지스트리를 한 번 읽고 모든 활성 버전을 미리 로드
+    - get(): 요청 경로 조회. 아직 로드되지 않았으면 None을 반환하고
+      백그라운드 로드를 예약 (요청이 역직렬화 비용을 치르지 않음)
+    - activate(): 새 버전을 백그라운드에서 로드한 뒤 레지스트리 활성 버전과 포인터를 교체
+      (로드 실패 시 기존 버전 유지)
+    - 활성 버전은 캐시에 고정되어 섀도/후보 버전 로드로 밀려나지 않음
+    - shared_dir가 주어지면 마스터가 내보낸 배열 묶음에 먼저 붙음 (멀티 워커 서빙)
+    """
+
+    def __init__(self, registry: ModelRegistry, cache_size: int = 8, shared_dir: Optional[Union[str, Path]] = None):
+        self.registry = registry
+        self.shared_dir = shared_dir
+        self.cache = ModelCache(cache_size)
+        self._active: Dict[str, int] = {}
+        self._pending: Dict[Tuple[str, int], Future] = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-loader")
+
+    def _load(self, model_name: str, version: int) -> LoadedModel:
+        loaded = self.cache.get((model_name, version))
+        if loaded is not None:
+            return loaded
+
+        entry = self.registry.get_version(model_name, version)
+        model = scaler = None
+        if self.shared_dir:
+            model = attach_object(self.shared_dir, shared_model_key(model_name, version))
+            scaler = attach_object(self.shared_dir, shared_scaler_key(model_name, version))
+        if model is None:
+            model = load_artifact(self.registry.resolve(entry["artifact"]))
+            scaler_path = self.registry.resolve(entry.get("scaler"))
+            scaler = load_artifact(scaler_path) if scaler_path else None
+
+        loaded = LoadedModel(model_name, version, model, scaler, entry)
+        self.cache.put(loaded)
+        return loaded
+
+    def _schedule(self, model_name: str, version: int) -> Future:
+        key = (model_name, version)
+        with self._lock:
+            future = self._pending.get(key)
+            if future is None or future.done():
+                future = self._executor.submit(self._load, model_name, version)
+                self._pending[key] = future
+            return future
+
+    def warm_up(self) -> Dict[str, int]:
+        """
+        활성 버전 미리 로드 (시작 시 1회)
+
+        Returns:
+            로드에 성공한 모델명 -> 버전
+        """
+        self.registry.reload()
+        warmed = {}
+        for model_name, version in self.registry.active_models().items():
+            try:
+                self._schedule(model_name, version).result()
+            except Exception as e:
+                print(f"⚠️  모델 로드 실패 ({model_name} v{version}): {e}")
+                continue
+            self._set_active(model_name, version)
+            warmed[model_name] = version
+        return warmed
+
+    def _set_active(self, model_name: str, version: int) -> None:
+        # 새 활성 버전을 고정한 뒤 포인터 교체, 이전 활성 버전은 고정 해제
+        self.cache.pin((model_name, version))
+        previous = self._active.get(model_name)
+        self._active[model_name] = version
+        if previous is not None and previous != version:
+            self.cache.unpin((model_name, previous))
+
+    def is_active(self, model_name: str) -> bool:
+        """서비스 중인 활성 버전이 있는지 여부"""
+        return model_name in self._active
+
+    def get(self, model_name: str) -> Optional[LoadedModel]:
+        """활성 모델 조회 (로드되어 있지 않으면 None)"""
+        version = self._active.get(model_name)
+        if version is None:
+            return None
+
+        loaded = self.cache.get((model_name, version))
+        if loaded is None:
+            # 활성 버전은 고정되어 있어 정상적으로는 오지 않음. 다시 올려두고 호출자에게 알림
+            print(f"⚠️  활성 모델이 캐시에 없습니다 ({model_name} v{version}), 다시 로드합니다")
+            self._schedule(model_name, version)
+        return loaded
+
+    def activate(self, model_name: str, version: int, force: bool = False) -> Future:
+        """
+        새 버전으로 교체 (논블로킹)
+
+        로드가 끝나기 전까지 요청은 기존 버전을 계속 사용한다. 로드에 성공한 뒤에만
+        레지스트리 활성 버전과 서비스 포인터를 바꾸므로, 실패하면 기존 버전이 그대로 남는다.
+
+        Returns:
+            교체가 끝나면 완료되는 Future (로드 실패 시 해당 예외)
+
+        Raises:
+            KeyError: 없는 모델/버전
+            ValueError: 드리프트 기준 미달 양자화 버전 (force=False)
+        """
+        self.registry.check_activation(model_name, version, force=force)
+        activated: Future = Future()
+
+        def swap(done: Future) -> None:
+            try:
+                loaded = done.result()
+                self.registry.set_active(model_name, version, force=force)
+                self._set_active(model_name, version)
+            except Exception as e:
+                print(f"⚠️  모델 교체 실패 ({model_name} v{version}): {e}")
+                activated.set_exception(e)
+            else:
+                activated.set_result(loaded)
+
+        self._schedule(model_name, version).add_done_callback(swap)
+        return activated
+
+    def export_shared(self, shared_dir: Union[str, Path]) -> Dict[str, bool]:
+        """
+        활성 버전을 로드해 배열 묶음으로 내보냄 (멀티 워커 서빙 마스터에서 1회)
+
+        to_arrays를 구현하지 않은 모델(Keras 등)은 내보내지 않으며, 워커가 각자 로드한다.
+        Keras 모델은 numpy_rnn.export_keras_model로 .npz를 만들어 등록하면 공유된다.
+
+        Returns:
+            모델명 -> 공유 여부
+        """
+        self.registry.reload()
+        exported = {}
+        for model_name, version in self.registry.active_models().items():
+            loaded = self._load(model_name, version)
+            scaler = shareable(loaded.scaler)
+            if not supports_arrays(loaded.model) or (loaded.scaler is not None and scaler is None):
+                exported[model_name] = False
+                continue
+            publish_object(shared_dir, shared_model_key(model_name, version), loaded.model)
+            if scaler is not None:
+                publish_object(shared_dir, shared_scaler_key(model_name, version), scaler)
+            exported[model_name] = True
+        return exported
+
+    def status(self) -> dict:
+        """활성 버전과 캐시 상태"""
+        return {
+            "active": dict(self._active),
+            "cached": [f"{name}:v{version}" for name, version in self.cache.keys()],
+            "shared_dir": str(self.shared_dir) if self.shared_dir else None,
+        }
+
+
+def shared_model_key(model_name: str, version: int) -> str:
+    return f"model-{model_name}-v{version}"
+
+
+def shared_scaler_key(model_name: str, version: int) -> str:
+    return f"scaler-{model_name}-v{version}"
@@ -0,0 +1,194 @@
+"""
+벡터화된 시퀀스 텐서 생성
+
+prepare_sequence_data의 (samples, window, features) 텐서를 파이썬 행 단위 루프 없이
+만든다. 팀별 롤링 통계는 그룹 누적합으로 한 번만 계산하고, 모든 윈도우는
+stride-tricks 뷰에서 미리 할당한 float32 배열 하나로 복사한다.
+"""
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .feature_store import TeamFeatureStore
+
+
+# 경기당 특성 순서: [홈 승률, 홈 평균 득점, 원정 승률, 원정 평균 득점, 홈/원정]
+SEQUENCE_FEATURES = ("home_win_rate", "home_avg_score", "away_win_rate", "away_avg_score", "is_home")
+
+
+def rolling_team_stats(matches, n_games: int = 10) -> Dict[str, np.ndarray]:
+    """
+    팀별 최근 N경기 롤링 통계 (그룹 누적합)
+
+    경기마다 홈/원정 두 행으로 펼친 long format에서 팀별 누적합을 구하고,
+    각 행은 해당 경기를 포함한 최근 n_games 경기의 합계를 가진다.
+
+    Args:
+        matches: 경기 DataFrame (시간순, 완료된 경기)
+        n_games: 롤링 윈도우 크기
+
+    Returns:
+        dict: team_id, match_pos(원본 행 위치), is_home, wins, runs_for,
+              runs_against, games (모두 팀 -> 경기순 정렬)
+    """
+    n = len(matches)
+    home_ids = matches["home_team_id"].to_numpy(dtype=np.int64)
+    away_ids = matches["away_team_id"].to_numpy(dtype=np.int64)
+    home_scores = matches["home_score"].to_numpy(dtype=np.float64)
+    away_scores = matches["away_score"].to_numpy(dtype=np.float64)
+    # Categorical winner(경기 이력 저장소)도 문자열 배열로 풀지 않고 비교
+    home_won = (matches["winner"] == "home").to_numpy()
+    away_won = (matches["winner"] == "away").to_numpy()
+
+    team_id = np.concatenate([home_ids, away_ids])
+    match_pos = np.concatenate([np.arange(n), np.arange(n)])
+    is_home = np.concatenate([np.ones(n, dtype=bool), np.zeros(n, dtype=bool)])
+    win = np.concatenate([home_won, away_won]).astype(np.int64)
+    scored = np.concatenate([home_scores, away_scores])
+    allowed = np.concatenate([away_scores, home_scores])
+
+    # 팀 -> 경기 순서로 정렬
+    order = np.lexsort((match_pos, team_id))
+    team_id = team_id[order]
+    match_pos = match_pos[order]
+    is_home = is_home[order]
+
+    # 그룹 시작 위치와 롤링 윈도우 시작 위치
+    idx = np.arange(len(order))
+    is_group_start = np.ones(len(order), dtype=bool)
+    is_group_start[1:] = team_id[1:] != team_id[:-1]
+    group_start = np.maximum.accumulate(np.where(is_group_start, idx, 0))
+    window_start = np.maximum(group_start, idx - n_games + 1)
+
+    def window_sum(values: np.ndarray) -> np.ndarray:
+        cumsum = np.concatenate([[0], np.cumsum(values[order])])
+        return cumsum[idx + 1] - cumsum[window_start]
+
+    return {
+        "team_id": team_id,
+        "match_pos": match_pos,
+        "is_home": is_home,
+        "wins": window_sum(win),
+        "runs_for": window_sum(scored),
+        "runs_against": window_sum(allowed),
+        "games": idx + 1 - window_start,
+    }
+
+
+def latest_team_features(matches, n_games: int = 10) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    전체 경기 기준 팀별 최신 특성 (extract_team_features와 동일한 값)
+
+    Returns:
+        team_ids: 정렬된 팀 ID 배열
+        features: (teams, 2) 배열 - [승률, 평균 득점]
+    """
+    stats = rolling_team_stats(matches, n_games)
+    team_id = stats["team_id"]
+
+    # 각 팀 그룹의 마지막 행
+    is_last = np.ones(len(team_id), dtype=bool)
+    is_last[:-1] = team_id[:-1] != team_id[1:]
+
+    features = np.column_stack([
+        stats["wins"][is_last] / n_games,
+        stats["runs_for"][is_last] / stats["games"][is_last],
+    ])
+    return team_id[is_last], features
+
+
+def build_sequence_tensor(
+    matches,
+    window_size: int = 10,
+    n_games: int = 10,
+    feature_store: Optional[TeamFeatureStore] = None,
+    dtype=np.float32,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    시퀀스 텐서 생성 (prepare_sequence_data와 같은 결과)
+
+    Args:
+        matches: 경기 DataFrame (시간순)
+        window_size: 시퀀스 윈도우 크기
+        n_games: 팀 특성 계산에 쓰는 최근 경기 수
+        feature_store: 주어지면 팀 특성을 저장소의 현재 값에서 읽음
+        dtype: 출력 텐서 자료형
+
+    Returns:
+        X: (samples, window_size, 5) 텐서
+        y: 다음 경기 홈팀 승리 여부 (samples,)
+    """
+    n = len(matches)
+    if n <= window_size:
+        return assemble_windows(
+            np.empty((n, len(SEQUENCE_FEATURES)), dtype=dtype),
+            matches["winner"].to_numpy(),
+            window_size,
+        )
+
+    home_ids = matches["home_team_id"].to_numpy(dtype=np.int64)
+    away_ids = matches["away_team_id"].to_numpy(dtype=np.int64)
+
+    if feature_store is not None:
+        team_ids = np.unique(np.concatenate([home_ids, away_ids]))
+        team_features = np.array([
+            [f["win_rate"], f["avg_score"]]
+            for f in (feature_store.get_features(int(t)) for t in team_ids)
+        ], dtype=np.float64).reshape(-1, 2)
+    else:
+        completed = matches[matches["winner"].notna()]
+        team_ids, team_features = latest_team_features(completed, n_games)
+
+    # 한 번도 경기하지 않은 팀은 마지막 0 행을 가리킴
+    lookup = np.vstack([team_features, np.zeros((1, 2))])
+    home_pos = _team_positions(team_ids, home_ids)
+    away_pos = _team_positions(team_ids, away_ids)
+
+    per_match = np.empty((n, len(SEQUENCE_FEATURES)), dtype=dtype)
+    per_match[:, 0:2] = lookup[home_pos]
+    per_match[:, 2:4] = lookup[away_pos]
+    per_match[:, 4] = 1
+
+    return assemble_windows(per_match, matches["winner"].to_numpy(), window_size)
+
+
+def assemble_windows(
+    per_match: np.ndarray,
+    winners: np.ndarray,
+    window_size: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    경기별 특성 행렬을 (samples, window, features) 텐서로 조립
+
+    Args:
+        per_match: (경기 수, 특성 수) 배열
+        winners: 경기별 winner 값 ('home'/'away')
+        window_size: 시퀀스 윈도우 크기
+
+    Returns:
+        X: per_match와 같은 자료형의 텐서
+        y: 윈도우 다음 경기 홈팀 승리 여부
+    """
+    n, n_features = per_match.shape
+    n_samples = max(n - window_size, 0)
+    X = np.empty((n_samples, window_size, n_features), dtype=per_match.dtype)
+    y = np.empty(n_samples, dtype=np.int64)
+    if n_samples == 0:
+        return X, y
+
+    # (n - window + 1, 1, window, features) 뷰 -> 앞의 n_samples개만 복사
+    windows = sliding_window_view(per_match, (window_size, n_features))
+    X[...] = windows[:n_samples, 0]
+
+    y[...] = winners[window_size:] == "home"
+    return X, y
+
+
+def _team_positions(team_ids: np.ndarray, ids: np.ndarray) -> np.ndarray:
+    """정렬된 team_ids에서 ids의 위치 (없으면 len(team_ids))"""
+    missing = len(team_ids)
+    if missing == 0:
+        return np.zeros(len(ids), dtype=np.int64)
+    pos = np.minimum(np.searchsorted(team_ids, ids), missing - 1)
+    return np.where(team_ids[pos] == ids, pos, missing)
@@ -0,0 +1,193 @@
+"""
+워커 간 공유 읽기 전용 배열 (메모리 매핑 .npy)
+
+멀티 워커 서빙(python run.py --workers N)에서 마스터 프로세스가 모델 가중치, 스케일러,
+팀 특성 저장소를 배열 묶음으로 한 번 내보내고, 워커는 np.load(mmap_mode="r")로 붙는다.
+같은 파일의 페이지는 OS 페이지 캐시를 공유하므로 워커를 늘려도 메모리가 거의 늘지 않는다.
+
+배열로 내보낼 수 있는 객체는 다음 두 메서드를 구현한다.
+    to_arrays() -> (Dict[str, np.ndarray], meta: dict)
+    from_arrays(arrays, meta) (classmethod, 배열을 복사하지 않고 그대로 사용)
+
+묶음 구조:
+    root/<name>.json          현재 묶음 디렉토리를 가리키는 포인터 (원자적 교체)
+    root/<name>-<token>/*.npy 배열 (한 번 쓰면 수정하지 않음)
+"""
+import importlib
+import json
+import os
+import shutil
+import uuid
+from pathlib import Path
+from typing import Dict, Optional, Tuple, Union
+
+import numpy as np
+
+
+def publish_arrays(root: Union[str, Path], name: str, arrays: Dict[str, np.ndarray], meta: Optional[dict] = None) -> Path:
+    """
+    배열 묶음 저장 후 포인터 교체
+
+    이미 붙어 있는 워커는 이전 파일을 계속 쓰고(Linux는 삭제된 파일도 매핑 유지),
+    다음에 붙는 워커부터 새 묶음을 읽는다.
+
+    Returns:
+        묶음 디렉토리
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    directory = root / f"{name}-{uuid.uuid4().hex[:12]}"
+    directory.mkdir()
+    for key, array in arrays.items():
+        np.save(directory / f"{key}.npy", np.ascontiguousarray(array), allow_pickle=False)
+
+    pointer = root / f"{name}.json"
+    previous = _read_pointer(pointer)
+    _write_pointer(pointer, {"directory": directory.name, "arrays": sorted(arrays), "meta": meta or {}})
+
+    if previous is not None:
+        shutil.rmtree(root / previous["directory"], ignore_errors=True)
+    return directory
+
+
+def attach_arrays(root: Union[str, Path], name: str) -> Optional[Tuple[Dict[str, np.ndarray], dict]]:
+    """
+    배열 묶음에 읽기 전용으로 붙음
+
+    Returns:
+        (이름 -> 메모리 매핑 배열, meta). 묶음이 없으면 None
+    """
+    root = Path(root)
+    pointer = _read_pointer(root / f"{name}.json")
+    if pointer is None:
+        return None
+    directory = root / pointer["directory"]
+    arrays = {key: np.load(directory / f"{key}.npy", mmap_mode="r") for key in pointer["arrays"]}
+    return arrays, pointer["meta"]
+
+
+def update_meta(root: Union[str, Path], name: str, meta: dict) -> None:
+    """
+    배열 파일은 그대로 두고 포인터의 meta만 원자적으로 교체
+
+    미리 할당한 배열 뒤쪽에 이어 쓴 뒤 유효 길이를 갱신할 때 사용한다.
+
+    Raises:
+        FileNotFoundError: 묶음이 없음
+    """
+    path = Path(root) / f"{name}.json"
+    pointer = _read_pointer(path)
+    if pointer is None:
+        raise FileNotFoundError(path)
+    _write_pointer(path, dict(pointer, meta=meta))
+
+
+def _read_pointer(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_pointer(path: Path, pointer: dict) -> None:
+    tmp_path = path.with_suffix(".json.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(pointer, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+# ========================================
+# 객체 <-> 배열 묶음
+# ========================================
+
+def supports_arrays(obj) -> bool:
+    """to_arrays/from_arrays로 공유할 수 있는 객체인지"""
+    return callable(getattr(obj, "to_arrays", None)) and callable(getattr(type(obj), "from_arrays", None))
+
+
+def publish_object(root: Union[str, Path], name: str, obj) -> Path:
+    """to_arrays 결과를 클래스 경로와 함께 저장"""
+    arrays, meta = obj.to_arrays()
+    cls = type(obj)
+    return publish_arrays(root, name, arrays, dict(meta, **{"class": f"{cls.__module__}:{cls.__qualname__}"}))
+
+
+def attach_object(root: Union[str, Path], name: str):
+    """
+    publish_object로 저장한 객체 복원 (배열은 메모리 매핑 그대로)
+
+    Returns:
+        복원한 객체 (묶음이 없으면 None)
+    """
+    attached = attach_arrays(root, name)
+    if attached is None:
+        return None
+    arrays, meta = attached
+    module_name, qualname = meta["class"].split(":")
+    cls = importlib.import_module(module_name)
+    for part in qualname.split("."):
+        cls = getattr(cls, part)
+    return cls.from_arrays(arrays, meta)
+
+
+class ArrayScaler:
+    """
+    평균/표준편차 배열만 가진 스케일러 (StandardScaler.transform과 같은 결과)
+
+    sklearn 스케일러 대신 공유 배열로 서빙할 때 사용한다.
+    """
+
+    def __init__(self, mean: np.ndarray, scale: np.ndarray):
+        self.mean_ = mean
+        self.scale_ = scale
+
+    @classmethod
+    def from_scaler(cls, scaler) -> Optional["ArrayScaler"]:
+        """mean_/scale_ 속성이 있는 스케일러 변환 (없으면 None)"""
+        mean = getattr(scaler, "mean_", None)
+        scale = getattr(scaler, "scale_", None)
+        if mean is None or scale is None:
+            return None
+        return cls(np.asarray(mean, dtype=np.float64), np.asarray(scale, dtype=np.float64))
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        return (X - self.mean_) / self.scale_
+
+    def to_arrays(self) -> Tuple[Dict[str, np.ndarray], dict]:
+        return {"mean": self.mean_, "scale": self.scale_}, {}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], meta: dict) -> "ArrayScaler":
+        return cls(arrays["mean"], arrays["scale"])
+
+
+def shareable(obj):
+    """공유 가능한 형태로 변환 (불가능하면 None)"""
+    if obj is None or supports_arrays(obj):
+        return obj
+    return ArrayScaler.from_scaler(obj)
+
+
+# ========================================
+# 메모리 측정
+# ========================================
+
+def process_memory(pid: Union[int, str] = "self") -> Dict[str, int]:
+    """
+    프로세스 메모리 (bytes, Linux /proc 기준)
+
+    Returns:
+        rss: 상주 메모리, pss: 공유 페이지를 공유 프로세스 수로 나눈 메모리,
+        shared: 다른 프로세스와 공유 중인 페이지
+    """
+    fields = {"Rss": "rss", "Pss": "pss", "Shared_Clean": "shared", "Shared_Dirty": "shared"}
+    memory = {"rss": 0, "pss": 0, "shared": 0}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                key, _, value = line.partition(":")
+                if key in fields:
+                    memory[fields[key]] += int(value.split()[0]) * 1024
+    except OSError:
+        pass
+    return memory
@@ -4,7 +4,7 @@ SQLAlchemy ORM 모델
 from sqlalchemy import Column, Integer, String, Date, DateTime, Boolean, DECIMAL, Text, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
-from backend.app.database import Base
+from ..database import Base
 
 
 class Team(Base):
@@ -114,6 +114,25 @@ class MatchOdds(Base):
     )
 
 
+class MatchOddsMovement(Base):
+    """배당률 변동 이력 테이블 (수집한 스냅샷을 모두 추가만 함)"""
+    __tablename__ = "match_odds_movements"
+    
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    match_id = Column(Integer, ForeignKey('matches.id'), nullable=False)
+    odds_provider = Column(String(50), nullable=False, comment='배당 제공처 (sportstoto 등)')
+    home_team_odds = Column(DECIMAL(5, 2), comment='홈팀 배당률')
+    away_team_odds = Column(DECIMAL(5, 2), comment='원정팀 배당률')
+    draw_odds = Column(DECIMAL(5, 2), comment='무승부 배당률')
+    
+    captured_at = Column(DateTime, nullable=False, comment='배당률 수집 시각')
+    created_at = Column(DateTime, server_default=func.now())
+    
+    __table_args__ = (
+        Index('idx_match_captured', 'match_id', 'captured_at'),
+    )
+
+
 class Prediction(Base):
     """AI 예측 결과 테이블"""
     __tablename__ = "predictions"
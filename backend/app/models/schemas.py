@@ -1,10 +1,15 @@
 """
 Pydantic 스키마 정의
 """
-from pydantic import BaseModel, Field
-from datetime import date, datetime
+import os
+from pydantic import BaseModel, Field, model_validator
+from datetime import date, datetime, timedelta
 from typing import Optional, List
 
+# 일괄 예측 한 번에 받는 최대 경기 수 / 날짜 범위 일수
+BULK_MAX_MATCHES = int(os.getenv("BULK_MAX_MATCHES", "500"))
+BULK_MAX_DAYS = int(os.getenv("BULK_MAX_DAYS", "31"))
+
 
 # ========================================
 # 팀 관련 스키마
@@ -36,6 +41,11 @@ class Match(BaseModel):
     is_completed: bool = False
 
 
+class MatchResult(BaseModel):
+    home_score: int = Field(..., ge=0)
+    away_score: int = Field(..., ge=0)
+
+
 class MatchList(BaseModel):
     matches: List[Match]
     total: int
@@ -54,6 +64,7 @@ class Prediction(BaseModel):
     confidence_score: float = Field(..., ge=0.0, le=1.0)
     recommended_bet: Optional[str] = None  # 'home', 'away', 'pass'
     expected_value: Optional[float] = None
+    kelly_percentage: Optional[float] = None
     predicted_at: datetime
 
 
@@ -62,6 +73,35 @@ class PredictionRequest(BaseModel):
     model_name: str = "lstm_v1"
 
 
+class BulkPredictionRequest(BaseModel):
+    match_ids: Optional[List[int]] = Field(None, max_length=BULK_MAX_MATCHES)
+    start_date: Optional[date] = None
+    end_date: Optional[date] = None
+    model_names: Optional[List[str]] = None  # 기본: 모든 모델
+
+    @model_validator(mode="after")
+    def check_date_span(self):
+        """날짜 범위 제한 (한쪽만 지정하면 경기 조회와 같이 오늘 기준 7일로 채워 계산)"""
+        if self.match_ids is None and (self.start_date is not None or self.end_date is not None):
+            start_date = self.start_date or date.today() - timedelta(days=7)
+            end_date = self.end_date or date.today() + timedelta(days=7)
+            if end_date < start_date:
+                raise ValueError("end_date는 start_date보다 앞설 수 없습니다")
+            if (end_date - start_date).days + 1 > BULK_MAX_DAYS:
+                raise ValueError(f"날짜 범위는 최대 {BULK_MAX_DAYS}일입니다")
+        return self
+
+
+class MatchPredictions(BaseModel):
+    match_id: int
+    predictions: List[Prediction]
+
+
+class BulkPredictionResponse(BaseModel):
+    results: List[MatchPredictions]
+    total: int
+
+
 # ========================================
 # 베팅 관련 스키마
 # ========================================
@@ -86,6 +126,35 @@ class BettingHistory(BaseModel):
 class BettingResultList(BaseModel):
     results: List[BettingHistory]
     total: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
+
+
+class SlateOdds(BaseModel):
+    match_id: int
+    home_odds: float = Field(..., gt=1.0)
+    away_odds: Optional[float] = Field(None, gt=1.0)
+
+
+class BulkBettingRequest(BaseModel):
+    slate: List[SlateOdds] = Field(..., min_length=1)
+    model_name: str = "ensemble_v1"  # 예측 모델
+    betting_models: Optional[List[str]] = None  # 기본: 전체 베팅 모델
+    bankroll: Optional[float] = Field(None, gt=0)
+
+
+class BulkBettingResponse(BaseModel):
+    """(베팅 모델, 경기) 행 순서의 컬럼별 결과"""
+    match_id: List[int]
+    betting_model: List[str]
+    bet_on: List[str]
+    win_probability: List[float]
+    odds: List[float]
+    expected_value: List[float]
+    kelly_fraction: List[float]
+    stake_fraction: List[float]
+    recommended_amount: List[float]
+    should_bet: List[bool]
+    total: int
 
 
 class BettingModelStats(BaseModel):
@@ -125,3 +194,55 @@ class ChartData(BaseModel):
     data: List[float]
 
 
+# ========================================
+# 백테스트 관련 스키마
+# ========================================
+
+class BacktestMetrics(BaseModel):
+    roi: float  # 수익 / 총 베팅 금액 (%)
+    total_profit: float
+    return_rate: float  # 수익 / 시작 자금 (%)
+    sharpe_ratio: float
+    max_drawdown: float  # (%)
+    win_rate: float  # (%)
+    total_bets: int
+    final_bankroll: float
+
+
+class BacktestSeason(BacktestMetrics):
+    season: int
+
+
+class BacktestResult(BaseModel):
+    name: str
+    params: dict
+    overall: BacktestMetrics
+    seasons: List[BacktestSeason]
+
+
+# ========================================
+# 배당률 수집 관련 스키마
+# ========================================
+
+class OddsSnapshot(BaseModel):
+    match_id: int
+    odds_provider: Optional[str] = None  # 기본: DEFAULT_ODDS_PROVIDER
+    home_team_odds: float = Field(..., gt=1.0)
+    away_team_odds: float = Field(..., gt=1.0)
+    draw_odds: Optional[float] = Field(None, gt=1.0)
+    captured_at: datetime
+
+
+class OddsIngestRequest(BaseModel):
+    snapshots: List[OddsSnapshot] = Field(..., min_length=1)
+
+
+class OddsIngestResult(BaseModel):
+    rows_read: int
+    rows_written: int  # DB 모드가 아니면 0
+    rows_rejected: int
+    batches: int
+    seconds: float
+    rows_per_second: Optional[int] = None
+
+
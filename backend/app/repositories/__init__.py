@@ -0,0 +1,3 @@
+"""
+데이터 접근 레이어 (비동기 리포지토리)
+"""
@@ -0,0 +1,55 @@
+"""
+리포지토리 공통 기능
+"""
+from decimal import Decimal
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.sql import Select
+
+from ..database import get_async_session_factory
+
+
+class BaseRepository:
+    """
+    비동기 리포지토리 기반 클래스
+
+    메서드마다 세션 팩토리에서 세션을 열고 닫는다.
+    테스트에서는 SQLite(aiosqlite) 세션 팩토리를 넘겨 사용한다.
+    """
+
+    def __init__(self, session_factory: Optional[async_sessionmaker] = None):
+        self.session_factory = session_factory or get_async_session_factory()
+
+
+async def paginate(session: AsyncSession, stmt: Select, page: int = 1, size: int = 50) -> dict:
+    """
+    페이지 단위 조회
+
+    Args:
+        session: 비동기 세션
+        stmt: 정렬이 지정된 select 문
+        page: 페이지 번호 (1부터)
+        size: 페이지 크기
+
+    Returns:
+        dict: items(ORM 객체 목록), total, page, size
+    """
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    total = (await session.execute(count_stmt)).scalar_one()
+
+    result = await session.execute(stmt.limit(size).offset((page - 1) * size))
+    return {
+        "items": list(result.unique().scalars()),
+        "total": total,
+        "page": page,
+        "size": size,
+    }
+
+
+def to_float(value) -> Optional[float]:
+    """DECIMAL 컬럼 값을 float로 변환"""
+    if value is None:
+        return None
+    return float(value) if isinstance(value, Decimal) else value
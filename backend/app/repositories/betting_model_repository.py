@@ -0,0 +1,51 @@
+"""
+베팅 모델 설정 리포지토리
+"""
+from typing import List
+
+from sqlalchemy import select
+
+from ..models.db_models import BettingModel
+from .base import BaseRepository, to_float
+
+
+def betting_model_to_dict(model: BettingModel) -> dict:
+    """BettingModel ORM 객체를 dict로 변환"""
+    return {
+        "id": model.id,
+        "name": model.name,
+        "description": model.description,
+        "min_confidence_threshold": to_float(model.min_confidence_threshold),
+        "min_ev_threshold": to_float(model.min_ev_threshold),
+        "max_kelly_percentage": to_float(model.max_kelly_percentage),
+        "risk_multiplier": to_float(model.risk_multiplier),
+        "is_active": bool(model.is_active),
+    }
+
+
+class BettingModelRepository(BaseRepository):
+    """betting_models 조회/저장"""
+
+    async def list_models(self, active_only: bool = False) -> List[dict]:
+        stmt = select(BettingModel).order_by(BettingModel.id)
+        if active_only:
+            stmt = stmt.where(BettingModel.is_active.is_(True))
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return [betting_model_to_dict(m) for m in result.scalars()]
+
+    async def add_candidates(self, candidates: List[dict]) -> List[dict]:
+        """
+        탐색 후보 모델 저장
+
+        Args:
+            candidates: candidate_models 결과
+
+        Returns:
+            저장된 모델 목록
+        """
+        models = [BettingModel(**candidate) for candidate in candidates]
+        async with self.session_factory() as session:
+            session.add_all(models)
+            await session.commit()
+            return [betting_model_to_dict(m) for m in models]
@@ -0,0 +1,261 @@
+"""
+베팅 내역 리포지토리
+"""
+import base64
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+
+from sqlalchemy import and_, case, func, or_, select, update
+from sqlalchemy.orm import aliased
+
+from ..models.db_models import BettingHistory, Match, Team
+from .base import BaseRepository, to_float
+
+# 스트리밍 조회 시 DB에서 한 번에 가져오는 행 수
+STREAM_CHUNK_SIZE = 1000
+
+# 응답에서 DECIMAL -> float 변환이 필요한 컬럼
+_DECIMAL_FIELDS = ("betting_amount", "odds", "expected_profit", "actual_profit")
+
+
+# ========================================
+# 커서 (bet_placed_at, id)
+# ========================================
+
+def encode_cursor(bet_placed_at: datetime, history_id: int) -> str:
+    """마지막 행의 (bet_placed_at, id)를 URL에 넣을 수 있는 문자열로 변환"""
+    raw = f"{bet_placed_at.isoformat()}|{history_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    커서 해석
+
+    Raises:
+        ValueError: 형식이 잘못된 커서
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        placed_at, history_id = base64.urlsafe_b64decode(padded).decode().split("|")
+        return datetime.fromisoformat(placed_at), int(history_id)
+    except Exception:
+        raise ValueError(f"잘못된 커서입니다: {cursor}")
+
+
+def after_cursor(row: dict, cursor: Tuple[datetime, int]) -> bool:
+    """최근 순 정렬에서 row가 커서 다음에 오는지 여부 (목 데이터용)"""
+    placed_at, history_id = cursor
+    return (row["bet_placed_at"], row["id"]) < (placed_at, history_id)
+
+
+# ========================================
+# 조회 쿼리
+# ========================================
+
+def _results_query(
+    betting_model: Optional[str] = None,
+    since: Optional[datetime] = None,
+    cursor: Optional[Tuple[datetime, int]] = None,
+):
+    """
+    베팅 결과 select 문 (최근 순)
+
+    ORM 객체 대신 응답에 필요한 컬럼만 조회해 스트리밍 시 세션에 객체가 쌓이지 않게 한다.
+    모델/기간/커서 조건은 idx_model, idx_bet_placed_at 인덱스를 타도록 SQL에서 처리
+    """
+    home_team = aliased(Team)
+    away_team = aliased(Team)
+    stmt = (
+        select(
+            BettingHistory.id,
+            BettingHistory.match_id,
+            Match.match_date,
+            home_team.name.label("home_team"),
+            away_team.name.label("away_team"),
+            BettingHistory.betting_model,
+            BettingHistory.bet_on,
+            BettingHistory.betting_amount,
+            BettingHistory.odds,
+            BettingHistory.expected_profit,
+            BettingHistory.actual_result,
+            BettingHistory.actual_profit,
+            BettingHistory.bet_placed_at,
+        )
+        .join(Match, BettingHistory.match_id == Match.id)
+        .join(home_team, Match.home_team_id == home_team.id)
+        .join(away_team, Match.away_team_id == away_team.id)
+    )
+    if betting_model:
+        stmt = stmt.where(BettingHistory.betting_model == betting_model)
+    if since is not None:
+        stmt = stmt.where(BettingHistory.bet_placed_at >= since)
+    if cursor is not None:
+        placed_at, history_id = cursor
+        # (bet_placed_at, id) < 커서: 행 값 비교 대신 풀어 써서 인덱스 범위 조회가 되게 함
+        stmt = stmt.where(or_(
+            BettingHistory.bet_placed_at < placed_at,
+            and_(BettingHistory.bet_placed_at == placed_at, BettingHistory.id < history_id),
+        ))
+    return stmt.order_by(BettingHistory.bet_placed_at.desc(), BettingHistory.id.desc())
+
+
+def betting_row_to_dict(row) -> dict:
+    """조회 행을 API 응답 dict로 변환"""
+    result = dict(row._mapping)
+    for field in _DECIMAL_FIELDS:
+        result[field] = to_float(result[field])
+    result["is_recent"] = False
+    return result
+
+
+class BettingRepository(BaseRepository):
+    """베팅 내역 조회"""
+
+    async def list_page(
+        self,
+        betting_model: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+    ) -> dict:
+        """
+        베팅 결과 한 페이지 (키셋 페이지네이션)
+
+        OFFSET 없이 이전 페이지 마지막 행 이후부터 조회하므로 페이지 깊이와 무관하게
+        limit + 1 행만 읽는다.
+
+        Args:
+            betting_model: 베팅 모델명
+            since: 이 시각 이후 베팅만
+            limit: 페이지 크기
+            cursor: 이전 응답의 next_cursor (없으면 첫 페이지)
+
+        Returns:
+            dict: results, next_cursor (마지막 페이지면 None)
+        """
+        position = decode_cursor(cursor) if cursor else None
+        stmt = _results_query(betting_model, since, position).limit(limit + 1)
+
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+
+        results = [betting_row_to_dict(row) for row in rows[:limit]]
+        next_cursor = None
+        if len(rows) > limit:
+            last = results[-1]
+            next_cursor = encode_cursor(last["bet_placed_at"], last["id"])
+
+        if results and position is None:
+            results[0]["is_recent"] = True
+        return {"results": results, "next_cursor": next_cursor}
+
+    async def list_results(
+        self,
+        betting_model: Optional[str] = None,
+        since: Optional[datetime] = None,
+        limit: int = 50,
+    ) -> List[dict]:
+        """베팅 결과 첫 페이지 (최근 순)"""
+        page = await self.list_page(betting_model, since, limit)
+        return page["results"]
+
+    async def stream_results(
+        self,
+        betting_model: Optional[str] = None,
+        since: Optional[datetime] = None,
+    ) -> AsyncIterator[dict]:
+        """
+        조건에 맞는 전체 베팅 결과를 한 행씩 반환 (내보내기용)
+
+        서버 측 커서로 STREAM_CHUNK_SIZE 행씩 가져오므로 내역 크기와 무관하게
+        메모리 사용량이 일정하다.
+        """
+        stmt = _results_query(betting_model, since).execution_options(yield_per=STREAM_CHUNK_SIZE)
+        async with self.session_factory() as session:
+            result = await session.stream(stmt)
+            async for row in result:
+                yield betting_row_to_dict(row)
+
+    async def stream_settled(
+        self,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        match_id: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[datetime, float, float]]:
+        """
+        [since, until) 구간의 결과 확정 베팅을 오래된 순으로 반환 (수익 분석/차트용)
+
+        세 컬럼만 idx_bet_placed_at 순서로 읽어 서버 측 커서로 흘려보낸다.
+
+        Returns:
+            (bet_placed_at, betting_amount, actual_profit)
+        """
+        stmt = (
+            select(BettingHistory.bet_placed_at, BettingHistory.betting_amount, BettingHistory.actual_profit)
+            .where(BettingHistory.actual_result.is_not(None))
+            .order_by(BettingHistory.bet_placed_at, BettingHistory.id)
+            .execution_options(yield_per=STREAM_CHUNK_SIZE)
+        )
+        if since is not None:
+            stmt = stmt.where(BettingHistory.bet_placed_at >= since)
+        if until is not None:
+            stmt = stmt.where(BettingHistory.bet_placed_at < until)
+        if match_id is not None:
+            stmt = stmt.where(BettingHistory.match_id == match_id)
+        async with self.session_factory() as session:
+            result = await session.stream(stmt)
+            async for placed_at, amount, profit in result:
+                yield placed_at, to_float(amount), to_float(profit)
+
+    async def settle_match(self, match_id: int, winner: str) -> int:
+        """
+        경기 결과로 베팅 결과 확정 (결과 정정 시 다시 확정)
+
+        적중하면 betting_amount * (odds - 1), 아니면 -betting_amount
+
+        Returns:
+            확정된 베팅 수
+        """
+        won = BettingHistory.bet_on == winner
+        stmt = (
+            update(BettingHistory)
+            .where(BettingHistory.match_id == match_id)
+            .values(
+                actual_result=case((won, "win"), else_="loss"),
+                actual_profit=case(
+                    (won, BettingHistory.betting_amount * (func.coalesce(BettingHistory.odds, 1) - 1)),
+                    else_=-BettingHistory.betting_amount,
+                ),
+                result_updated_at=func.now(),
+            )
+        )
+        async with self.session_factory() as session:
+            async with session.begin():
+                result = await session.execute(stmt)
+        return result.rowcount
+
+    async def model_stats(self, model_name: str) -> dict:
+        """베팅 모델별 승률/수익률 집계"""
+        is_win = case((BettingHistory.actual_result == "win", 1), else_=0)
+        stmt = (
+            select(
+                func.count(BettingHistory.id),
+                func.coalesce(func.sum(is_win), 0),
+                func.coalesce(func.sum(BettingHistory.betting_amount), 0),
+                func.coalesce(func.sum(BettingHistory.actual_profit), 0),
+            )
+            .where(BettingHistory.betting_model == model_name)
+            .where(BettingHistory.actual_result.is_not(None))
+        )
+        async with self.session_factory() as session:
+            total, wins, staked, profit = (await session.execute(stmt)).one()
+
+        staked = to_float(staked) or 0.0
+        return {
+            "name": model_name,
+            "win_rate": round(wins / total * 100, 1) if total else 0.0,
+            "return_rate": round(to_float(profit) / staked * 100, 1) if staked else 0.0,
+            "total_bets": total,
+            "win_bets": int(wins),
+        }
@@ -0,0 +1,157 @@
+"""
+경기 리포지토리
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import joinedload
+
+from ..models.db_models import Match
+from .base import BaseRepository, paginate
+
+
+def match_to_dict(match: Match) -> dict:
+    """Match ORM 객체를 API 응답 dict로 변환"""
+    return {
+        "id": match.id,
+        "home_team_id": match.home_team_id,
+        "away_team_id": match.away_team_id,
+        "home_team_name": match.home_team.name,
+        "away_team_name": match.away_team.name,
+        "match_date": match.match_date,
+        "season": match.season,
+        "stadium": match.stadium,
+        "home_score": match.home_score,
+        "away_score": match.away_score,
+        "winner": match.winner,
+        "is_completed": bool(match.is_completed),
+    }
+
+
+def _with_teams():
+    """홈/원정 팀을 같은 쿼리에서 함께 로드하는 select 문"""
+    return select(Match).options(
+        joinedload(Match.home_team),
+        joinedload(Match.away_team),
+    )
+
+
+class MatchRepository(BaseRepository):
+    """경기 조회"""
+
+    async def get_by_id(self, match_id: int) -> Optional[dict]:
+        async with self.session_factory() as session:
+            result = await session.execute(_with_teams().where(Match.id == match_id))
+            match = result.unique().scalar_one_or_none()
+            return match_to_dict(match) if match else None
+
+    async def list_by_date_range(
+        self,
+        start_date: date,
+        end_date: date,
+        page: int = 1,
+        size: Optional[int] = None,
+    ) -> dict:
+        """
+        날짜 범위 경기 목록
+
+        Returns:
+            dict: matches, total (size를 지정하면 해당 페이지만)
+        """
+        stmt = (
+            _with_teams()
+            .where(Match.match_date.between(start_date, end_date))
+            .order_by(Match.match_date, Match.id)
+        )
+        async with self.session_factory() as session:
+            if size is None:
+                result = await session.execute(stmt)
+                matches = [match_to_dict(m) for m in result.unique().scalars()]
+                return {"matches": matches, "total": len(matches)}
+
+            page_data = await paginate(session, stmt, page, size)
+            return {
+                "matches": [match_to_dict(m) for m in page_data["items"]],
+                "total": page_data["total"],
+            }
+
+    async def list_upcoming(self, limit: int = 10, from_date: Optional[date] = None) -> List[dict]:
+        """오늘 이후 미완료 경기 (가까운 순)"""
+        stmt = (
+            _with_teams()
+            .where(Match.match_date >= (from_date or date.today()))
+            .where(Match.is_completed.is_(False))
+            .order_by(Match.match_date, Match.id)
+            .limit(limit)
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return [match_to_dict(m) for m in result.unique().scalars()]
+
+    async def list_recent(self, limit: int = 10, until_date: Optional[date] = None) -> List[dict]:
+        """오늘까지 완료된 경기 (최근 순)"""
+        stmt = (
+            _with_teams()
+            .where(Match.match_date <= (until_date or date.today()))
+            .where(Match.is_completed.is_(True))
+            .order_by(Match.match_date.desc(), Match.id.desc())
+            .limit(limit)
+        )
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return [match_to_dict(m) for m in result.unique().scalars()]
+
+    async def list_completed_results(self, after_id: int = 0, limit: int = 50000) -> List[dict]:
+        """
+        완료 경기 결과 (경기 이력 저장소 적재용, ID 순, 팀 조인 없음)
+
+        Args:
+            after_id: 이 ID 다음부터 (키셋 페이지네이션)
+            limit: 최대 경기 수
+        """
+        stmt = (
+            select(
+                Match.id,
+                Match.match_date,
+                Match.season,
+                Match.home_team_id,
+                Match.away_team_id,
+                Match.home_score,
+                Match.away_score,
+                Match.winner,
+            )
+            .where(Match.is_completed.is_(True))
+            .where(Match.id > after_id)
+            .order_by(Match.id)
+            .limit(limit)
+        )
+        async with self.session_factory() as session:
+            return [dict(row._mapping) for row in await session.execute(stmt)]
+
+    async def upsert(self, match: dict) -> dict:
+        """
+        경기 저장 (id가 있으면 갱신, 없으면 추가)
+
+        Args:
+            match: match_to_dict 형식의 경기 정보 (팀 이름 필드는 무시)
+
+        Returns:
+            저장된 경기 정보
+        """
+        columns = {
+            key: value for key, value in match.items()
+            if key in Match.__table__.columns.keys()
+        }
+        async with self.session_factory() as session:
+            row = await session.get(Match, columns["id"]) if columns.get("id") else None
+            if row is None:
+                row = Match(**columns)
+                session.add(row)
+            else:
+                for key, value in columns.items():
+                    setattr(row, key, value)
+            await session.commit()
+            match_id = row.id
+
+        return await self.get_by_id(match_id)
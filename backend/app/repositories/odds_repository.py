@@ -0,0 +1,114 @@
+"""
+배당률 리포지토리
+"""
+from typing import Dict, Iterable, List, Set, Tuple
+
+from sqlalchemy import case, func, insert, or_, select
+from sqlalchemy.dialects.mysql import insert as mysql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+from ..models.db_models import Match, MatchOdds, MatchOddsMovement
+from .base import BaseRepository, to_float
+
+# match_odds upsert 시 갱신하는 컬럼 (captured_at은 비교 기준이라 마지막)
+_LATEST_COLUMNS = ("home_team_odds", "away_team_odds", "draw_odds", "captured_at")
+
+
+def latest_snapshots(snapshots: List[dict]) -> List[dict]:
+    """(경기, 제공처)별 가장 늦게 수집된 스냅샷만 남김"""
+    latest: Dict[Tuple[int, str], dict] = {}
+    for snapshot in snapshots:
+        key = (snapshot["match_id"], snapshot["odds_provider"])
+        current = latest.get(key)
+        if current is None or snapshot["captured_at"] >= current["captured_at"]:
+            latest[key] = snapshot
+    return list(latest.values())
+
+
+def upsert_latest_statement(dialect_name: str):
+    """
+    match_odds 최신 배당률 upsert 문 (executemany용)
+
+    이미 더 늦은 시각의 배당률이 저장돼 있으면 유지한다 (순서가 뒤섞인 파일 대비).
+
+    - MySQL: INSERT ... ON DUPLICATE KEY UPDATE
+    - SQLite/PostgreSQL: INSERT ... ON CONFLICT (match_id, odds_provider) DO UPDATE
+    """
+    table = MatchOdds.__table__
+    if dialect_name == "mysql":
+        stmt = mysql_insert(table)
+        newer = or_(table.c.captured_at.is_(None), stmt.inserted.captured_at >= table.c.captured_at)
+        # 목록 순서대로 적용되므로 captured_at을 마지막에 갱신해야 앞 컬럼들이 기존 시각과 비교함
+        return stmt.on_duplicate_key_update(
+            [("updated_at", func.now())]
+            + [
+                (column, case((newer, stmt.inserted[column]), else_=table.c[column]))
+                for column in _LATEST_COLUMNS
+            ]
+        )
+
+    stmt = sqlite_insert(table)
+    return stmt.on_conflict_do_update(
+        index_elements=["match_id", "odds_provider"],
+        set_=dict({column: stmt.excluded[column] for column in _LATEST_COLUMNS}, updated_at=func.now()),
+        where=or_(table.c.captured_at.is_(None), table.c.captured_at <= stmt.excluded.captured_at),
+    )
+
+
+class OddsRepository(BaseRepository):
+    """match_odds / match_odds_movements 저장 및 조회"""
+
+    async def existing_match_ids(self, match_ids: Iterable[int]) -> Set[int]:
+        """matches에 있는 경기 ID (외래 키 위반으로 묶음 전체가 실패하지 않도록 저장 전에 확인)"""
+        match_ids = set(match_ids)
+        if not match_ids:
+            return set()
+        stmt = select(Match.id).where(Match.id.in_(match_ids))
+        async with self.session_factory() as session:
+            return set((await session.execute(stmt)).scalars())
+
+    async def write_batch(self, snapshots: List[dict]) -> int:
+        """
+        정규화된 스냅샷 묶음 저장 (트랜잭션 1개)
+
+        변동 이력은 전체를 다중 행 INSERT로 추가하고, match_odds에는 (경기, 제공처)별
+        최신 1건만 upsert한다. ORM 객체를 만들지 않고 Core executemany로 보낸다.
+
+        Args:
+            snapshots: normalize_odds 결과 목록
+
+        Returns:
+            저장한 스냅샷 수
+        """
+        if not snapshots:
+            return 0
+        latest = latest_snapshots(snapshots)
+        async with self.session_factory() as session:
+            async with session.begin():
+                dialect_name = session.get_bind().dialect.name
+                await session.execute(insert(MatchOddsMovement), snapshots)
+                await session.execute(upsert_latest_statement(dialect_name), latest)
+        return len(snapshots)
+
+    async def latest(self, match_id: int) -> List[dict]:
+        """경기의 제공처별 최신 배당률"""
+        stmt = select(MatchOdds).where(MatchOdds.match_id == match_id).order_by(MatchOdds.odds_provider)
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).scalars().all()
+        return [
+            {
+                "match_id": row.match_id,
+                "odds_provider": row.odds_provider,
+                "home_team_odds": to_float(row.home_team_odds),
+                "away_team_odds": to_float(row.away_team_odds),
+                "draw_odds": to_float(row.draw_odds),
+                "captured_at": row.captured_at,
+            }
+            for row in rows
+        ]
+
+    async def count_movements(self, match_id: int) -> int:
+        """경기의 배당률 변동 이력 수"""
+        stmt = select(func.count()).where(MatchOddsMovement.match_id == match_id)
+        async with self.session_factory() as session:
+            return (await session.execute(stmt)).scalar_one()
@@ -0,0 +1,69 @@
+"""
+모델 성능 지표 리포지토리
+"""
+from datetime import date
+from typing import List, Optional
+
+from sqlalchemy import select
+
+from ..models.db_models import ModelPerformance
+from .base import BaseRepository, to_float
+
+
+class PerformanceRepository(BaseRepository):
+    """model_performances 조회"""
+
+    async def latest(self, model_name: str, period: str) -> Optional[dict]:
+        """
+        가장 최근 평가 결과 (직전 평가의 정확도를 previous_accuracy로 포함)
+        """
+        stmt = (
+            select(ModelPerformance)
+            .where(
+                ModelPerformance.model_name == model_name,
+                ModelPerformance.evaluation_period == period,
+            )
+            .order_by(ModelPerformance.evaluation_date.desc())
+            .limit(2)
+        )
+        async with self.session_factory() as session:
+            rows = list((await session.execute(stmt)).scalars())
+
+        if not rows:
+            return None
+
+        latest = rows[0]
+        return {
+            "model_name": latest.model_name,
+            "evaluation_period": latest.evaluation_period,
+            "accuracy": to_float(latest.accuracy),
+            "log_loss": to_float(latest.log_loss),
+            "brier_score": to_float(latest.brier_score),
+            "previous_accuracy": to_float(rows[1].accuracy) if len(rows) > 1 else None,
+        }
+
+    async def save_snapshots(self, snapshots: List[dict], evaluation_date: date) -> None:
+        """
+        기간별 지표 저장 (같은 모델/기간/날짜 행이 있으면 갱신)
+
+        Args:
+            snapshots: model_name, evaluation_period 및 지표 컬럼을 가진 dict 목록
+            evaluation_date: 평가 날짜
+        """
+        columns = set(ModelPerformance.__table__.columns.keys())
+        async with self.session_factory() as session:
+            for snapshot in snapshots:
+                values = {k: v for k, v in snapshot.items() if k in columns}
+                stmt = select(ModelPerformance).where(
+                    ModelPerformance.model_name == values["model_name"],
+                    ModelPerformance.evaluation_period == values["evaluation_period"],
+                    ModelPerformance.evaluation_date == evaluation_date,
+                )
+                row = (await session.execute(stmt)).scalar_one_or_none()
+                if row is None:
+                    session.add(ModelPerformance(evaluation_date=evaluation_date, **values))
+                else:
+                    for key, value in values.items():
+                        setattr(row, key, value)
+            await session.commit()
+
@@ -0,0 +1,299 @@
+"""
+예측 결과 리포지토리
+"""
+from typing import Dict, List, Optional
+
+from sqlalchemy import bindparam, func, select, update
+
+from ..models.db_models import BettingHistory, Match, MatchOdds, Prediction
+from .base import BaseRepository, to_float
+
+
+def prediction_to_dict(prediction: Prediction) -> dict:
+    """Prediction ORM 객체를 API 응답 dict로 변환"""
+    return {
+        "id": prediction.id,
+        "match_id": prediction.match_id,
+        "model_name": prediction.model_name,
+        "home_win_probability": to_float(prediction.home_win_probability),
+        "away_win_probability": to_float(prediction.away_win_probability),
+        "confidence_score": to_float(prediction.confidence_score),
+        "recommended_bet": prediction.recommended_bet,
+        "expected_value": to_float(prediction.expected_value),
+        "kelly_percentage": to_float(prediction.kelly_percentage),
+        "predicted_at": prediction.predicted_at,
+    }
+
+
+def latest_odds_subquery():
+    """
+    경기별 최신 배당률 1건 (수집 시각 순, 수집 시각이 없으면 갱신 시각, 같으면 id 순)
+
+    match_odds는 (경기, 제공처)별 upsert라 id가 큰 행이 최신이 아니다.
+    """
+    captured = func.coalesce(MatchOdds.captured_at, MatchOdds.updated_at)
+    ranked = (
+        select(
+            MatchOdds.match_id,
+            MatchOdds.home_team_odds,
+            MatchOdds.away_team_odds,
+            captured.label("captured_at"),
+            func.row_number().over(
+                partition_by=MatchOdds.match_id,
+                order_by=(captured.desc(), MatchOdds.id.desc()),
+            ).label("odds_rank"),
+        )
+        .where(MatchOdds.home_team_odds.is_not(None))
+        .subquery()
+    )
+    return select(ranked).where(ranked.c.odds_rank == 1).subquery()
+
+
+class PredictionRepository(BaseRepository):
+    """저장된 예측 조회"""
+
+    async def get(self, match_id: int, model_name: str) -> Optional[dict]:
+        stmt = select(Prediction).where(
+            Prediction.match_id == match_id,
+            Prediction.model_name == model_name,
+        )
+        async with self.session_factory() as session:
+            prediction = (await session.execute(stmt)).scalar_one_or_none()
+            return prediction_to_dict(prediction) if prediction else None
+
+    async def list_by_match(self, match_id: int) -> List[dict]:
+        stmt = select(Prediction).where(Prediction.match_id == match_id).order_by(Prediction.model_name)
+        async with self.session_factory() as session:
+            result = await session.execute(stmt)
+            return [prediction_to_dict(p) for p in result.scalars()]
+
+    async def probabilities(self, match_ids: List[int]) -> List[dict]:
+        """
+        경기들의 모델별 예측 확률 (추천 재계산 입력)
+
+        Returns:
+            {match_id, model_name, home_win_probability, confidence_score} 목록
+        """
+        stmt = select(
+            Prediction.match_id,
+            Prediction.model_name,
+            Prediction.home_win_probability,
+            Prediction.confidence_score,
+        ).where(Prediction.match_id.in_(match_ids))
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+
+        result = []
+        for row in rows:
+            home_prob = to_float(row.home_win_probability)
+            confidence = to_float(row.confidence_score)
+            result.append({
+                "match_id": row.match_id,
+                "model_name": row.model_name,
+                "home_win_probability": home_prob,
+                "confidence_score": confidence if confidence is not None else max(home_prob, 1 - home_prob),
+            })
+        return result
+
+    async def latest_odds(self, match_ids: List[int]) -> Dict[int, dict]:
+        """
+        경기별 저장된 최신 배당률 (추천 재계산 입력)
+
+        Returns:
+            match_id -> {match_id, home_team_odds, away_team_odds, captured_at}
+        """
+        latest_odds = latest_odds_subquery()
+        stmt = select(latest_odds).where(latest_odds.c.match_id.in_(match_ids))
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+        return {
+            row.match_id: {
+                "match_id": row.match_id,
+                "home_team_odds": to_float(row.home_team_odds),
+                "away_team_odds": to_float(row.away_team_odds),
+                "captured_at": row.captured_at,
+            }
+            for row in rows
+            if row.captured_at is not None
+        }
+
+    async def update_recommendations(self, recommendations: List[dict]) -> None:
+        """
+        베팅 추천 컬럼만 갱신 (executemany, 트랜잭션 1개)
+
+        Args:
+            recommendations: {match_id, model_name, recommended_bet, expected_value, kelly_percentage} 목록
+        """
+        if not recommendations:
+            return
+        # ORM update는 executemany에 기본 키가 필요하므로 Core 테이블로 보냄
+        table = Prediction.__table__
+        stmt = (
+            update(table)
+            .where(table.c.match_id == bindparam("b_match_id"))
+            .where(table.c.model_name == bindparam("b_model_name"))
+            .values(
+                recommended_bet=bindparam("recommended_bet"),
+                expected_value=bindparam("expected_value"),
+                kelly_percentage=bindparam("kelly_percentage"),
+            )
+        )
+        params = [
+            {
+                "b_match_id": row["match_id"],
+                "b_model_name": row["model_name"],
+                "recommended_bet": row["recommended_bet"],
+                "expected_value": row["expected_value"],
+                "kelly_percentage": row["kelly_percentage"],
+            }
+            for row in recommendations
+        ]
+        async with self.session_factory() as session:
+            async with session.begin():
+                await session.execute(stmt, params)
+
+    async def history_with_odds(self, model_name: str) -> List[dict]:
+        """
+        완료된 경기의 예측 + 배당률 + 결과 (백테스트 입력, 날짜 순)
+
+        경기마다 가장 최근에 수집된 배당률 1건을 사용한다.
+        """
+        latest_odds = latest_odds_subquery()
+        stmt = (
+            select(
+                Prediction.match_id,
+                Match.match_date,
+                Match.season,
+                Prediction.home_win_probability,
+                Prediction.confidence_score,
+                latest_odds.c.home_team_odds,
+                latest_odds.c.away_team_odds,
+                Match.winner,
+            )
+            .join(Match, Prediction.match_id == Match.id)
+            .join(latest_odds, latest_odds.c.match_id == Match.id)
+            .where(Prediction.model_name == model_name)
+            .where(Match.is_completed.is_(True))
+            .order_by(Match.match_date, Match.id)
+        )
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+
+        history = []
+        for row in rows:
+            home_prob = to_float(row.home_win_probability)
+            confidence = to_float(row.confidence_score)
+            history.append({
+                "match_id": row.match_id,
+                "match_date": row.match_date,
+                "season": row.season,
+                "home_win_probability": home_prob,
+                "confidence": confidence if confidence is not None else max(home_prob, 1 - home_prob),
+                "home_odds": to_float(row.home_team_odds),
+                "away_odds": to_float(row.away_team_odds),
+                "home_won": row.winner == "home",
+            })
+        return history
+
+    async def predictions_with_odds(self, model_name: str) -> List[dict]:
+        """
+        예측 + 경기별 최신 배당률 (경기 정보/결과 없이)
+
+        경기 날짜/시즌/결과는 경기 이력 저장소에서 붙인다 (backtester.history_from_store).
+        """
+        latest_odds = latest_odds_subquery()
+        stmt = (
+            select(
+                Prediction.match_id,
+                Prediction.home_win_probability,
+                Prediction.confidence_score,
+                latest_odds.c.home_team_odds,
+                latest_odds.c.away_team_odds,
+            )
+            .join(latest_odds, latest_odds.c.match_id == Prediction.match_id)
+            .where(Prediction.model_name == model_name)
+        )
+        async with self.session_factory() as session:
+            rows = (await session.execute(stmt)).all()
+
+        predictions = []
+        for row in rows:
+            home_prob = to_float(row.home_win_probability)
+            confidence = to_float(row.confidence_score)
+            predictions.append({
+                "match_id": row.match_id,
+                "home_win_probability": home_prob,
+                "confidence": confidence if confidence is not None else max(home_prob, 1 - home_prob),
+                "home_odds": to_float(row.home_team_odds),
+                "away_odds": to_float(row.away_team_odds),
+            })
+        return predictions
+
+    async def evaluation_history(self, match_id: Optional[int] = None) -> Dict[str, dict]:
+        """
+        완료 경기 예측 (성능 집계 입력)
+
+        Args:
+            match_id: 주어지면 해당 경기만
+
+        Returns:
+            모델명 -> {match_id, match_date, home_win_probability, home_won} 컬럼 목록
+        """
+        stmt = (
+            select(
+                Prediction.model_name,
+                Prediction.match_id,
+                Match.match_date,
+                Prediction.home_win_probability,
+                Match.winner,
+            )
+            .join(Match, Prediction.match_id == Match.id)
+            .where(Match.is_completed.is_(True))
+        )
+        if match_id is not None:
+            stmt = stmt.where(Prediction.match_id == match_id)
+
+        history: Dict[str, dict] = {}
+        async with self.session_factory() as session:
+            for row in await session.execute(stmt):
+                columns = history.setdefault(
+                    row.model_name, {"match_id": [], "match_date": [], "home_win_probability": [], "home_won": []}
+                )
+                columns["match_id"].append(row.match_id)
+                columns["match_date"].append(row.match_date)
+                columns["home_win_probability"].append(to_float(row.home_win_probability))
+                columns["home_won"].append(row.winner == "home")
+        return history
+
+    async def bet_outcomes(self, match_id: Optional[int] = None) -> Dict[str, dict]:
+        """
+        예측 모델별 결과 확정 베팅 (betting_histories.prediction_id 기준)
+
+        Returns:
+            모델명 -> {match_date, betting_amount, actual_profit} 컬럼 목록
+        """
+        stmt = (
+            select(
+                Prediction.model_name,
+                Match.match_date,
+                BettingHistory.betting_amount,
+                BettingHistory.actual_profit,
+            )
+            .join(Prediction, BettingHistory.prediction_id == Prediction.id)
+            .join(Match, BettingHistory.match_id == Match.id)
+            .where(BettingHistory.actual_result.is_not(None))
+        )
+        if match_id is not None:
+            stmt = stmt.where(BettingHistory.match_id == match_id)
+
+        outcomes: Dict[str, dict] = {}
+        async with self.session_factory() as session:
+            for row in await session.execute(stmt):
+                columns = outcomes.setdefault(
+                    row.model_name, {"match_date": [], "betting_amount": [], "actual_profit": []}
+                )
+                columns["match_date"].append(row.match_date)
+                columns["betting_amount"].append(to_float(row.betting_amount))
+                columns["actual_profit"].append(to_float(row.actual_profit) or 0.0)
+        return outcomes
+
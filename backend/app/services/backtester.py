@@ -0,0 +1,308 @@
+"""
+워크포워드 베팅 백테스트
+
+저장된 예측과 배당률을 날짜 순으로 재생하면서 베팅 모델별 켈리 베팅으로
+자금 변화를 시뮬레이션한다. 시즌을 순서대로 진행하며 자금은 다음 시즌으로 이어진다.
+
+- 경기 단위 연산은 모두 (설정 수, 경기 수) 배열로 처리
+- 같은 날 경기는 그날 시작 자금 기준으로 동시에 베팅 (하루 총 베팅 비율은 최대 1)
+- 설정이 많으면 프로세스 풀로 나눠 실행
+"""
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..ml.match_history import WINNER_HOME, MatchHistoryStore
+from .betting_engine import BETTING_MODELS, PARAM_KEYS, decide, params_array, score_sides
+
+# 한 번에 시뮬레이션하는 설정 수 (메모리 사용량 = 설정 수 x 경기 수 x 8바이트 x 몇 배)
+BACKTEST_CHUNK_SIZE = int(os.getenv("BACKTEST_CHUNK_SIZE", "256"))
+
+HISTORY_FIELDS = (
+    "match_id", "match_date", "season",
+    "home_win_probability", "confidence", "home_odds", "away_odds", "home_won",
+)
+
+METRIC_FIELDS = (
+    "roi", "total_profit", "return_rate", "sharpe_ratio", "max_drawdown",
+    "win_rate", "total_bets", "final_bankroll",
+)
+
+
+# ========================================
+# 입력 데이터
+# ========================================
+
+def history_from_rows(rows: List[dict]) -> Dict[str, np.ndarray]:
+    """예측+배당률+결과 행 목록을 컬럼 배열로 변환"""
+    history = {field: [row[field] for row in rows] for field in HISTORY_FIELDS}
+    return {
+        "match_id": np.asarray(history["match_id"], dtype=np.int64),
+        "match_date": np.asarray(history["match_date"], dtype="datetime64[D]"),
+        "season": np.asarray(history["season"], dtype=np.int64),
+        "home_win_probability": np.asarray(history["home_win_probability"], dtype=np.float64),
+        "confidence": np.asarray(history["confidence"], dtype=np.float64),
+        "home_odds": np.asarray(history["home_odds"], dtype=np.float64),
+        "away_odds": np.asarray(
+            [np.nan if v is None else v for v in history["away_odds"]], dtype=np.float64
+        ),
+        "home_won": np.asarray(history["home_won"], dtype=bool),
+    }
+
+
+def history_from_store(store: MatchHistoryStore, predictions: List[dict]) -> Dict[str, np.ndarray]:
+    """
+    예측+배당률 행에 경기 이력 저장소의 날짜/시즌/결과를 붙여 컬럼 배열로 변환
+
+    저장소에 없는 경기(미완료)는 제외한다. 결과는 history_from_rows와 같은 형식이다.
+    """
+    match_ids = np.asarray([row["match_id"] for row in predictions], dtype=np.int64)
+    positions = store.positions(match_ids)
+    found = positions >= 0
+    rows = positions[found]
+    columns = store.columns()
+
+    def field(name: str) -> np.ndarray:
+        values = [row[name] for row in predictions]
+        return np.asarray([np.nan if v is None else v for v in values], dtype=np.float64)[found]
+
+    return {
+        "match_id": match_ids[found],
+        "match_date": columns["match_date"][rows],
+        "season": columns["season"][rows].astype(np.int64),
+        "home_win_probability": field("home_win_probability"),
+        "confidence": field("confidence"),
+        "home_odds": field("home_odds"),
+        "away_odds": field("away_odds"),
+        "home_won": columns["winner"][rows] == WINNER_HOME,
+    }
+
+
+def prepare_history(history: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    시뮬레이션용 전처리 (설정과 무관한 부분, 1회)
+
+    날짜 순 정렬, 날짜/시즌 경계, 베팅 방향과 1원당 손익을 미리 계산한다.
+    """
+    order = np.lexsort((history["match_id"], history["match_date"]))
+    history = {key: np.asarray(values)[order] for key, values in history.items()}
+
+    sides = score_sides(history["home_win_probability"], history["home_odds"], history["away_odds"])
+    side_won = history["home_won"] != sides["on_away"]
+
+    dates = history["match_date"]
+    day_starts = np.flatnonzero(np.r_[True, dates[1:] != dates[:-1]])
+    day_index = np.cumsum(np.r_[False, dates[1:] != dates[:-1]])
+    day_season = history["season"][day_starts]
+    season_day_starts = np.flatnonzero(np.r_[True, day_season[1:] != day_season[:-1]])
+
+    return {
+        "confidence": history["confidence"],
+        "expected_value": sides["expected_value"],
+        "kelly_fraction": sides["kelly_fraction"],
+        "side_won": side_won,
+        "payoff": np.where(side_won, sides["odds"] - 1.0, -1.0),
+        "day_starts": day_starts,
+        "day_index": day_index,
+        "seasons": day_season[season_day_starts],
+        "season_day_starts": season_day_starts,
+    }
+
+
+def parameter_grid(**axes: Sequence[float]) -> List[dict]:
+    """
+    파라미터 격자
+
+    예: parameter_grid(min_confidence=[0.55, 0.6], min_ev=[300, 500], max_kelly=[0.1], risk_multiplier=[1.0])
+    """
+    missing = [key for key in PARAM_KEYS if key not in axes]
+    if missing:
+        raise ValueError(f"파라미터가 없습니다: {missing}")
+    return [dict(zip(PARAM_KEYS, values)) for values in itertools.product(*(axes[k] for k in PARAM_KEYS))]
+
+
+# ========================================
+# 시뮬레이션
+# ========================================
+
+def _metrics(
+    daily_return: np.ndarray,
+    start_bankroll: np.ndarray,
+    staked: np.ndarray,
+    bets: np.ndarray,
+    wins: np.ndarray,
+    periods_per_season: float,
+) -> Dict[str, np.ndarray]:
+    """(설정 수, 일수) 일별 수익률 -> 설정별 지표"""
+    log_growth = np.log(np.maximum(1.0 + daily_return, 1e-12))
+    equity = start_bankroll[:, None] * np.exp(np.cumsum(log_growth, axis=1))
+    path = np.concatenate([start_bankroll[:, None], equity], axis=1)
+    drawdown = path / np.maximum.accumulate(path, axis=1) - 1.0
+
+    final = equity[:, -1] if equity.shape[1] else start_bankroll
+    profit = final - start_bankroll
+    std = daily_return.std(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(std > 0, daily_return.mean(axis=1) / std * np.sqrt(periods_per_season), 0.0)
+        roi = np.where(staked > 0, profit / staked * 100, 0.0)
+        win_rate = np.where(bets > 0, wins / bets * 100, 0.0)
+
+    return {
+        "roi": np.round(roi, 2),
+        "total_profit": np.round(profit),
+        "return_rate": np.round(profit / start_bankroll * 100, 2),
+        "sharpe_ratio": np.round(sharpe, 3),
+        "max_drawdown": np.round(drawdown.min(axis=1) * 100, 2),
+        "win_rate": np.round(win_rate, 1),
+        "total_bets": bets,
+        "final_bankroll": np.round(final),
+    }
+
+
+def simulate(
+    prepared: Dict[str, np.ndarray],
+    params: Dict[str, np.ndarray],
+    initial_bankroll: float = 1_000_000,
+    by_season: bool = True,
+) -> Dict[str, object]:
+    """
+    설정 M개 동시 시뮬레이션
+
+    Args:
+        prepared: prepare_history 결과
+        params: params_array 결과 (키별 (M,) 배열)
+        initial_bankroll: 시작 자금
+        by_season: 시즌별 지표 계산 여부 (False면 seasons는 빈 dict)
+
+    Returns:
+        dict: overall (지표별 (M,) 배열), seasons (시즌 -> 지표별 (M,) 배열)
+    """
+    stake, should_bet = decide(prepared["confidence"], prepared, params)
+    day_starts, day_index = prepared["day_starts"], prepared["day_index"]
+
+    # 하루 총 베팅 비율이 1을 넘으면 비율대로 줄임
+    exposure = np.add.reduceat(stake, day_starts, axis=1)
+    stake = stake * np.minimum(1.0, 1.0 / np.maximum(exposure, 1e-12))[:, day_index]
+
+    daily_return = np.add.reduceat(stake * prepared["payoff"], day_starts, axis=1)
+    log_equity = np.cumsum(np.log(np.maximum(1.0 + daily_return, 1e-12)), axis=1)
+    day_start_bankroll = initial_bankroll * np.exp(
+        np.concatenate([np.zeros((len(stake), 1)), log_equity[:, :-1]], axis=1)
+    )
+    staked = np.add.reduceat(stake * day_start_bankroll[:, day_index], day_starts, axis=1)
+    bets = np.add.reduceat(should_bet, day_starts, axis=1)
+    wins = np.add.reduceat(should_bet & prepared["side_won"], day_starts, axis=1)
+
+    season_bounds = np.r_[prepared["season_day_starts"], daily_return.shape[1]]
+    periods = daily_return.shape[1] / len(prepared["seasons"])
+
+    seasons = {}
+    season_ranges = zip(prepared["seasons"], season_bounds[:-1], season_bounds[1:]) if by_season else ()
+    for season, d0, d1 in season_ranges:
+        seasons[int(season)] = _metrics(
+            daily_return[:, d0:d1],
+            day_start_bankroll[:, d0],
+            staked[:, d0:d1].sum(axis=1),
+            bets[:, d0:d1].sum(axis=1),
+            wins[:, d0:d1].sum(axis=1),
+            d1 - d0,
+        )
+
+    overall = _metrics(
+        daily_return,
+        np.full(len(stake), float(initial_bankroll)),
+        staked.sum(axis=1),
+        bets.sum(axis=1),
+        wins.sum(axis=1),
+        periods,
+    )
+    return {"overall": overall, "seasons": seasons}
+
+
+def _results(names: Sequence[str], configs: Sequence[dict], simulated: dict) -> List[dict]:
+    """설정별 결과 dict 목록으로 변환"""
+    def row(metrics: Dict[str, np.ndarray], i: int) -> dict:
+        return {field: metrics[field][i].item() for field in METRIC_FIELDS}
+
+    return [
+        {
+            "name": name,
+            "params": dict(config),
+            "overall": row(simulated["overall"], i),
+            "seasons": [
+                dict(season=season, **row(metrics, i))
+                for season, metrics in simulated["seasons"].items()
+            ],
+        }
+        for i, (name, config) in enumerate(zip(names, configs))
+    ]
+
+
+def _simulate_chunk(
+    prepared: Dict[str, np.ndarray],
+    names: Sequence[str],
+    configs: Sequence[dict],
+    initial_bankroll: float,
+) -> List[dict]:
+    return _results(names, configs, simulate(prepared, params_array(configs), initial_bankroll))
+
+
+# 프로세스 풀 워커에 1번만 전달되는 입력
+_worker_prepared: Optional[Dict[str, np.ndarray]] = None
+
+
+def _init_worker(prepared: Dict[str, np.ndarray]) -> None:
+    global _worker_prepared
+    _worker_prepared = prepared
+
+
+def _run_in_worker(names: Sequence[str], configs: Sequence[dict], initial_bankroll: float) -> List[dict]:
+    return _simulate_chunk(_worker_prepared, names, configs, initial_bankroll)
+
+
+def run_backtest(
+    history: Dict[str, np.ndarray],
+    configs: Optional[Dict[str, dict]] = None,
+    initial_bankroll: float = 1_000_000,
+    workers: Optional[int] = None,
+    chunk_size: int = BACKTEST_CHUNK_SIZE,
+) -> List[dict]:
+    """
+    워크포워드 백테스트
+
+    Args:
+        history: history_from_rows 형식의 컬럼 배열
+        configs: 이름 -> 전략 파라미터 (기본: BETTING_MODELS)
+        initial_bankroll: 시작 자금
+        workers: 프로세스 수 (설정이 chunk_size 이하이거나 1이면 현재 프로세스에서 실행)
+        chunk_size: 한 번에 시뮬레이션하는 설정 수
+
+    Returns:
+        설정별 결과 (name, params, overall 지표, 시즌별 지표)
+    """
+    if configs is None:
+        configs = BETTING_MODELS
+    names, params = list(configs), list(configs.values())
+    prepared = prepare_history(history)
+
+    chunks = [
+        (names[i:i + chunk_size], params[i:i + chunk_size])
+        for i in range(0, len(names), chunk_size)
+    ]
+
+    if workers == 1 or len(chunks) == 1:
+        results = []
+        for chunk_names, chunk_params in chunks:
+            results.extend(_simulate_chunk(prepared, chunk_names, chunk_params, initial_bankroll))
+        return results
+
+    # 입력 배열은 워커 초기화 때 한 번만 전달하고 작업마다 설정만 보냄
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(prepared,)) as executor:
+        futures = [
+            executor.submit(_run_in_worker, chunk_names, chunk_params, initial_bankroll)
+            for chunk_names, chunk_params in chunks
+        ]
+        return [result for future in futures for result in future.result()]
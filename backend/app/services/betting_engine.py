@@ -0,0 +1,197 @@
+"""
+배치 베팅 결정 엔진
+
+여러 경기의 예측 확률/배당률/신뢰도 배열을 받아 모든 베팅 모델에 대해
+기대값, 켈리 비율, 베팅 여부를 한 번에 계산한다.
+"""
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# 기대값 임계값의 기준 베팅 금액 (원)
+UNIT_AMOUNT = 10000
+
+# 베팅 모델별 전략 파라미터 (betting_models 테이블 초기값과 동일)
+BETTING_MODELS: Dict[str, dict] = {
+    "하이리턴": {"min_confidence": 0.55, "min_ev": 1000, "max_kelly": 0.25, "risk_multiplier": 1.2},
+    "스탠다드": {"min_confidence": 0.60, "min_ev": 500, "max_kelly": 0.15, "risk_multiplier": 1.0},
+    "로우리스크": {"min_confidence": 0.70, "min_ev": 300, "max_kelly": 0.10, "risk_multiplier": 0.8},
+}
+
+DEFAULT_BETTING_MODEL = "스탠다드"
+
+PARAM_KEYS = ("min_confidence", "min_ev", "max_kelly", "risk_multiplier")
+
+
+def expected_value(win_probability, odds, bet_amount=UNIT_AMOUNT):
+    """
+    기대값 (스칼라/배열 모두 가능)
+
+    승리 시 (odds - 1) * 금액, 패배 시 -금액
+    """
+    return (np.asarray(win_probability) * np.asarray(odds) - 1.0) * bet_amount
+
+
+def kelly_fraction(win_probability, odds):
+    """
+    켈리 포뮬러 베팅 비율 (스칼라/배열 모두 가능, 음수는 0)
+    """
+    win_probability = np.asarray(win_probability, dtype=np.float64)
+    odds = np.asarray(odds, dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kelly = (win_probability * odds - 1.0) / (odds - 1.0)
+    return np.clip(np.nan_to_num(kelly, nan=0.0), 0.0, None)
+
+
+def model_params(betting_models: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    베팅 모델 파라미터를 (모델 수,) 배열로 변환
+
+    Raises:
+        KeyError: 등록되지 않은 베팅 모델
+    """
+    names = list(betting_models) if betting_models else list(BETTING_MODELS)
+    for name in names:
+        if name not in BETTING_MODELS:
+            raise KeyError(f"등록되지 않은 베팅 모델입니다: {name}")
+
+    params = params_array([BETTING_MODELS[name] for name in names])
+    params["names"] = np.array(names, dtype=object)
+    return params
+
+
+def params_array(configs: Sequence[dict]) -> Dict[str, np.ndarray]:
+    """파라미터 dict 목록 -> 키별 (설정 수,) 배열"""
+    return {
+        key: np.array([config[key] for config in configs], dtype=np.float64)
+        for key in PARAM_KEYS
+    }
+
+
+def score_sides(
+    home_win_probability,
+    home_odds,
+    away_odds=None,
+    unit_amount: float = UNIT_AMOUNT,
+) -> Dict[str, np.ndarray]:
+    """
+    경기별 베팅 방향과 기대값/켈리 비율 (베팅 모델과 무관한 부분)
+
+    원정 배당률이 있으면 기대값이 큰 쪽을 고르고, 없으면 홈팀만 평가한다.
+
+    Returns:
+        dict: on_away, win_probability, odds, expected_value, kelly_fraction (모두 (N,))
+    """
+    p_home = np.asarray(home_win_probability, dtype=np.float64)
+    home_odds = np.asarray(home_odds, dtype=np.float64)
+
+    ev_home = expected_value(p_home, home_odds, unit_amount)
+    if away_odds is None:
+        on_away = np.zeros(len(p_home), dtype=bool)
+        away_odds = home_odds
+        ev_away = ev_home
+    else:
+        away_odds = np.asarray(away_odds, dtype=np.float64)
+        ev_away = expected_value(1.0 - p_home, away_odds, unit_amount)
+        on_away = np.nan_to_num(ev_away, nan=-np.inf) > ev_home
+
+    p_side = np.where(on_away, 1.0 - p_home, p_home)
+    odds = np.where(on_away, away_odds, home_odds)
+    return {
+        "on_away": on_away,
+        "win_probability": p_side,
+        "odds": odds,
+        "expected_value": np.where(on_away, ev_away, ev_home),
+        "kelly_fraction": kelly_fraction(p_side, odds),
+    }
+
+
+def decide(confidence, sides: Dict[str, np.ndarray], params: Dict[str, np.ndarray]):
+    """
+    설정 M개 x 경기 N개 베팅 여부와 베팅 비율
+
+    켈리 비율에 리스크 배수를 곱한 뒤 최대 켈리 비율로 제한한다.
+
+    Returns:
+        (stake_fraction (M, N), should_bet (M, N))
+    """
+    confidence = np.asarray(confidence, dtype=np.float64)
+    kelly = sides["kelly_fraction"]
+    should_bet = (
+        (confidence >= params["min_confidence"][:, None])
+        & (sides["expected_value"] >= params["min_ev"][:, None])
+        & (kelly > 0)
+    )
+    stake = np.minimum(kelly * params["risk_multiplier"][:, None], params["max_kelly"][:, None])
+    return np.where(should_bet, stake, 0.0), should_bet
+
+
+def evaluate_slate(
+    home_win_probability,
+    confidence,
+    home_odds,
+    away_odds=None,
+    betting_models: Optional[Sequence[str]] = None,
+    unit_amount: float = UNIT_AMOUNT,
+    bankroll: Optional[float] = None,
+) -> Dict[str, np.ndarray]:
+    """
+    경기 N개 x 베팅 모델 M개 베팅 결정
+
+    Args:
+        home_win_probability: (N,) 홈팀 승리 확률
+        confidence: (N,) 예측 신뢰도
+        home_odds: (N,) 홈팀 배당률
+        away_odds: (N,) 원정팀 배당률 (없는 경기는 NaN)
+        betting_models: 평가할 베팅 모델 (기본: 전체)
+        unit_amount: 기대값 계산 기준 금액
+        bankroll: 자금 (주어지면 추천 금액 = 자금 x 베팅 비율)
+
+    Returns:
+        dict: betting_model (M,), bet_on (N,), win_probability (N,), odds (N,),
+        expected_value (N,), kelly_fraction (N,), stake_fraction (M, N),
+        recommended_amount (M, N), should_bet (M, N)
+    """
+    sides = score_sides(home_win_probability, home_odds, away_odds, unit_amount)
+    params = model_params(betting_models)
+    stake, should_bet = decide(confidence, sides, params)
+
+    if bankroll is None:
+        amount = np.where(should_bet, float(unit_amount), 0.0)
+    else:
+        amount = np.floor(stake * bankroll)
+
+    return {
+        "betting_model": params["names"],
+        "bet_on": np.where(sides["on_away"], "away", "home"),
+        "win_probability": sides["win_probability"],
+        "odds": sides["odds"],
+        "expected_value": sides["expected_value"],
+        "kelly_fraction": sides["kelly_fraction"],
+        "stake_fraction": stake,
+        "recommended_amount": amount,
+        "should_bet": should_bet,
+    }
+
+
+def to_columns(result: Dict[str, np.ndarray], match_ids: Sequence[int]) -> Dict[str, List]:
+    """
+    evaluate_slate 결과를 (베팅 모델, 경기) 행 순서의 컬럼 목록으로 변환 (JSON 응답용)
+    """
+    n_models, n_matches = result["should_bet"].shape
+
+    def per_match(values: np.ndarray) -> np.ndarray:
+        return np.tile(values, n_models)
+
+    return {
+        "match_id": per_match(np.asarray(match_ids)).tolist(),
+        "betting_model": np.repeat(result["betting_model"], n_matches).tolist(),
+        "bet_on": per_match(result["bet_on"]).tolist(),
+        "win_probability": np.round(per_match(result["win_probability"]), 4).tolist(),
+        "odds": per_match(result["odds"]).tolist(),
+        "expected_value": np.round(per_match(result["expected_value"]), 2).tolist(),
+        "kelly_fraction": np.round(per_match(result["kelly_fraction"]), 4).tolist(),
+        "stake_fraction": np.round(result["stake_fraction"].reshape(-1), 4).tolist(),
+        "recommended_amount": result["recommended_amount"].reshape(-1).tolist(),
+        "should_bet": result["should_bet"].reshape(-1).tolist(),
+    }
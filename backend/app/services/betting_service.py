@@ -1,64 +1,139 @@
 """
 베팅 관련 비즈니스 로직
 """
-from datetime import date, timedelta
-from typing import List, Optional
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, List, Optional
+
+import numpy as np
+
 from ..data import mock_data
+from ..database import DATA_SOURCE
+from ..repositories.betting_repository import (
+    BettingRepository,
+    after_cursor,
+    decode_cursor,
+    encode_cursor,
+)
+from .betting_engine import BETTING_MODELS, DEFAULT_BETTING_MODEL, evaluate_slate, to_columns
+
+# 기간 -> 일수
+PERIOD_DAYS = {
+    "7일": 7,
+    "30일": 30,
+    "3개월": 90,
+    "6개월": 180,
+    "1년": 365,
+}
+
+# 목 데이터 모드에서 생성하는 베팅 내역 수 (하루 1건, 1년치)
+MOCK_HISTORY_SIZE = 365
+
+
+def _period_start(period: Optional[str]) -> Optional[datetime]:
+    """기간 -> 시작 시각 (전체/미지정이면 None)"""
+    if not period or period == "전체":
+        return None
+    days = PERIOD_DAYS.get(period, 30)
+    return datetime.combine(date.today() - timedelta(days=days), datetime.min.time())
 
 
 class BettingService:
     """베팅 서비스"""
     
-    def get_betting_results(
+    def __init__(self, repository: Optional[BettingRepository] = None):
+        if repository is None and DATA_SOURCE == "db":
+            repository = BettingRepository()
+        self.repository = repository
+    
+    async def get_betting_results(
         self, 
         betting_model: Optional[str] = None,
         period: Optional[str] = None,
-        limit: int = 50
-    ) -> List[dict]:
+        limit: int = 50,
+        cursor: Optional[str] = None
+    ) -> dict:
         """
-        베팅 결과 조회
+        베팅 결과 조회 (커서 기반 페이지)
         
         Args:
             betting_model: 베팅 모델명 (하이리턴, 스탠다드, 로우리스크)
             period: 기간 (7일, 30일, 전체 등)
-            limit: 최대 결과 수
+            limit: 페이지 크기
+            cursor: 이전 응답의 next_cursor
+        
+        Returns:
+            dict: results, next_cursor
+        
+        Raises:
+            ValueError: 잘못된 커서
+        """
+        since = _period_start(period)
+        
+        if self.repository is not None:
+            return await self.repository.list_page(betting_model, since, limit, cursor)
+        
+        position = decode_cursor(cursor) if cursor else None
+        results = self._mock_results(betting_model, since)
+        if position is not None:
+            results = [r for r in results if after_cursor(r, position)]
+        
+        page = results[:limit]
+        next_cursor = None
+        if len(results) > limit:
+            next_cursor = encode_cursor(page[-1]["bet_placed_at"], page[-1]["id"])
+        for i, result in enumerate(page):
+            result["is_recent"] = i == 0 and position is None
+        return {"results": page, "next_cursor": next_cursor}
+    
+    async def stream_betting_results(
+        self,
+        betting_model: Optional[str] = None,
+        period: Optional[str] = None
+    ) -> AsyncIterator[dict]:
         """
-        results = mock_data.generate_betting_results(num_results=limit)
+        조건에 맞는 전체 베팅 결과를 한 건씩 반환 (내보내기용)
+        """
+        since = _period_start(period)
+        
+        if self.repository is not None:
+            async for result in self.repository.stream_results(betting_model, since):
+                yield result
+            return
+        
+        for result in self._mock_results(betting_model, since):
+            yield result
+    
+    def _mock_results(self, betting_model: Optional[str], since: Optional[datetime]) -> List[dict]:
+        """목 베팅 내역 (최근 순, 필터 적용)"""
+        results = mock_data.generate_betting_results(num_results=MOCK_HISTORY_SIZE)
         
         # 베팅 모델 필터링
         if betting_model:
             results = [r for r in results if r["betting_model"] == betting_model]
         
         # 기간 필터링
-        if period and period != "전체":
-            days_map = {
-                "7일": 7,
-                "30일": 30,
-                "3개월": 90,
-                "6개월": 180,
-                "1년": 365,
-            }
-            days = days_map.get(period, 30)
-            cutoff_date = date.today() - timedelta(days=days)
-            results = [r for r in results if r["match_date"] >= cutoff_date]
+        if since is not None:
+            results = [r for r in results if r["bet_placed_at"] >= since]
         
+        results.sort(key=lambda r: (r["bet_placed_at"], r["id"]), reverse=True)
         return results
     
-    def get_betting_model_stats(self, model_name: str) -> dict:
+    async def get_betting_model_stats(self, model_name: str) -> dict:
         """
         베팅 모델 통계 조회
         """
+        if self.repository is not None:
+            return await self.repository.model_stats(model_name)
         return mock_data.generate_betting_model_stats(model_name)
     
-    def get_all_betting_models_stats(self) -> List[dict]:
+    async def get_all_betting_models_stats(self) -> List[dict]:
         """
         모든 베팅 모델 통계 조회
         """
-        models = ["하이리턴", "스탠다드", "로우리스크"]
         stats = []
         
-        for model in models:
-            stat = self.get_betting_model_stats(model)
+        for model in BETTING_MODELS:
+            stat = await self.get_betting_model_stats(model)
             stats.append(stat)
         
         return stats
@@ -80,30 +155,53 @@ class BettingService:
         Returns:
             베팅 추천 정보
         """
-        # 베팅 모델별 임계값
-        thresholds = {
-            "하이리턴": {"min_confidence": 0.55, "min_ev": 1000},
-            "스탠다드": {"min_confidence": 0.60, "min_ev": 500},
-            "로우리스크": {"min_confidence": 0.70, "min_ev": 300},
-        }
-        
-        threshold = thresholds.get(betting_model, thresholds["스탠다드"])
-        
-        # 기대값 계산
-        home_win_prob = prediction["home_win_probability"]
-        expected_value = (home_win_prob * odds * 10000) - 10000
-        
-        # 베팅 추천 결정
-        should_bet = (
-            prediction["confidence_score"] >= threshold["min_confidence"] and
-            expected_value >= threshold["min_ev"]
+        result = evaluate_slate(
+            home_win_probability=[prediction["home_win_probability"]],
+            confidence=[prediction["confidence_score"]],
+            home_odds=[odds],
+            betting_models=[betting_model if betting_model in BETTING_MODELS else DEFAULT_BETTING_MODEL],
         )
+        should_bet = bool(result["should_bet"][0, 0])
         
         return {
             "should_bet": should_bet,
-            "expected_value": expected_value,
-            "recommended_amount": 10000 if should_bet else 0,
+            "expected_value": float(result["expected_value"][0]),
+            "recommended_amount": float(result["recommended_amount"][0, 0]),
+            "kelly_fraction": float(result["kelly_fraction"][0]),
+            "stake_fraction": float(result["stake_fraction"][0, 0]),
             "confidence": prediction["confidence_score"],
         }
+    
+    def recommend_slate(
+        self,
+        predictions: List[dict],
+        slate: List[dict],
+        betting_models: Optional[List[str]] = None,
+        bankroll: Optional[float] = None
+    ) -> dict:
+        """
+        하루 경기 전체 x 베팅 모델 일괄 추천
+        
+        Args:
+            predictions: 경기별 예측 (slate와 같은 순서)
+            slate: 경기별 배당률 (match_id, home_odds, away_odds)
+            betting_models: 평가할 베팅 모델 (기본: 전체)
+            bankroll: 자금 (주어지면 켈리 비율로 추천 금액 계산)
+        
+        Returns:
+            (베팅 모델, 경기) 행 순서의 컬럼별 결과
+        """
+        away_odds = [item.get("away_odds") for item in slate]
+        result = evaluate_slate(
+            home_win_probability=[p["home_win_probability"] for p in predictions],
+            confidence=[p["confidence_score"] for p in predictions],
+            home_odds=[item["home_odds"] for item in slate],
+            away_odds=[np.nan if o is None else o for o in away_odds],
+            betting_models=betting_models,
+            bankroll=bankroll,
+        )
+        columns = to_columns(result, [item["match_id"] for item in slate])
+        columns["total"] = len(columns["match_id"])
+        return columns
 
 
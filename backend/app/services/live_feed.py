@@ -0,0 +1,176 @@
+"""
+실시간 피드 허브
+
+경기 종료, 배당률 수집, 베팅 추천 재계산 이벤트를 구독 중인 클라이언트(SSE/WebSocket)에
+push한다. 변경 1건당 직렬화는 한 번만 하고, 같은 바이트열을 클라이언트별 큐에 넣는다.
+
+- 클라이언트별 큐 크기는 LIVE_QUEUE_SIZE로 제한
+- 느린 클라이언트의 큐가 가득 차면 쌓인 메시지를 버리고 resync 메시지 1건만 남김
+  (클라이언트는 REST API로 다시 조회). 다른 클라이언트와 발행 쪽은 기다리지 않음
+"""
+import asyncio
+import itertools
+import json
+import os
+from typing import FrozenSet, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from ..events import MATCH_COMPLETED, ODDS_UPDATED, RECOMMENDATIONS_UPDATED, EventBus
+
+# 클라이언트별 대기 메시지 수 상한
+LIVE_QUEUE_SIZE = int(os.getenv("LIVE_QUEUE_SIZE", "256"))
+
+# 메시지가 없을 때 연결 유지용 heartbeat 간격 (초)
+LIVE_HEARTBEAT_SECONDS = float(os.getenv("LIVE_HEARTBEAT_SECONDS", "15"))
+
+# 클라이언트에 보내는 토픽
+LIVE_TOPICS = (MATCH_COMPLETED, ODDS_UPDATED, RECOMMENDATIONS_UPDATED)
+
+# 큐가 넘쳐 메시지를 버렸을 때 보내는 토픽
+RESYNC = "resync"
+
+
+class LiveMessage:
+    """직렬화된 메시지 (모든 클라이언트가 공유)"""
+
+    __slots__ = ("id", "topic", "match_ids", "data")
+
+    def __init__(self, id: int, topic: str, match_ids: FrozenSet[int], data: str):
+        self.id = id
+        self.topic = topic
+        self.match_ids = match_ids
+        self.data = data
+
+    def sse(self) -> bytes:
+        """text/event-stream 형식"""
+        return f"id: {self.id}\nevent: {self.topic}\ndata: {self.data}\n\n".encode()
+
+
+class LiveClient:
+    """구독 중인 클라이언트 1개"""
+
+    __slots__ = ("queue", "topics", "match_ids", "delivered", "dropped", "resyncs")
+
+    def __init__(self, queue: asyncio.Queue, topics: FrozenSet[str], match_ids: Optional[FrozenSet[int]] = None):
+        self.queue = queue
+        self.topics = topics
+        self.match_ids = match_ids
+        self.delivered = 0
+        self.dropped = 0
+        self.resyncs = 0
+
+    def wants(self, message: LiveMessage) -> bool:
+        if message.topic not in self.topics:
+            return False
+        return self.match_ids is None or not message.match_ids or bool(self.match_ids & message.match_ids)
+
+
+def _match_ids(topic: str, payload: dict) -> FrozenSet[int]:
+    if topic == MATCH_COMPLETED:
+        return frozenset([payload["id"]])
+    return frozenset(payload.get("match_ids", ()))
+
+
+class LiveFeedHub:
+    """이벤트 -> 구독 클라이언트 fan-out"""
+
+    def __init__(self, queue_size: int = LIVE_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self._clients: Set[LiveClient] = set()
+        self._ids = itertools.count(1)
+        self._totals = {"published": 0, "delivered": 0, "dropped": 0, "resyncs": 0}
+        self._by_topic = {topic: 0 for topic in LIVE_TOPICS}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def attach(self, events: EventBus) -> None:
+        """이벤트 버스의 피드 토픽 구독"""
+        for topic in LIVE_TOPICS:
+            events.subscribe(topic, lambda payload, topic=topic: self.publish(topic, payload))
+
+    def connect(self, topics=None, match_ids=None) -> LiveClient:
+        """
+        클라이언트 등록
+
+        Args:
+            topics: 받을 토픽 (기본: 전체)
+            match_ids: 받을 경기 (기본: 전체)
+
+        Raises:
+            ValueError: 알 수 없는 토픽
+        """
+        topics = frozenset(topics or LIVE_TOPICS)
+        unknown = topics - set(LIVE_TOPICS)
+        if unknown:
+            raise ValueError(f"알 수 없는 토픽입니다: {', '.join(sorted(unknown))}")
+        client = LiveClient(
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            topics=topics | {RESYNC},
+            match_ids=frozenset(match_ids) if match_ids else None,
+        )
+        self._clients.add(client)
+        return client
+
+    def disconnect(self, client: LiveClient) -> None:
+        self._clients.discard(client)
+
+    def publish(self, topic: str, payload: dict) -> LiveMessage:
+        """
+        변경 1건을 직렬화해 구독 클라이언트 큐에 넣음 (기다리지 않음)
+        """
+        message = LiveMessage(
+            id=next(self._ids),
+            topic=topic,
+            match_ids=_match_ids(topic, payload),
+            data=json.dumps(jsonable_encoder(payload), ensure_ascii=False, separators=(",", ":")),
+        )
+        self._totals["published"] += 1
+        self._by_topic[topic] = self._by_topic.get(topic, 0) + 1
+
+        for client in self._clients:
+            if client.wants(message):
+                self._offer(client, message)
+        return message
+
+    def _offer(self, client: LiveClient, message: LiveMessage) -> None:
+        try:
+            client.queue.put_nowait(message)
+            client.delivered += 1
+            self._totals["delivered"] += 1
+            return
+        except asyncio.QueueFull:
+            pass
+
+        # 느린 클라이언트: 밀린 메시지를 버리고 다시 조회하라고 알림
+        dropped = client.queue.qsize() + 1
+        while not client.queue.empty():
+            client.queue.get_nowait()
+        client.queue.put_nowait(LiveMessage(
+            id=message.id,
+            topic=RESYNC,
+            match_ids=frozenset(),
+            data=json.dumps({"dropped": dropped, "last_id": message.id}),
+        ))
+        client.dropped += dropped
+        client.resyncs += 1
+        self._totals["dropped"] += dropped
+        self._totals["resyncs"] += 1
+
+    async def next_message(self, client: LiveClient, timeout: float = LIVE_HEARTBEAT_SECONDS) -> Optional[LiveMessage]:
+        """다음 메시지 (timeout 동안 없으면 None -> heartbeat)"""
+        try:
+            return await asyncio.wait_for(client.queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def metrics(self) -> dict:
+        """연결 수, 발행/전달/버린 메시지 수, 클라이언트 큐 최대 길이"""
+        return {
+            "clients": len(self._clients),
+            "queue_size": self.queue_size,
+            **self._totals,
+            "published_by_topic": dict(self._by_topic),
+            "max_backlog": max((client.queue.qsize() for client in self._clients), default=0),
+        }
@@ -0,0 +1,128 @@
+"""
+메모리 경기 인덱스
+
+- id -> 경기: O(1) 조회
+- 날짜 -> 정렬된 경기 ID: 이진 탐색으로 범위 조회
+- 팀 -> 경기 ID
+경기가 저장/갱신될 때마다 증분으로 반영한다.
+"""
+from bisect import bisect_left, bisect_right, insort
+from datetime import date
+from typing import Dict, Iterator, List, Optional, Set
+
+
+class MatchIndex:
+    """경기 인덱스"""
+
+    def __init__(self):
+        self._by_id: Dict[int, dict] = {}
+        self._dates: List[date] = []
+        self._ids_by_date: Dict[date, List[int]] = {}
+        self._ids_by_team: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __contains__(self, match_id: int) -> bool:
+        return match_id in self._by_id
+
+    # ========================================
+    # 쓰기
+    # ========================================
+
+    def upsert(self, match: dict) -> None:
+        """경기 추가 또는 갱신"""
+        match_id = match["id"]
+        previous = self._by_id.get(match_id)
+        if previous is not None:
+            self._unlink(previous)
+
+        self._by_id[match_id] = match
+
+        match_date = match["match_date"]
+        ids = self._ids_by_date.get(match_date)
+        if ids is None:
+            ids = self._ids_by_date[match_date] = []
+            insort(self._dates, match_date)
+        insort(ids, match_id)
+
+        for team_id in (match["home_team_id"], match["away_team_id"]):
+            self._ids_by_team.setdefault(team_id, set()).add(match_id)
+
+    def upsert_many(self, matches: List[dict]) -> None:
+        for match in matches:
+            self.upsert(match)
+
+    def remove(self, match_id: int) -> Optional[dict]:
+        match = self._by_id.pop(match_id, None)
+        if match is not None:
+            self._unlink(match)
+        return match
+
+    def _unlink(self, match: dict) -> None:
+        match_date = match["match_date"]
+        ids = self._ids_by_date[match_date]
+        ids.pop(bisect_left(ids, match["id"]))
+        if not ids:
+            del self._ids_by_date[match_date]
+            self._dates.pop(bisect_left(self._dates, match_date))
+
+        for team_id in (match["home_team_id"], match["away_team_id"]):
+            self._ids_by_team[team_id].discard(match["id"])
+
+    # ========================================
+    # 조회
+    # ========================================
+
+    def get(self, match_id: int) -> Optional[dict]:
+        return self._by_id.get(match_id)
+
+    def max_id(self) -> int:
+        """가장 큰 경기 ID (비어 있으면 0)"""
+        return max(self._by_id, default=0)
+
+    def date_range(self, start_date: date, end_date: date) -> List[dict]:
+        """날짜 범위 경기 (날짜, ID 순)"""
+        lo = bisect_left(self._dates, start_date)
+        hi = bisect_right(self._dates, end_date)
+        return [
+            self._by_id[match_id]
+            for match_date in self._dates[lo:hi]
+            for match_id in self._ids_by_date[match_date]
+        ]
+
+    def _forward(self, from_date: date) -> Iterator[dict]:
+        for i in range(bisect_left(self._dates, from_date), len(self._dates)):
+            for match_id in self._ids_by_date[self._dates[i]]:
+                yield self._by_id[match_id]
+
+    def _backward(self, until_date: date) -> Iterator[dict]:
+        for i in range(bisect_right(self._dates, until_date) - 1, -1, -1):
+            for match_id in reversed(self._ids_by_date[self._dates[i]]):
+                yield self._by_id[match_id]
+
+    def upcoming(self, from_date: date, limit: int) -> List[dict]:
+        """from_date 이후 미완료 경기 limit개 (가까운 순, 필요한 만큼만 탐색)"""
+        result = []
+        for match in self._forward(from_date):
+            if not match["is_completed"]:
+                result.append(match)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def recent(self, until_date: date, limit: int) -> List[dict]:
+        """until_date까지 완료된 경기 limit개 (최근 순, 필요한 만큼만 탐색)"""
+        result = []
+        for match in self._backward(until_date):
+            if match["is_completed"]:
+                result.append(match)
+                if len(result) >= limit:
+                    break
+        return result
+
+    def by_team(self, team_id: int) -> List[dict]:
+        """팀의 경기 (날짜 순)"""
+        matches = [self._by_id[i] for i in self._ids_by_team.get(team_id, ())]
+        matches.sort(key=lambda m: (m["match_date"], m["id"]))
+        return matches
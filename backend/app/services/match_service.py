@@ -1,71 +1,234 @@
 """
 경기 관련 비즈니스 로직
 """
+import asyncio
+import os
 from datetime import date, timedelta
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 from ..data import mock_data
+from ..database import DATA_SOURCE
+from ..events import MATCH_COMPLETED, EventBus
+from ..ml.match_history import MATCH_HISTORY_DIR, MatchHistoryStore
+from ..repositories.betting_repository import BettingRepository
+from ..repositories.match_repository import MatchRepository
+from .match_index import MatchIndex
+
+# 인덱스에 올리는 기간 (오늘 기준 전후 일수, 날짜가 바뀌면 다시 구축)
+MATCH_INDEX_DAYS = int(os.getenv("MATCH_INDEX_DAYS", "30"))
 
 
 class MatchService:
     """경기 서비스"""
     
-    def get_matches_by_date_range(
+    def __init__(
+        self,
+        repository: Optional[MatchRepository] = None,
+        events: Optional[EventBus] = None,
+        history: Optional[MatchHistoryStore] = None,
+        betting_repository: Optional[BettingRepository] = None,
+    ):
+        if repository is None and DATA_SOURCE == "db":
+            repository = MatchRepository()
+        if betting_repository is None and DATA_SOURCE == "db":
+            betting_repository = BettingRepository()
+        if history is None and DATA_SOURCE == "db":
+            history = MatchHistoryStore(MATCH_HISTORY_DIR)
+        self.repository = repository
+        # 경기 종료 시 베팅 결과 확정
+        self.betting_repository = betting_repository
+        self.events = events or EventBus()
+        
+        # 완료 경기 컬럼 저장소 (학습/백테스트/특성 저장소 입력, 경기 종료 시 이어 씀)
+        self.history = history
+        
+        # 메모리 경기 인덱스 (첫 조회 시 구축, 이후 증분 갱신)
+        # 날짜가 바뀌거나 다른 프로세스가 경기 이력을 쓰면 (포인터 변경) 다시 구축
+        self.index = MatchIndex()
+        self._coverage: Optional[Tuple[date, date]] = None
+        self._coverage_day: Optional[date] = None
+        self._history_stamp = None
+        self._index_lock = asyncio.Lock()
+    
+    def add_result_listener(self, listener: Callable) -> None:
+        """경기 결과 기록 시 호출할 콜백 등록 (match dict를 받음, 동기/비동기 모두 가능)"""
+        self.events.subscribe(MATCH_COMPLETED, listener)
+    
+    def _index_stale(self) -> bool:
+        """인덱스를 (다시) 구축해야 하는지 여부"""
+        if self._coverage is None or self._coverage_day != date.today():
+            return True
+        if self.repository is None:
+            # 모의 데이터는 바깥에서 바뀌지 않음 (날짜가 바뀔 때만 범위 이동)
+            return False
+        return self.history is not None and self.history.stamp != self._history_stamp
+    
+    async def _ensure_index(self) -> Tuple[date, date]:
+        """
+        인덱스 구축 (최초 1회, 날짜가 바뀌거나 다른 프로세스가 경기 이력을 쓰면 다시 구축)
+        
+        모의 데이터는 날짜가 바뀔 때 범위만 이동한다 (_rolled_mock_matches).
+        
+        Returns:
+            인덱스가 보장하는 날짜 범위
+        """
+        if not self._index_stale():
+            return self._coverage
+        
+        async with self._index_lock:
+            if self._index_stale():
+                today = date.today()
+                # 로드 중에 바뀐 포인터는 다음 조회에서 다시 반영되도록 로드 전에 기록
+                stamp = self.history.stamp if self.history is not None else None
+                start_date = today - timedelta(days=MATCH_INDEX_DAYS)
+                end_date = today + timedelta(days=MATCH_INDEX_DAYS)
+                
+                if self.repository is not None:
+                    result = await self.repository.list_by_date_range(start_date, end_date)
+                    matches = result["matches"]
+                elif self._coverage is None:
+                    matches = mock_data.generate_matches(start_date, end_date)
+                else:
+                    matches = self._rolled_mock_matches(start_date, end_date)
+                
+                # 최초 구축은 기존 인덱스에 채우고, 이후에는 새 인덱스로 교체 (범위 밖 경기 정리)
+                index = self.index if self._coverage is None else MatchIndex()
+                index.upsert_many(matches)
+                self.index = index
+                self._coverage = (start_date, end_date)
+                self._coverage_day = today
+                self._history_stamp = stamp
+        
+        return self._coverage
+    
+    def _rolled_mock_matches(self, start_date: date, end_date: date) -> List[dict]:
+        """
+        모의 데이터 범위 이동
+
+        범위에 남는 경기는 기존 인덱스 그대로 (기록된 결과 유지), 새로 들어오는 날짜만 생성하고
+        ID는 기존 경기 다음부터 매긴다.
+        """
+        covered_end = self._coverage[1]
+        matches = self.index.date_range(start_date, end_date)
+        next_id = self.index.max_id() + 1
+        added = mock_data.generate_matches(max(start_date, covered_end + timedelta(days=1)), end_date)
+        for offset, match in enumerate(added):
+            match["id"] = next_id + offset
+        return matches + added
+    
+    async def get_matches_by_date_range(
         self, 
         start_date: Optional[date] = None, 
-        end_date: Optional[date] = None
-    ) -> List[dict]:
+        end_date: Optional[date] = None,
+        page: int = 1,
+        size: Optional[int] = None
+    ) -> dict:
         """
         날짜 범위로 경기 조회
+        
+        인덱스 범위 안이면 이진 탐색으로 잘라내고, 벗어나면 원본에서 조회
+        
+        Returns:
+            dict: matches, total (size를 지정하면 해당 페이지만, total은 전체 수)
         """
         if start_date is None:
             start_date = date.today() - timedelta(days=7)
         if end_date is None:
             end_date = date.today() + timedelta(days=7)
         
-        matches = mock_data.generate_matches(start_date, end_date)
-        return matches
+        covered_start, covered_end = await self._ensure_index()
+        if covered_start <= start_date and end_date <= covered_end:
+            matches = self.index.date_range(start_date, end_date)
+        elif self.repository is not None:
+            return await self.repository.list_by_date_range(start_date, end_date, page, size)
+        else:
+            matches = mock_data.generate_matches(start_date, end_date)
+        
+        total = len(matches)
+        if size is not None:
+            matches = matches[(page - 1) * size:page * size]
+        return {"matches": matches, "total": total}
     
-    def get_match_by_id(self, match_id: int) -> Optional[dict]:
+    async def get_match_by_id(self, match_id: int) -> Optional[dict]:
         """
-        경기 ID로 조회
+        경기 ID로 조회 (O(1))
         """
-        # 간단한 구현 - 실제로는 DB에서 조회
-        matches = self.get_matches_by_date_range(
-            date.today() - timedelta(days=30),
-            date.today() + timedelta(days=30)
-        )
-        
-        for match in matches:
-            if match["id"] == match_id:
-                return match
-        
-        return None
+        await self._ensure_index()
+        match = self.index.get(match_id)
+        if match is None and self.repository is not None:
+            # 인덱스 범위 밖의 경기
+            match = await self.repository.get_by_id(match_id)
+            if match is not None:
+                self.index.upsert(match)
+        return match
     
-    def get_upcoming_matches(self, limit: int = 10) -> List[dict]:
+    async def get_upcoming_matches(self, limit: int = 10) -> List[dict]:
         """
         예정된 경기 조회
         """
-        matches = self.get_matches_by_date_range(
-            date.today(),
-            date.today() + timedelta(days=14)
-        )
+        await self._ensure_index()
+        upcoming = self.index.upcoming(date.today(), limit)
         
-        # 완료되지 않은 경기만 필터링
-        upcoming = [m for m in matches if not m["is_completed"]]
-        return upcoming[:limit]
+        if len(upcoming) < limit and self.repository is not None:
+            # 인덱스 범위 이후 경기까지 필요한 경우
+            return await self.repository.list_upcoming(limit)
+        return upcoming
     
-    def get_recent_matches(self, limit: int = 10) -> List[dict]:
+    async def get_recent_matches(self, limit: int = 10) -> List[dict]:
         """
         최근 경기 결과 조회
         """
-        matches = self.get_matches_by_date_range(
-            date.today() - timedelta(days=14),
-            date.today()
+        await self._ensure_index()
+        recent = self.index.recent(date.today(), limit)
+        
+        if len(recent) < limit and self.repository is not None:
+            # 인덱스 범위 이전 경기까지 필요한 경우
+            return await self.repository.list_recent(limit)
+        return recent
+    
+    async def upsert_match(self, match: dict) -> dict:
+        """
+        경기 저장 후 인덱스에 증분 반영
+        """
+        await self._ensure_index()
+        if self.repository is not None:
+            match = await self.repository.upsert(match)
+        # 진행 중인 재구축이 끝난 뒤 새 인덱스에 반영
+        async with self._index_lock:
+            self.index.upsert(match)
+        return match
+    
+    async def record_result(self, match_id: int, home_score: int, away_score: int) -> Optional[dict]:
+        """
+        경기 결과 기록 (경기 종료)
+        
+        같은 결과가 다시 들어오면 아무것도 바꾸지 않는다 (이벤트도 발행하지 않음).
+        베팅 결과를 먼저 확정한 뒤 경기 종료 이벤트를 발행한다 (결과 정정 포함).
+        
+        Returns:
+            갱신된 경기 정보 (경기가 없으면 None)
+        """
+        match = await self.get_match_by_id(match_id)
+        if match is None:
+            return None
+        if match.get("is_completed") and (match.get("home_score"), match.get("away_score")) == (home_score, away_score):
+            return match
+        
+        match = dict(
+            match,
+            home_score=home_score,
+            away_score=away_score,
+            winner="home" if home_score > away_score else "away",
+            is_completed=True,
         )
+        match = await self.upsert_match(match)
+        if self.betting_repository is not None:
+            await self.betting_repository.settle_match(match["id"], match["winner"])
+        if self.history is not None:
+            current = self.history.stamp == self._history_stamp
+            await asyncio.to_thread(self.history.append, [match])
+            if current:
+                # 이 프로세스가 쓴 포인터 변경은 인덱스에 이미 반영됨
+                self._history_stamp = self.history.stamp
         
-        # 완료된 경기만 필터링
-        recent = [m for m in matches if m["is_completed"]]
-        recent.sort(key=lambda x: x["match_date"], reverse=True)
-        return recent[:limit]
-
-
+        await self.events.publish(MATCH_COMPLETED, match)
+        return match
@@ -0,0 +1,216 @@
+"""
+배당률 수집 파이프라인
+
+파일(CSV/NDJSON)이나 피드에서 읽은 배당률 스냅샷을 정규화해 묶음 단위로 저장한다.
+
+- 필드 이름/시각 형식이 제각각인 입력을 match_odds 컬럼 형식으로 정규화 (잘못된 행은 건너뜀)
+- ODDS_BATCH_SIZE 행마다 트랜잭션 1개로 변동 이력 추가 + 최신 배당률 upsert
+- 묶음마다 odds.updated 이벤트 발행 (캐시 삭제, 베팅 추천 재계산)
+"""
+import csv
+import json
+import os
+import time
+from datetime import datetime
+from functools import lru_cache
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Union
+
+from ..database import DATA_SOURCE
+from ..events import ODDS_UPDATED, EventBus
+from ..repositories.odds_repository import OddsRepository, latest_snapshots
+
+# 트랜잭션 1개에 넣는 스냅샷 수
+ODDS_BATCH_SIZE = int(os.getenv("ODDS_BATCH_SIZE", "5000"))
+
+# 제공처가 없는 입력에 쓰는 기본값
+DEFAULT_ODDS_PROVIDER = os.getenv("DEFAULT_ODDS_PROVIDER", "sportstoto")
+
+# 정규화 컬럼 -> 입력에서 허용하는 필드 이름
+_FIELD_ALIASES = {
+    "match_id": ("match_id", "game_id"),
+    "odds_provider": ("odds_provider", "provider", "bookmaker"),
+    "home_team_odds": ("home_team_odds", "home_odds", "home"),
+    "away_team_odds": ("away_team_odds", "away_odds", "away"),
+    "draw_odds": ("draw_odds", "draw"),
+    "captured_at": ("captured_at", "timestamp", "ts"),
+}
+
+# DECIMAL(5, 2) 범위 안의 배당률만 허용
+_MAX_ODDS = 999.99
+
+
+# ========================================
+# 정규화
+# ========================================
+
+def _pick(raw: dict, field: str):
+    for name in _FIELD_ALIASES[field]:
+        value = raw.get(name)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def _parse_odds(value, field: str, required: bool = True) -> Optional[float]:
+    if value is None:
+        if required:
+            raise ValueError(f"{field} 값이 없습니다")
+        return None
+    odds = round(float(str(value).strip().replace(",", ".")), 2)
+    if not 1.0 < odds <= _MAX_ODDS:
+        raise ValueError(f"{field} 범위를 벗어났습니다: {value}")
+    return odds
+
+
+def _parse_time(value) -> datetime:
+    """ISO 문자열, epoch 초/밀리초 -> 로컬 시각 (tz 없음)"""
+    if value is None:
+        raise ValueError("captured_at 값이 없습니다")
+    if isinstance(value, datetime):
+        parsed = value
+    elif isinstance(value, (int, float)):
+        parsed = _from_epoch(float(value))
+    else:
+        return _parse_time_text(str(value))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone().replace(tzinfo=None)
+    return parsed.replace(microsecond=0)
+
+
+@lru_cache(maxsize=4096)
+def _parse_time_text(text: str) -> datetime:
+    # 피드는 같은 시각 문자열이 경기 수만큼 반복되므로 캐시
+    text = text.strip()
+    if text.replace(".", "", 1).isdigit():
+        return _parse_time(_from_epoch(float(text)))
+    return _parse_time(datetime.fromisoformat(text.replace("Z", "+00:00")))
+
+
+def _from_epoch(seconds: float) -> datetime:
+    return datetime.fromtimestamp(seconds / 1000 if seconds > 1e11 else seconds)
+
+
+def normalize_odds(raw: dict) -> dict:
+    """
+    입력 1건 -> match_odds 컬럼 형식
+
+    Raises:
+        ValueError: 필수 값이 없거나 형식이 잘못된 입력
+    """
+    match_id = _pick(raw, "match_id")
+    if match_id is None:
+        raise ValueError("match_id 값이 없습니다")
+    provider = _pick(raw, "odds_provider")
+    return {
+        "match_id": int(match_id),
+        "odds_provider": str(provider).strip().lower() if provider else DEFAULT_ODDS_PROVIDER,
+        "home_team_odds": _parse_odds(_pick(raw, "home_team_odds"), "home_team_odds"),
+        "away_team_odds": _parse_odds(_pick(raw, "away_team_odds"), "away_team_odds"),
+        "draw_odds": _parse_odds(_pick(raw, "draw_odds"), "draw_odds", required=False),
+        "captured_at": _parse_time(_pick(raw, "captured_at")),
+    }
+
+
+def read_odds_file(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    배당률 파일을 한 행씩 읽음 (.csv, .ndjson/.jsonl)
+    """
+    path = Path(path)
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.suffix == ".csv":
+            yield from csv.DictReader(f)
+        elif path.suffix in (".ndjson", ".jsonl"):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            raise ValueError(f"지원하지 않는 파일 형식입니다: {path.suffix}")
+
+
+# ========================================
+# 수집
+# ========================================
+
+class OddsIngestionService:
+    """배당률 수집 서비스"""
+
+    def __init__(
+        self,
+        repository: Optional[OddsRepository] = None,
+        events: Optional[EventBus] = None,
+        batch_size: int = ODDS_BATCH_SIZE,
+    ):
+        if repository is None and DATA_SOURCE == "db":
+            repository = OddsRepository()
+        self.repository = repository
+        self.events = events or EventBus()
+        self.batch_size = batch_size
+
+        # 누적 처리량 (GET /api/odds/ingestion/metrics)
+        self._totals = {"rows_read": 0, "rows_written": 0, "rows_rejected": 0, "batches": 0, "seconds": 0.0}
+        self._last_run: Optional[dict] = None
+
+    async def _flush(self, batch: List[dict], run: dict) -> None:
+        if self.repository is not None:
+            # 없는 경기의 스냅샷은 형식 오류처럼 거절 (외래 키 위반으로 묶음 전체가 실패하지 않게)
+            known = await self.repository.existing_match_ids(snapshot["match_id"] for snapshot in batch)
+            valid = [snapshot for snapshot in batch if snapshot["match_id"] in known]
+            run["rows_rejected"] += len(batch) - len(valid)
+            batch = valid
+            if not batch:
+                return
+            run["rows_written"] += await self.repository.write_batch(batch)
+        run["batches"] += 1
+
+        latest = latest_snapshots(batch)
+        await self.events.publish(ODDS_UPDATED, {
+            "match_ids": sorted({snapshot["match_id"] for snapshot in latest}),
+            "odds": latest,
+        })
+
+    async def ingest(self, snapshots: Iterable[dict]) -> dict:
+        """
+        스냅샷 수집
+
+        Args:
+            snapshots: 원본 입력 (read_odds_file, 피드, API 본문 등)
+
+        Returns:
+            이번 실행 처리량 (rows_read, rows_written, rows_rejected, batches, seconds, rows_per_second)
+        """
+        started = time.perf_counter()
+        run = {"rows_read": 0, "rows_written": 0, "rows_rejected": 0, "batches": 0}
+
+        batch: List[dict] = []
+        for raw in snapshots:
+            run["rows_read"] += 1
+            try:
+                batch.append(normalize_odds(raw))
+            except (ValueError, TypeError):
+                run["rows_rejected"] += 1
+                continue
+            if len(batch) >= self.batch_size:
+                await self._flush(batch, run)
+                batch = []
+        if batch:
+            await self._flush(batch, run)
+
+        elapsed = time.perf_counter() - started
+        run["seconds"] = round(elapsed, 3)
+        run["rows_per_second"] = round(run["rows_read"] / elapsed) if elapsed > 0 else None
+
+        for key in self._totals:
+            self._totals[key] += elapsed if key == "seconds" else run[key]
+        self._last_run = run
+        return run
+
+    def metrics(self) -> dict:
+        """누적/최근 실행 처리량"""
+        seconds = self._totals["seconds"]
+        return {
+            **{key: round(value, 3) if key == "seconds" else value for key, value in self._totals.items()},
+            "rows_per_second": round(self._totals["rows_read"] / seconds) if seconds else None,
+            "batch_size": self.batch_size,
+            "last_run": self._last_run,
+        }
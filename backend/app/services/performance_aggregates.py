@@ -0,0 +1,222 @@
+"""
+모델 성능 일별 집계
+
+모델별로 하루 단위 합계(정답 수, log loss 합, 제곱 오차 합, 베팅 손익 모멘트)를 배열에
+쌓아 두고 누적 합으로 임의 기간 지표를 O(1)에 계산한다.
+경기가 끝날 때마다 그날 칸만 더하고, 누적 합은 바뀐 날부터 다시 계산한다.
+"""
+from datetime import date, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+# 일별 합계 컬럼
+AGGREGATE_FIELDS = (
+    "predictions",        # 예측 수
+    "correct",            # 정답 수
+    "log_loss_sum",       # log loss 항 합
+    "squared_error_sum",  # (p - y)^2 합
+    "bets",               # 베팅 수
+    "bet_wins",           # 적중 수
+    "staked",             # 베팅 금액 합
+    "profit",             # 손익 합
+    "return_sum",         # 베팅별 수익률 합
+    "return_sq_sum",      # 베팅별 수익률 제곱 합
+)
+_FIELD = {name: i for i, name in enumerate(AGGREGATE_FIELDS)}
+
+# log loss 계산 시 확률 하한/상한
+_EPS = 1e-15
+
+
+def prediction_terms(home_win_probability, home_won) -> np.ndarray:
+    """
+    예측 N건 -> (N, 필드 수) 집계 항 (베팅 컬럼은 0)
+    """
+    p = np.clip(np.asarray(home_win_probability, dtype=np.float64), _EPS, 1 - _EPS)
+    y = np.asarray(home_won, dtype=np.float64)
+
+    terms = np.zeros((len(p), len(AGGREGATE_FIELDS)))
+    terms[:, _FIELD["predictions"]] = 1
+    terms[:, _FIELD["correct"]] = (p >= 0.5) == (y == 1)
+    terms[:, _FIELD["log_loss_sum"]] = -(y * np.log(p) + (1 - y) * np.log(1 - p))
+    terms[:, _FIELD["squared_error_sum"]] = (p - y) ** 2
+    return terms
+
+
+def bet_terms(betting_amount, actual_profit) -> np.ndarray:
+    """
+    베팅 N건 -> (N, 필드 수) 집계 항 (예측 컬럼은 0)
+    """
+    amount = np.asarray(betting_amount, dtype=np.float64)
+    profit = np.asarray(actual_profit, dtype=np.float64)
+    returns = np.divide(profit, amount, out=np.zeros_like(profit), where=amount > 0)
+
+    terms = np.zeros((len(amount), len(AGGREGATE_FIELDS)))
+    terms[:, _FIELD["bets"]] = 1
+    terms[:, _FIELD["bet_wins"]] = profit > 0
+    terms[:, _FIELD["staked"]] = amount
+    terms[:, _FIELD["profit"]] = profit
+    terms[:, _FIELD["return_sum"]] = returns
+    terms[:, _FIELD["return_sq_sum"]] = returns ** 2
+    return terms
+
+
+class DailyAggregates:
+    """
+    모델 1개의 일별 합계와 누적 합
+
+    _prefix[i]는 origin부터 i일 전날까지의 합이다.
+    """
+
+    def __init__(self, origin: date, capacity: int = 512):
+        self.origin = origin
+        self._daily = np.zeros((capacity, len(AGGREGATE_FIELDS)))
+        self._prefix = np.zeros((capacity + 1, len(AGGREGATE_FIELDS)))
+        self._days = 0
+        self._dirty_from = 0
+
+    def _index(self, day: date) -> int:
+        index = (day - self.origin).days
+        if index < 0:
+            # origin 이전 날짜: 앞쪽으로 늘림
+            self._daily = np.concatenate([np.zeros((-index, self._daily.shape[1])), self._daily])
+            self._prefix = np.zeros((len(self._daily) + 1, self._daily.shape[1]))
+            self.origin = day
+            self._days -= index
+            self._dirty_from = 0
+            index = 0
+
+        if index >= len(self._daily):
+            capacity = max(index + 1, len(self._daily) * 2)
+            self._daily = np.resize(self._daily, (capacity, self._daily.shape[1]))
+            self._daily[self._days:] = 0
+            prefix = np.zeros((capacity + 1, self._daily.shape[1]))
+            prefix[:self._days + 1] = self._prefix[:self._days + 1]
+            self._prefix = prefix
+        return index
+
+    def add(self, days, terms: np.ndarray) -> None:
+        """
+        날짜별 집계 항 더하기
+
+        Args:
+            days: 날짜 N개 (date 또는 datetime64[D])
+            terms: (N, 필드 수) prediction_terms/bet_terms 결과
+        """
+        days = np.asarray(days, dtype="datetime64[D]")
+        if not len(days):
+            return
+        self._index(days.min().item())
+        last = self._index(days.max().item())
+
+        indexes = (days - np.datetime64(self.origin, "D")).astype(np.int64)
+        np.add.at(self._daily, indexes, terms)
+        self._days = max(self._days, last + 1)
+        self._dirty_from = min(self._dirty_from, int(indexes.min()))
+
+    def _refresh(self) -> None:
+        # 바뀐 날 이후만 누적 합 다시 계산
+        start = self._dirty_from
+        if start < self._days:
+            self._prefix[start + 1:self._days + 1] = (
+                self._prefix[start] + np.cumsum(self._daily[start:self._days], axis=0)
+            )
+        self._dirty_from = self._days
+
+    def window(self, start: Optional[date], end: date) -> np.ndarray:
+        """
+        [start, end] 기간 합계 (start가 None이면 처음부터)
+
+        Returns:
+            (필드 수,) 합계
+        """
+        self._refresh()
+        hi = min(max((end - self.origin).days + 1, 0), self._days)
+        lo = 0 if start is None else min(max((start - self.origin).days, 0), hi)
+        return self._prefix[hi] - self._prefix[lo]
+
+
+class ModelAggregates:
+    """예측 모델별 일별 집계"""
+
+    def __init__(self):
+        self._models: Dict[str, DailyAggregates] = {}
+
+    def __contains__(self, model_name: str) -> bool:
+        return model_name in self._models
+
+    def _get(self, model_name: str, day) -> DailyAggregates:
+        aggregates = self._models.get(model_name)
+        if aggregates is None:
+            origin = np.datetime64(day, "D").item()
+            aggregates = self._models[model_name] = DailyAggregates(origin)
+        return aggregates
+
+    def add_predictions(self, model_name: str, days, home_win_probability, home_won) -> None:
+        """완료 경기 예측 N건 반영"""
+        days = np.asarray(days, dtype="datetime64[D]")
+        if len(days):
+            self._get(model_name, days.min()).add(days, prediction_terms(home_win_probability, home_won))
+
+    def add_bets(self, model_name: str, days, betting_amount, actual_profit) -> None:
+        """결과가 확정된 베팅 N건 반영"""
+        days = np.asarray(days, dtype="datetime64[D]")
+        if len(days):
+            self._get(model_name, days.min()).add(days, bet_terms(betting_amount, actual_profit))
+
+    def metrics(self, model_name: str, period_days: Optional[int], as_of: Optional[date] = None) -> dict:
+        """
+        기간 지표 (O(1))
+
+        Args:
+            model_name: 예측 모델명
+            period_days: 기간 일수 (None이면 전체)
+            as_of: 기간 마지막 날 (기본: 오늘)
+
+        Returns:
+            accuracy, log_loss, brier_score, previous_accuracy(직전 같은 길이 기간),
+            total_bets, win_count, win_rate, total_profit, roi, sharpe_ratio
+        """
+        as_of = as_of or date.today()
+        aggregates = self._models[model_name]
+
+        start = None if period_days is None else as_of - timedelta(days=period_days - 1)
+        sums = aggregates.window(start, as_of)
+
+        previous_accuracy = None
+        if start is not None:
+            previous = aggregates.window(start - timedelta(days=period_days), start - timedelta(days=1))
+            previous_accuracy = _ratio(previous[_FIELD["correct"]], previous[_FIELD["predictions"]], 3)
+
+        return dict(_summary(sums), previous_accuracy=previous_accuracy)
+
+
+def _ratio(numerator: float, denominator: float, digits: int) -> Optional[float]:
+    return round(float(numerator / denominator), digits) if denominator else None
+
+
+def _summary(sums: np.ndarray) -> dict:
+    """기간 합계 -> 지표"""
+    n = sums[_FIELD["predictions"]]
+    bets = sums[_FIELD["bets"]]
+
+    sharpe = None
+    if bets > 1:
+        mean = sums[_FIELD["return_sum"]] / bets
+        variance = sums[_FIELD["return_sq_sum"]] / bets - mean ** 2
+        if variance > 0:
+            sharpe = round(float(mean / np.sqrt(variance)), 4)
+
+    return {
+        "accuracy": _ratio(sums[_FIELD["correct"]], n, 3),
+        "log_loss": _ratio(sums[_FIELD["log_loss_sum"]], n, 3),
+        "brier_score": _ratio(sums[_FIELD["squared_error_sum"]], n, 3),
+        "total_predictions": int(n),
+        "total_bets": int(bets),
+        "win_count": int(sums[_FIELD["bet_wins"]]),
+        "win_rate": _ratio(sums[_FIELD["bet_wins"]], bets, 4),
+        "total_profit": round(float(sums[_FIELD["profit"]]), 2),
+        "roi": _ratio(sums[_FIELD["profit"]] * 100, sums[_FIELD["staked"]], 2),
+        "sharpe_ratio": sharpe,
+    }
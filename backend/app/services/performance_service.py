@@ -1,15 +1,170 @@
 """
 성능 분석 관련 비즈니스 로직
 """
-from datetime import date, timedelta
-from typing import Optional
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Dict, List, Optional
 from ..data import mock_data
+from ..database import DATA_SOURCE
+from ..repositories.betting_repository import BettingRepository
+from ..repositories.performance_repository import PerformanceRepository
+from ..repositories.prediction_repository import PredictionRepository
+from ..ml.match_history import MATCH_HISTORY_DIR, MatchHistoryStore
+from .backtester import history_from_rows, history_from_store, run_backtest
+from .betting_engine import BETTING_MODELS
+from .betting_service import MOCK_HISTORY_SIZE, PERIOD_DAYS
+from .performance_aggregates import ModelAggregates
+from .profit_analytics import ProfitWindows, analyze_profit_stream
+from .roi_series import DEFAULT_CHART_POINTS, CumulativeSeries, chart_points
+
+# 성능 평가 기간 (전체는 None)
+EVALUATION_PERIODS = {**PERIOD_DAYS, "전체": None}
 
 
 class PerformanceService:
     """성능 분석 서비스"""
     
-    def get_model_performance(
+    def __init__(
+        self,
+        repository: Optional[PerformanceRepository] = None,
+        prediction_repository: Optional[PredictionRepository] = None,
+        betting_repository: Optional[BettingRepository] = None,
+        match_history: Optional[MatchHistoryStore] = None
+    ):
+        if repository is None and DATA_SOURCE == "db":
+            repository = PerformanceRepository()
+        if prediction_repository is None and DATA_SOURCE == "db":
+            prediction_repository = PredictionRepository()
+        if betting_repository is None and DATA_SOURCE == "db":
+            betting_repository = BettingRepository()
+        if match_history is None and DATA_SOURCE == "db":
+            match_history = MatchHistoryStore(MATCH_HISTORY_DIR)
+        self.repository = repository
+        self.prediction_repository = prediction_repository
+        self.betting_repository = betting_repository
+        # 백테스트용 경기 날짜/시즌/결과 (비어 있으면 DB에서 경기까지 조인)
+        self.match_history = match_history
+        
+        # 모델별 일별 집계 (시작 시 한 번 구축, 경기 종료 시 증분 갱신)
+        self.aggregates = ModelAggregates()
+        # 집계에 반영된 경기 -> 홈팀 승리 여부 (중복 이벤트 무시, 승자 정정 시 다시 구축)
+        self._counted: Dict[int, bool] = {}
+        
+        # 누적 손익 시계열 (최초 차트 조회 시 구축, 경기 종료 시 증분 갱신)
+        self.roi_series = CumulativeSeries()
+        self._series_loaded = False
+        self._series_lock = asyncio.Lock()
+    
+    async def warm_up(self) -> List[str]:
+        """
+        저장된 예측/베팅 결과로 일별 집계와 누적 손익 시계열 구축 (시작 시 1회)
+        
+        Returns:
+            집계된 모델명 목록
+        """
+        await self._ensure_series()
+        if self.prediction_repository is None:
+            return []
+        
+        predictions = await self.prediction_repository.evaluation_history()
+        bets = await self.prediction_repository.bet_outcomes()
+        aggregates = ModelAggregates()
+        counted = {}
+        self._add_to_aggregates(aggregates, counted, predictions, bets)
+        self.aggregates, self._counted = aggregates, counted
+        return sorted(predictions)
+    
+    @staticmethod
+    def _add_to_aggregates(aggregates: ModelAggregates, counted: Dict[int, bool], predictions: dict, bets: dict) -> None:
+        for model_name, columns in predictions.items():
+            aggregates.add_predictions(
+                model_name, columns["match_date"], columns["home_win_probability"], columns["home_won"]
+            )
+            counted.update(zip(columns["match_id"], columns["home_won"]))
+        for model_name, columns in bets.items():
+            aggregates.add_bets(
+                model_name, columns["match_date"], columns["betting_amount"], columns["actual_profit"]
+            )
+    
+    async def _ensure_series(self) -> None:
+        """결과 확정 베팅 전체로 누적 손익 시계열 구축 (최초 1회)"""
+        if self._series_loaded:
+            return
+        
+        async with self._series_lock:
+            if self._series_loaded:
+                return
+            if self.betting_repository is not None:
+                rows = self.betting_repository.stream_settled()
+            else:
+                rows = self._mock_settled(datetime.min, datetime.max)
+            
+            placed_at, amount, profit = [], [], []
+            async for row_placed_at, row_amount, row_profit in rows:
+                placed_at.append(row_placed_at)
+                amount.append(row_amount)
+                profit.append(row_profit)
+            self.roi_series.extend(placed_at, amount, profit)
+            self._series_loaded = True
+    
+    async def on_match_completed(self, match: dict) -> None:
+        """
+        경기 종료 시 해당 경기 예측/베팅만 집계와 누적 손익 시계열에 더하고 model_performances 갱신
+        
+        이미 반영한 경기의 같은 결과는 무시하고, 승자가 바뀐 결과 정정은 이전 반영분을 빼기 위해
+        집계와 시계열을 DB에서 다시 구축한다 (드문 경우).
+        """
+        home_won = match.get("winner") == "home"
+        previous = self._counted.get(match["id"])
+        if previous == home_won:
+            return
+        self._counted[match["id"]] = home_won
+        if previous is not None:
+            await self._rebuild()
+            return
+        
+        if self._series_loaded and self.betting_repository is not None:
+            rows = [row async for row in self.betting_repository.stream_settled(match_id=match["id"])]
+            if rows:
+                self.roi_series.extend(*zip(*rows))
+        
+        if self.prediction_repository is None:
+            return
+        
+        predictions = await self.prediction_repository.evaluation_history(match["id"])
+        bets = await self.prediction_repository.bet_outcomes(match["id"])
+        self._add_to_aggregates(self.aggregates, self._counted, predictions, bets)
+        
+        if self.repository is not None and predictions:
+            await self.refresh_snapshots(sorted(set(predictions) | set(bets)))
+    
+    async def _rebuild(self) -> None:
+        """집계와 누적 손익 시계열을 DB에서 다시 구축하고 model_performances 갱신"""
+        async with self._series_lock:
+            self.roi_series = CumulativeSeries()
+            self._series_loaded = False
+        model_names = await self.warm_up()
+        if self.repository is not None and model_names:
+            await self.refresh_snapshots(model_names)
+    
+    async def refresh_snapshots(self, model_names: List[str], as_of: Optional[date] = None) -> None:
+        """
+        모델별 전체 평가 기간 지표를 model_performances에 저장 (집계에서 O(1) 계산)
+        """
+        as_of = as_of or date.today()
+        snapshots = [
+            dict(
+                self.aggregates.metrics(model_name, days, as_of),
+                model_name=model_name,
+                evaluation_period=period,
+            )
+            for model_name in model_names
+            if model_name in self.aggregates
+            for period, days in EVALUATION_PERIODS.items()
+        ]
+        await self.repository.save_snapshots(snapshots, as_of)
+    
+    async def get_model_performance(
         self, 
         model_name: str = "lstm_v1",
         period: str = "30일"
@@ -21,19 +176,32 @@ class PerformanceService:
             model_name: 모델명
             period: 평가 기간 (7일, 30일, 3개월, 6개월, 1년, 전체)
         """
+        if model_name in self.aggregates and period in EVALUATION_PERIODS:
+            metrics = self.aggregates.metrics(model_name, EVALUATION_PERIODS[period])
+            if metrics["accuracy"] is not None:
+                return dict(metrics, model_name=model_name, evaluation_period=period)
+        
+        if self.repository is not None:
+            performance = await self.repository.latest(model_name, period)
+            if performance is not None:
+                return performance
         return mock_data.generate_model_performance(model_name, period)
     
-    def get_profit_analysis(
+    async def get_profit_analysis(
         self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        initial_bankroll: float = 1_000_000
     ) -> dict:
         """
         수익 분석 데이터 조회
         
+        베팅 내역을 시간 순으로 한 번만 읽어 기간 지표와 직전 같은 길이 기간의 ROI를 함께 계산한다.
+        
         Args:
             start_date: 시작 날짜
             end_date: 종료 날짜
+            initial_bankroll: 기간 시작 자금 (최대 낙폭 기준)
         """
         if end_date is None:
             end_date = date.today()
@@ -41,15 +209,38 @@ class PerformanceService:
         if start_date is None:
             start_date = end_date - timedelta(days=30)
         
-        return mock_data.generate_profit_analysis(start_date, end_date)
+        windows = ProfitWindows(start_date, end_date, initial_bankroll)
+        since, until = windows.query_range
+        
+        if self.betting_repository is not None:
+            rows = self.betting_repository.stream_settled(since, until)
+        else:
+            rows = self._mock_settled(since, until)
+        return await analyze_profit_stream(rows, windows)
+    
+    async def _mock_settled(self, since: datetime, until: datetime):
+        """목 베팅 내역을 stream_settled 형식으로 반환"""
+        results = mock_data.generate_betting_results(num_results=MOCK_HISTORY_SIZE)
+        results.sort(key=lambda r: (r["bet_placed_at"], r["id"]))
+        for r in results:
+            if since <= r["bet_placed_at"] < until:
+                yield r["bet_placed_at"], r["betting_amount"], r["actual_profit"]
     
-    def get_chart_data(
+    async def get_chart_data(
         self,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        points: int = DEFAULT_CHART_POINTS
     ) -> dict:
         """
-        ROI 추이 차트 데이터 조회
+        ROI 추이 차트 데이터 조회 (베팅 수 기준)
+        
+        기간 내 베팅별 누적 ROI를 LTTB로 points개 이하로 줄여 반환한다.
+        
+        Args:
+            start_date: 시작 날짜
+            end_date: 종료 날짜
+            points: 최대 점 수
         """
         if end_date is None:
             end_date = date.today()
@@ -57,9 +248,11 @@ class PerformanceService:
         if start_date is None:
             start_date = end_date - timedelta(days=30)
         
-        return mock_data.generate_chart_data(start_date, end_date)
+        await self._ensure_series()
+        labels, data = chart_points(self.roi_series.window(start_date, end_date), points)
+        return {"labels": labels, "data": data}
     
-    def compare_models(self, period: str = "30일") -> list:
+    async def compare_models(self, period: str = "30일") -> list:
         """
         모델 성능 비교
         """
@@ -67,12 +260,57 @@ class PerformanceService:
         performances = []
         
         for model_name in models:
-            perf = self.get_model_performance(model_name, period)
+            perf = await self.get_model_performance(model_name, period)
             performances.append(perf)
         
         # 정확도 순으로 정렬
         performances.sort(key=lambda x: x["accuracy"], reverse=True)
         
         return performances
+    
+    async def run_backtest(
+        self,
+        model_name: str = "ensemble_v1",
+        betting_models: Optional[List[str]] = None,
+        initial_bankroll: float = 1_000_000
+    ) -> List[dict]:
+        """
+        저장된 예측/배당률로 베팅 모델 백테스트
+        
+        Args:
+            model_name: 예측 모델명
+            betting_models: 베팅 모델 (기본: 전체)
+            initial_bankroll: 시작 자금
+        
+        Returns:
+            베팅 모델별 전체/시즌별 ROI, 샤프 비율, 최대 낙폭, 승률
+        
+        Raises:
+            KeyError: 등록되지 않은 베팅 모델
+        """
+        names = betting_models or list(BETTING_MODELS)
+        configs = {name: BETTING_MODELS[name] for name in names}
+        
+        history = await self.backtest_history(model_name)
+        if not len(history["match_id"]):
+            return []
+        
+        # 시뮬레이션은 CPU 작업이므로 이벤트 루프 밖에서 실행
+        return await asyncio.to_thread(run_backtest, history, configs, initial_bankroll)
+    
+    async def backtest_history(self, model_name: str) -> dict:
+        """
+        백테스트 입력 (history_from_rows 형식의 컬럼 배열)
+        
+        경기 이력 저장소가 있으면 예측/배당률만 DB에서 읽고 경기 날짜/시즌/결과는 저장소에서 붙인다.
+        """
+        if self.prediction_repository is None:
+            return history_from_rows(mock_data.generate_prediction_history())
+        
+        if self.match_history is not None and len(self.match_history):
+            predictions = await self.prediction_repository.predictions_with_odds(model_name)
+            return history_from_store(self.match_history, predictions)
+        
+        return history_from_rows(await self.prediction_repository.history_with_odds(model_name))
 
 
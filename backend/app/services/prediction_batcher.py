@@ -0,0 +1,217 @@
+"""
+예측 요청 마이크로 배칭
+
+동시에 들어온 예측 요청을 최대 max_wait_ms 동안 또는 max_batch_size개까지 모아
+모델별로 한 번의 배치 predict를 실행하고 결과를 각 요청에 나눠준다.
+
+대기열은 max_queue_size로 제한되며, 가득 차면 요청을 바로 거절한다(RuntimeError -> 503).
+워커가 종료(stop)되거나 예기치 않게 죽으면 대기 중인 요청을 모두 실패 처리한다.
+"""
+import asyncio
+import os
+from collections import Counter, deque
+from typing import List, Optional
+
+from .prediction_service import PredictionService
+
+# 배칭 설정
+BATCH_MAX_SIZE = int(os.getenv("PREDICTION_BATCH_MAX_SIZE", "32"))
+BATCH_MAX_WAIT_MS = float(os.getenv("PREDICTION_BATCH_MAX_WAIT_MS", "5"))
+BATCH_MAX_QUEUE = int(os.getenv("PREDICTION_BATCH_MAX_QUEUE", "1024"))
+
+# 대기 시간 분위수 계산에 쓰는 최근 샘플 수
+_WAIT_SAMPLES = 2048
+
+
+class PredictionBatcher:
+    """예측 요청 병합기"""
+
+    def __init__(
+        self,
+        service: PredictionService,
+        max_batch_size: int = BATCH_MAX_SIZE,
+        max_wait_ms: float = BATCH_MAX_WAIT_MS,
+        max_queue_size: int = BATCH_MAX_QUEUE,
+    ):
+        self.service = service
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self.max_queue_size = max_queue_size
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+        # 지표
+        self._batch_sizes = Counter()
+        self._rejected = 0
+        self._total_items = 0
+        self._total_batches = 0
+        self._wait_ms = deque(maxlen=_WAIT_SAMPLES)
+        self._inference_ms = deque(maxlen=_WAIT_SAMPLES)
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        # 이벤트 루프가 뜬 뒤 첫 요청에서 워커 시작
+        # (이전 워커가 남긴 요청은 워커가 종료되면서 이미 실패 처리됨)
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(self.max_queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._run())
+        return self._queue
+
+    async def submit(self, match_id: int, model_name: str = "lstm_v1") -> dict:
+        """
+        예측 요청 1건 제출 후 배치 결과 대기
+        
+        Raises:
+            RuntimeError: 대기열이 가득 참, 또는 배처 종료/워커 오류
+        """
+        queue = self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        try:
+            queue.put_nowait((match_id, model_name, future, loop.time()))
+        except asyncio.QueueFull:
+            self._rejected += 1
+            raise RuntimeError(f"예측 대기열이 가득 찼습니다 ({self.max_queue_size}건)")
+        return await future
+
+    async def stop(self) -> None:
+        """워커 종료 (앱 종료 시). 대기 중인 요청은 RuntimeError로 실패"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    def _fail_pending(self, batch: List[tuple], error: BaseException) -> None:
+        # 처리 중인 배치와 대기열에 남은 요청을 모두 실패 처리
+        pending = list(batch)
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for _, _, future, _ in pending:
+            if not future.done():
+                future.set_exception(error)
+
+    async def _collect(self, batch: List[tuple]) -> List[tuple]:
+        """
+        첫 요청 이후 max_wait_ms 동안 또는 max_batch_size개까지 batch에 수집
+        
+        (대기 중 취소되어도 이미 꺼낸 요청이 batch에 남아 실패 처리될 수 있게 호출자의 목록에 담음)
+        """
+        loop = asyncio.get_running_loop()
+        batch.append(await self._queue.get())
+        deadline = loop.time() + self.max_wait_ms / 1000
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # 이미 대기 중인 요청은 기다리지 않고 함께 처리
+        while len(batch) < self.max_batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _run(self) -> None:
+        batch: List[tuple] = []
+        try:
+            while True:
+                batch = []
+                await self._process(await self._collect(batch))
+        except asyncio.CancelledError:
+            self._fail_pending(batch, RuntimeError("예측 배처가 종료되었습니다"))
+            raise
+        except Exception as e:
+            # 배치 처리 밖의 오류: 요청이 끝없이 기다리지 않도록 실패 처리 (다음 요청에서 워커 재시작)
+            print(f"⚠️  예측 배처 워커 오류: {e}")
+            self._fail_pending(batch, RuntimeError(f"예측 배처 워커 오류: {e}"))
+
+    async def _process(self, batch: List[tuple]) -> None:
+        """배치 1개를 모델별로 나눠 추론하고 결과 분배"""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+
+        by_model = {}
+        for item in batch:
+            by_model.setdefault(item[1], []).append(item)
+
+        for model_name, items in by_model.items():
+            match_ids = [match_id for match_id, _, _, _ in items]
+            try:
+                # 모델 추론은 CPU 작업이므로 이벤트 루프 밖에서 실행
+                results = await asyncio.to_thread(
+                    self.service.generate_predictions, match_ids, model_name
+                )
+            except Exception:
+                # 한 요청의 오류(없는 경기 등)가 같은 배치의 다른 요청을 실패시키지 않도록 1건씩 다시 처리
+                await self._process_each(items, model_name)
+                continue
+
+            for (_, _, future, _), result in zip(items, results):
+                if not future.done():
+                    future.set_result(result)
+
+        finished = loop.time()
+        self._total_batches += 1
+        self._total_items += len(batch)
+        self._batch_sizes[len(batch)] += 1
+        self._inference_ms.append((finished - started) * 1000)
+        self._wait_ms.extend((started - enqueued) * 1000 for _, _, _, enqueued in batch)
+
+    async def _process_each(self, items: List[tuple], model_name: str) -> None:
+        """배치 추론이 실패한 모델 그룹을 요청별로 추론 (실패한 요청만 오류)"""
+        for match_id, _, future, _ in items:
+            if future.done():
+                continue
+            try:
+                results = await asyncio.to_thread(self.service.generate_predictions, [match_id], model_name)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                continue
+            if not future.done():
+                future.set_result(results[0])
+
+    def metrics(self) -> dict:
+        """
+        배칭 지표
+
+        Returns:
+            큐 길이/용량, 거절 수, 배치 크기 분포, 대기/추론 시간 (ms)
+        """
+        waits = sorted(self._wait_ms)
+        inference = sorted(self._inference_ms)
+
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+            "rejected": self._rejected,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "total_batches": self._total_batches,
+            "total_items": self._total_items,
+            "avg_batch_size": round(self._total_items / self._total_batches, 2) if self._total_batches else 0.0,
+            "batch_size_histogram": dict(sorted(self._batch_sizes.items())),
+            "wait_ms": _summary(waits),
+            "inference_ms": _summary(inference),
+        }
+
+
+def _summary(sorted_values: List[float]) -> dict:
+    """정렬된 값의 평균/p50/p99/최대"""
+    if not sorted_values:
+        return {"avg": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+
+    def pct(q: float) -> float:
+        return round(sorted_values[min(len(sorted_values) - 1, int(q * len(sorted_values)))], 3)
+
+    return {
+        "avg": round(sum(sorted_values) / len(sorted_values), 3),
+        "p50": pct(0.50),
+        "p99": pct(0.99),
+        "max": round(sorted_values[-1], 3),
+    }
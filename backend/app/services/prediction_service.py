@@ -1,53 +1,505 @@
 """
 예측 관련 비즈니스 로직
 """
-from typing import Optional
+import asyncio
+import os
+import threading
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+import numpy as np
+
 from ..data import mock_data
+from ..database import DATA_SOURCE
+from ..ml.ensemble import EnsembleModel, MemberOutputCache, cached_member_predict, model_predict
+from ..ml.feature_store import TeamFeatureStore
+from ..ml.match_history import MATCH_HISTORY_DIR, MatchHistoryStore
+from ..ml.registry import LoadedModel, ModelManager, ModelRegistry
+from ..ml.shared_arrays import attach_object, publish_object
+from ..ml.sequence_builder import SEQUENCE_FEATURES
+from ..repositories.prediction_repository import PredictionRepository
+from .rescoring import ProbabilityCache
+
+if TYPE_CHECKING:
+    from .match_service import MatchService
+
+# 팀 특성 저장소 파일 경로
+FEATURE_STORE_PATH = os.getenv("FEATURE_STORE_PATH", "models/feature_store.pkl")
+
+# 모델 레지스트리 설정
+MODEL_REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", "models")
+MODEL_CACHE_SIZE = int(os.getenv("MODEL_CACHE_SIZE", "8"))
+MEMBER_OUTPUT_CACHE_SIZE = int(os.getenv("MEMBER_OUTPUT_CACHE_SIZE", "50000"))
+
+# 멀티 워커 서빙 시 마스터가 내보낸 공유 배열 디렉토리 (run.py --workers가 설정)
+SHARED_ARRAY_DIR = os.getenv("SHARED_ARRAY_DIR", "")
+
+# 공유 배열 묶음 이름
+SHARED_FEATURE_STORE = "feature_store"
+
+# 모델 입력 시퀀스 길이
+SEQUENCE_WINDOW = 10
+
+# 서비스 모델 목록
+MODEL_NAMES = ["lstm_v1", "gru_v1", "ensemble_v1"]
+
+# 앙상블 구성 (멤버 모델 -> 가중치). 멤버 출력을 재사용해 가중 평균
+ENSEMBLE_MEMBERS = {
+    "ensemble_v1": {"lstm_v1": 0.5, "gru_v1": 0.5},
+}
+
+
+class _ServingModel:
+    """스케일러를 먼저 적용하는 모델 래퍼"""
+    
+    def __init__(self, loaded: LoadedModel):
+        self.loaded = loaded
+        self.key = f"{loaded.name}:v{loaded.version}"
+    
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        scaler = self.loaded.scaler
+        if scaler is not None:
+            X = scaler.transform(X.reshape(-1, X.shape[-1])).reshape(X.shape)
+        return model_predict(self.loaded.model, X)
+
+
+def _load_feature_store(shared_dir: str = "") -> TeamFeatureStore:
+    # 공유 배열 -> 경기 이력 저장소(경기 종료마다 갱신) -> 저장 파일 순
+    if shared_dir:
+        store = attach_object(shared_dir, SHARED_FEATURE_STORE)
+        if store is not None:
+            return store
+    history = MatchHistoryStore(MATCH_HISTORY_DIR)
+    if len(history):
+        return TeamFeatureStore.from_matches(history.to_frame())
+    if Path(FEATURE_STORE_PATH).exists():
+        return TeamFeatureStore.load(FEATURE_STORE_PATH)
+    return TeamFeatureStore()
+
+
+def export_shared_state(shared_dir: str) -> dict:
+    """
+    팀 특성 저장소와 활성 모델을 공유 배열로 내보냄 (멀티 워커 서빙 마스터에서 1회)
+    
+    Returns:
+        dict: feature_store (반영된 경기 수), models (모델명 -> 공유 여부)
+    """
+    store = _load_feature_store()
+    publish_object(shared_dir, SHARED_FEATURE_STORE, store)
+    manager = ModelManager(ModelRegistry(MODEL_REGISTRY_DIR), cache_size=1)
+    return {"feature_store": len(store), "models": manager.export_shared(shared_dir)}
 
 
 class PredictionService:
     """예측 서비스"""
     
+    def __init__(
+        self,
+        feature_store: Optional[TeamFeatureStore] = None,
+        model_manager: Optional[ModelManager] = None,
+        repository: Optional[PredictionRepository] = None,
+        history: Optional[MatchHistoryStore] = None,
+        match_service: Optional["MatchService"] = None,
+    ):
+        if model_manager is None:
+            model_manager = ModelManager(
+                ModelRegistry(MODEL_REGISTRY_DIR), MODEL_CACHE_SIZE, shared_dir=SHARED_ARRAY_DIR or None,
+            )
+        if repository is None and DATA_SOURCE == "db":
+            repository = PredictionRepository()
+        
+        self.repository = repository
+        # 완료 경기 이력 (워밍업 시 입력 시퀀스 윈도우 복원)
+        self.history = history
+        # 경기 ID -> 경기 (예측할 경기의 홈/원정 팀 조회, 메모리 인덱스)
+        self.match_service = match_service
+        # 특성 저장소 파일은 import 시점이 아니라 워밍업(또는 첫 사용)에서 로드
+        self._feature_store = feature_store
+        self._feature_store_lock = threading.Lock()
+        self.model_manager = model_manager
+        # 멤버 모델 출력 캐시 (경기, 모델 버전, 특성 해시)
+        self.member_cache = MemberOutputCache(MEMBER_OUTPUT_CACHE_SIZE)
+        self.ensemble_timings: Dict[str, dict] = {}
+        # 앙상블명 -> 멤버 버전이 같을 동안 재사용하는 앙상블 (스레드 풀 유지)
+        self._ensembles: Dict[str, EnsembleModel] = {}
+        self._ensembles_lock = threading.Lock()
+        # 경기별 모델 확률 (배당률 변경 시 추론 없이 추천만 재계산)
+        self.probabilities = ProbabilityCache()
+        # 최근 완료 경기들의 특성 벡터 (모델 입력 시퀀스)
+        self._recent_vectors = deque(maxlen=SEQUENCE_WINDOW)
+        # 모의 예측으로 대체 중인(등록된 버전이 없는) 모델
+        self._mock_models = set()
+    
+    @property
+    def feature_store(self) -> TeamFeatureStore:
+        """팀 특성 저장소 (공유 배열, 경기 이력 저장소 또는 FEATURE_STORE_PATH에서 첫 사용 시 로드)"""
+        if self._feature_store is None:
+            with self._feature_store_lock:
+                if self._feature_store is None:
+                    self._feature_store = _load_feature_store(SHARED_ARRAY_DIR)
+        return self._feature_store
+    
+    def warm_up(self) -> dict:
+        """
+        팀 특성 저장소와 활성 모델 미리 로드 (앱 시작 시 백그라운드에서 호출)
+        
+        입력 시퀀스 윈도우도 경기 이력 저장소의 최근 완료 경기로 다시 채운다.
+        """
+        self.feature_store
+        self.restore_recent_vectors()
+        return self.model_manager.warm_up()
+    
+    def restore_recent_vectors(self) -> int:
+        """
+        최근 SEQUENCE_WINDOW개 완료 경기로 입력 시퀀스 윈도우 복원
+        
+        재시작 직후에도 0으로 채운 시퀀스로 예측하지 않도록 워밍업에서 호출한다.
+        
+        Returns:
+            복원한 경기 수
+        """
+        history = self.history if self.history is not None else MatchHistoryStore(MATCH_HISTORY_DIR)
+        if not len(history):
+            print("⚠️  경기 이력 저장소가 비어 있어 입력 시퀀스를 복원하지 못했습니다 (build_match_history.py)")
+            return 0
+        
+        columns = history.columns()
+        recent = slice(max(len(columns["id"]) - SEQUENCE_WINDOW, 0), None)
+        matches = [
+            {"id": int(match_id), "home_team_id": int(home), "away_team_id": int(away)}
+            for match_id, home, away in zip(
+                columns["id"][recent], columns["home_team_id"][recent], columns["away_team_id"][recent]
+            )
+        ]
+        self._recent_vectors.clear()
+        self._recent_vectors.extend(self.build_match_features(match) for match in matches)
+        return len(matches)
+    
+    def on_match_completed(self, match: dict) -> bool:
+        """
+        경기 종료 시 팀 특성 저장소 갱신 (O(1))
+        """
+        updated = self.feature_store.update(match)
+        if updated:
+            self._recent_vectors.append(self.build_match_features(match))
+        return updated
+    
+    def build_match_features(self, match: dict) -> list:
+        """
+        경기 직전 시점의 모델 입력 특성 벡터
+        """
+        return self.feature_store.match_feature_vector(match, as_of_match=match["id"])
+    
+    def build_sequence(self) -> np.ndarray:
+        """
+        현재 시점 최근 완료 경기 시퀀스 (SEQUENCE_WINDOW, 특성 수)
+        
+        완료 경기가 부족하면 앞쪽을 0으로 채운다.
+        """
+        sequence = np.zeros((SEQUENCE_WINDOW, len(SEQUENCE_FEATURES)), dtype=np.float32)
+        if self._recent_vectors:
+            sequence[-len(self._recent_vectors):] = self._recent_vectors
+        return sequence
+    
+    def build_sequences(self, match_ids: List[int], matches: Optional[Dict[int, dict]] = None) -> np.ndarray:
+        """
+        경기별 모델 입력 (경기 수, SEQUENCE_WINDOW, 특성 수)
+        
+        최근 완료 경기 SEQUENCE_WINDOW - 1개 뒤에 예측할 경기의 경기 직전 특성
+        (두 팀의 롤링 특성, build_match_features)을 마지막 시점으로 붙인다.
+        
+        Args:
+            match_ids: 경기 ID 목록
+            matches: 경기 ID -> 경기 (없으면 match_service 인덱스에서 조회)
+        
+        Raises:
+            KeyError: 경기를 찾을 수 없음
+        """
+        base = self.build_sequence()
+        X = np.empty((len(match_ids), SEQUENCE_WINDOW, len(SEQUENCE_FEATURES)), dtype=np.float32)
+        X[:, :-1] = base[1:]
+        X[:, -1] = [self.build_match_features(self._find_match(match_id, matches)) for match_id in match_ids]
+        return X
+    
+    def _find_match(self, match_id: int, matches: Optional[Dict[int, dict]]) -> dict:
+        match = matches.get(match_id) if matches else None
+        if match is None and self.match_service is not None:
+            match = self.match_service.index.get(match_id)
+        if match is None:
+            raise KeyError(f"경기를 찾을 수 없습니다: {match_id}")
+        return match
+    
+    async def prefetch_matches(self, match_ids: List[int]) -> List[int]:
+        """
+        인덱스에 없는 경기(인덱스 기간 밖)를 저장소에서 읽어 인덱스에 올림
+        
+        예측은 스레드 풀의 동기 경로에서 인덱스만 조회하므로 비동기 요청 경로에서 먼저 호출한다.
+        
+        Returns:
+            어디에도 없는 경기 ID 목록
+        """
+        if self.match_service is None:
+            return []
+        missing = []
+        for match_id in match_ids:
+            if await self.match_service.get_match_by_id(match_id) is None:
+                missing.append(match_id)
+        return missing
+    
+    def _loaded_model(self, model_name: str) -> Optional[LoadedModel]:
+        """
+        서비스 중인 모델 (등록된 버전이 없으면 None)
+        
+        Raises:
+            RuntimeError: 등록된 활성 버전이 있는데 로드되어 있지 않음 (로드 실패/재로드 중)
+        """
+        loaded = self.model_manager.get(model_name)
+        if loaded is not None:
+            return loaded
+        
+        entry = self.model_manager.registry.get_version(model_name)
+        if entry is not None:
+            raise RuntimeError(f"{model_name} v{entry['version']} 모델이 로드되지 않았습니다")
+        if model_name not in self._mock_models:
+            self._mock_models.add(model_name)
+            print(f"⚠️  {model_name}: 등록된 모델 버전이 없어 모의 예측을 반환합니다")
+        return None
+    
+    def _predict_proba(
+        self,
+        loaded: LoadedModel,
+        X: np.ndarray,
+        match_ids: Optional[List[int]] = None
+    ) -> np.ndarray:
+        """
+        (batch, window, features) 입력의 홈팀 승률
+        
+        match_ids가 주어지면 멤버 출력 캐시에 없는 경기만 추론한다.
+        """
+        model = _ServingModel(loaded)
+        probabilities, _ = cached_member_predict(model, model.key, X, match_ids, self.member_cache)
+        return probabilities
+    
+    def _predict_ensemble(self, model_name: str, X: np.ndarray, match_ids: List[int]) -> Optional[np.ndarray]:
+        """
+        캐시된 멤버 출력으로 앙상블 예측 (멤버가 하나라도 없으면 None)
+        
+        캐시에 없는 멤버는 스레드 풀에서 병렬로 추론하고 멤버별 소요 시간을 기록한다.
+        """
+        members = ENSEMBLE_MEMBERS[model_name]
+        loaded_members = [self._loaded_model(member) for member in members]
+        if any(loaded is None for loaded in loaded_members):
+            return None
+        
+        ensemble = self._ensemble(model_name, loaded_members, list(members.values()))
+        probabilities = ensemble.predict(X, keys=match_ids).reshape(-1)
+        self.ensemble_timings[model_name] = ensemble.last_timings
+        return probabilities
+    
+    def _ensemble(self, model_name: str, loaded_members: List[LoadedModel], weights: List[float]) -> EnsembleModel:
+        """
+        멤버 버전이 그대로면 기존 앙상블 재사용, 멤버가 교체되면 새로 만들고 이전 스레드 풀 종료
+        """
+        serving = [_ServingModel(loaded) for loaded in loaded_members]
+        keys = [model.key for model in serving]
+        with self._ensembles_lock:
+            ensemble = self._ensembles.get(model_name)
+            if ensemble is not None and list(ensemble.models) == keys:
+                return ensemble
+            if ensemble is not None:
+                ensemble.close()
+            ensemble = EnsembleModel(
+                {model.key: model for model in serving},
+                weights=weights,
+                cache=self.member_cache,
+            )
+            self._ensembles[model_name] = ensemble
+            return ensemble
+    
+    def ensemble_metrics(self) -> dict:
+        """
+        앙상블 멤버별 마지막 소요 시간과 멤버 출력 캐시 상태
+        """
+        return {
+            "timings": self.ensemble_timings,
+            "member_cache": self.member_cache.stats(),
+        }
+    
+    def _build_prediction(self, match_id: int, model_name: str, home_win_prob: float) -> dict:
+        """
+        모델 출력 확률을 예측 결과 dict로 변환
+        """
+        home_win_prob = round(float(home_win_prob), 4)
+        away_win_prob = round(1 - home_win_prob, 4)
+        confidence = max(home_win_prob, away_win_prob)
+        
+        if home_win_prob > 0.6 and confidence > 0.7:
+            recommended_bet = "home"
+        elif away_win_prob > 0.6 and confidence > 0.7:
+            recommended_bet = "away"
+        else:
+            recommended_bet = "pass"
+        
+        return {
+            "id": match_id,
+            "match_id": match_id,
+            "model_name": model_name,
+            "home_win_probability": home_win_prob,
+            "away_win_probability": away_win_prob,
+            "confidence_score": confidence,
+            "recommended_bet": recommended_bet,
+            "expected_value": None,
+            "kelly_percentage": None,
+            "predicted_at": datetime.now(),
+        }
+    
     def generate_prediction(self, match_id: int, model_name: str = "lstm_v1") -> dict:
         """
         경기 예측 생성
         
-        실제 구현 시:
-        1. match_id로 경기 데이터 조회
-        2. 팀별 최근 성적, 특성 추출
-        3. ML 모델 로드
-        4. 예측 실행
-        5. 결과 DB 저장
-        6. 결과 반환
+        1. match_id로 경기 조회 (match_service 인덱스)
+        2. 최근 완료 경기 시퀀스 + 두 팀의 경기 직전 특성 (build_sequences)
+        3. 활성 모델 예측 (시작 시 ModelManager가 미리 로드)
         """
-        # 현재는 모의 데이터 반환
-        prediction = mock_data.generate_prediction(match_id, model_name)
-        return prediction
+        return self.generate_predictions([match_id], model_name)[0]
     
-    def get_prediction(
+    def generate_predictions(
+        self,
+        match_ids: List[int],
+        model_name: str = "lstm_v1",
+        matches: Optional[Dict[int, dict]] = None,
+    ) -> List[dict]:
+        """
+        여러 경기 예측을 한 번의 배치 forward pass로 생성
+        
+        Args:
+            match_ids: 경기 ID 목록
+            model_name: 모델명
+            matches: 경기 ID -> 경기 (없으면 match_service 인덱스에서 조회)
+        
+        Returns:
+            match_ids 순서의 예측 결과 목록
+        """
+        return self.predict_models(match_ids, [model_name], matches)[model_name]
+    
+    def predict_models(
+        self,
+        match_ids: List[int],
+        model_names: List[str],
+        matches: Optional[Dict[int, dict]] = None,
+    ) -> Dict[str, List[dict]]:
+        """
+        여러 경기 x 여러 모델 예측
+        
+        입력 시퀀스는 경기마다(해당 경기의 홈/원정 팀 특성으로) 한 번만 만들고,
+        모델마다 전체 경기에 대해 배치 forward pass를 한 번 실행한다. 앙상블은 멤버 출력을 재사용한다.
+        
+        Args:
+            match_ids: 경기 ID 목록
+            model_names: 모델명 목록
+            matches: 경기 ID -> 경기 (없으면 match_service 인덱스에서 조회)
+        
+        Returns:
+            모델명 -> match_ids 순서의 예측 결과 목록
+        
+        Raises:
+            KeyError: 실제 모델로 예측할 경기를 찾을 수 없음
+        """
+        results: Dict[str, List[dict]] = {}
+        inputs = {}
+        
+        def sequences() -> np.ndarray:
+            if "X" not in inputs:
+                inputs["X"] = self.build_sequences(match_ids, matches)
+            return inputs["X"]
+        
+        def run(model_name: str) -> List[dict]:
+            if model_name in results:
+                return results[model_name]
+            
+            if model_name in ENSEMBLE_MEMBERS:
+                probabilities = self._predict_ensemble(model_name, sequences(), match_ids)
+                if probabilities is None:
+                    # 멤버 모델이 없으면 멤버 예측(모의 데이터)의 가중 평균
+                    members = ENSEMBLE_MEMBERS[model_name]
+                    member_probs = np.array([
+                        [p["home_win_probability"] for p in run(member)] for member in members
+                    ])
+                    probabilities = np.average(member_probs, axis=0, weights=list(members.values()))
+                predictions = [
+                    self._build_prediction(match_id, model_name, prob)
+                    for match_id, prob in zip(match_ids, probabilities)
+                ]
+            else:
+                loaded = self._loaded_model(model_name)
+                if loaded is None:
+                    # 등록된 버전이 없는 모델(학습 전 개발 환경)은 모의 데이터 반환
+                    predictions = [
+                        mock_data.generate_prediction(match_id, model_name) for match_id in match_ids
+                    ]
+                else:
+                    probabilities = self._predict_proba(loaded, sequences(), match_ids)
+                    predictions = [
+                        self._build_prediction(match_id, model_name, prob)
+                        for match_id, prob in zip(match_ids, probabilities)
+                    ]
+            
+            results[model_name] = predictions
+            self.probabilities.remember(predictions)
+            return predictions
+        
+        return {model_name: run(model_name) for model_name in model_names}
+    
+    def generate_bulk_predictions(
+        self,
+        match_ids: List[int],
+        model_names: Optional[List[str]] = None,
+        matches: Optional[Dict[int, dict]] = None,
+    ) -> List[dict]:
+        """
+        여러 경기의 모든 모델 예측 (경기별로 묶어서 반환)
+        """
+        model_names = model_names or MODEL_NAMES
+        by_model = self.predict_models(match_ids, model_names, matches)
+        
+        return [
+            {
+                "match_id": match_id,
+                "predictions": [by_model[model_name][i] for model_name in model_names],
+            }
+            for i, match_id in enumerate(match_ids)
+        ]
+    
+    async def get_prediction(
         self, 
         match_id: int, 
         model_name: str = "lstm_v1"
     ) -> Optional[dict]:
         """
-        저장된 예측 조회
-        
-        실제 구현 시: DB에서 조회
+        저장된 예측 조회 (저장된 예측이 없으면 새로 생성)
         """
-        # 현재는 새로 생성
-        return self.generate_prediction(match_id, model_name)
+        if self.repository is not None:
+            stored = await self.repository.get(match_id, model_name)
+            if stored is not None:
+                self.probabilities.remember([stored])
+                return stored
+        
+        await self.prefetch_matches([match_id])
+        # 모델 추론은 이벤트 루프를 막지 않도록 스레드에서
+        return await asyncio.to_thread(self.generate_prediction, match_id, model_name)
     
-    def get_predictions_by_match(self, match_id: int) -> list:
+    async def get_predictions_by_match(self, match_id: int) -> list:
         """
         경기의 모든 모델 예측 조회
         """
-        models = ["lstm_v1", "gru_v1", "ensemble_v1"]
-        predictions = []
+        if self.repository is not None:
+            stored = await self.repository.list_by_match(match_id)
+            if stored:
+                self.probabilities.remember(stored)
+                return stored
         
-        for model_name in models:
-            pred = self.generate_prediction(match_id, model_name)
-            predictions.append(pred)
-        
-        return predictions
-
-
+        await self.prefetch_matches([match_id])
+        results = await asyncio.to_thread(self.generate_bulk_predictions, [match_id])
+        return results[0]["predictions"]
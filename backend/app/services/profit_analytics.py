@@ -0,0 +1,156 @@
+"""
+기간 수익 분석
+
+betting_histories를 bet_placed_at 순으로 한 번 훑으면서 ROI, 샤프 비율, 최대 낙폭, 승률을
+계산한다. 직전 같은 길이 기간도 같은 순회에서 함께 계산하므로 쿼리는 1번이다.
+
+- 평균/분산은 Welford 방식으로 갱신 (행을 저장하지 않음, 메모리 O(1))
+- 최대 낙폭은 기간 시작 자금 + 누적 손익의 고점 대비 하락률
+"""
+import math
+from datetime import date, datetime, timedelta
+from typing import AsyncIterable, Iterable, Optional, Tuple
+
+# (bet_placed_at, betting_amount, actual_profit)
+ProfitRow = Tuple[datetime, float, float]
+
+
+class RunningStats:
+    """Welford 누적 평균/분산"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def push(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def std(self) -> float:
+        """모표준편차 (2개 미만이면 0)"""
+        return math.sqrt(self._m2 / self.count) if self.count > 1 else 0.0
+
+
+class ProfitAccumulator:
+    """
+    한 기간의 베팅을 시간 순으로 받아 지표 계산
+
+    Args:
+        initial_bankroll: 기간 시작 자금 (최대 낙폭 기준)
+    """
+
+    def __init__(self, initial_bankroll: float):
+        self.initial_bankroll = initial_bankroll
+        self.bets = 0
+        self.wins = 0
+        self.staked = 0.0
+        self.profit = 0.0
+        self.returns = RunningStats()  # 베팅별 수익률 (손익 / 베팅 금액)
+        self._peak = initial_bankroll
+        self._max_drawdown = 0.0
+
+    def push(self, betting_amount: float, actual_profit: float) -> None:
+        self.bets += 1
+        self.wins += actual_profit > 0
+        self.staked += betting_amount
+        self.profit += actual_profit
+        if betting_amount > 0:
+            self.returns.push(actual_profit / betting_amount)
+
+        equity = self.initial_bankroll + self.profit
+        self._peak = max(self._peak, equity)
+        if self._peak > 0:
+            self._max_drawdown = min(self._max_drawdown, equity / self._peak - 1.0)
+
+    def roi(self) -> Optional[float]:
+        return round(self.profit / self.staked * 100, 2) if self.staked else None
+
+    def summary(self) -> dict:
+        """
+        Returns:
+            roi(%), total_profit, sharpe_ratio(베팅 단위), max_drawdown(%), win_rate(%)
+        """
+        std = self.returns.std
+        return {
+            "roi": self.roi() or 0.0,
+            "total_profit": round(self.profit, 2),
+            "sharpe_ratio": round(self.returns.mean / std, 3) if std > 0 else 0.0,
+            "max_drawdown": round(self._max_drawdown * 100, 2),
+            "win_rate": round(self.wins / self.bets * 100, 1) if self.bets else 0.0,
+        }
+
+
+class ProfitWindows:
+    """
+    분석 기간과 직전 같은 길이 기간을 한 번의 순회로 계산
+
+    add()에는 previous_start 이후 행이 bet_placed_at 오름차순으로 들어와야 한다.
+    """
+
+    def __init__(self, start_date: date, end_date: date, initial_bankroll: float = 1_000_000):
+        length = (end_date - start_date).days + 1
+        self.start_date = start_date
+        self.end_date = end_date
+        self.previous_start = start_date - timedelta(days=length)
+        self._start = datetime.combine(start_date, datetime.min.time())
+        self._until = datetime.combine(end_date + timedelta(days=1), datetime.min.time())
+        self.current = ProfitAccumulator(initial_bankroll)
+        self.previous = ProfitAccumulator(initial_bankroll)
+
+    @property
+    def query_range(self) -> Tuple[datetime, datetime]:
+        """조회 범위 [since, until)"""
+        return datetime.combine(self.previous_start, datetime.min.time()), self._until
+
+    def add(self, bet_placed_at: datetime, betting_amount: float, actual_profit: float) -> None:
+        if bet_placed_at >= self._until:
+            return
+        target = self.current if bet_placed_at >= self._start else self.previous
+        target.push(float(betting_amount), float(actual_profit))
+
+    def result(self) -> dict:
+        """ProfitAnalysis 응답 dict"""
+        return dict(
+            self.current.summary(),
+            period_start=self.start_date,
+            period_end=self.end_date,
+            previous_roi=self.previous.roi(),
+        )
+
+
+def analyze_profit(
+    rows: Iterable[ProfitRow],
+    start_date: date,
+    end_date: date,
+    initial_bankroll: float = 1_000_000,
+) -> dict:
+    """
+    시간 순 베팅 행으로 기간 수익 분석
+
+    Args:
+        rows: ProfitWindows.query_range 범위의 (bet_placed_at, betting_amount, actual_profit), 오름차순
+        start_date: 분석 시작 날짜
+        end_date: 분석 종료 날짜 (포함)
+        initial_bankroll: 기간 시작 자금
+
+    Returns:
+        ProfitAnalysis 응답 dict (previous_roi 포함)
+    """
+    windows = ProfitWindows(start_date, end_date, initial_bankroll)
+    for row in rows:
+        windows.add(*row)
+    return windows.result()
+
+
+async def analyze_profit_stream(
+    rows: AsyncIterable[ProfitRow],
+    windows: ProfitWindows,
+) -> dict:
+    """analyze_profit의 비동기 스트림 버전 (DB 서버 측 커서용)"""
+    async for row in rows:
+        windows.add(*row)
+    return windows.result()
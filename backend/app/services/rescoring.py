@@ -0,0 +1,192 @@
+"""
+배당률 변경 시 베팅 추천 재계산
+
+배당률이 바뀌면 그 경기 예측의 추천(recommended_bet, expected_value, kelly_percentage)만
+다시 계산한다. 모델 추론은 다시 하지 않고 이미 계산된 예측 확률을 재사용한다.
+
+- 예측 확률: ProbabilityCache (예측 생성/조회 시 채움) -> 없으면 predictions 테이블에서 1회 조회
+- 배당률: 이벤트 묶음과 match_odds에 저장된 최신 배당률 중 더 늦게 수집된 것
+  (순서가 뒤섞인 피드에서 묶음이 저장된 값보다 오래될 수 있음)
+- 계산: 영향받은 (경기, 예측 모델) 행 x 전체 베팅 모델을 evaluate_slate 한 번으로
+- 베팅 모델별 결정이 바뀐 항목만 recommendations.updated 이벤트로 발행 (라이브 피드 전송용)
+"""
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ..events import RECOMMENDATIONS_UPDATED, EventBus
+from ..repositories.prediction_repository import PredictionRepository
+from .betting_engine import BETTING_MODELS, DEFAULT_BETTING_MODEL, evaluate_slate
+
+# 예측 확률 캐시 크기 (경기 수)
+PROBABILITY_CACHE_SIZE = int(os.getenv("PROBABILITY_CACHE_SIZE", "5000"))
+# 마지막으로 발행한 베팅 비율을 기억할 (경기, 예측 모델) 수
+RESCORE_STAKES_SIZE = int(os.getenv("RESCORE_STAKES_SIZE", "20000"))
+
+
+class ProbabilityCache:
+    """
+    경기별 예측 모델 확률 LRU 캐시
+
+    match_id -> {model_name: (home_win_probability, confidence_score)}
+    """
+
+    def __init__(self, max_matches: int = PROBABILITY_CACHE_SIZE):
+        self.max_matches = max_matches
+        self._matches: "OrderedDict[int, Dict[str, Tuple[float, float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._matches)
+
+    def remember(self, predictions: Iterable[dict]) -> None:
+        """예측 결과 dict들의 확률 저장"""
+        for prediction in predictions:
+            match_id = prediction["match_id"]
+            models = self._matches.setdefault(match_id, {})
+            models[prediction["model_name"]] = (
+                float(prediction["home_win_probability"]),
+                float(prediction["confidence_score"]),
+            )
+            self._matches.move_to_end(match_id)
+        while len(self._matches) > self.max_matches:
+            self._matches.popitem(last=False)
+
+    def get(self, match_id: int) -> Optional[Dict[str, Tuple[float, float]]]:
+        models = self._matches.get(match_id)
+        if models is not None:
+            self._matches.move_to_end(match_id)
+        return models
+
+
+def latest_odds_by_match(snapshots: List[dict]) -> Dict[int, dict]:
+    """경기별 가장 늦게 수집된 배당률 (제공처 무관)"""
+    latest: Dict[int, dict] = {}
+    for snapshot in snapshots:
+        current = latest.get(snapshot["match_id"])
+        if current is None or snapshot["captured_at"] >= current["captured_at"]:
+            latest[snapshot["match_id"]] = snapshot
+    return latest
+
+
+class RecommendationRescorer:
+    """odds.updated 구독 -> 영향받은 경기 추천만 재계산"""
+
+    def __init__(
+        self,
+        probabilities: ProbabilityCache,
+        repository: Optional[PredictionRepository] = None,
+        events: Optional[EventBus] = None,
+        betting_models: Optional[List[str]] = None,
+        max_stakes: int = RESCORE_STAKES_SIZE,
+    ):
+        self.probabilities = probabilities
+        self.repository = repository
+        self.events = events or EventBus()
+        self.betting_models = betting_models or list(BETTING_MODELS)
+        self._default_index = self.betting_models.index(
+            DEFAULT_BETTING_MODEL if DEFAULT_BETTING_MODEL in self.betting_models else self.betting_models[0]
+        )
+
+        # (경기, 예측 모델) -> 베팅 모델별 베팅 비율 (바뀐 항목만 발행, LRU)
+        self.max_stakes = max_stakes
+        self._stakes: "OrderedDict[Tuple[int, str], np.ndarray]" = OrderedDict()
+        self._metrics = {"events": 0, "rows_rescored": 0, "changes_published": 0, "last_ms": None}
+
+    async def _probabilities_for(self, match_ids: List[int]) -> Dict[int, Dict[str, Tuple[float, float]]]:
+        found = {match_id: self.probabilities.get(match_id) for match_id in match_ids}
+        missing = [match_id for match_id, models in found.items() if models is None]
+        if missing and self.repository is not None:
+            self.probabilities.remember(await self.repository.probabilities(missing))
+            found.update({match_id: self.probabilities.get(match_id) for match_id in missing})
+        return {match_id: models for match_id, models in found.items() if models}
+
+    async def on_odds_updated(self, payload: dict) -> List[dict]:
+        """
+        배당률 변경 처리
+
+        Args:
+            payload: odds.updated 이벤트 (match_ids, odds)
+
+        Returns:
+            베팅 결정이 바뀐 (경기, 예측 모델, 베팅 모델) 추천 목록
+        """
+        started = time.perf_counter()
+        odds = latest_odds_by_match(payload.get("odds", []))
+        if odds and self.repository is not None:
+            # 저장된 값이 같거나 더 늦으면 저장된 값 사용
+            stored = await self.repository.latest_odds(sorted(odds))
+            odds = latest_odds_by_match([*odds.values(), *stored.values()])
+        probabilities = await self._probabilities_for(sorted(odds))
+
+        rows = [
+            (match_id, model_name, prob, confidence)
+            for match_id, models in probabilities.items()
+            for model_name, (prob, confidence) in sorted(models.items())
+        ]
+        self._metrics["events"] += 1
+        if not rows:
+            return []
+
+        away_odds = [odds[match_id]["away_team_odds"] for match_id, *_ in rows]
+        result = evaluate_slate(
+            home_win_probability=[prob for _, _, prob, _ in rows],
+            confidence=[confidence for *_, confidence in rows],
+            home_odds=[odds[match_id]["home_team_odds"] for match_id, *_ in rows],
+            away_odds=[np.nan if o is None else o for o in away_odds],
+            betting_models=self.betting_models,
+        )
+        should_bet = result["should_bet"]
+        stake = np.round(result["stake_fraction"], 4)
+
+        # predictions 행 추천은 기본 베팅 모델 기준
+        recommendations = [
+            {
+                "match_id": match_id,
+                "model_name": model_name,
+                "recommended_bet": str(result["bet_on"][i]) if should_bet[self._default_index, i] else "pass",
+                "expected_value": round(float(result["expected_value"][i]), 2),
+                "kelly_percentage": round(float(result["kelly_fraction"][i]), 4),
+            }
+            for i, (match_id, model_name, _, _) in enumerate(rows)
+        ]
+        if self.repository is not None:
+            await self.repository.update_recommendations(recommendations)
+
+        changes = []
+        for i, (match_id, model_name, _, _) in enumerate(rows):
+            previous = self._stakes.pop((match_id, model_name), None)
+            self._stakes[(match_id, model_name)] = stake[:, i]
+            for m, betting_model in enumerate(self.betting_models):
+                if previous is not None and previous[m] == stake[m, i]:
+                    continue
+                changes.append({
+                    "match_id": match_id,
+                    "model_name": model_name,
+                    "betting_model": betting_model,
+                    "should_bet": bool(should_bet[m, i]),
+                    "bet_on": str(result["bet_on"][i]),
+                    "odds": float(result["odds"][i]),
+                    "expected_value": recommendations[i]["expected_value"],
+                    "kelly_fraction": recommendations[i]["kelly_percentage"],
+                    "stake_fraction": float(stake[m, i]),
+                })
+
+        while len(self._stakes) > self.max_stakes:
+            self._stakes.popitem(last=False)
+
+        self._metrics["rows_rescored"] += len(rows)
+        self._metrics["changes_published"] += len(changes)
+        self._metrics["last_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        if changes:
+            await self.events.publish(RECOMMENDATIONS_UPDATED, {
+                "match_ids": sorted({change["match_id"] for change in changes}),
+                "recommendations": changes,
+            })
+        return changes
+
+    def metrics(self) -> dict:
+        """재계산 처리량 (이벤트 수, 재계산 행 수, 발행한 변경 수, 마지막 처리 시간)"""
+        return dict(self._metrics, cached_matches=len(self.probabilities))
@@ -0,0 +1,150 @@
+"""
+누적 ROI 차트 시계열
+
+결과가 확정된 베팅의 누적 베팅 금액/누적 손익을 배열에 쌓아 두고, 임의 기간의 누적 ROI
+곡선을 요청한 점 수로 줄여서 반환한다.
+
+- 베팅 1건당 24바이트 (시각, 누적 베팅 금액, 누적 손익)
+- 기간 조회는 이진 탐색 + 배열 슬라이스, 다운샘플링(LTTB)은 기간 길이에 선형
+"""
+from datetime import date, timedelta
+from typing import Tuple
+
+import numpy as np
+
+# 차트 기본 점 수
+DEFAULT_CHART_POINTS = 100
+
+
+class CumulativeSeries:
+    """bet_placed_at 순 누적 베팅 금액/손익 저장소"""
+
+    def __init__(self, capacity: int = 1024):
+        self._time = np.empty(capacity, dtype="datetime64[s]")
+        self._staked = np.empty(capacity)
+        self._profit = np.empty(capacity)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _reserve(self, size: int) -> None:
+        if size <= len(self._time):
+            return
+        capacity = max(size, len(self._time) * 2)
+        for name in ("_time", "_staked", "_profit"):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    def extend(self, bet_placed_at, betting_amount, actual_profit) -> None:
+        """
+        베팅 N건 추가
+
+        보통은 마지막 시각 이후 베팅이라 뒤에 이어 붙이고, 더 이른 베팅이 섞이면
+        그 위치부터 누적 합을 다시 계산한다.
+        """
+        times = np.asarray(bet_placed_at, dtype="datetime64[s]")
+        if not len(times):
+            return
+        amount = np.asarray(betting_amount, dtype=np.float64)
+        profit = np.asarray(actual_profit, dtype=np.float64)
+        order = np.argsort(times, kind="stable")
+        times, amount, profit = times[order], amount[order], profit[order]
+
+        n = self._size
+        self._reserve(n + len(times))
+        if n and times[0] < self._time[n - 1]:
+            # 앞쪽에 끼워 넣을 베팅: 삽입 위치 이후만 병합 후 재계산
+            start = int(np.searchsorted(self._time[:n], times[0], side="right"))
+            base_staked = self._staked[start - 1] if start else 0.0
+            base_profit = self._profit[start - 1] if start else 0.0
+            tail_amount = np.diff(self._staked[start:n], prepend=base_staked)
+            tail_profit = np.diff(self._profit[start:n], prepend=base_profit)
+
+            times = np.concatenate([self._time[start:n], times])
+            amount = np.concatenate([tail_amount, amount])
+            profit = np.concatenate([tail_profit, profit])
+            order = np.argsort(times, kind="stable")
+            times, amount, profit = times[order], amount[order], profit[order]
+            n = start
+
+        base_staked = self._staked[n - 1] if n else 0.0
+        base_profit = self._profit[n - 1] if n else 0.0
+        end = n + len(times)
+        self._time[n:end] = times
+        self._staked[n:end] = base_staked + np.cumsum(amount)
+        self._profit[n:end] = base_profit + np.cumsum(profit)
+        self._size = end
+
+    def window(self, start_date: date, end_date: date) -> np.ndarray:
+        """
+        [start_date, end_date] 기간 누적 ROI (%)
+
+        기간 첫 베팅부터 다시 누적한 값이다.
+
+        Returns:
+            (기간 베팅 수,) 베팅별 누적 ROI
+        """
+        time = self._time[:self._size]
+        lo = int(np.searchsorted(time, np.datetime64(start_date, "s"), side="left"))
+        hi = int(np.searchsorted(time, np.datetime64(end_date + timedelta(days=1), "s"), side="left"))
+        if lo >= hi:
+            return np.empty(0)
+
+        base_staked = self._staked[lo - 1] if lo else 0.0
+        base_profit = self._profit[lo - 1] if lo else 0.0
+        staked = self._staked[lo:hi] - base_staked
+        profit = self._profit[lo:hi] - base_profit
+        return np.divide(profit * 100, staked, out=np.zeros(hi - lo), where=staked > 0)
+
+
+def lttb(y: np.ndarray, threshold: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets 다운샘플링 (x는 0..n-1)
+
+    첫/마지막 점을 고정하고 가운데를 threshold - 2개 구간으로 나눠, 구간마다 직전 선택 점과
+    다음 구간 평균이 이루는 삼각형 넓이가 가장 큰 점을 고른다. 급등/급락 같은 모양이 남는다.
+
+    Args:
+        y: (n,) 값
+        threshold: 남길 점 수
+
+    Returns:
+        선택한 점 인덱스 (오름차순)
+    """
+    n = len(y)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    x = np.arange(n, dtype=np.float64)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    edges = np.r_[edges, n]  # 마지막 구간의 "다음 구간"은 마지막 점
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for i in range(threshold - 2):
+        lo, hi = edges[i], edges[i + 1]
+        next_lo, next_hi = edges[i + 1], edges[i + 2]
+        avg_x = x[next_lo:next_hi].mean()
+        avg_y = y[next_lo:next_hi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        selected[i + 1] = a
+    return selected
+
+
+def chart_points(roi: np.ndarray, points: int = DEFAULT_CHART_POINTS) -> Tuple[list, list]:
+    """
+    누적 ROI -> ChartData (labels, data)
+
+    Args:
+        roi: CumulativeSeries.window 결과
+        points: 최대 점 수
+    """
+    indexes = lttb(roi, points)
+    labels = [f"베팅 {i + 1}" for i in indexes.tolist()]
+    data = np.round(roi[indexes], 2).tolist()
+    return labels, data
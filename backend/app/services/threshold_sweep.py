@@ -0,0 +1,218 @@
+"""
+베팅 모델 임계값 탐색
+
+과거 예측/배당률로 임계값 조합 수천 개를 백테스트하고 ROI-최대 낙폭 파레토 프런트를
+betting_models 후보로 남긴다.
+
+- 입력 배열은 공유 메모리에 한 번 올리고 워커는 이름으로 붙기만 함 (작업마다 피클링하지 않음)
+- 워커는 자기 묶음에서 지배되는 조합을 먼저 걸러 프런트 후보만 돌려줌
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .backtester import parameter_grid, prepare_history, simulate
+from .betting_engine import PARAM_KEYS, params_array
+
+# 워커 작업 1건당 조합 수
+SWEEP_CHUNK_SIZE = int(os.getenv("SWEEP_CHUNK_SIZE", "128"))
+
+# 기본 탐색 범위 (6 x 8 x 6 x 5 = 1,440개)
+DEFAULT_GRID = {
+    "min_confidence": [0.50, 0.55, 0.60, 0.65, 0.70, 0.75],
+    "min_ev": [0, 100, 300, 500, 700, 1000, 1500, 2000],
+    "max_kelly": [0.02, 0.05, 0.10, 0.15, 0.20, 0.25],
+    "risk_multiplier": [0.25, 0.5, 0.8, 1.0, 1.2],
+}
+
+# 베팅 수가 이보다 적은 조합은 우연일 가능성이 커서 제외
+MIN_BETS = 30
+
+
+# ========================================
+# 공유 메모리 입력
+# ========================================
+
+class SharedArrays:
+    """
+    numpy 배열 묶음을 공유 메모리에 올림 (with 블록이 끝나면 해제)
+
+    spec (키 -> (블록 이름, shape, dtype))만 워커에 넘기면 attach_shared로 같은 메모리를 본다.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.arrays = arrays
+        self.spec: Dict[str, Tuple[str, tuple, str]] = {}
+        self._blocks: List[shared_memory.SharedMemory] = []
+
+    def __enter__(self) -> "SharedArrays":
+        for key, array in self.arrays.items():
+            array = np.ascontiguousarray(array)
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+            self._blocks.append(block)
+            self.spec[key] = (block.name, array.shape, array.dtype.str)
+        return self
+
+    def __exit__(self, *exc) -> None:
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+
+def attach_shared(spec: Dict[str, Tuple[str, tuple, str]]):
+    """
+    공유 메모리 블록에 붙어 배열 뷰 생성
+
+    Returns:
+        (키 -> 배열, 블록 목록). 블록은 배열을 쓰는 동안 참조를 유지해야 함
+    """
+    arrays, blocks = {}, []
+    for key, (name, shape, dtype) in spec.items():
+        block = shared_memory.SharedMemory(name=name)
+        blocks.append(block)
+        arrays[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+    return arrays, blocks
+
+
+# ========================================
+# 파레토 프런트
+# ========================================
+
+def pareto_mask(roi: np.ndarray, drawdown: np.ndarray) -> np.ndarray:
+    """
+    ROI와 최대 낙폭(음수, 0에 가까울수록 좋음) 모두 최대화 기준 비지배 여부
+
+    ROI 내림차순으로 훑으며 지금까지의 최고 낙폭보다 나은 점만 남긴다 (O(n log n)).
+    완전히 같은 점은 하나만 남긴다.
+    """
+    order = np.lexsort((-drawdown, -roi))
+    sorted_dd = drawdown[order]
+    best_before = np.maximum.accumulate(np.r_[-np.inf, sorted_dd[:-1]])
+    mask = np.zeros(len(roi), dtype=bool)
+    mask[order] = sorted_dd > best_before
+    return mask
+
+
+def _front(rows: List[dict]) -> List[dict]:
+    if not rows:
+        return []
+    roi = np.array([row["roi"] for row in rows])
+    drawdown = np.array([row["max_drawdown"] for row in rows])
+    mask = pareto_mask(roi, drawdown)
+    front = [row for row, keep in zip(rows, mask) if keep]
+    front.sort(key=lambda row: row["roi"], reverse=True)
+    return front
+
+
+def _evaluate(
+    prepared: Dict[str, np.ndarray],
+    configs: Sequence[dict],
+    initial_bankroll: float,
+    min_bets: int,
+) -> List[dict]:
+    """조합 묶음 백테스트 후 묶음 안의 파레토 프런트만 반환"""
+    overall = simulate(prepared, params_array(configs), initial_bankroll, by_season=False)["overall"]
+    rows = [
+        {
+            **{key: float(config[key]) for key in PARAM_KEYS},
+            "roi": float(overall["roi"][i]),
+            "max_drawdown": float(overall["max_drawdown"][i]),
+            "sharpe_ratio": float(overall["sharpe_ratio"][i]),
+            "win_rate": float(overall["win_rate"][i]),
+            "total_bets": int(overall["total_bets"][i]),
+        }
+        for i, config in enumerate(configs)
+        if overall["total_bets"][i] >= min_bets
+    ]
+    return _front(rows)
+
+
+# 워커 프로세스 상태 (초기화 시 공유 메모리에 붙음)
+_worker_prepared: Optional[Dict[str, np.ndarray]] = None
+_worker_blocks: list = []
+
+
+def _init_worker(spec: Dict[str, Tuple[str, tuple, str]]) -> None:
+    global _worker_prepared, _worker_blocks
+    _worker_prepared, _worker_blocks = attach_shared(spec)
+
+
+def _evaluate_in_worker(configs: Sequence[dict], initial_bankroll: float, min_bets: int) -> List[dict]:
+    return _evaluate(_worker_prepared, configs, initial_bankroll, min_bets)
+
+
+# ========================================
+# 탐색 실행
+# ========================================
+
+def run_sweep(
+    history: Dict[str, np.ndarray],
+    grid: Optional[Dict[str, Sequence[float]]] = None,
+    initial_bankroll: float = 1_000_000,
+    workers: Optional[int] = None,
+    chunk_size: int = SWEEP_CHUNK_SIZE,
+    min_bets: int = MIN_BETS,
+) -> dict:
+    """
+    임계값 조합 탐색
+
+    Args:
+        history: history_from_rows 형식의 컬럼 배열
+        grid: 파라미터별 후보 값 (기본: DEFAULT_GRID)
+        initial_bankroll: 시작 자금
+        workers: 프로세스 수 (1이면 현재 프로세스에서 실행)
+        chunk_size: 워커 작업 1건당 조합 수
+        min_bets: 이보다 베팅 수가 적은 조합은 제외
+
+    Returns:
+        dict: evaluated (평가한 조합 수), front (ROI 내림차순 파레토 프런트)
+    """
+    configs = parameter_grid(**(grid or DEFAULT_GRID))
+    prepared = prepare_history(history)
+    chunks = [configs[i:i + chunk_size] for i in range(0, len(configs), chunk_size)]
+
+    candidates = []
+    if workers == 1:
+        for chunk in chunks:
+            candidates.extend(_evaluate(prepared, chunk, initial_bankroll, min_bets))
+    else:
+        with SharedArrays(prepared) as shared:
+            with ProcessPoolExecutor(
+                max_workers=workers, initializer=_init_worker, initargs=(shared.spec,)
+            ) as executor:
+                futures = [
+                    executor.submit(_evaluate_in_worker, chunk, initial_bankroll, min_bets)
+                    for chunk in chunks
+                ]
+                for future in futures:
+                    candidates.extend(future.result())
+
+    return {"evaluated": len(configs), "front": _front(candidates)}
+
+
+def candidate_models(front: List[dict], prefix: Optional[str] = None) -> List[dict]:
+    """
+    파레토 프런트를 betting_models 후보 행으로 변환 (비활성 상태로 저장)
+    """
+    prefix = prefix or f"후보-{datetime.now():%Y%m%d%H%M}"
+    return [
+        {
+            "name": f"{prefix}-{i + 1:02d}",
+            "description": (
+                f"임계값 탐색 후보: ROI {row['roi']}%, 최대 낙폭 {row['max_drawdown']}%, "
+                f"샤프 {row['sharpe_ratio']}, 승률 {row['win_rate']}%, 베팅 {row['total_bets']}건"
+            ),
+            "min_confidence_threshold": row["min_confidence"],
+            "min_ev_threshold": row["min_ev"],
+            "max_kelly_percentage": row["max_kelly"],
+            "risk_multiplier": row["risk_multiplier"],
+            "is_active": False,
+        }
+        for i, row in enumerate(front)
+    ]
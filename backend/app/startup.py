@@ -0,0 +1,187 @@
+"""
+앱 시작 처리: 백그라운드 워밍업과 시작 프로파일
+
+- StartupWarmup: 모델 로드/성능 집계 같은 무거운 준비 단계를 lifespan 밖에서 실행한다.
+  서버는 바로 요청을 받고(liveness), 준비 완료 여부(readiness)는 /health/ready로 따로 알린다.
+- import_profile: python -X importtime 결과를 모듈/패키지별로 집계 (python profile_startup.py)
+"""
+import asyncio
+import inspect
+import os
+import re
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional
+
+# true면 워밍업을 백그라운드에서 실행 (false면 끝날 때까지 요청을 받지 않음)
+WARMUP_IN_BACKGROUND = os.getenv("WARMUP_IN_BACKGROUND", "true").lower() == "true"
+
+# 워밍업 중 예측 요청이 모델 로드를 기다리는 최대 시간 (초, 넘으면 503)
+WARMUP_WAIT_SECONDS = float(os.getenv("WARMUP_WAIT_SECONDS", "10"))
+
+
+# ========================================
+# 워밍업
+# ========================================
+
+class StartupWarmup:
+    """
+    이름 붙은 준비 단계를 등록 순서대로 실행
+
+    단계 함수는 동기(스레드 풀에서 실행)/비동기 모두 가능하다. 실패한 단계는 기록만 하고
+    다음 단계로 넘어간다 (모델이 없어도 모의 데이터로 서비스 가능).
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, Callable] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._status: Dict[str, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._started_at: Optional[float] = None
+        self._finished_at: Optional[float] = None
+
+    def add_step(self, name: str, fn: Callable) -> None:
+        """준비 단계 등록 (start 전에 호출, 같은 이름은 교체)"""
+        self._steps[name] = fn
+        self._status[name] = {"status": "pending"}
+
+    @property
+    def ready(self) -> bool:
+        """모든 단계가 끝났는지 (실패 포함)"""
+        return self._finished_at is not None
+
+    def start(self) -> asyncio.Task:
+        """백그라운드 실행 시작"""
+        self._events = {name: asyncio.Event() for name in self._steps}
+        self._started_at = time.perf_counter()
+        self._finished_at = None
+        self._task = asyncio.get_running_loop().create_task(self._run())
+        return self._task
+
+    async def run(self) -> None:
+        """끝날 때까지 실행 (WARMUP_IN_BACKGROUND=false)"""
+        await self.start()
+
+    async def _run(self) -> None:
+        for name, fn in self._steps.items():
+            status = self._status[name]
+            status["status"] = "running"
+            started = time.perf_counter()
+            try:
+                if inspect.iscoroutinefunction(fn):
+                    result = await fn()
+                else:
+                    result = await asyncio.to_thread(fn)
+                status.update(status="done", result=result)
+            except Exception as e:
+                status.update(status="failed", error=str(e))
+                print(f"⚠️  워밍업 실패 ({name}): {e}")
+            status["seconds"] = round(time.perf_counter() - started, 3)
+            self._events[name].set()
+        self._finished_at = time.perf_counter()
+
+    async def wait_for(self, name: str, timeout: float = WARMUP_WAIT_SECONDS) -> bool:
+        """
+        단계가 끝날 때까지 대기
+
+        Returns:
+            끝났으면 True (등록되지 않았거나 시작 전이면 바로 True)
+        """
+        event = self._events.get(name)
+        if event is None:
+            return True
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def stop(self) -> None:
+        """진행 중인 워밍업 취소 (앱 종료 시)"""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> dict:
+        """준비 여부와 단계별 상태/소요 시간"""
+        elapsed = None
+        if self._started_at is not None:
+            elapsed = round((self._finished_at or time.perf_counter()) - self._started_at, 3)
+        return {"ready": self.ready, "seconds": elapsed, "steps": self._status}
+
+
+# 앱 전역 워밍업 (main.py lifespan이 단계를 등록하고, 라우터가 준비 완료를 기다림)
+startup = StartupWarmup()
+
+
+# ========================================
+# import 시간 프로파일
+# ========================================
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)$")
+
+
+def parse_importtime(output: str) -> List[dict]:
+    """
+    python -X importtime 출력 -> [{module, self_ms, cumulative_ms, depth}]
+    """
+    modules = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            modules.append({
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    return modules
+
+
+def import_profile(module: str = "app.main", top: int = 20) -> dict:
+    """
+    새 인터프리터에서 module import 시간 측정
+
+    Args:
+        module: import할 모듈
+        top: 모듈/패키지별 목록 길이
+
+    Returns:
+        dict: total_ms, by_package (최상위 패키지별 self 시간 합),
+        slowest (self 시간 순 모듈), app_modules (module 최상위 패키지 모듈의 누적 시간)
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(completed.stderr.strip().splitlines()[-1])
+    modules = parse_importtime(completed.stderr)
+
+    by_package: Dict[str, float] = {}
+    for entry in modules:
+        package = entry["module"].split(".")[0]
+        by_package[package] = by_package.get(package, 0.0) + entry["self_ms"]
+
+    root = module.split(".")[0]
+    total = next((m["cumulative_ms"] for m in modules if m["module"] == module), None)
+    return {
+        "module": module,
+        "total_ms": round(total, 1) if total is not None else None,
+        "by_package": [
+            {"package": package, "self_ms": round(ms, 1)}
+            for package, ms in sorted(by_package.items(), key=lambda item: -item[1])[:top]
+        ],
+        "slowest": sorted(modules, key=lambda m: -m["self_ms"])[:top],
+        "app_modules": sorted(
+            (m for m in modules if m["module"].split(".")[0] == root),
+            key=lambda m: -m["cumulative_ms"],
+        )[:top],
+    }
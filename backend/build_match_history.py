@@ -0,0 +1,53 @@
+"""
+경기 이력 저장소 적재 스크립트
+완료 경기를 MATCH_HISTORY_DIR 컬럼 저장소(메모리 매핑 .npy)에 적재
+이후에는 경기 결과 기록 시 API 서버가 이어 쓴다.
+
+사용법:
+    python build_match_history.py              # DB의 완료 경기 전체 (이미 있는 경기는 건너뜀)
+    python build_match_history.py --mock [일수]  # 모의 경기 (DATA_SOURCE=db가 아닐 때)
+"""
+import asyncio
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+# backend 디렉토리를 Python 경로에 추가
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+from app.data import mock_data
+from app.database import DATA_SOURCE, dispose_async_engine
+from app.ml.match_history import MATCH_HISTORY_DIR, MatchHistoryStore
+from app.repositories.match_repository import MatchRepository
+
+
+async def main(args, mock: bool):
+    store = MatchHistoryStore(MATCH_HISTORY_DIR)
+    before = len(store)
+    started = time.perf_counter()
+    written = 0
+
+    if mock or DATA_SOURCE != "db":
+        days = int(args[0]) if args else 3 * 365
+        matches = mock_data.generate_matches(date.today() - timedelta(days=days), date.today(), include_future=False)
+        written = store.append(matches)
+    else:
+        repository = MatchRepository()
+        after_id = 0
+        while True:
+            rows = await repository.list_completed_results(after_id)
+            if not rows:
+                break
+            written += await asyncio.to_thread(store.append, rows)
+            after_id = rows[-1]["id"]
+        await dispose_async_engine()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ {MATCH_HISTORY_DIR}: {before:,}경기 -> {len(store):,}경기 (추가/정정 {written:,}경기, {elapsed:.1f}s)")
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    asyncio.run(main(args, "--mock" in sys.argv))
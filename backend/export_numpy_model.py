@@ -0,0 +1,62 @@
+"""
+Keras 모델 -> NumPy 런타임(.npz) 변환 스크립트
+레지스트리의 활성 Keras 버전(.h5/.keras)을 .npz로 변환해 새 버전으로 등록
+(스케일러, 특성 스키마, 평가 지표는 그대로 복사). TensorFlow가 설치된 학습 환경에서 실행한다.
+
+사용법:
+    python export_numpy_model.py lstm_v1 [gru_v1 ...] [--no-activate]
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# backend 디렉토리를 Python 경로에 추가
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from app.ml.numpy_rnn import from_keras
+from app.ml.registry import ModelRegistry, load_artifact
+from app.services.prediction_service import MODEL_REGISTRY_DIR
+
+
+def export(registry: ModelRegistry, model_name: str, activate: bool) -> None:
+    entry = registry.get_version(model_name)
+    if entry is None:
+        print(f"❌ {model_name}: 활성 버전이 없습니다")
+        return
+    artifact = registry.resolve(entry["artifact"])
+    if artifact.suffix.lower() not in (".h5", ".keras"):
+        print(f"⚠️  {model_name} v{entry['version']}: Keras 모델이 아닙니다 ({artifact.name})")
+        return
+
+    keras_model = load_artifact(artifact)
+    model = from_keras(keras_model)
+
+    # 변환 직후 같은 입력으로 출력 비교
+    X = np.random.default_rng(0).normal(size=(256, *keras_model.input_shape[1:])).astype(np.float32)
+    max_diff = float(np.abs(model.predict(X) - keras_model.predict(X, verbose=0)).max())
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = model.save(Path(tmp) / f"{artifact.stem}.npz")
+        registered = registry.register(
+            model_name,
+            path,
+            scaler_path=registry.resolve(entry.get("scaler")),
+            feature_schema=entry.get("feature_schema"),
+            metrics=entry.get("metrics"),
+            activate=activate,
+        )
+    print(f"✅ {model_name} v{entry['version']} -> v{registered['version']} ({registered['artifact']}, "
+          f"파라미터 {model.num_parameters:,}개, Keras 대비 최대 오차 {max_diff:.2e})")
+
+
+if __name__ == "__main__":
+    names = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not names:
+        print(__doc__)
+        sys.exit(1)
+    registry = ModelRegistry(MODEL_REGISTRY_DIR)
+    for name in names:
+        export(registry, name, activate="--no-activate" not in sys.argv)
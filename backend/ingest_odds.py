@@ -0,0 +1,54 @@
+"""
+배당률 수집 스크립트
+CSV/NDJSON 배당률 파일(또는 모의 피드)을 match_odds / match_odds_movements에 저장
+
+사용법:
+    python ingest_odds.py 파일.csv [파일.ndjson ...]
+    python ingest_odds.py --mock [경기 수] [분 수]
+    (DATA_SOURCE=db가 아니면 저장 없이 정규화/처리량만 측정)
+"""
+import asyncio
+import itertools
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# backend 디렉토리를 Python 경로에 추가
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+from app.data import mock_data
+from app.database import DATA_SOURCE, dispose_async_engine
+from app.services.odds_ingestion import OddsIngestionService, read_odds_file
+
+
+async def main(args, mock: bool):
+    if mock:
+        num_matches = int(args[0]) if args else 720
+        minutes = int(args[1]) if len(args) > 1 else 24 * 60
+        start = datetime.combine(datetime.now().date(), datetime.min.time()) - timedelta(minutes=minutes)
+        snapshots = mock_data.generate_odds_feed(list(range(1, num_matches + 1)), start, minutes)
+        source = f"모의 피드 (경기 {num_matches}개 x {minutes}분)"
+    elif args:
+        snapshots = itertools.chain.from_iterable(read_odds_file(path) for path in args)
+        source = ", ".join(args)
+    else:
+        print(__doc__)
+        return
+    
+    if DATA_SOURCE != "db":
+        print("⚠️  DATA_SOURCE=db가 아니므로 저장하지 않습니다")
+    
+    result = await OddsIngestionService().ingest(snapshots)
+    print(f"✅ {source}")
+    print(f"   읽음 {result['rows_read']:,}행 / 저장 {result['rows_written']:,}행 / "
+          f"제외 {result['rows_rejected']:,}행 / 묶음 {result['batches']}개")
+    print(f"   {result['seconds']:.1f}s ({result['rows_per_second'] or 0:,}행/s)")
+    
+    if DATA_SOURCE == "db":
+        await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    asyncio.run(main(args, "--mock" in sys.argv))
@@ -11,6 +11,7 @@ sys.path.insert(0, str(backend_dir))
 
 from app.database import init_db, check_db_connection, SessionLocal
 from app.models.db_models import Team, BettingModel
+from app.services.betting_engine import BETTING_MODELS
 
 
 def insert_initial_data():
@@ -43,32 +44,22 @@ def insert_initial_data():
         db.bulk_save_objects(teams)
         print(f"✅ 팀 정보 {len(teams)}개 입력 완료")
         
-        # 베팅 모델
+        # 베팅 모델 (전략 파라미터는 베팅 엔진과 같은 값 사용)
+        descriptions = {
+            '하이리턴': '고수익 고위험 전략',
+            '스탠다드': '균형잡힌 전략',
+            '로우리스크': '안정성 우선 전략',
+        }
         betting_models = [
             BettingModel(
-                name='하이리턴',
-                description='고수익 고위험 전략',
-                min_confidence_threshold=0.55,
-                min_ev_threshold=1000,
-                max_kelly_percentage=0.25,
-                risk_multiplier=1.2
-            ),
-            BettingModel(
-                name='스탠다드',
-                description='균형잡힌 전략',
-                min_confidence_threshold=0.60,
-                min_ev_threshold=500,
-                max_kelly_percentage=0.15,
-                risk_multiplier=1.0
-            ),
-            BettingModel(
-                name='로우리스크',
-                description='안정성 우선 전략',
-                min_confidence_threshold=0.70,
-                min_ev_threshold=300,
-                max_kelly_percentage=0.10,
-                risk_multiplier=0.8
-            ),
+                name=name,
+                description=descriptions.get(name),
+                min_confidence_threshold=params['min_confidence'],
+                min_ev_threshold=params['min_ev'],
+                max_kelly_percentage=params['max_kelly'],
+                risk_multiplier=params['risk_multiplier']
+            )
+            for name, params in BETTING_MODELS.items()
         ]
         
         db.bulk_save_objects(betting_models)
@@ -0,0 +1,58 @@
+"""
+API 프로세스 시작 프로파일
+모듈별 import 시간과 lifespan 시작/워밍업 단계별 소요 시간 출력
+
+사용법:
+    python profile_startup.py [표시할 모듈 수]
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# backend 디렉토리를 Python 경로에 추가
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+from app.startup import import_profile
+
+
+def print_imports(top: int) -> None:
+    profile = import_profile("app.main", top)
+    print(f"📦 import app.main: {profile['total_ms']:,.1f}ms (새 인터프리터, -X importtime)")
+
+    print("\n패키지별 (self 합계)")
+    for entry in profile["by_package"]:
+        print(f"  {entry['self_ms']:>9,.1f}ms  {entry['package']}")
+
+    print("\napp 모듈 (누적)")
+    for entry in profile["app_modules"]:
+        print(f"  {entry['cumulative_ms']:>9,.1f}ms  {entry['module']}")
+
+    print("\n가장 느린 모듈 (self)")
+    for entry in profile["slowest"]:
+        print(f"  {entry['self_ms']:>9,.1f}ms  {entry['module']}")
+
+
+async def measure_lifespan() -> None:
+    started = time.perf_counter()
+    from app.main import app
+    from app.startup import startup
+    imported = time.perf_counter()
+
+    async with app.router.lifespan_context(app):
+        serving = time.perf_counter()
+        while not startup.ready:
+            await asyncio.sleep(0.01)
+        ready = time.perf_counter()
+        status = startup.status()
+
+    print(f"\n🚀 import {imported - started:.3f}s -> 요청 수신 가능 {serving - imported:.3f}s "
+          f"-> 준비 완료 {ready - serving:.3f}s")
+    for name, step in status["steps"].items():
+        print(f"  {step.get('seconds', 0):>7.3f}s  {name} ({step['status']})")
+
+
+if __name__ == "__main__":
+    print_imports(int(sys.argv[1]) if len(sys.argv) > 1 else 15)
+    asyncio.run(measure_lifespan())
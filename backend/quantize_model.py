@@ -0,0 +1,110 @@
+"""
+모델 가중치 양자화 스크립트
+레지스트리의 활성 NumPy 런타임 버전(.npz)을 float16 또는 int8(출력 채널별 스케일)로 양자화해
+새 버전으로 등록한다. 경기 이력 저장소의 최근 경기(보류 데이터)로 원본과 log loss, Brier score를
+비교한 드리프트 리포트를 함께 기록하며, 기준을 통과한 경우에만 활성화한다.
+
+Keras 버전은 먼저 export_numpy_model.py로 .npz를 만든다.
+
+사용법:
+    python quantize_model.py lstm_v1 [gru_v1 ...]   # int8
+    python quantize_model.py lstm_v1 --float16
+    python quantize_model.py lstm_v1 --no-activate  # 등록만 (POST /api/predictions/models/{name}/activate로 승격)
+    python quantize_model.py lstm_v1 --force        # 기준 미달이어도 활성화
+"""
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+# backend 디렉토리를 Python 경로에 추가
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+from app.data import mock_data
+from app.ml.asof_features import build_asof_sequence_tensor
+from app.ml.match_history import MATCH_HISTORY_DIR, MatchHistoryStore
+from app.ml.numpy_rnn import NumpySequenceModel
+from app.ml.quantization import drift_report
+from app.ml.registry import ModelRegistry, load_artifact
+from app.services.prediction_service import MODEL_REGISTRY_DIR, SEQUENCE_WINDOW
+
+# 최근 경기 중 보류 데이터 비율
+HOLDOUT_FRACTION = 0.2
+
+
+def load_holdout():
+    """경기 이력 저장소(없으면 모의 경기 1년)의 최근 HOLDOUT_FRACTION 시퀀스"""
+    store = MatchHistoryStore(MATCH_HISTORY_DIR)
+    if len(store):
+        X, y = build_asof_sequence_tensor(store.to_frame(), SEQUENCE_WINDOW)
+    else:
+        print("⚠️  경기 이력 저장소가 비어 있어 모의 경기로 평가합니다")
+        with tempfile.TemporaryDirectory() as tmp:
+            store = MatchHistoryStore(tmp)
+            store.append(mock_data.generate_matches(date.today() - timedelta(days=365), date.today(), include_future=False))
+            X, y = build_asof_sequence_tensor(store.to_frame(), SEQUENCE_WINDOW)
+
+    start = int(len(X) * (1 - HOLDOUT_FRACTION))
+    return X[start:], y[start:]
+
+
+def quantize(registry: ModelRegistry, model_name: str, mode: str, X, y, activate: bool, force: bool) -> None:
+    entry = registry.get_version(model_name)
+    if entry is None:
+        print(f"❌ {model_name}: 활성 버전이 없습니다")
+        return
+    artifact = registry.resolve(entry["artifact"])
+    if artifact.suffix.lower() != ".npz":
+        print(f"⚠️  {model_name} v{entry['version']}: NumPy 런타임 모델이 아닙니다 ({artifact.name}), "
+              f"export_numpy_model.py로 먼저 변환하세요")
+        return
+
+    model = NumpySequenceModel.load(artifact)
+    if model.quantization is not None:
+        print(f"⚠️  {model_name} v{entry['version']}: 이미 {model.quantization}로 양자화된 버전입니다")
+        return
+
+    scaler_path = registry.resolve(entry.get("scaler"))
+    if scaler_path is not None:
+        scaler = load_artifact(scaler_path)
+        X = scaler.transform(X.reshape(-1, X.shape[-1])).reshape(X.shape)
+
+    quantized = model.quantize(mode)
+    report = drift_report(model, quantized, X, y)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = quantized.save(Path(tmp) / f"{artifact.stem}-{mode}.npz")
+        registered = registry.register(
+            model_name,
+            path,
+            scaler_path=scaler_path,
+            feature_schema=entry.get("feature_schema"),
+            metrics=entry.get("metrics"),
+            activate=activate and report["passed"],
+            quantization={"mode": mode, "source_version": entry["version"], "report": report},
+        )
+    if activate and force and not report["passed"]:
+        registry.set_active(model_name, registered["version"], force=True)
+
+    status = "통과" if report["passed"] else "미달"
+    print(f"{'✅' if report['passed'] else '❌'} {model_name} v{entry['version']} -> v{registered['version']} "
+          f"({mode}, 가중치 {report['reference_bytes'] / 1024:.0f}KB -> {report['candidate_bytes'] / 1024:.0f}KB)")
+    print(f"   보류 데이터 {report['samples']:,}건: log loss {report['log_loss_delta']:+.5f}, "
+          f"Brier {report['brier_delta']:+.5f}, 확률 최대 차이 {report['max_abs_diff']:.2e} -> 기준 {status}")
+
+
+if __name__ == "__main__":
+    names = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    if not names:
+        print(__doc__)
+        sys.exit(1)
+    mode = "float16" if "--float16" in sys.argv else "int8"
+    registry = ModelRegistry(MODEL_REGISTRY_DIR)
+    X, y = load_holdout()
+    for name in names:
+        quantize(
+            registry, name, mode, X, y,
+            activate="--no-activate" not in sys.argv,
+            force="--force" in sys.argv,
+        )
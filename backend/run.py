@@ -1,15 +1,65 @@
 """
 백엔드 서버 실행 스크립트
+
+사용법:
+    python run.py                   # 개발 모드 (코드 변경 시 자동 재시작)
+    CACHE_BACKEND=redis python run.py --workers 4
+                                    # 운영 모드 (모델/특성 배열을 공유 메모리로 한 번만 올림,
+                                    # 응답 캐시 공유와 워커 간 이벤트 중계에 Redis 필요)
 """
+import argparse
+import os
+
 import uvicorn
 
-if __name__ == "__main__":
-    uvicorn.run(
-        "app.main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,  # 개발 모드에서 코드 변경 시 자동 재시작
-        log_level="info"
-    )
+# 운영 모드 기본 워커 수와 공유 배열 디렉토리
+WEB_CONCURRENCY = int(os.getenv("WEB_CONCURRENCY", "1"))
+DEFAULT_SHARED_ARRAY_DIR = "models/shared"
+
+
+def prepare_shared_arrays(shared_dir: str) -> None:
+    """
+    워커를 띄우기 전에 모델 가중치/스케일러/팀 특성 저장소를 메모리 매핑 배열로 내보냄
 
+    워커는 SHARED_ARRAY_DIR 환경 변수로 같은 파일에 읽기 전용으로 붙는다.
+    """
+    os.environ["SHARED_ARRAY_DIR"] = shared_dir
+    from app.services.prediction_service import export_shared_state
+
+    exported = export_shared_state(shared_dir)
+    shared = [name for name, ok in exported["models"].items() if ok]
+    private = [name for name, ok in exported["models"].items() if not ok]
+    print(f"✅ 공유 배열 준비 완료 ({shared_dir}): 특성 저장소 {exported['feature_store']}경기, 모델 {shared}")
+    if private:
+        print(f"⚠️  배열로 내보낼 수 없는 모델은 워커마다 로드합니다: {private}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="KBO 베팅 AI 백엔드 서버")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=WEB_CONCURRENCY, help="워커 프로세스 수 (2 이상이면 운영 모드)")
+    parser.add_argument("--shared-dir", default=os.getenv("SHARED_ARRAY_DIR") or DEFAULT_SHARED_ARRAY_DIR)
+    args = parser.parse_args()
 
+    if args.workers > 1:
+        # 프로세스 내 캐시/집계는 워커 간 이벤트 중계 없이는 다른 워커의 쓰기를 모름
+        if os.getenv("CACHE_BACKEND", "memory") != "redis":
+            parser.error("--workers 2 이상은 CACHE_BACKEND=redis가 필요합니다 (응답 캐시 공유, 워커 간 이벤트 중계)")
+        os.environ["EVENT_RELAY"] = "redis"
+        prepare_shared_arrays(args.shared_dir)
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            workers=args.workers,
+            log_level="info"
+        )
+    else:
+        uvicorn.run(
+            "app.main:app",
+            host=args.host,
+            port=args.port,
+            reload=True,  # 개발 모드에서 코드 변경 시 자동 재시작
+            log_level="info"
+        )
@@ -0,0 +1,56 @@
+"""
+베팅 모델 임계값 탐색 스크립트
+과거 예측/배당률로 임계값 조합을 백테스트하고 파레토 프런트를 betting_models 후보로 저장
+
+사용법:
+    python sweep_thresholds.py [예측 모델명] [--save]
+    (DATA_SOURCE=db가 아니면 모의 과거 데이터 사용, --save는 DB 모드에서만 저장)
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# backend 디렉토리를 Python 경로에 추가
+backend_dir = Path(__file__).resolve().parent
+sys.path.insert(0, str(backend_dir))
+
+from app.database import DATA_SOURCE, dispose_async_engine
+from app.repositories.betting_model_repository import BettingModelRepository
+from app.services.performance_service import PerformanceService
+from app.services.threshold_sweep import candidate_models, run_sweep
+
+
+async def main(model_name: str, save: bool):
+    # 경기 이력 저장소가 있으면 경기 날짜/시즌/결과는 저장소에서 읽음
+    history = await PerformanceService().backtest_history(model_name)
+    
+    num_matches = len(history["match_id"])
+    if not num_matches:
+        print(f"❌ {model_name} 예측과 배당률이 있는 완료 경기가 없습니다")
+        return
+    
+    started = time.perf_counter()
+    result = await asyncio.to_thread(run_sweep, history)
+    elapsed = time.perf_counter() - started
+    
+    front = result["front"]
+    print(f"✅ 경기 {num_matches}개 x 조합 {result['evaluated']}개 탐색 완료 ({elapsed:.1f}s)")
+    print(f"   파레토 프런트 {len(front)}개")
+    for row in front:
+        print(f"   ROI {row['roi']:>8.2f}%  최대 낙폭 {row['max_drawdown']:>7.2f}%  "
+              f"신뢰도 {row['min_confidence']:.2f}  기대값 {row['min_ev']:>6.0f}  "
+              f"켈리 {row['max_kelly']:.2f}  배수 {row['risk_multiplier']:.2f}  베팅 {row['total_bets']}건")
+    
+    if save:
+        if DATA_SOURCE != "db":
+            print("⚠️  DATA_SOURCE=db 일 때만 저장합니다")
+            return
+        saved = await BettingModelRepository().add_candidates(candidate_models(front))
+        print(f"✅ 후보 베팅 모델 {len(saved)}개 저장 (비활성)")
+        await dispose_async_engine()
+
+
+if __name__ == "__main__":
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    asyncio.run(main(args[0] if args else "ensemble_v1", "--save" in sys.argv))
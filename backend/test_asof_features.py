@@ -0,0 +1,89 @@
+"""
+시점 정합 팀 특성 테스트
+
+- 각 (경기, 팀) 특성이 "경기 날짜 이전에 끝난 경기만" 쓰는 브루트포스 계산과 같은지 확인
+  (같은 날 더블헤더, 미완료 경기, 처음 출전하는 팀 포함)
+- match_date가 datetime.date(object)인 ORM/mock_data 행에서도 동작
+"""
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.data import mock_data
+from app.ml.asof_features import ASOF_FEATURES, asof_team_features, build_asof_sequence_tensor
+
+START = date(2024, 3, 23)
+
+
+def make_frame(num_matches: int, seed: int = 0) -> pd.DataFrame:
+    """하루 0~3경기, 일부 미완료인 경기 DataFrame (match_date는 datetime.date)"""
+    rng = np.random.default_rng(seed)
+    day_offsets = np.cumsum(rng.integers(0, 2, num_matches))  # 같은 날 여러 경기
+    rows = []
+    for i in range(num_matches):
+        home, away = (rng.choice(12, 2, replace=False) + 1).tolist()
+        home_score, away_score = rng.integers(0, 13, 2).tolist()
+        completed = rng.random() > 0.1
+        rows.append({
+            "id": i + 1,
+            "match_date": START + timedelta(days=int(day_offsets[i])),
+            "home_team_id": home,
+            "away_team_id": away,
+            "home_score": home_score if completed else None,
+            "away_score": away_score if completed else None,
+            "winner": ("home" if home_score > away_score else "away") if completed else None,
+        })
+    return pd.DataFrame(rows)
+
+
+def brute_force_features(matches: pd.DataFrame, match_id: int, team_id: int, n_games: int = 10) -> list:
+    """경기 날짜보다 엄격히 앞선 완료 경기에서 팀의 최근 n_games 경기"""
+    match_date = matches.loc[matches["id"] == match_id, "match_date"].iloc[0]
+    before = matches[(matches["match_date"] < match_date) & matches["winner"].notna()]
+    before = before[(before["home_team_id"] == team_id) | (before["away_team_id"] == team_id)]
+    recent = before.sort_values("match_date", kind="mergesort").tail(n_games)
+    if recent.empty:
+        return [0.0] * len(ASOF_FEATURES)
+
+    is_home = recent["home_team_id"] == team_id
+    scored = np.where(is_home, recent["home_score"], recent["away_score"]).astype(float)
+    allowed = np.where(is_home, recent["away_score"], recent["home_score"]).astype(float)
+    wins = int(((recent["winner"] == "home") & is_home).sum() + ((recent["winner"] == "away") & ~is_home).sum())
+    return [wins, len(recent) - wins, scored.mean(), allowed.mean(), wins / n_games]
+
+
+def test_features_use_only_earlier_dates():
+    matches = make_frame(400)
+    assert matches["match_date"].dtype == object
+
+    features = asof_team_features(matches)
+    assert len(features) == 2 * len(matches)
+    for row in features.itertuples():
+        expected = brute_force_features(matches, row.match_id, row.team_id)
+        np.testing.assert_allclose([getattr(row, name) for name in ASOF_FEATURES], expected, err_msg=str(row))
+
+
+def test_future_results_do_not_change_features():
+    matches = make_frame(300, seed=1)
+    cutoff = matches["match_date"].iloc[150]
+    before = asof_team_features(matches[matches["match_date"] <= cutoff])
+
+    # 이후 날짜 결과를 바꿔도 cutoff까지의 특성은 그대로
+    changed = matches.copy()
+    later = (changed["match_date"] > cutoff) & changed["winner"].notna()
+    changed.loc[later, "winner"] = np.where(changed.loc[later, "winner"] == "home", "away", "home")
+    after = asof_team_features(changed)
+    after = after[after["match_id"].isin(before["match_id"])]
+
+    key = ["match_id", "side"]
+    pd.testing.assert_frame_equal(
+        before.sort_values(key).reset_index(drop=True),
+        after.sort_values(key).reset_index(drop=True),
+    )
+
+
+def test_mock_data_rows():
+    rows = mock_data.generate_matches(START, START + timedelta(days=60), include_future=False)
+    X, y = build_asof_sequence_tensor(pd.DataFrame(rows), 10)
+    assert X.shape == (len(rows) - 10, 10, 5) and len(y) == len(X)
@@ -0,0 +1,122 @@
+"""
+워크포워드 백테스트 테스트 및 벤치마크
+
+- 배열 시뮬레이션 결과가 경기별 반복문 계산과 같은지 확인
+- python test_backtester.py 로 실행하면 10시즌 x 파라미터 격자 소요 시간 측정
+"""
+import time
+
+import numpy as np
+
+from app.data.mock_data import generate_prediction_history
+from app.services.backtester import history_from_rows, parameter_grid, run_backtest
+from app.services.betting_engine import BETTING_MODELS
+
+
+def reference_backtest(rows, params, initial_bankroll=1_000_000):
+    """날짜별로 자금을 갱신하는 단순 반복문 백테스트 (전체 기간 지표만)"""
+    bankroll = peak = initial_bankroll
+    max_drawdown = staked = 0.0
+    bets = wins = 0
+
+    by_date = {}
+    for row in rows:
+        by_date.setdefault(row["match_date"], []).append(row)
+
+    for match_date in sorted(by_date):
+        day = []
+        for row in by_date[match_date]:
+            p_home = row["home_win_probability"]
+            ev_home = (p_home * row["home_odds"] - 1) * 10000
+            ev_away = ((1 - p_home) * row["away_odds"] - 1) * 10000
+            on_away = ev_away > ev_home
+            p, odds, ev = (1 - p_home, row["away_odds"], ev_away) if on_away else (p_home, row["home_odds"], ev_home)
+            kelly = max(0.0, (p * odds - 1) / (odds - 1))
+            if row["confidence"] >= params["min_confidence"] and ev >= params["min_ev"] and kelly > 0:
+                stake = min(kelly * params["risk_multiplier"], params["max_kelly"])
+                day.append((stake, odds, row["home_won"] != on_away))
+
+        exposure = sum(stake for stake, _, _ in day)
+        scale = min(1.0, 1.0 / exposure) if exposure > 0 else 1.0
+        profit = 0.0
+        for stake, odds, won in day:
+            amount = stake * scale * bankroll
+            staked += amount
+            profit += amount * (odds - 1) if won else -amount
+            bets += 1
+            wins += won
+        bankroll += profit
+        peak = max(peak, bankroll)
+        max_drawdown = min(max_drawdown, bankroll / peak - 1)
+
+    return {
+        "final_bankroll": bankroll,
+        "roi": (bankroll - initial_bankroll) / staked * 100 if staked else 0.0,
+        "max_drawdown": max_drawdown * 100,
+        "total_bets": bets,
+        "win_rate": wins / bets * 100 if bets else 0.0,
+    }
+
+
+def test_matches_loop_reference():
+    rows = generate_prediction_history(num_seasons=2, days_per_season=40, seed=3)
+    results = run_backtest(history_from_rows(rows))
+
+    assert [r["name"] for r in results] == list(BETTING_MODELS)
+    for result in results:
+        expected = reference_backtest(rows, BETTING_MODELS[result["name"]])
+        overall = result["overall"]
+        assert overall["total_bets"] == expected["total_bets"]
+        assert np.isclose(overall["final_bankroll"], expected["final_bankroll"], atol=1)
+        assert np.isclose(overall["roi"], expected["roi"], atol=0.01)
+        assert np.isclose(overall["max_drawdown"], expected["max_drawdown"], atol=0.01)
+        assert np.isclose(overall["win_rate"], expected["win_rate"], atol=0.1)
+
+        # 시즌 결과는 자금을 이어받으므로 시즌 수익 합 = 전체 수익
+        assert [s["season"] for s in result["seasons"]] == [2015, 2016]
+        season_profit = sum(s["total_profit"] for s in result["seasons"])
+        assert np.isclose(season_profit, overall["total_profit"], atol=2)
+
+
+def test_process_pool_matches_single_process():
+    history = history_from_rows(generate_prediction_history(num_seasons=1, days_per_season=30))
+    grid = parameter_grid(
+        min_confidence=[0.55, 0.6], min_ev=[0, 500], max_kelly=[0.1, 0.25], risk_multiplier=[1.0]
+    )
+    configs = {f"grid_{i}": params for i, params in enumerate(grid)}
+
+    single = run_backtest(history, configs, workers=1, chunk_size=3)
+    pooled = run_backtest(history, configs, workers=2, chunk_size=3)
+    assert single == pooled
+
+
+def run_benchmark():
+    """10시즌(7,200경기) x 3모델 x 파라미터 격자"""
+    rows = generate_prediction_history(num_seasons=10)
+    history = history_from_rows(rows)
+
+    start = time.perf_counter()
+    run_backtest(history)
+    print(f"베팅 모델 3개: {time.perf_counter() - start:.3f}s")
+
+    grid = parameter_grid(
+        min_confidence=np.linspace(0.5, 0.75, 6),
+        min_ev=np.linspace(0, 1500, 6),
+        max_kelly=[0.05, 0.1, 0.15, 0.25],
+        risk_multiplier=[0.8, 1.0, 1.2],
+    )
+    configs = {f"{name}_{i}": dict(params) for name in BETTING_MODELS for i, params in enumerate(grid)}
+
+    for workers in (1, None):
+        start = time.perf_counter()
+        run_backtest(history, configs, workers=workers)
+        elapsed = time.perf_counter() - start
+        print(f"설정 {len(configs)}개, workers={workers or '자동'}: {elapsed:.3f}s")
+
+    start = time.perf_counter()
+    reference_backtest(rows, BETTING_MODELS["스탠다드"])
+    print(f"반복문 기준 설정 1개: {time.perf_counter() - start:.3f}s")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,69 @@
+"""
+배치 베팅 결정 엔진 테스트
+
+evaluate_slate 결과가 기존 1건씩 계산하던 방식과 같은지 확인
+"""
+import numpy as np
+
+from app.services.betting_engine import BETTING_MODELS, evaluate_slate, to_columns
+from app.services.betting_service import BettingService
+
+
+def reference_recommendation(p_home, confidence, odds, params):
+    """기존 BettingService.calculate_betting_recommendation 계산 (홈팀 기준)"""
+    ev = (p_home * odds * 10000) - 10000
+    kelly = max(0, (p_home * odds - 1) / (odds - 1))
+    should_bet = confidence >= params["min_confidence"] and ev >= params["min_ev"]
+    stake = min(kelly * params["risk_multiplier"], params["max_kelly"]) if should_bet else 0.0
+    return should_bet, ev, kelly, stake
+
+
+def test_matches_scalar_reference():
+    rng = np.random.default_rng(0)
+    n = 500
+    p_home = rng.uniform(0.3, 0.8, n)
+    confidence = np.maximum(p_home, 1 - p_home)
+    odds = rng.uniform(1.2, 3.5, n)
+
+    result = evaluate_slate(p_home, confidence, odds)
+
+    for m, name in enumerate(result["betting_model"]):
+        params = BETTING_MODELS[name]
+        for i in range(n):
+            should_bet, ev, kelly, stake = reference_recommendation(p_home[i], confidence[i], odds[i], params)
+            assert result["should_bet"][m, i] == should_bet
+            assert np.isclose(result["expected_value"][i], ev)
+            assert np.isclose(result["kelly_fraction"][i], kelly)
+            assert np.isclose(result["stake_fraction"][m, i], stake)
+
+
+def test_picks_better_side():
+    """원정 기대값이 크면 원정에 베팅, 원정 배당률이 없으면 홈만 평가"""
+    result = evaluate_slate(
+        home_win_probability=[0.3, 0.7, 0.3],
+        confidence=[0.7, 0.7, 0.7],
+        home_odds=[2.0, 2.0, 2.0],
+        away_odds=[2.0, 2.0, np.nan],
+        betting_models=["스탠다드"],
+        bankroll=1_000_000,
+    )
+    assert result["bet_on"].tolist() == ["away", "home", "home"]
+    assert result["should_bet"][0].tolist() == [True, True, False]
+    assert result["recommended_amount"][0, 0] == 150000  # 켈리 0.4 -> 최대 0.15로 제한
+
+    columns = to_columns(result, [11, 12, 13])
+    assert columns["match_id"] == [11, 12, 13]
+    assert columns["betting_model"] == ["스탠다드"] * 3
+
+
+def test_service_recommendation():
+    service = BettingService()
+    prediction = {"home_win_probability": 0.65, "confidence_score": 0.65}
+
+    recommendation = service.calculate_betting_recommendation(prediction, odds=2.0)
+    assert recommendation["should_bet"]
+    assert np.isclose(recommendation["expected_value"], 3000)
+    assert recommendation["recommended_amount"] == 10000
+
+    low_risk = service.calculate_betting_recommendation(prediction, odds=2.0, betting_model="로우리스크")
+    assert not low_risk["should_bet"]
@@ -0,0 +1,130 @@
+"""
+멤버 출력 재사용 앙상블 테스트
+
+- 캐시 적중 시 멤버 추론 없음, 일부만 없으면 없는 경기만 추론 (부분 미스)
+- 특성이 바뀌거나 멤버 버전이 바뀌면 캐시 무효 (다시 추론)
+- last_timings에 멤버별 소요 시간과 추론 행 수 기록
+- verbose 인자가 없는 (sklearn 방식) 멤버도 사용 가능, 스레드 풀은 앙상블마다 하나
+- 예측 서비스는 멤버 버전이 같을 동안 앙상블을 재사용하고 교체되면 새로 만듦
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.ml.ensemble import EnsembleModel, MemberOutputCache, model_predict
+from app.ml.registry import ModelManager, ModelRegistry
+from app.services.prediction_service import PredictionService
+from test_numpy_rnn import FEATURES, WINDOW, random_model
+
+
+class CountingModel:
+    """predict(X)만 있는 (verbose 인자 없는) 모델, 추론한 행을 기록"""
+
+    def __init__(self, offset: float):
+        self.offset = offset
+        self.rows = []
+
+    def predict(self, X):
+        self.rows.append(len(X))
+        return (X.mean(axis=(1, 2)) * 0.01 + self.offset).reshape(-1, 1)
+
+
+def make_inputs(batch: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(batch, WINDOW, FEATURES)).astype(np.float32)
+
+
+def test_cache_hits_and_partial_misses():
+    a, b = CountingModel(0.4), CountingModel(0.6)
+    ensemble = EnsembleModel({"a:v1": a, "b:v1": b}, weights=[0.25, 0.75], cache=MemberOutputCache())
+    X = make_inputs(6)
+    keys = list(range(6))
+
+    expected = 0.25 * a.predict(X) + 0.75 * b.predict(X)
+    a.rows.clear()
+    b.rows.clear()
+    np.testing.assert_allclose(ensemble.predict(X, keys=keys), expected)
+    assert a.rows == b.rows == [6]
+    assert set(ensemble.last_timings) == {"a:v1", "b:v1"}
+    for timing in ensemble.last_timings.values():
+        assert timing["computed_rows"] == 6 and timing["ms"] >= 0
+
+    # 전부 캐시 적중: 추론 없음
+    np.testing.assert_allclose(ensemble.predict(X, keys=keys), expected)
+    assert a.rows == b.rows == [6]
+    assert all(timing["computed_rows"] == 0 for timing in ensemble.last_timings.values())
+
+    # 부분 미스: 새 경기 2건만 추론
+    X_more = np.concatenate([X[:4], make_inputs(2, seed=1)])
+    ensemble.predict(X_more, keys=[0, 1, 2, 3, 10, 11])
+    assert a.rows == b.rows == [6, 2]
+    assert all(timing["computed_rows"] == 2 for timing in ensemble.last_timings.values())
+    assert ensemble.cache.stats()["hits"] == 2 * (6 + 4)
+
+
+def test_invalidation_on_feature_or_version_change():
+    cache = MemberOutputCache()
+    a = CountingModel(0.5)
+    X = make_inputs(3)
+    EnsembleModel({"a:v1": a}, cache=cache).predict(X, keys=[1, 2, 3])
+
+    # 같은 경기라도 특성이 바뀐 행만 다시 추론
+    changed = X.copy()
+    changed[1, -1] += 1.0
+    EnsembleModel({"a:v1": a}, cache=cache).predict(changed, keys=[1, 2, 3])
+    assert a.rows == [3, 1]
+
+    # 새 멤버 버전은 캐시를 공유하지 않음
+    EnsembleModel({"a:v2": a}, cache=cache).predict(X, keys=[1, 2, 3])
+    assert a.rows == [3, 1, 3]
+
+    # 키가 없으면 캐시 없이 전체 추론
+    EnsembleModel({"a:v1": a}, cache=cache).predict(X)
+    assert a.rows == [3, 1, 3, 3]
+
+
+def test_verbose_only_for_keras_and_executor_reuse():
+    X = make_inputs(4)
+    model = random_model("gru")
+    np.testing.assert_array_equal(model_predict(model, X), model.predict(X))
+    with pytest.raises(TypeError):
+        CountingModel(0.5).predict(X, verbose=0)
+    assert model_predict(CountingModel(0.5), X).shape == (4, 1)
+
+    ensemble = EnsembleModel([CountingModel(0.4), CountingModel(0.6)])
+    executor = ensemble._executor
+    for _ in range(3):
+        np.testing.assert_allclose(ensemble.predict(X), 0.5 * (2 * X.mean(axis=(1, 2)) * 0.01 + 1.0).reshape(-1, 1))
+    assert ensemble._executor is executor
+
+    # close() 후에도 (교체 중 남은 요청) 순차로 예측
+    ensemble.close()
+    assert ensemble.predict(X).shape == (4, 1)
+
+
+def test_service_reuses_ensemble_until_members_change():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        registry = ModelRegistry(root / "registry")
+        registry.register("lstm_v1", random_model("lstm").save(root / "lstm_model.npz"))
+        registry.register("gru_v1", random_model("gru").save(root / "gru_model.npz"))
+        registry.register("gru_v1", random_model("gru", seed=2).save(root / "gru_model_2.npz"), activate=False)
+        manager = ModelManager(registry)
+        service = PredictionService(model_manager=manager)
+        manager.warm_up()
+
+        X = make_inputs(3)
+        service._predict_ensemble("ensemble_v1", X, [1, 2, 3])
+        first = service._ensembles["ensemble_v1"]
+        service._predict_ensemble("ensemble_v1", X, [1, 2, 3])
+        assert service._ensembles["ensemble_v1"] is first
+        assert all(t["computed_rows"] == 0 for t in service.ensemble_metrics()["timings"]["ensemble_v1"].values())
+
+        manager.activate("gru_v1", 2).result()
+        service._predict_ensemble("ensemble_v1", X, [1, 2, 3])
+        second = service._ensembles["ensemble_v1"]
+        assert second is not first and first._executor is None
+        assert list(second.models) == ["lstm_v1:v1", "gru_v1:v2"]
+        assert second.last_timings["gru_v1:v2"]["computed_rows"] == 3
+        assert second.last_timings["lstm_v1:v1"]["computed_rows"] == 0
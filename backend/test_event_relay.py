@@ -0,0 +1,111 @@
+"""
+워커 간 이벤트 중계 테스트
+
+- 한 워커가 발행한 경기 종료/배당률 이벤트가 다른 워커의 remote 구독자에게 전달됨
+  (date/datetime 값 복원, 자기 이벤트는 다시 받지 않음)
+- remote=False 구독자(DB 쓰기)는 발행한 워커에서만 실행
+- 중계된 이벤트로 다른 워커의 실시간 피드 구독자도 변경을 받음
+- 멀티 워커 실행은 CACHE_BACKEND=redis 없이는 거부
+"""
+import asyncio
+import os
+import subprocess
+import sys
+from datetime import date, datetime
+from pathlib import Path
+
+from app.event_relay import RedisEventRelay, decode_event, encode_event
+from app.events import MATCH_COMPLETED, ODDS_UPDATED, EventBus
+from app.services.live_feed import LiveFeedHub
+
+
+class FakeBroker:
+    """Redis pub/sub 채널 흉내 (같은 이벤트 루프의 클라이언트끼리)"""
+
+    def __init__(self):
+        self.queues = []
+
+    def client(self) -> "FakeRedis":
+        return FakeRedis(self)
+
+
+class FakeRedis:
+    def __init__(self, broker: FakeBroker):
+        self.broker = broker
+
+    async def publish(self, channel, data):
+        for queue in self.broker.queues:
+            queue.put_nowait({"type": "message", "channel": channel, "data": data})
+
+    def pubsub(self):
+        return FakePubSub(self.broker)
+
+
+class FakePubSub:
+    def __init__(self, broker: FakeBroker):
+        self.broker = broker
+        self.queue = asyncio.Queue()
+
+    async def subscribe(self, channel):
+        self.broker.queues.append(self.queue)
+
+    async def unsubscribe(self, channel):
+        self.broker.queues.remove(self.queue)
+
+    async def listen(self):
+        yield {"type": "subscribe", "data": 1}
+        while True:
+            yield await self.queue.get()
+
+
+def test_encode_round_trip():
+    payload = {"id": 3, "match_date": date(2024, 5, 1), "odds": [{"captured_at": datetime(2024, 5, 1, 18, 30)}]}
+    assert decode_event(encode_event("w1", MATCH_COMPLETED, payload)) == ("w1", MATCH_COMPLETED, payload)
+
+
+def test_relays_events_to_other_workers():
+    async def scenario():
+        broker = FakeBroker()
+        buses = [EventBus(), EventBus()]
+        relays = [RedisEventRelay(bus, client=broker.client()) for bus in buses]
+        received = [[], []]
+        db_writes = []
+        hubs = [LiveFeedHub(), LiveFeedHub()]
+        for i, bus in enumerate(buses):
+            bus.subscribe(MATCH_COMPLETED, received[i].append)
+            bus.subscribe(ODDS_UPDATED, db_writes.append, remote=False)
+            hubs[i].attach(bus)
+        clients = [hub.connect() for hub in hubs]
+        for relay in relays:
+            relay.start()
+            await relay.wait_subscribed()
+
+        match = {"id": 7, "match_date": date(2024, 5, 1), "winner": "home", "is_completed": True}
+        await buses[0].publish(MATCH_COMPLETED, match)
+        await buses[1].publish(ODDS_UPDATED, {"match_ids": [7], "odds": []})
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+        for relay in relays:
+            await relay.stop()
+        return received, db_writes, clients, relays
+
+    received, db_writes, clients, relays = asyncio.run(scenario())
+    assert received[0] == received[1] == [{"id": 7, "match_date": date(2024, 5, 1), "winner": "home", "is_completed": True}]
+    # DB에 쓰는 구독자는 발행한 워커에서만 한 번
+    assert db_writes == [{"match_ids": [7], "odds": []}]
+    # 두 워커의 피드 구독자 모두 두 이벤트를 받음 (자기 워커 이벤트가 먼저)
+    for client in clients:
+        assert {client.queue.get_nowait().topic for _ in range(2)} == {MATCH_COMPLETED, ODDS_UPDATED}
+        assert client.queue.empty()
+    assert [relay.metrics["received"] for relay in relays] == [1, 1]
+
+
+def test_multi_worker_requires_redis():
+    env = dict(os.environ, CACHE_BACKEND="memory")
+    result = subprocess.run(
+        [sys.executable, "run.py", "--workers", "2"],
+        cwd=Path(__file__).parent, env=env, capture_output=True, text=True, timeout=30,
+    )
+    assert result.returncode != 0
+    assert "CACHE_BACKEND=redis" in result.stderr
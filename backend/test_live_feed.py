@@ -0,0 +1,98 @@
+"""
+실시간 피드 테스트
+
+- 토픽/경기 필터, 직렬화는 변경 1건당 한 번
+- 큐가 넘친 클라이언트만 resync로 바뀌고 다른 클라이언트는 영향 없음
+- WebSocket으로 이벤트 버스 변경이 전달됨
+- python test_live_feed.py 로 실행하면 클라이언트 5,000개 fan-out 시간 측정
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import live
+from app.events import MATCH_COMPLETED, ODDS_UPDATED, RECOMMENDATIONS_UPDATED, EventBus
+from app.services.live_feed import RESYNC, LiveFeedHub
+
+
+def test_fan_out_filters_and_resync():
+    async def scenario():
+        hub = LiveFeedHub(queue_size=2)
+        events = EventBus()
+        hub.attach(events)
+        everything = hub.connect()
+        match_1 = hub.connect(match_ids=[1])
+        odds_only = hub.connect(topics=[ODDS_UPDATED])
+
+        await events.publish(ODDS_UPDATED, {"match_ids": [2], "odds": [{"captured_at": datetime(2024, 5, 1)}]})
+        await events.publish(MATCH_COMPLETED, {"id": 1, "home_score": 3})
+        assert match_1.queue.qsize() == 1 and odds_only.queue.qsize() == 1
+
+        message = await hub.next_message(everything)
+        assert message.topic == ODDS_UPDATED
+        assert json.loads(message.data)["odds"][0]["captured_at"] == "2024-05-01T00:00:00"
+        assert message.sse().startswith(b"id: 1\nevent: odds.updated\n")
+
+        # everything 큐(2칸)가 넘침 -> 밀린 메시지 대신 resync 1건
+        await events.publish(RECOMMENDATIONS_UPDATED, {"match_ids": [1], "recommendations": []})
+        await events.publish(RECOMMENDATIONS_UPDATED, {"match_ids": [1], "recommendations": []})
+        resync = await hub.next_message(everything)
+        assert resync.topic == RESYNC and json.loads(resync.data) == {"dropped": 3, "last_id": 4}
+        assert await hub.next_message(everything, timeout=0.01) is None
+        assert match_1.resyncs == 1 and odds_only.resyncs == 0
+
+        try:
+            hub.connect(topics=["scores"])
+            assert False
+        except ValueError:
+            pass
+
+        hub.disconnect(match_1)
+        metrics = hub.metrics()
+        assert metrics["clients"] == 2 and metrics["published"] == 4 and metrics["resyncs"] == 2
+
+    asyncio.run(scenario())
+
+
+def test_websocket_receives_published_changes():
+    app = FastAPI()
+    app.include_router(live.router, prefix="/api/live")
+
+    with TestClient(app) as client:
+        with client.websocket_connect("/api/live/ws?match_ids=7") as ws:
+            client.portal.call(live.live_hub.publish, MATCH_COMPLETED, {"id": 8})
+            client.portal.call(live.live_hub.publish, MATCH_COMPLETED, {"id": 7, "winner": "home"})
+            message = ws.receive_json()
+            assert message["topic"] == MATCH_COMPLETED and message["data"] == {"id": 7, "winner": "home"}
+            assert client.get("/api/live/metrics").json()["clients"] == 1
+
+        assert client.get("/api/live/stream?topics=scores").status_code == 400
+
+
+def run_benchmark():
+    """구독 클라이언트 5,000개 x 추천 변경 1,000건"""
+    async def main():
+        hub = LiveFeedHub(queue_size=256)
+        clients = [hub.connect() for _ in range(5000)]
+        payload = {"match_ids": [1], "recommendations": [{"match_id": 1, "stake_fraction": 0.05}] * 6}
+
+        started = time.perf_counter()
+        for _ in range(1000):
+            hub.publish(RECOMMENDATIONS_UPDATED, payload)
+            for client in clients[:100]:
+                while not client.queue.empty():
+                    client.queue.get_nowait()
+        elapsed = time.perf_counter() - started
+        metrics = hub.metrics()
+        print(f"변경 1,000건 -> 클라이언트 {len(clients):,}개: {elapsed:.2f}s "
+              f"(변경당 {elapsed:.1f}ms), resync {metrics['resyncs']:,}건")
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,179 @@
+"""
+경기 이력 컬럼 저장소 테스트 및 벤치마크
+
+- 이어 쓰기/늦게 들어온 과거 경기/결과 정정 후에도 (날짜, ID) 순서와 날짜 범위 조회 유지
+- 다른 인스턴스(다른 워커)가 포인터 변경을 보고 다시 붙음
+- fcntl이 없는 Windows에서는 msvcrt.locking으로 잠금 (잠금을 얻을 때까지 재시도)
+- 저장소에서 구축한 팀 특성 저장소와 학습 텐서가 dict 행 목록 경로와 같음
+- python test_match_history.py 로 실행하면 dict 행 -> DataFrame 경로와 로드/구축 시간 비교
+"""
+import tempfile
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from app.ml.asof_features import build_asof_sequence_tensor
+from app.ml.feature_store import TeamFeatureStore
+from app.ml import match_history
+from app.ml.match_history import MatchHistoryStore
+from app.services.backtester import history_from_store
+
+START = date(2024, 3, 23)
+
+
+def make_rows(num_matches: int, seed: int = 0) -> list:
+    """하루 5경기씩 진행한 완료 경기 dict 목록 (MatchService.record_result 형식)"""
+    rng = np.random.default_rng(seed)
+    rows = []
+    for i in range(num_matches):
+        home, away = (rng.choice(10, 2, replace=False) + 1).tolist()
+        home_score, away_score = rng.integers(0, 13, 2).tolist()
+        rows.append({
+            "id": i + 1,
+            "match_date": START + timedelta(days=i // 5),
+            "season": 2024,
+            "home_team_id": home,
+            "away_team_id": away,
+            "home_score": home_score,
+            "away_score": away_score,
+            "winner": "home" if home_score > away_score else "away",
+            "is_completed": True,
+        })
+    return rows
+
+
+def test_append_order_and_date_index():
+    rows = make_rows(300)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MatchHistoryStore(tmp, initial_capacity=64)
+        reader = MatchHistoryStore(tmp)
+
+        assert store.append(rows[100:200]) == 100
+        for row in rows[200:220]:  # 경기 종료마다 1건씩
+            store.append([row])
+        assert store.append(rows[:100]) == 100  # 과거 경기가 늦게 적재 -> 재작성
+        assert store.append([dict(rows[0], is_completed=False, winner=None, home_score=None)]) == 0
+        assert store.append(rows[200:210]) == 0  # 같은 결과 중복 이벤트
+
+        # 결과 정정
+        corrected = dict(rows[5], home_score=0, away_score=9, winner="away")
+        assert store.append([corrected]) == 1
+
+        assert len(reader) == 220
+        columns = reader.columns()
+        assert columns["id"].tolist() == list(range(1, 221))
+        assert isinstance(columns["id"].base, np.memmap)
+        assert reader.columns()["away_score"][reader.positions([6])[0]] == 9
+
+        day = START + timedelta(days=10)
+        assert reader.columns(day, day)["id"].tolist() == list(range(51, 56))
+        assert reader.positions([3, 220, 999]).tolist() == [2, 219, -1]
+
+
+def test_windows_lock_fallback(monkeypatch):
+    class FakeMsvcrt:
+        LK_UNLCK, LK_LOCK = 0, 1
+
+        def __init__(self):
+            self.calls = []
+
+        def locking(self, fd, mode, nbytes):
+            self.calls.append(mode)
+            if len(self.calls) == 1:
+                raise OSError("잠금 대기 시간 초과")  # 다른 프로세스가 잡고 있음
+
+    msvcrt = FakeMsvcrt()
+    monkeypatch.setattr(match_history, "fcntl", None)
+    monkeypatch.setattr(match_history, "msvcrt", msvcrt, raising=False)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MatchHistoryStore(tmp)
+        assert store.append(make_rows(20)) == 20
+        assert len(store) == 20
+    assert msvcrt.calls == [FakeMsvcrt.LK_LOCK, FakeMsvcrt.LK_LOCK, FakeMsvcrt.LK_UNLCK]
+
+
+def test_feature_store_and_training_tensor_match_row_path():
+    rows = make_rows(2000, seed=1)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MatchHistoryStore(tmp)
+        store.append(rows)
+        frame = store.to_frame()
+
+        built = TeamFeatureStore.from_matches(frame)
+        reference = TeamFeatureStore()
+        reference.ingest(rows)
+        assert len(built) == len(reference)
+        for row in rows[::13]:
+            for team_id in (row["home_team_id"], row["away_team_id"]):
+                np.testing.assert_allclose(
+                    list(built.get_features(team_id, row["id"]).values()),
+                    list(reference.get_features(team_id, row["id"]).values()),
+                )
+
+        # 이후 증분 갱신도 같은 상태에서 이어짐
+        next_match = dict(make_rows(1)[0], id=5000, match_date=START + timedelta(days=999))
+        built.update(next_match)
+        reference.update(next_match)
+        for team_id in range(1, 11):
+            assert built.get_features(team_id) == reference.get_features(team_id)
+
+        X, y = build_asof_sequence_tensor(frame, 10)
+        reference_frame = pd.DataFrame(rows)
+        reference_frame["match_date"] = pd.to_datetime(reference_frame["match_date"])
+        X_ref, y_ref = build_asof_sequence_tensor(reference_frame, 10)
+        np.testing.assert_allclose(X, X_ref)
+        np.testing.assert_array_equal(y, y_ref)
+
+        # 백테스트 입력: 저장소에 없는(미완료) 경기는 제외
+        predictions = [
+            {"match_id": match_id, "home_win_probability": 0.6, "confidence": 0.6, "home_odds": 1.9, "away_odds": None}
+            for match_id in (10, 2500, 20)
+        ]
+        history = history_from_store(store, predictions)
+        assert history["match_id"].tolist() == [10, 20]
+        assert history["home_won"].tolist() == [rows[9]["winner"] == "home", rows[19]["winner"] == "home"]
+        assert history["match_date"].tolist() == [rows[9]["match_date"], rows[19]["match_date"]]
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+def run_benchmark(seasons: int = 10):
+    rows = make_rows(720 * seasons, seed=2)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = MatchHistoryStore(tmp)
+        store.append(rows)
+
+        started = time.perf_counter()
+        frame = pd.DataFrame(rows)
+        frame["match_date"] = pd.to_datetime(frame["match_date"])
+        from_rows = time.perf_counter() - started
+
+        started = time.perf_counter()
+        frame = MatchHistoryStore(tmp).to_frame()
+        from_store = time.perf_counter() - started
+
+        started = time.perf_counter()
+        TeamFeatureStore().ingest(rows)
+        ingest = time.perf_counter() - started
+
+        started = time.perf_counter()
+        TeamFeatureStore.from_matches(frame)
+        vectorized = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for row in make_rows(100, seed=3):
+            store.append([dict(row, id=row["id"] + 10 ** 6, match_date=START + timedelta(days=5000))])
+        append = (time.perf_counter() - started) / 100
+
+    print(f"경기 {len(rows):,}개 ({seasons}시즌)")
+    print(f"  DataFrame: dict 행 {from_rows * 1000:.1f}ms / 저장소 {from_store * 1000:.1f}ms")
+    print(f"  특성 저장소: ingest {ingest * 1000:.1f}ms / from_matches {vectorized * 1000:.1f}ms")
+    print(f"  경기 1건 이어 쓰기 {append * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
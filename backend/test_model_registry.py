@@ -0,0 +1,115 @@
+"""
+모델 레지스트리 / 모델 관리자 테스트
+
+- 등록, 백그라운드 로드 후 교체(hot-swap), 로드 실패 시 기존 버전 유지
+- 활성 버전은 섀도/후보 버전이 캐시를 채워도 밀려나지 않음
+- 재시작(워밍업) 시 경기 이력 저장소에서 입력 시퀀스 윈도우 복원
+- 등록된 모델이 로드되지 않았으면 모의 예측 대신 오류
+"""
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.ml.feature_store import TeamFeatureStore
+from app.ml.match_history import MatchHistoryStore
+from app.ml.registry import LoadedModel, ModelCache, ModelManager, ModelRegistry
+from app.services.prediction_service import SEQUENCE_WINDOW, PredictionService
+from test_match_history import make_rows
+from test_numpy_rnn import FEATURES, WINDOW, random_model
+
+
+def register_versions(root: Path, registry: ModelRegistry, seeds) -> list:
+    entries = []
+    for seed in seeds:
+        path = random_model("gru", seed=seed).save(root / f"gru_model_{seed}.npz")
+        entries.append(registry.register("gru_v1", path, activate=not entries))
+    return entries
+
+
+def test_register_activate_and_hot_swap():
+    X = np.random.default_rng(0).normal(size=(4, WINDOW, FEATURES)).astype(np.float32)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        registry = ModelRegistry(root / "registry")
+        register_versions(root, registry, seeds=(1, 2))
+        assert registry.active_models() == {"gru_v1": 1}
+        assert [v["version"] for v in registry.list_versions("gru_v1")] == [1, 2]
+
+        manager = ModelManager(registry)
+        assert manager.warm_up() == {"gru_v1": 1}
+        np.testing.assert_array_equal(manager.get("gru_v1").model.predict(X), random_model("gru", seed=1).predict(X))
+
+        manager.activate("gru_v1", 2).result()
+        assert manager.get("gru_v1").version == 2
+        assert ModelRegistry(root / "registry").active_models() == {"gru_v1": 2}
+
+        # 로드에 실패한 버전은 레지스트리/서비스 포인터 모두 바뀌지 않음
+        broken = root / "broken.npz"
+        broken.write_bytes(b"not a model")
+        registry.register("gru_v1", broken, activate=False)
+        with pytest.raises(Exception):
+            manager.activate("gru_v1", 3).result()
+        assert manager.get("gru_v1").version == 2
+        assert ModelRegistry(root / "registry").active_models() == {"gru_v1": 2}
+
+        with pytest.raises(KeyError):
+            manager.activate("gru_v1", 99)
+
+
+def test_active_versions_are_not_evicted():
+    cache = ModelCache(max_size=2)
+    cache.put(LoadedModel("lstm_v1", 1, None, None, {}))
+    cache.pin(("lstm_v1", 1))
+    for version in range(2, 6):
+        cache.put(LoadedModel("lstm_v1", version, None, None, {}))
+    assert cache.keys() == [("lstm_v1", 1), ("lstm_v1", 5)]
+
+    cache.unpin(("lstm_v1", 1))
+    cache.put(LoadedModel("lstm_v1", 6, None, None, {}))
+    assert cache.keys() == [("lstm_v1", 5), ("lstm_v1", 6)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        registry = ModelRegistry(root / "registry")
+        register_versions(root, registry, seeds=range(1, 6))
+        manager = ModelManager(registry, cache_size=2)
+        manager.warm_up()
+        # 섀도/후보 버전 로드가 캐시를 채워도 활성 버전은 남아 있음
+        for version in range(2, 6):
+            manager._schedule("gru_v1", version).result()
+        assert manager.get("gru_v1").version == 1
+
+        # 교체 후에는 이전 활성 버전 고정이 풀림
+        manager.activate("gru_v1", 5).result()
+        for version in (2, 3):
+            manager._schedule("gru_v1", version).result()
+        assert ("gru_v1", 1) not in manager.cache.keys()
+        assert manager.get("gru_v1").version == 5
+
+
+def test_warm_up_restores_sequence_and_refuses_unloaded_models():
+    rows = make_rows(200)
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        history = MatchHistoryStore(root / "history")
+        history.append(rows)
+        feature_store = TeamFeatureStore.from_matches(history.to_frame())
+        registry = ModelRegistry(root / "registry")
+        registry.register("lstm_v1", random_model("lstm").save(root / "lstm_model.npz"))
+
+        service = PredictionService(
+            feature_store=feature_store, model_manager=ModelManager(registry), history=history,
+        )
+        # 워밍업 전: 등록된 모델이 아직 로드되지 않았으면 모의 예측으로 대체하지 않음
+        with pytest.raises(RuntimeError):
+            service.generate_predictions([1], "lstm_v1")
+
+        service.warm_up()
+        expected = [feature_store.match_feature_vector(row, as_of_match=row["id"]) for row in rows[-SEQUENCE_WINDOW:]]
+        np.testing.assert_allclose(list(service._recent_vectors), expected)
+        assert np.count_nonzero(service._recent_vectors[0]) > 1
+
+        # 등록된 버전이 없는 모델은 개발용 모의 예측
+        assert service.generate_predictions([1], "gru_v1")[0]["model_name"] == "gru_v1"
@@ -0,0 +1,262 @@
+"""
+NumPy LSTM/GRU 런타임 테스트 및 벤치마크
+
+- 배치 순전파가 샘플/시점 단위 참조 구현(Keras 게이트 수식)과 같음
+- TensorFlow가 설치되어 있으면 build_lstm_model/build_gru_model 구조의 Keras 출력과 비교
+- .npz 아티팩트를 레지스트리로 로드하고 멀티 워커 공유 배열로 내보낼 수 있음
+- python test_numpy_rnn.py 로 실행하면 배치 크기별 지연 시간과 import/로드 후 프로세스 메모리 출력
+  (TensorFlow가 있으면 Keras와 비교)
+"""
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.ml.numpy_rnn import NumpySequenceModel, from_keras
+from app.ml.registry import ModelManager, ModelRegistry
+from app.ml.sequence_builder import SEQUENCE_FEATURES
+
+WINDOW = 10
+FEATURES = len(SEQUENCE_FEATURES)
+
+
+def random_model(kind: str, seed: int = 0, dtype=np.float32, reset_after: bool = True) -> NumpySequenceModel:
+    """build_lstm_model(BiLSTM 64 -> LSTM 32 -> Dense 16 -> Dense 1) / build_gru_model 구조의 임의 가중치 모델"""
+    rng = np.random.default_rng(seed)
+    gates = 4 if kind == "lstm" else 3
+
+    def recurrent(inputs: int, units: int) -> dict:
+        bias_shape = (2, gates * units) if kind == "gru" and reset_after else (gates * units,)
+        return {
+            "kernel": rng.normal(0, 0.3, (inputs, gates * units)),
+            "recurrent_kernel": rng.normal(0, 0.3, (units, gates * units)),
+            "bias": rng.normal(0, 0.1, bias_shape),
+        }
+
+    def spec(units: int, return_sequences: bool) -> dict:
+        layer = {"type": kind, "units": units, "activation": "tanh",
+                 "recurrent_activation": "sigmoid", "return_sequences": return_sequences}
+        if kind == "gru":
+            layer["reset_after"] = reset_after
+        return layer
+
+    if kind == "lstm":
+        first = {f"{direction}_{name}": value
+                 for direction in ("forward", "backward") for name, value in recurrent(FEATURES, 64).items()}
+        layers = [{"type": "bidirectional", "layer": spec(64, True)}, spec(32, False)]
+        weights = [first, recurrent(128, 32)]
+    else:
+        layers = [spec(64, True), spec(32, False)]
+        weights = [recurrent(FEATURES, 64), recurrent(64, 32)]
+
+    layers += [{"type": "dense", "activation": "relu"}, {"type": "dense", "activation": "sigmoid"}]
+    weights += [
+        {"kernel": rng.normal(0, 0.3, (32, 16)), "bias": rng.normal(0, 0.1, 16)},
+        {"kernel": rng.normal(0, 0.3, (16, 1)), "bias": rng.normal(0, 0.1, 1)},
+    ]
+    weights = [{name: value.astype(dtype) for name, value in w.items()} for w in weights]
+    return NumpySequenceModel(layers, weights, dtype=dtype)
+
+
+# ========================================
+# 참조 구현 (샘플 1개, 시점 1개씩)
+# ========================================
+
+def _sigmoid(x):
+    return 1 / (1 + np.exp(-x))
+
+
+def _reference_recurrent(sequence, w, spec, reverse=False):
+    units = spec["units"]
+    h = np.zeros(units)
+    c = np.zeros(units)
+    outputs = [None] * len(sequence)
+    steps = range(len(sequence) - 1, -1, -1) if reverse else range(len(sequence))
+    for t in steps:
+        x = sequence[t]
+        if spec["type"] == "lstm":
+            W, U, b = w["kernel"], w["recurrent_kernel"], w["bias"]
+            gate = [x @ W[:, k * units:(k + 1) * units] + h @ U[:, k * units:(k + 1) * units] + b[k * units:(k + 1) * units]
+                    for k in range(4)]
+            c = _sigmoid(gate[1]) * c + _sigmoid(gate[0]) * np.tanh(gate[2])
+            h = _sigmoid(gate[3]) * np.tanh(c)
+        else:
+            W, U, b = w["kernel"], w["recurrent_kernel"], w["bias"]
+            b_in, b_rec = (b[0], b[1]) if spec["reset_after"] else (b, np.zeros_like(b))
+            part = lambda M, k: M[..., k * units:(k + 1) * units]
+            z = _sigmoid(x @ part(W, 0) + part(b_in, 0) + h @ part(U, 0) + part(b_rec, 0))
+            r = _sigmoid(x @ part(W, 1) + part(b_in, 1) + h @ part(U, 1) + part(b_rec, 1))
+            if spec["reset_after"]:
+                candidate = np.tanh(x @ part(W, 2) + part(b_in, 2) + r * (h @ part(U, 2) + part(b_rec, 2)))
+            else:
+                candidate = np.tanh(x @ part(W, 2) + part(b_in, 2) + (r * h) @ part(U, 2))
+            h = z * h + (1 - z) * candidate
+        outputs[t] = h
+    return np.array(outputs) if spec["return_sequences"] else h
+
+
+def reference_predict(model: NumpySequenceModel, X: np.ndarray) -> np.ndarray:
+    results = []
+    for sample in X.astype(np.float64):
+        out = sample
+        for spec, w in zip(model.layers, model.weights):
+            w = {name: value.astype(np.float64) for name, value in w.items()}
+            if spec["type"] == "dense":
+                out = out @ w["kernel"] + w["bias"]
+                out = np.maximum(out, 0) if spec["activation"] == "relu" else _sigmoid(out)
+            elif spec["type"] == "bidirectional":
+                forward = {k[8:]: v for k, v in w.items() if k.startswith("forward_")}
+                backward = {k[9:]: v for k, v in w.items() if k.startswith("backward_")}
+                out = np.concatenate([
+                    _reference_recurrent(out, forward, spec["layer"]),
+                    _reference_recurrent(out, backward, spec["layer"], reverse=True),
+                ], axis=-1)
+            else:
+                out = _reference_recurrent(out, w, spec)
+        results.append(out)
+    return np.array(results)
+
+
+def test_batched_forward_matches_reference():
+    X = np.random.default_rng(1).normal(size=(7, WINDOW, FEATURES))
+    for kind, reset_after in (("lstm", True), ("gru", True), ("gru", False)):
+        model = random_model(kind, dtype=np.float64, reset_after=reset_after)
+        predicted = model.predict(X)
+        assert predicted.shape == (7, 1)
+        np.testing.assert_allclose(predicted, reference_predict(model, X), rtol=1e-10)
+        # 배치를 나눠도 같은 결과
+        np.testing.assert_allclose(model.predict(X, batch_size=3), predicted, rtol=1e-12)
+
+
+def test_matches_keras():
+    tf = pytest.importorskip("tensorflow")
+    from tensorflow.keras.layers import GRU, LSTM, Bidirectional, Dense, Dropout
+    from tensorflow.keras.models import Sequential
+
+    # docs/model_structure_example.py의 build_lstm_model / build_gru_model과 같은 구조
+    lstm = Sequential([
+        Bidirectional(LSTM(64, return_sequences=True), input_shape=(WINDOW, FEATURES)),
+        Dropout(0.2), LSTM(32), Dropout(0.2), Dense(16, activation="relu"), Dropout(0.2),
+        Dense(1, activation="sigmoid"),
+    ])
+    gru = Sequential([
+        GRU(64, return_sequences=True, input_shape=(WINDOW, FEATURES)),
+        Dropout(0.2), GRU(32), Dropout(0.2), Dense(16, activation="relu"), Dropout(0.2),
+        Dense(1, activation="sigmoid"),
+    ])
+    gru_v1 = Sequential([  # TF1 방식 GRU (reset_after=False)
+        GRU(64, return_sequences=True, reset_after=False, input_shape=(WINDOW, FEATURES)),
+        GRU(32, reset_after=False), Dense(1, activation="sigmoid"),
+    ])
+    X = np.random.default_rng(2).normal(size=(64, WINDOW, FEATURES)).astype(np.float32)
+    tf.random.set_seed(0)
+    for keras_model in (lstm, gru, gru_v1):
+        # 학습된 모델처럼 bias도 0이 아니게
+        keras_model.set_weights([w + np.random.default_rng(3).normal(0, 0.1, w.shape) for w in keras_model.get_weights()])
+        expected = keras_model.predict(X, verbose=0)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = from_keras(keras_model).save(Path(tmp) / "model.npz")
+            np.testing.assert_allclose(NumpySequenceModel.load(path).predict(X), expected, atol=1e-5)
+
+
+def test_registry_loads_and_shares_npz_artifact():
+    model = random_model("lstm")
+    X = np.random.default_rng(4).normal(size=(5, WINDOW, FEATURES))
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        path = model.save(root / "lstm_model.npz")
+        registry = ModelRegistry(root / "registry")
+        registry.register("lstm_v1", path, feature_schema=list(SEQUENCE_FEATURES))
+
+        manager = ModelManager(registry)
+        manager.warm_up()
+        loaded = manager.get("lstm_v1").model
+        assert isinstance(loaded, NumpySequenceModel)
+        np.testing.assert_array_equal(loaded.predict(X), model.predict(X))
+
+        assert manager.export_shared(root / "shared") == {"lstm_v1": True}
+        worker = ModelManager(ModelRegistry(root / "registry"), shared_dir=root / "shared")
+        worker.warm_up()
+        shared = worker.get("lstm_v1").model
+        assert isinstance(shared.weights[0]["forward_kernel"], np.memmap)
+        np.testing.assert_array_equal(shared.predict(X), model.predict(X))
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+_MEMORY_PROBE = """
+import sys, time
+started = time.perf_counter()
+import numpy as np
+{load}
+loaded = time.perf_counter()
+X = np.random.default_rng(0).normal(size=(32, {window}, {features})).astype(np.float32)
+model.predict(X)
+from app.ml.shared_arrays import process_memory
+print(loaded - started, process_memory()["rss"])
+"""
+
+_NUMPY_LOAD = "from app.ml.numpy_rnn import NumpySequenceModel\nmodel = NumpySequenceModel.load(sys.argv[1])"
+_KERAS_LOAD = "from tensorflow.keras.models import load_model\nmodel = load_model(sys.argv[1], compile=False)"
+
+
+def _probe(load: str, path: Path) -> str:
+    code = _MEMORY_PROBE.format(load=load, window=WINDOW, features=FEATURES)
+    completed = subprocess.run([sys.executable, "-c", code, str(path)], capture_output=True, text=True)
+    if completed.returncode != 0:
+        return "실패: " + completed.stderr.strip().splitlines()[-1]
+    seconds, rss = completed.stdout.strip().splitlines()[-1].split()
+    return f"import+로드 {float(seconds) * 1000:,.0f}ms, RSS {int(rss) / 2 ** 20:,.0f}MB"
+
+
+def run_benchmark():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for kind in ("lstm", "gru"):
+            model = random_model(kind)
+            path = model.save(root / f"{kind}.npz")
+            print(f"{kind}: 파라미터 {model.num_parameters:,}개, .npz {path.stat().st_size / 1024:,.0f}KB")
+
+            for batch in (1, 32, 512):
+                X = np.random.default_rng(0).normal(size=(batch, WINDOW, FEATURES)).astype(np.float32)
+                repeats = max(5, 2000 // batch)
+                model.predict(X)
+                started = time.perf_counter()
+                for _ in range(repeats):
+                    model.predict(X)
+                elapsed = (time.perf_counter() - started) / repeats
+                print(f"  배치 {batch:>4}: {elapsed * 1000:7.2f}ms ({batch / elapsed:,.0f}경기/s)")
+
+            print(f"  NumPy 런타임: {_probe(_NUMPY_LOAD, path)}")
+
+        try:
+            import tensorflow  # noqa: F401
+        except ImportError:
+            print("TensorFlow 미설치: Keras 비교 생략")
+            return
+
+        from tensorflow.keras.layers import LSTM, Bidirectional, Dense
+        from tensorflow.keras.models import Sequential
+        keras_model = Sequential([
+            Bidirectional(LSTM(64, return_sequences=True), input_shape=(WINDOW, FEATURES)),
+            LSTM(32), Dense(16, activation="relu"), Dense(1, activation="sigmoid"),
+        ])
+        keras_path = root / "lstm.h5"
+        keras_model.save(keras_path)
+        X = np.random.default_rng(0).normal(size=(32, WINDOW, FEATURES)).astype(np.float32)
+        keras_model.predict(X, verbose=0)
+        started = time.perf_counter()
+        for _ in range(50):
+            keras_model.predict(X, verbose=0)
+        print(f"Keras lstm 배치 32: {(time.perf_counter() - started) / 50 * 1000:.2f}ms")
+        print(f"  Keras: {_probe(_KERAS_LOAD, keras_path)}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
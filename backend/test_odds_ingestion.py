@@ -0,0 +1,173 @@
+"""
+배당률 수집 테스트
+
+- 필드 이름/시각 형식이 다른 입력 정규화
+- 변동 이력은 전부 추가, match_odds는 (경기, 제공처)별 최신 1건 (순서가 뒤섞여도)
+- 없는 경기의 스냅샷은 거절 수에 세고 나머지는 저장
+- MySQL 문은 ON DUPLICATE KEY UPDATE에서 captured_at을 마지막에 갱신
+- 백테스트 입력은 경기별로 가장 늦게 수집된 배당률 사용 (upsert로 id 순서와 달라도)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.data.mock_data import generate_odds_feed
+from app.database import create_async_db_engine, init_async_db
+from app.events import ODDS_UPDATED, EventBus
+from app.models.db_models import Prediction
+from app.repositories.prediction_repository import PredictionRepository
+from app.repositories.odds_repository import OddsRepository, upsert_latest_statement
+from app.services.odds_ingestion import OddsIngestionService, normalize_odds
+from test_repositories import run_with_db
+
+
+def test_normalize_odds():
+    captured = datetime(2024, 5, 1, 18, 30)
+    row = normalize_odds({
+        "game_id": "7", "bookmaker": " Sportstoto ", "home": "1,85", "away": 2.1,
+        "ts": captured.timestamp() * 1000,
+    })
+    assert row == {
+        "match_id": 7, "odds_provider": "sportstoto", "home_team_odds": 1.85, "away_team_odds": 2.1,
+        "draw_odds": None, "captured_at": captured,
+    }
+
+    utc = captured.astimezone(timezone.utc).isoformat().replace("+00:00", "Z")
+    assert normalize_odds({"match_id": 7, "home_odds": 1.9, "away_odds": 2.0, "captured_at": utc})["captured_at"] == captured
+
+    for bad in (
+        {"match_id": 7, "home_odds": 0.9, "away_odds": 2.0, "captured_at": utc},  # 배당률 1 이하
+        {"match_id": 7, "home_odds": 1.9, "captured_at": utc},                     # 원정 배당률 없음
+        {"home_odds": 1.9, "away_odds": 2.0, "captured_at": utc},                  # 경기 없음
+    ):
+        try:
+            normalize_odds(bad)
+            assert False, bad
+        except ValueError:
+            pass
+
+
+def test_ingest_keeps_history_and_latest():
+    async def check(session_factory):
+        events = EventBus()
+        published = []
+        events.subscribe(ODDS_UPDATED, published.append)
+        repository = OddsRepository(session_factory)
+        service = OddsIngestionService(repository, events, batch_size=50)
+
+        start = datetime(2024, 5, 1, 12)
+        feed = list(generate_odds_feed([1, 2, 3], start, minutes=60, providers=["a", "b"]))
+        latest_home = {(r["match_id"], r["provider"]): r["home_odds"] for r in feed}
+
+        # 뒤쪽 절반을 먼저 수집해도 최신 배당률이 과거 값으로 덮이지 않음
+        half = len(feed) // 2
+        await service.ingest(feed[half:])
+        result = await service.ingest(feed[:half] + [{"match_id": 1, "home_odds": "x"}])
+
+        assert result["rows_rejected"] == 1 and result["rows_written"] == half
+        assert await repository.count_movements(1) == 120
+        latest = await repository.latest(1)
+        assert [row["odds_provider"] for row in latest] == ["a", "b"]
+        assert all(row["captured_at"] == start + timedelta(minutes=59) for row in latest)
+        assert all(row["home_team_odds"] == latest_home[(1, row["odds_provider"])] for row in latest)
+
+        assert published[0]["match_ids"] == [1, 2, 3]
+        assert service.metrics()["rows_read"] == len(feed) + 1
+
+    run_with_db(check)
+
+
+def test_unknown_match_rows_are_rejected():
+    async def check(session_factory):
+        events = EventBus()
+        published = []
+        events.subscribe(ODDS_UPDATED, published.append)
+        repository = OddsRepository(session_factory)
+        service = OddsIngestionService(repository, events, batch_size=2)
+
+        start = datetime(2024, 5, 1, 12)
+        rows = [
+            {"match_id": 1, "home_odds": 1.8, "away_odds": 2.0, "captured_at": start},
+            {"match_id": 9999, "home_odds": 1.5, "away_odds": 2.5, "captured_at": start},
+            {"match_id": 2, "home_odds": 1.9, "away_odds": 1.9, "captured_at": start},
+            {"match_id": 9998, "home_odds": 1.5, "away_odds": 2.5, "captured_at": start},
+        ]
+        result = await service.ingest(rows)
+
+        assert result["rows_read"] == 4 and result["rows_written"] == 2 and result["rows_rejected"] == 2
+        assert await repository.count_movements(1) == await repository.count_movements(2) == 1
+        assert await repository.count_movements(9999) == 0
+        assert [payload["match_ids"] for payload in published] == [[1], [2]]
+        assert service.metrics()["last_run"]["rows_rejected"] == 2
+
+    run_with_db(check)
+
+
+def test_backtest_inputs_use_latest_captured_odds():
+    async def check(session_factory):
+        async with session_factory() as session:
+            session.add_all([
+                Prediction(match_id=match_id, model_name="lstm_v1", home_win_probability=0.6, away_win_probability=0.4)
+                for match_id in (1, 2)
+            ])
+            await session.commit()
+
+        repository = OddsRepository(session_factory)
+        start = datetime(2024, 5, 1, 12)
+        # 제공처 a(먼저 저장, id가 작음)가 나중에 다시 수집되어 가장 최신
+        await repository.write_batch([
+            normalize_odds({"match_id": 1, "odds_provider": "a", "home_odds": 1.5, "away_odds": 2.5, "captured_at": start}),
+            normalize_odds({"match_id": 2, "odds_provider": "a", "home_odds": 1.7, "away_odds": 2.2, "captured_at": start}),
+        ])
+        await repository.write_batch([
+            normalize_odds({"match_id": 1, "odds_provider": "b", "home_odds": 1.6, "away_odds": 2.4,
+                            "captured_at": start + timedelta(hours=1)}),
+        ])
+        await repository.write_batch([
+            normalize_odds({"match_id": 1, "odds_provider": "a", "home_odds": 1.9, "away_odds": 1.9,
+                            "captured_at": start + timedelta(hours=2)}),
+        ])
+
+        predictions = PredictionRepository(session_factory)
+        history = {row["match_id"]: row for row in await predictions.history_with_odds("lstm_v1")}
+        assert {match_id: row["home_odds"] for match_id, row in history.items()} == {1: 1.9, 2: 1.7}
+        rows = {row["match_id"]: row for row in await predictions.predictions_with_odds("lstm_v1")}
+        assert {match_id: row["home_odds"] for match_id, row in rows.items()} == {1: 1.9, 2: 1.7}
+
+    run_with_db(check)
+
+
+def test_mysql_upsert_updates_captured_at_last():
+    sql = str(upsert_latest_statement("mysql").compile(dialect=mysql.dialect()))
+    assert "ON DUPLICATE KEY UPDATE" in sql
+    assert sql.rstrip().split("ON DUPLICATE KEY UPDATE")[1].strip().split(",")[-1].lstrip().startswith(
+        "captured_at = CASE"
+    )
+
+
+def run_benchmark():
+    """한 시즌(720경기) x 경기당 24시간 분 단위 스냅샷 -> SQLite"""
+    async def main():
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_async_db_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'odds.db')}")
+            await init_async_db(engine)
+            service = OddsIngestionService(OddsRepository(async_sessionmaker(engine, expire_on_commit=False)))
+            minutes = int(sys.argv[1]) if len(sys.argv) > 1 else 24 * 60
+
+            started = time.perf_counter()
+            result = await service.ingest(generate_odds_feed(list(range(1, 721)), datetime(2024, 3, 1), minutes))
+            print(f"{result['rows_read']:,}행: {time.perf_counter() - started:.1f}s "
+                  f"({result['rows_per_second']:,}행/s, 묶음 {result['batches']}개)")
+            await engine.dispose()
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,176 @@
+"""
+모델 성능 일별 집계 테스트
+
+- 누적 합 기간 지표가 원본 전체를 다시 계산한 값과 같은지
+- 경기 결과 기록 시 집계와 model_performances가 증분 갱신되는지
+- 같은 결과를 다시 기록해도 집계가 늘지 않고, 결과 정정은 이전 반영분을 대체하는지
+"""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import select
+
+from app.models.db_models import BettingHistory, ModelPerformance, Prediction
+from app.repositories.betting_repository import BettingRepository
+from app.repositories.match_repository import MatchRepository
+from app.repositories.performance_repository import PerformanceRepository
+from app.repositories.prediction_repository import PredictionRepository
+from app.services.match_service import MatchService
+from app.services.performance_aggregates import ModelAggregates
+from app.services.performance_service import PerformanceService
+from test_repositories import TODAY, run_with_db
+
+
+def brute_force(days, p, y, start, end):
+    mask = (days >= np.datetime64(start)) & (days <= np.datetime64(end))
+    p, y = np.clip(p[mask], 1e-15, 1 - 1e-15), y[mask]
+    return {
+        "accuracy": round(float(np.mean((p >= 0.5) == y)), 3),
+        "log_loss": round(float(np.mean(-(y * np.log(p) + (1 - y) * np.log(1 - p)))), 3),
+        "brier_score": round(float(np.mean((p - y) ** 2)), 3),
+    }
+
+
+def test_window_metrics_match_brute_force():
+    rng = np.random.default_rng(0)
+    n = 3000
+    origin = date(2024, 3, 1)
+    days = np.array([origin + timedelta(days=int(d)) for d in rng.integers(0, 400, n)], dtype="datetime64[D]")
+    p = rng.uniform(0.2, 0.8, n)
+    y = rng.random(n) < p
+
+    bulk = ModelAggregates()
+    bulk.add_predictions("lstm_v1", days, p, y)
+
+    as_of = origin + timedelta(days=300)
+    for period_days in (7, 30, 90, 180, 365):
+        metrics = bulk.metrics("lstm_v1", period_days, as_of)
+        start = as_of - timedelta(days=period_days - 1)
+        expected = brute_force(days, p, y, start, as_of)
+        for key, value in expected.items():
+            assert abs(metrics[key] - value) < 1e-9, (period_days, key)
+
+        previous = brute_force(days, p, y, start - timedelta(days=period_days), start - timedelta(days=1))
+        if np.isnan(previous["accuracy"]):
+            assert metrics["previous_accuracy"] is None  # 직전 기간에 데이터 없음
+        else:
+            assert metrics["previous_accuracy"] == previous["accuracy"]
+
+    total = bulk.metrics("lstm_v1", None, as_of)
+    assert total["total_predictions"] == int((days <= np.datetime64(as_of)).sum())
+
+    # 한 건씩 임의 순서로 넣어도 한 번에 넣은 것과 같은 결과
+    sample = rng.permutation(n)[:500]
+    incremental = ModelAggregates()
+    for i in sample:
+        incremental.add_predictions("lstm_v1", days[i:i + 1], p[i:i + 1], y[i:i + 1])
+
+    expected = ModelAggregates()
+    expected.add_predictions("lstm_v1", days[sample], p[sample], y[sample])
+    assert incremental.metrics("lstm_v1", None, as_of) == expected.metrics("lstm_v1", None, as_of)
+
+
+def test_record_result_refreshes_performance():
+    """경기 결과 기록 -> 해당 경기 예측만 집계에 더하고 model_performances 저장"""
+    async def check(session_factory):
+        async with session_factory() as session:
+            for match_id in range(1, 41):  # 1~30: 완료, 31~40: 예정
+                session.add(Prediction(
+                    match_id=match_id,
+                    model_name="lstm_v1",
+                    home_win_probability=0.7,
+                    away_win_probability=0.3,
+                    confidence_score=0.7,
+                ))
+            await session.commit()
+
+        match_service = MatchService(MatchRepository(session_factory))
+        performance_service = PerformanceService(
+            PerformanceRepository(session_factory), PredictionRepository(session_factory)
+        )
+        match_service.add_result_listener(performance_service.on_match_completed)
+
+        assert await performance_service.warm_up() == ["lstm_v1"]
+        before = await performance_service.get_model_performance("lstm_v1", "전체")
+
+        upcoming = [m for m in await match_service.get_upcoming_matches(50) if m["id"] <= 40]
+        await match_service.record_result(upcoming[0]["id"], 1, 0)
+
+        after = await performance_service.get_model_performance("lstm_v1", "전체")
+        assert performance_service.aggregates.metrics("lstm_v1", None)["total_predictions"] == (
+            before["total_predictions"] + 1
+        )
+        assert after["evaluation_period"] == "전체"
+
+        async with session_factory() as session:
+            rows = (await session.execute(
+                select(ModelPerformance).where(ModelPerformance.evaluation_date == TODAY)
+            )).scalars().all()
+        assert {row.evaluation_period for row in rows} == {"7일", "30일", "3개월", "6개월", "1년", "전체"}
+
+    run_with_db(check)
+
+
+def test_repeated_result_and_correction():
+    """결과 재전송은 무시, 정정은 베팅 재확정 후 집계/시계열에서 이전 결과를 대체"""
+    async def check(session_factory):
+        match_id = 40  # 예정 경기
+        async with session_factory() as session:
+            prediction = Prediction(
+                match_id=match_id, model_name="lstm_v1", home_win_probability=0.7, away_win_probability=0.3,
+            )
+            session.add(prediction)
+            await session.flush()
+            session.add(BettingHistory(
+                match_id=match_id, prediction_id=prediction.id, betting_model="스탠다드", bet_on="home",
+                betting_amount=10000, odds=1.8, expected_profit=8000, bet_placed_at=datetime(2030, 1, 1),
+            ))
+            await session.commit()
+
+        betting_repository = BettingRepository(session_factory)
+        match_service = MatchService(MatchRepository(session_factory), betting_repository=betting_repository)
+        performance_service = PerformanceService(
+            PerformanceRepository(session_factory), PredictionRepository(session_factory), betting_repository,
+        )
+        match_service.add_result_listener(performance_service.on_match_completed)
+        published = []
+        match_service.add_result_listener(published.append)
+        await performance_service.warm_up()
+        series_size = len(performance_service.roi_series)
+
+        def totals():
+            metrics = performance_service.aggregates.metrics("lstm_v1", None, date(2100, 1, 1))
+            return metrics["total_predictions"], metrics["accuracy"], metrics["total_bets"], metrics["total_profit"]
+
+        async def settled():
+            async with session_factory() as session:
+                bet = (await session.execute(
+                    select(BettingHistory).where(BettingHistory.match_id == match_id)
+                )).scalar_one()
+            return bet.actual_result, float(bet.actual_profit)
+
+        await match_service.record_result(match_id, 3, 1)
+        assert await settled() == ("win", 8000.0)
+        assert totals() == (1, 1.0, 1, 8000.0)
+        assert len(performance_service.roi_series) == series_size + 1
+
+        # 같은 결과 재전송: 이벤트/집계 변화 없음
+        for _ in range(3):
+            await match_service.record_result(match_id, 3, 1)
+        assert len(published) == 1
+        assert totals() == (1, 1.0, 1, 8000.0)
+        assert len(performance_service.roi_series) == series_size + 1
+
+        # 점수 정정 (승자 그대로): 베팅/집계 그대로
+        await match_service.record_result(match_id, 4, 1)
+        assert totals() == (1, 1.0, 1, 8000.0)
+
+        # 승자 정정: 이전 반영분 대신 새 결과
+        await match_service.record_result(match_id, 1, 3)
+        assert await settled() == ("loss", -10000.0)
+        assert totals() == (1, 0.0, 1, -10000.0)
+        assert len(performance_service.roi_series) == series_size + 1
+        await performance_service.on_match_completed(published[-1])
+        assert totals() == (1, 0.0, 1, -10000.0)
+
+    run_with_db(check)
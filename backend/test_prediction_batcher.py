@@ -0,0 +1,144 @@
+"""
+예측 마이크로 배처 테스트
+
+- 동시 요청이 max_batch_size 단위로 합쳐지고 결과가 요청별로 돌아감 (모델별 분리)
+- 요청이 1건뿐이면 max_wait_ms 후 바로 처리
+- 대기열이 가득 차면 거절, stop/워커 오류 시 대기 중인 요청 모두 실패
+- 없는 경기가 섞인 배치는 요청별로 다시 처리해 그 요청만 실패
+- 지표(배치 수, 크기 분포, 거절 수)
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.prediction_batcher import PredictionBatcher
+
+
+class FakeService:
+    """generate_predictions 호출을 기록하는 예측 서비스"""
+
+    def __init__(self, delay: float = 0.0, gate: threading.Event = None):
+        self.calls = []
+        self.delay = delay
+        self.gate = gate
+
+    def generate_predictions(self, match_ids, model_name):
+        if self.gate is not None:
+            self.gate.wait(5)
+        time.sleep(self.delay)
+        self.calls.append((model_name, list(match_ids)))
+        return [{"match_id": match_id, "model_name": model_name} for match_id in match_ids]
+
+
+def test_coalesces_concurrent_requests():
+    service = FakeService(delay=0.01)
+    batcher = PredictionBatcher(service, max_batch_size=8, max_wait_ms=20)
+
+    async def scenario():
+        requests = [(i, "lstm_v1" if i % 3 else "gru_v1") for i in range(20)]
+        results = await asyncio.gather(*(batcher.submit(i, model) for i, model in requests))
+        await batcher.stop()
+        return requests, results
+
+    requests, results = asyncio.run(scenario())
+    assert [(r["match_id"], r["model_name"]) for r in results] == requests
+
+    # 20건이 요청별 추론 없이 최대 8건 배치로 합쳐짐
+    metrics = batcher.metrics()
+    assert metrics["total_items"] == 20
+    assert metrics["total_batches"] == 3
+    assert max(metrics["batch_size_histogram"]) == 8
+    assert all(len(ids) <= 8 for _, ids in service.calls)
+    assert sorted(i for _, ids in service.calls for i in ids) == list(range(20))
+    assert {model for model, _ in service.calls} == {"lstm_v1", "gru_v1"}
+
+
+def test_single_request_flushes_after_max_wait():
+    service = FakeService()
+    batcher = PredictionBatcher(service, max_batch_size=32, max_wait_ms=30)
+
+    async def scenario():
+        started = time.perf_counter()
+        result = await batcher.submit(7)
+        elapsed = time.perf_counter() - started
+        await batcher.stop()
+        return result, elapsed
+
+    result, elapsed = asyncio.run(scenario())
+    assert result["match_id"] == 7
+    assert 0.025 <= elapsed < 1.0
+    metrics = batcher.metrics()
+    assert metrics["batch_size_histogram"] == {1: 1}
+    assert metrics["wait_ms"]["max"] >= 25
+
+
+def test_unknown_match_fails_only_its_request():
+    class LookupService(FakeService):
+        def generate_predictions(self, match_ids, model_name):
+            if 999 in match_ids:
+                raise KeyError(f"경기를 찾을 수 없습니다: 999")
+            return super().generate_predictions(match_ids, model_name)
+
+    service = LookupService()
+    batcher = PredictionBatcher(service, max_batch_size=8, max_wait_ms=20)
+
+    async def scenario():
+        outcomes = await asyncio.gather(*(batcher.submit(i) for i in (1, 999, 2)), return_exceptions=True)
+        await batcher.stop()
+        return outcomes
+
+    valid, invalid, other = asyncio.run(scenario())
+    assert valid["match_id"] == 1 and other["match_id"] == 2
+    assert isinstance(invalid, KeyError) and "999" in str(invalid)
+    assert service.calls == [("lstm_v1", [1]), ("lstm_v1", [2])]
+
+
+def test_full_queue_rejects_and_stop_fails_pending():
+    gate = threading.Event()
+    batcher = PredictionBatcher(FakeService(gate=gate), max_batch_size=1, max_wait_ms=0, max_queue_size=2)
+
+    async def scenario():
+        # 첫 요청은 추론 중(gate 대기), 다음 2건은 대기열, 그 이후는 거절
+        tasks = [asyncio.create_task(batcher.submit(0))]
+        await asyncio.sleep(0.05)
+        tasks += [asyncio.create_task(batcher.submit(i)) for i in (1, 2)]
+        await asyncio.sleep(0)
+        try:
+            with pytest.raises(RuntimeError):
+                await batcher.submit(99)
+            assert batcher.metrics()["rejected"] == 1
+            assert batcher.metrics()["queue_depth"] == 2
+            await batcher.stop()
+        finally:
+            gate.set()
+        return await asyncio.gather(*tasks, return_exceptions=True)
+
+    outcomes = asyncio.run(scenario())
+    assert len(outcomes) == 3
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+
+
+def test_worker_crash_fails_pending_and_restarts():
+    class BrokenService(FakeService):
+        def generate_predictions(self, match_ids, model_name):
+            if self.calls:
+                return super().generate_predictions(match_ids, model_name)
+            self.calls.append((model_name, list(match_ids)))
+            return None  # 결과 분배(zip)에서 배치 처리 밖의 오류 발생
+
+    batcher = PredictionBatcher(BrokenService(), max_batch_size=4, max_wait_ms=10)
+
+    async def scenario():
+        outcomes = await asyncio.wait_for(
+            asyncio.gather(*(batcher.submit(i) for i in range(3)), return_exceptions=True), 2
+        )
+        # 다음 요청에서 워커가 새로 시작됨
+        recovered = await asyncio.wait_for(batcher.submit(5), 2)
+        await batcher.stop()
+        return outcomes, recovered
+
+    outcomes, recovered = asyncio.run(scenario())
+    assert all(isinstance(outcome, RuntimeError) for outcome in outcomes)
+    assert recovered["match_id"] == 5
@@ -0,0 +1,91 @@
+"""
+예측 서비스 배치 입력 테스트
+
+- 한 배치 안의 경기마다 해당 경기 홈/원정 팀 특성으로 입력을 만듦 (경기가 다르면 입력/확률도 다름)
+- 경기 조회는 호출자가 넘긴 경기 또는 경기 서비스 인덱스, 없는 경기는 KeyError
+- 일괄 예측 요청은 경기 수와 날짜 범위 일수 제한 (넘으면 422)
+"""
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.ml.feature_store import TeamFeatureStore
+from app.ml.match_history import MatchHistoryStore
+from app.ml.registry import ModelManager, ModelRegistry
+from app.models.schemas import BULK_MAX_DAYS, BULK_MAX_MATCHES, BulkPredictionRequest
+from app.services.match_service import MatchService
+from app.services.prediction_service import SEQUENCE_WINDOW, PredictionService
+from test_match_history import START, make_rows
+from test_numpy_rnn import random_model
+
+
+def test_batch_rows_use_each_matchs_teams():
+    rows = make_rows(300)
+    upcoming = [
+        dict(id=1001, match_date=START + timedelta(days=100), season=2024, home_team_id=1, away_team_id=2,
+             home_score=None, away_score=None, winner=None, is_completed=False),
+        dict(id=1002, match_date=START + timedelta(days=100), season=2024, home_team_id=7, away_team_id=4,
+             home_score=None, away_score=None, winner=None, is_completed=False),
+    ]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        history = MatchHistoryStore(root / "history")
+        history.append(rows)
+        feature_store = TeamFeatureStore.from_matches(history.to_frame())
+        registry = ModelRegistry(root / "registry")
+        registry.register("lstm_v1", random_model("lstm").save(root / "lstm_model.npz"))
+
+        match_service = MatchService(history=history)
+        match_service.index.upsert_many(upcoming)
+        service = PredictionService(
+            feature_store=feature_store,
+            model_manager=ModelManager(registry),
+            history=history,
+            match_service=match_service,
+        )
+        service.warm_up()
+
+        X = service.build_sequences([1001, 1002, 1001])
+        assert X.shape == (3, SEQUENCE_WINDOW, 5)
+        assert not np.array_equal(X[0], X[1])
+        np.testing.assert_array_equal(X[0], X[2])
+        # 앞부분은 공통 최근 경기 시퀀스, 마지막 시점은 각 경기 두 팀의 현재 특성
+        np.testing.assert_array_equal(X[0, :-1], X[1, :-1])
+        np.testing.assert_allclose(X[1, -1], service.build_match_features(upcoming[1]))
+        assert X[1, -1, 0] == pytest.approx(feature_store.get_features(7)["win_rate"])
+
+        predictions = service.generate_predictions([1001, 1002])
+        assert predictions[0]["home_win_probability"] != predictions[1]["home_win_probability"]
+
+        # 호출자가 넘긴 경기 dict도 사용
+        other = dict(upcoming[0], id=2001, home_team_id=3)
+        assert service.generate_predictions([2001], matches={2001: other})[0]["match_id"] == 2001
+
+        with pytest.raises(KeyError):
+            service.generate_predictions([9999])
+
+
+def test_bulk_request_limits():
+    BulkPredictionRequest(match_ids=list(range(BULK_MAX_MATCHES)))
+    start = date(2024, 5, 1)
+    BulkPredictionRequest(start_date=start, end_date=start + timedelta(days=BULK_MAX_DAYS - 1))
+    with pytest.raises(ValidationError):
+        BulkPredictionRequest(match_ids=list(range(BULK_MAX_MATCHES + 1)))
+    with pytest.raises(ValidationError):
+        BulkPredictionRequest(start_date=start, end_date=start + timedelta(days=BULK_MAX_DAYS))
+    with pytest.raises(ValidationError):
+        BulkPredictionRequest(start_date=start, end_date=start - timedelta(days=1))
+    # 한쪽만 지정하면 오늘 기준 7일로 채워 계산
+    with pytest.raises(ValidationError):
+        BulkPredictionRequest(start_date=date.today() - timedelta(days=BULK_MAX_DAYS))
+
+    from app.main import app
+    response = TestClient(app).post("/api/predictions/bulk", json={
+        "start_date": "2024-01-01", "end_date": "2024-12-31",
+    })
+    assert response.status_code == 422
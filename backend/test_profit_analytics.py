@@ -0,0 +1,80 @@
+"""
+수익 분석 테스트
+
+- 한 번의 순회 결과가 기간별로 나눠 전체를 다시 계산한 값과 같은지
+- DB 스트리밍 경로가 직전 기간 ROI까지 한 쿼리로 계산하는지
+"""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from app.repositories.betting_repository import BettingRepository
+from app.services.performance_service import PerformanceService
+from app.services.profit_analytics import analyze_profit
+from test_repositories import TODAY, run_with_db
+
+
+def brute_force(amount, profit, bankroll):
+    equity = bankroll + np.cumsum(profit)
+    peak = np.maximum.accumulate(np.r_[bankroll, equity])[1:]
+    returns = profit / amount
+    return {
+        "roi": round(float(profit.sum() / amount.sum() * 100), 2),
+        "total_profit": round(float(profit.sum()), 2),
+        "sharpe_ratio": round(float(returns.mean() / returns.std()), 3),
+        "max_drawdown": round(float(min((equity / peak - 1).min(), 0) * 100), 2),
+        "win_rate": round(float((profit > 0).mean() * 100), 1),
+    }
+
+
+def test_single_pass_matches_brute_force():
+    rng = np.random.default_rng(0)
+    n = 5000
+    start, end = date(2024, 6, 1), date(2024, 8, 29)  # 90일
+    offsets = np.sort(rng.integers(-90 * 24, 90 * 24 + 48, n))  # 시간 단위, 종료일 이후 일부 포함
+    placed_at = [datetime.combine(start, datetime.min.time()) + timedelta(hours=int(h)) for h in offsets]
+    amount = rng.choice([10000.0, 30000.0, 50000.0], n)
+    odds = rng.uniform(1.5, 3.0, n)
+    profit = np.where(rng.random(n) < 0.5, amount * (odds - 1), -amount)
+
+    result = analyze_profit(zip(placed_at, amount, profit), start, end, initial_bankroll=500_000)
+
+    days = np.array([p.date() for p in placed_at], dtype="datetime64[D]")
+    current = (days >= np.datetime64(start)) & (days <= np.datetime64(end))
+    previous = days < np.datetime64(start)
+
+    expected = brute_force(amount[current], profit[current], 500_000)
+    for key, value in expected.items():
+        assert result[key] == value, key
+    assert result["previous_roi"] == round(float(profit[previous].sum() / amount[previous].sum() * 100), 2)
+    assert result["period_start"] == start and result["period_end"] == end
+
+
+def test_empty_period():
+    result = analyze_profit([], date(2024, 1, 1), date(2024, 1, 31))
+    assert result["roi"] == 0.0 and result["max_drawdown"] == 0.0
+    assert result["previous_roi"] is None
+
+
+def test_profit_analysis_from_db():
+    """테스트 DB: 경기마다 10,000원 베팅, 하루 5경기"""
+    async def check(session_factory):
+        service = PerformanceService(betting_repository=BettingRepository(session_factory))
+        start, end = TODAY - timedelta(days=3), TODAY - timedelta(days=1)
+        result = await service.get_profit_analysis(start, end)
+
+        rows = [
+            (placed_at.date(), profit)
+            async for placed_at, _, profit in BettingRepository(session_factory).stream_settled(
+                datetime.combine(TODAY - timedelta(days=6), datetime.min.time()),
+                datetime.combine(TODAY, datetime.min.time()),
+            )
+        ]
+        current = [p for day, p in rows if day >= start]
+        previous = [p for day, p in rows if day < start]
+        assert len(current) == 15 and len(previous) == 15
+        assert result["total_profit"] == sum(current)
+        assert result["roi"] == round(sum(current) / (10000 * 15) * 100, 2)
+        assert result["previous_roi"] == round(sum(previous) / (10000 * 15) * 100, 2)
+
+    run_with_db(check)
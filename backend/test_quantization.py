@@ -0,0 +1,142 @@
+"""
+양자화 가중치(float16 / int8 채널별 스케일) 테스트 및 벤치마크
+
+- 양자화 모델 출력이 원본과 가깝고, .npz/공유 배열로 저장해도 저장 dtype과 결과가 유지됨
+- 드리프트 리포트 기준을 통과하지 못한 양자화 버전은 레지스트리가 활성화를 거부
+- python test_quantization.py 로 실행하면 방식별 가중치 메모리, 지연 시간, 드리프트 출력
+"""
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from app.ml.numpy_rnn import NumpySequenceModel, quantize_int8
+from app.ml.quantization import drift_report
+from app.ml.registry import ModelManager, ModelRegistry
+from app.ml.shared_arrays import attach_object, publish_object
+from test_numpy_rnn import FEATURES, WINDOW, random_model
+
+
+def holdout(model: NumpySequenceModel, samples: int = 2000, seed: int = 5):
+    """원본 모델 확률로 결과를 뽑은 보류 데이터"""
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(samples, WINDOW, FEATURES)).astype(np.float32)
+    y = (rng.random(samples) < model.predict(X)[:, 0]).astype(np.int8)
+    return X, y
+
+
+def test_int8_per_channel_scales():
+    matrix = np.random.default_rng(0).normal(size=(32, 8)).astype(np.float32)
+    matrix[:, 3] *= 100  # 열마다 크기가 달라도 각자의 스케일 사용
+    matrix[:, 5] = 0
+    q, scale = quantize_int8(matrix)
+    assert q.dtype == np.int8 and scale.shape == (8,)
+    assert np.abs(q).max(axis=0)[[0, 3]].tolist() == [127, 127]
+    np.testing.assert_allclose(q * scale, matrix, atol=scale.max() / 2 + 1e-6)
+    np.testing.assert_array_equal(q[:, 5], 0)
+
+
+def test_quantized_forward_and_round_trip():
+    X = np.random.default_rng(1).normal(size=(64, WINDOW, FEATURES)).astype(np.float32)
+    for kind in ("lstm", "gru"):
+        model = random_model(kind)
+        expected = model.predict(X)
+        for mode, tolerance in (("float16", 2e-3), ("int8", 2e-2)):
+            quantized = model.quantize(mode)
+            assert quantized.num_parameters == model.num_parameters
+            assert quantized.nbytes < model.nbytes * (0.6 if mode == "float16" else 0.35)
+            np.testing.assert_allclose(quantized.predict(X), expected, atol=tolerance)
+
+            with tempfile.TemporaryDirectory() as tmp:
+                loaded = NumpySequenceModel.load(quantized.save(Path(tmp) / "model.npz"))
+                publish_object(tmp, "model", quantized)
+                shared = attach_object(tmp, "model")
+                for restored in (loaded, shared):
+                    assert restored.quantization == mode
+                    assert restored.weights[1]["recurrent_kernel"].dtype == quantized.weights[1]["recurrent_kernel"].dtype
+                    assert restored.weights[1]["bias"].dtype == np.float32
+                    np.testing.assert_array_equal(restored.predict(X), quantized.predict(X))
+
+        with pytest.raises(ValueError):
+            model.quantize("int4")
+        with pytest.raises(ValueError):
+            model.quantize("int8").quantize("float16")
+
+
+def test_drift_report_gates_promotion():
+    model = random_model("lstm")
+    quantized = model.quantize("int8")
+    X, y = holdout(model)
+
+    report = drift_report(model, quantized, X, y)
+    assert report["samples"] == len(y) and report["passed"]
+    assert abs(report["log_loss_delta"]) < 1e-3 and abs(report["brier_delta"]) < 1e-3
+    assert report["candidate_bytes"] < report["reference_bytes"]
+    failed = drift_report(model, quantized, X, y, max_log_loss_delta=-1.0)
+    assert not failed["passed"]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        registry = ModelRegistry(root / "registry")
+        registry.register("lstm_v1", model.save(root / "lstm_model.npz"))
+        path = quantized.save(root / "lstm_model-int8.npz")
+
+        # 기준 미달 버전은 등록만 되고 활성화는 거부
+        with pytest.raises(ValueError):
+            registry.register("lstm_v1", path, quantization={"mode": "int8", "source_version": 1, "report": failed})
+        assert registry.active_models() == {"lstm_v1": 1}
+        registry.register("lstm_v1", path, activate=False,
+                          quantization={"mode": "int8", "source_version": 1, "report": failed})
+        manager = ModelManager(registry)
+        manager.warm_up()
+        with pytest.raises(ValueError):
+            manager.activate("lstm_v1", 2)
+        assert registry.active_models() == {"lstm_v1": 1}
+        registry.set_active("lstm_v1", 2, force=True)
+
+        passed = registry.register("lstm_v1", path, quantization={"mode": "int8", "source_version": 1, "report": report})
+        assert registry.active_models() == {"lstm_v1": passed["version"]}
+        assert registry.get_version("lstm_v1")["quantization"]["report"]["passed"]
+
+        manager.activate("lstm_v1", passed["version"]).result()
+        served = manager.get("lstm_v1").model
+        assert served.quantization == "int8"
+        np.testing.assert_array_equal(served.predict(X[:8]), quantized.predict(X[:8]))
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+def run_benchmark():
+    for kind in ("lstm", "gru"):
+        model = random_model(kind)
+        X_holdout, y_holdout = holdout(model, samples=5000)
+        X = np.random.default_rng(0).normal(size=(32, WINDOW, FEATURES)).astype(np.float32)
+        print(f"{kind}: 파라미터 {model.num_parameters:,}개")
+
+        for mode in (None, "float16", "int8"):
+            candidate = model if mode is None else model.quantize(mode)
+            candidate.predict(X)
+            started = time.perf_counter()
+            for _ in range(200):
+                candidate.predict(X)
+            elapsed = (time.perf_counter() - started) / 200
+            line = f"  {mode or 'float32':>7}: 가중치 {candidate.nbytes / 1024:6.0f}KB, 배치 32 {elapsed * 1000:.2f}ms"
+            if mode is not None:
+                report = drift_report(model, candidate, X_holdout, y_holdout)
+                line += (f", log loss {report['log_loss_delta']:+.5f}, Brier {report['brier_delta']:+.5f}, "
+                         f"최대 차이 {report['max_abs_diff']:.1e}")
+            print(line)
+
+    # 활성 lstm_v1/gru_v1 + 섀도 후보 2개 + 이전 버전 1개가 함께 상주할 때 (앙상블은 멤버 출력 재사용)
+    versions = [random_model("lstm", seed=1), random_model("gru", seed=2)] * 2 + [random_model("lstm", seed=3)]
+    for mode in (None, "float16", "int8"):
+        total = sum((m if mode is None else m.quantize(mode)).nbytes for m in versions)
+        print(f"{len(versions)}개 버전 상주 {mode or 'float32':>7}: {total / 2 ** 20:.2f}MB")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,344 @@
+"""
+비동기 리포지토리 테스트 및 부하 테스트
+
+- SQLite(aiosqlite) 임시 DB에 데이터를 넣고 리포지토리/서비스 조회 결과 확인
+- python test_repositories.py 로 실행하면 기존 동기 세션 경로와
+  비동기 리포지토리 경로의 초당 요청 수 비교
+"""
+import asyncio
+import os
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session, joinedload
+
+from app.database import create_async_db_engine, init_async_db
+from app.models.db_models import BettingHistory, Match, Team
+from app.ml.match_history import MatchHistoryStore
+from app.repositories.betting_repository import BettingRepository
+from app.repositories.match_repository import MatchRepository, match_to_dict
+from app.services.match_service import MatchService
+
+TODAY = date.today()
+
+
+async def create_test_db(path: str, num_matches: int = 60) -> async_sessionmaker:
+    """임시 SQLite DB 생성 후 팀/경기/베팅 내역 입력"""
+    engine = create_async_db_engine(f"sqlite+aiosqlite:///{path}")
+    await init_async_db(engine)
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+
+    async with session_factory() as session:
+        teams = [Team(id=i, name=f"팀{i}", abbreviation=f"T{i}") for i in range(1, 11)]
+        session.add_all(teams)
+
+        for i in range(num_matches):
+            match_date = TODAY + timedelta(days=i // 5 - num_matches // 10)
+            completed = match_date < TODAY
+            home_score, away_score = (i % 7, (i * 3) % 7) if completed else (None, None)
+            session.add(Match(
+                id=i + 1,
+                home_team_id=i % 10 + 1,
+                away_team_id=(i + 3) % 10 + 1,
+                match_date=match_date,
+                season=match_date.year,
+                round=i,
+                match_number=1,
+                home_score=home_score,
+                away_score=away_score,
+                winner=("home" if home_score > away_score else "away") if completed else None,
+                is_completed=completed,
+            ))
+            if completed:
+                session.add(BettingHistory(
+                    match_id=i + 1,
+                    betting_model="스탠다드" if i % 2 else "하이리턴",
+                    bet_on="home",
+                    betting_amount=10000,
+                    odds=2.0,
+                    expected_profit=10000,
+                    actual_result="win" if home_score > away_score else "loss",
+                    actual_profit=10000 if home_score > away_score else -10000,
+                    bet_placed_at=datetime.combine(match_date, datetime.min.time()),
+                ))
+        await session.commit()
+
+    return session_factory
+
+
+def run_with_db(coro_fn):
+    """임시 DB를 만들어 coro_fn(session_factory) 실행"""
+    async def main():
+        with tempfile.TemporaryDirectory() as tmp:
+            session_factory = await create_test_db(os.path.join(tmp, "test.db"))
+            try:
+                return await coro_fn(session_factory)
+            finally:
+                await session_factory.kw["bind"].dispose()
+    return asyncio.run(main())
+
+
+def test_match_repository():
+    """경기 조회 및 팀 이름 eager loading"""
+    async def check(session_factory):
+        repository = MatchRepository(session_factory)
+
+        match = await repository.get_by_id(1)
+        assert match["home_team_name"] == "팀1"
+        assert match["away_team_name"] == "팀4"
+        assert await repository.get_by_id(9999) is None
+
+        recent = await repository.list_recent(limit=5)
+        assert len(recent) == 5
+        assert all(m["is_completed"] for m in recent)
+        assert recent[0]["match_date"] >= recent[-1]["match_date"]
+
+        upcoming = await repository.list_upcoming(limit=5)
+        assert all(not m["is_completed"] and m["match_date"] >= TODAY for m in upcoming)
+
+    run_with_db(check)
+
+
+def test_match_pagination():
+    """페이지 조회 시 total은 전체 경기 수"""
+    async def check(session_factory):
+        service = MatchService(MatchRepository(session_factory))
+        start, end = TODAY - timedelta(days=30), TODAY + timedelta(days=30)
+
+        everything = await service.get_matches_by_date_range(start, end)
+        page = await service.get_matches_by_date_range(start, end, page=2, size=7)
+
+        assert page["total"] == everything["total"] == 60
+        assert [m["id"] for m in page["matches"]] == [m["id"] for m in everything["matches"][7:14]]
+
+    run_with_db(check)
+
+
+def test_betting_repository():
+    """모델 필터와 집계"""
+    async def check(session_factory):
+        repository = BettingRepository(session_factory)
+
+        results = await repository.list_results(betting_model="스탠다드", limit=10)
+        assert results and all(r["betting_model"] == "스탠다드" for r in results)
+        assert results[0]["is_recent"]
+        assert results[0]["bet_placed_at"] >= results[-1]["bet_placed_at"]
+
+        stats = await repository.model_stats("스탠다드")
+        assert stats["total_bets"] == len(await repository.list_results("스탠다드", limit=100))
+        assert 0 <= stats["win_rate"] <= 100
+
+    run_with_db(check)
+
+
+def test_betting_keyset_pagination():
+    """커서로 끝까지 넘기면 같은 bet_placed_at 행까지 중복/누락 없이 전체 조회"""
+    async def check(session_factory):
+        repository = BettingRepository(session_factory)
+        everything = await repository.list_results(limit=1000)
+
+        seen, cursor = [], None
+        while True:
+            page = await repository.list_page(limit=4, cursor=cursor)
+            seen.extend(r["id"] for r in page["results"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+
+        assert seen == [r["id"] for r in everything]
+        streamed = [r async for r in repository.stream_results(betting_model="하이리턴")]
+        assert [r["id"] for r in streamed] == [
+            r["id"] for r in everything if r["betting_model"] == "하이리턴"
+        ]
+
+        try:
+            await repository.list_page(cursor="잘못된커서")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("잘못된 커서는 ValueError")
+
+    run_with_db(check)
+
+
+def test_match_index():
+    """인덱스 조회가 리포지토리 조회와 같고, 결과 기록이 인덱스에 반영됨"""
+    async def check(session_factory):
+        repository = MatchRepository(session_factory)
+        service = MatchService(repository)
+
+        assert await service.get_match_by_id(7) == await repository.get_by_id(7)
+        assert await service.get_upcoming_matches(5) == await repository.list_upcoming(5)
+        assert await service.get_recent_matches(5) == await repository.list_recent(5)
+        assert len(service.index) == 60
+
+        upcoming = await service.get_upcoming_matches(1)
+        match_id = upcoming[0]["id"]
+        updated = await service.record_result(match_id, 5, 2)
+        assert updated["winner"] == "home" and updated["is_completed"]
+        assert (await repository.get_by_id(match_id))["home_score"] == 5
+        assert service.index.get(match_id)["is_completed"]
+        assert match_id not in [m["id"] for m in await service.get_upcoming_matches(5)]
+        assert match_id in [m["id"] for m in service.index.by_team(updated["home_team_id"])]
+
+    run_with_db(check)
+
+
+def test_match_index_follows_date_and_history(monkeypatch):
+    """날짜가 바뀌면 인덱스 범위가 따라 움직이고, 다른 프로세스의 결과 기록(이력 포인터 변경)을 반영"""
+    from app.services import match_service as match_service_module
+
+    async def check(session_factory):
+        repository = MatchRepository(session_factory)
+        with tempfile.TemporaryDirectory() as tmp:
+            service = MatchService(repository, history=MatchHistoryStore(tmp))
+            other = MatchService(repository, history=MatchHistoryStore(tmp))
+            days = match_service_module.MATCH_INDEX_DAYS
+
+            assert await service._ensure_index() == (TODAY - timedelta(days=days), TODAY + timedelta(days=days))
+
+            class Tomorrow(date):
+                @classmethod
+                def today(cls):
+                    return TODAY + timedelta(days=1)
+
+            monkeypatch.setattr(match_service_module, "date", Tomorrow)
+            covered_start, covered_end = await service._ensure_index()
+            assert (covered_start, covered_end) == (TODAY - timedelta(days=days - 1), TODAY + timedelta(days=days + 1))
+            monkeypatch.undo()
+            await service._ensure_index()
+
+            # 다른 워커가 기록한 결과
+            match_id = (await service.get_upcoming_matches(1))[0]["id"]
+            await other.record_result(match_id, 3, 1)
+            assert (await service.get_match_by_id(match_id))["is_completed"]
+            assert match_id not in [m["id"] for m in await service.get_upcoming_matches(5)]
+
+            # 자기 쓰기로는 다시 구축하지 않음
+            index = service.index
+            next_id = (await service.get_upcoming_matches(1))[0]["id"]
+            await service.record_result(next_id, 0, 2)
+            await service.get_match_by_id(next_id)
+            assert service.index is index and service.index.get(next_id)["winner"] == "away"
+
+    run_with_db(check)
+
+
+def test_mock_match_index_rolls_with_date(monkeypatch):
+    """모의 데이터도 날짜가 바뀌면 범위가 이동하고, 기록된 결과와 기존 경기 ID는 유지"""
+    from app.services import match_service as match_service_module
+
+    async def check():
+        service = MatchService()
+        days = match_service_module.MATCH_INDEX_DAYS
+        await service._ensure_index()
+        match_id = (await service.get_upcoming_matches(1))[0]["id"]
+        await service.record_result(match_id, 6, 3)
+        max_id = service.index.max_id()
+
+        class Tomorrow(date):
+            @classmethod
+            def today(cls):
+                return TODAY + timedelta(days=1)
+
+        monkeypatch.setattr(match_service_module, "date", Tomorrow)
+        covered_start, covered_end = await service._ensure_index()
+        assert (covered_start, covered_end) == (TODAY - timedelta(days=days - 1), TODAY + timedelta(days=days + 1))
+
+        recorded = await service.get_match_by_id(match_id)
+        assert recorded["is_completed"] and recorded["home_score"] == 6
+        added = service.index.date_range(covered_end, covered_end)
+        assert added and min(m["id"] for m in added) == max_id + 1
+        assert service.index.date_range(TODAY - timedelta(days=days), TODAY - timedelta(days=days)) == []
+
+    asyncio.run(check())
+
+
+def test_match_history_backfill_and_append():
+    """완료 경기 적재 후 결과 기록 시 경기 이력 저장소에 이어 씀"""
+    async def check(session_factory):
+        repository = MatchRepository(session_factory)
+        with tempfile.TemporaryDirectory() as tmp:
+            history = MatchHistoryStore(tmp)
+            service = MatchService(repository, history=history)
+
+            first = await repository.list_completed_results(limit=10)
+            rest = await repository.list_completed_results(after_id=first[-1]["id"])
+            history.append(first + rest)
+            completed = len(first) + len(rest)
+            assert len(history) == completed == len(await repository.list_recent(100))
+
+            upcoming = (await service.get_upcoming_matches(1))[0]
+            await service.record_result(upcoming["id"], 1, 4)
+            assert len(history) == completed + 1
+            row = history.positions([upcoming["id"]])[0]
+            assert history.columns()["away_score"][row] == 4
+
+    run_with_db(check)
+
+
+def run_load_test(num_requests: int = 2000, concurrency: int = 50, db_latency_ms: float = 0.0):
+    """
+    동기 세션 경로 vs 비동기 리포지토리 경로 초당 요청 수
+
+    동기 경로는 async 엔드포인트 안에서 PyMySQL/SQLite 동기 세션을 쓰는 기존 get_db 방식과 같다.
+    db_latency_ms는 MySQL 서버 왕복 지연을 흉내 낸다 (동기 경로는 이벤트 루프를 막고 대기).
+    """
+    import httpx
+    from fastapi import FastAPI
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "load.db")
+
+        async def main():
+            session_factory = await create_test_db(path, num_matches=500)
+            repository = MatchRepository(session_factory)
+            sync_engine = create_engine(f"sqlite:///{path}")
+
+            app = FastAPI()
+
+            @app.get("/sync/{match_id}")
+            async def sync_match(match_id: int):
+                time.sleep(db_latency_ms / 1000)
+                with Session(sync_engine) as db:
+                    match = db.execute(
+                        select(Match)
+                        .options(joinedload(Match.home_team), joinedload(Match.away_team))
+                        .where(Match.id == match_id)
+                    ).unique().scalar_one()
+                    return match_to_dict(match)
+
+            @app.get("/async/{match_id}")
+            async def async_match(match_id: int):
+                await asyncio.sleep(db_latency_ms / 1000)
+                return await repository.get_by_id(match_id)
+
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                for path_prefix in ("/sync", "/async"):
+                    semaphore = asyncio.Semaphore(concurrency)
+
+                    async def call(i):
+                        async with semaphore:
+                            response = await client.get(f"{path_prefix}/{i % 500 + 1}")
+                            assert response.status_code == 200
+
+                    start = time.perf_counter()
+                    await asyncio.gather(*(call(i) for i in range(num_requests)))
+                    elapsed = time.perf_counter() - start
+                    print(f"{path_prefix:>7}: {num_requests / elapsed:8.1f} req/s "
+                          f"({num_requests}건, 동시 {concurrency}, DB 지연 {db_latency_ms}ms)")
+
+            sync_engine.dispose()
+            await session_factory.kw["bind"].dispose()
+
+        asyncio.run(main())
+
+
+if __name__ == "__main__":
+    # 로컬 SQLite 그대로 / MySQL 네트워크 왕복(2ms) 가정
+    run_load_test(db_latency_ms=0.0)
+    run_load_test(db_latency_ms=2.0)
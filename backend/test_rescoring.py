@@ -0,0 +1,154 @@
+"""
+배당률 변경 시 베팅 추천 재계산 테스트
+
+- 저장된 예측 확률로 추천/기대값/켈리 비율 갱신 (추론 없음)
+- 경기별 가장 늦은 배당률 사용, 결정이 바뀐 항목만 발행
+- 이벤트 묶음보다 늦게 저장된 배당률이 있으면 저장된 배당률 사용
+- 마지막 베팅 비율 기억은 LRU로 크기 제한
+- python test_rescoring.py 로 실행하면 배당률 묶음(경기 720개) 재계산 시간 측정
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import select
+
+from app.events import RECOMMENDATIONS_UPDATED, EventBus
+from app.models.db_models import MatchOdds, Prediction
+from app.repositories.prediction_repository import PredictionRepository
+from app.services.rescoring import ProbabilityCache, RecommendationRescorer
+from test_repositories import run_with_db
+
+CAPTURED = datetime(2024, 5, 1, 18)
+
+
+def odds_event(match_id, home, away, minutes=0):
+    return {
+        "match_id": match_id, "odds_provider": "sportstoto", "home_team_odds": home,
+        "away_team_odds": away, "draw_odds": None, "captured_at": CAPTURED + timedelta(minutes=minutes),
+    }
+
+
+def test_rescore_updates_stored_recommendations():
+    async def check(session_factory):
+        async with session_factory() as session:
+            session.add_all([
+                Prediction(match_id=50, model_name="lstm_v1", home_win_probability=0.7,
+                           away_win_probability=0.3, confidence_score=0.7, recommended_bet="pass"),
+                Prediction(match_id=50, model_name="gru_v1", home_win_probability=0.45,
+                           away_win_probability=0.55, confidence_score=0.55, recommended_bet="pass"),
+            ])
+            await session.commit()
+
+        events = EventBus()
+        published = []
+        events.subscribe(RECOMMENDATIONS_UPDATED, published.append)
+        repository = PredictionRepository(session_factory)
+        rescorer = RecommendationRescorer(ProbabilityCache(), repository, events)
+
+        # 경기 50은 더 늦은 배당률(2.0)만 사용, 예측 없는 경기는 무시
+        payload = {"match_ids": [50, 999], "odds": [
+            odds_event(50, 2.0, 1.9, minutes=5), odds_event(50, 1.3, 3.0), odds_event(999, 2.0, 2.0),
+        ]}
+        changes = await rescorer.on_odds_updated(payload)
+        assert len(changes) == 2 * 3
+        assert published[0]["match_ids"] == [50]
+
+        stored = await repository.get(50, "lstm_v1")
+        assert stored["recommended_bet"] == "home"
+        assert stored["expected_value"] == 4000.0 and stored["kelly_percentage"] == 0.4
+        assert (await repository.get(50, "gru_v1"))["recommended_bet"] == "pass"
+
+        # 같은 배당률이 다시 오면 발행하지 않음
+        assert await rescorer.on_odds_updated(payload) == []
+        assert len(published) == 1
+
+        # 원정 쪽 기대값이 커지면 방향이 바뀜
+        changes = await rescorer.on_odds_updated({"match_ids": [50], "odds": [odds_event(50, 1.3, 4.0, 10)]})
+        assert {change["bet_on"] for change in changes if change["model_name"] == "lstm_v1"} == {"away"}
+        assert (await repository.get(50, "lstm_v1"))["recommended_bet"] == "away"
+
+        metrics = rescorer.metrics()
+        assert metrics["events"] == 3 and metrics["rows_rescored"] == 6
+
+        async with session_factory() as session:
+            assert (await session.execute(select(Prediction.recommended_bet).where(
+                Prediction.match_id == 50, Prediction.model_name == "gru_v1"
+            ))).scalar_one() == "pass"
+
+    run_with_db(check)
+
+
+def test_rescore_prefers_newer_stored_odds():
+    async def check(session_factory):
+        async with session_factory() as session:
+            session.add_all([
+                Prediction(match_id=50, model_name="lstm_v1", home_win_probability=0.7,
+                           away_win_probability=0.3, confidence_score=0.7, recommended_bet="pass"),
+                MatchOdds(match_id=50, odds_provider="betman", home_team_odds=2.0, away_team_odds=1.9,
+                          captured_at=CAPTURED + timedelta(minutes=30)),
+            ])
+            await session.commit()
+
+        repository = PredictionRepository(session_factory)
+        rescorer = RecommendationRescorer(ProbabilityCache(), repository)
+
+        # 늦게 도착한 오래된 묶음 (원정 쪽이 유리한 배당률)은 저장된 최신 배당률에 밀림
+        changes = await rescorer.on_odds_updated({"match_ids": [50], "odds": [odds_event(50, 1.3, 4.0)]})
+        assert {change["bet_on"] for change in changes} == {"home"}
+        assert (await repository.get(50, "lstm_v1"))["recommended_bet"] == "home"
+
+        # 저장된 값보다 늦은 묶음은 그대로 사용
+        changes = await rescorer.on_odds_updated({"match_ids": [50], "odds": [odds_event(50, 1.3, 4.0, 60)]})
+        assert {change["bet_on"] for change in changes} == {"away"}
+
+    run_with_db(check)
+
+
+def test_probability_cache_lru():
+    cache = ProbabilityCache(max_matches=2)
+    cache.remember([
+        {"match_id": 1, "model_name": "lstm_v1", "home_win_probability": 0.6, "confidence_score": 0.6},
+        {"match_id": 2, "model_name": "lstm_v1", "home_win_probability": 0.4, "confidence_score": 0.6},
+    ])
+    assert cache.get(1) == {"lstm_v1": (0.6, 0.6)}  # 1이 최근 사용으로 이동
+    cache.remember([{"match_id": 3, "model_name": "gru_v1", "home_win_probability": 0.5, "confidence_score": 0.5}])
+    assert cache.get(2) is None and len(cache) == 2
+
+    # 저장소 없이 캐시된 확률만으로 재계산
+    rescorer = RecommendationRescorer(cache)
+    changes = asyncio.run(rescorer.on_odds_updated({"match_ids": [1], "odds": [odds_event(1, 2.0, 1.8)]}))
+    assert {change["match_id"] for change in changes} == {1}
+
+    # 베팅 비율 기억은 최근 (경기, 예측 모델) max_stakes개까지
+    rescorer = RecommendationRescorer(cache, max_stakes=1)
+    asyncio.run(rescorer.on_odds_updated({"match_ids": [1, 3], "odds": [odds_event(1, 2.0, 1.8), odds_event(3, 2.0, 1.8)]}))
+    assert list(rescorer._stakes) == [(3, "gru_v1")]
+
+
+def run_benchmark():
+    """경기 720개 x 예측 모델 3개 배당률 묶음 재계산 (저장소 없이)"""
+    cache = ProbabilityCache()
+    match_ids = list(range(1, 721))
+    cache.remember(
+        {"match_id": match_id, "model_name": model_name, "home_win_probability": 0.35 + (match_id % 30) / 100,
+         "confidence_score": 0.65}
+        for match_id in match_ids for model_name in ("lstm_v1", "gru_v1", "ensemble_v1")
+    )
+    rescorer = RecommendationRescorer(cache)
+
+    async def main():
+        started = time.perf_counter()
+        for step in range(100):
+            odds = [odds_event(m, 1.5 + (m + step) % 10 / 10, 2.5 - (m + step) % 10 / 10, step) for m in match_ids]
+            await rescorer.on_odds_updated({"match_ids": match_ids, "odds": odds})
+        elapsed = time.perf_counter() - started
+        metrics = rescorer.metrics()
+        print(f"묶음 100개 ({metrics['rows_rescored']:,}행): {elapsed:.2f}s, "
+              f"묶음당 {elapsed * 10:.1f}ms, 발행 {metrics['changes_published']:,}건")
+
+    asyncio.run(main())
+
+
+if __name__ == "__main__":
+    run_benchmark()
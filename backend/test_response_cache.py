@@ -0,0 +1,118 @@
+"""
+GET 응답 캐시 테스트
+
+- 같은 요청은 라우터를 다시 타지 않고, ETag가 같으면 304
+- 경기 종료/배당률 이벤트가 해당 경기 태그 항목만 삭제
+- 요청 처리 중에 태그가 삭제되면 그 응답은 저장하지 않음
+- 메모리 백엔드 TTL/LRU
+"""
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.cache import MemoryCache, ResponseCacheMiddleware, cache_key, register_invalidation, route_tags
+from app.events import MATCH_COMPLETED, ODDS_UPDATED, EventBus
+
+
+def make_app(cache):
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    calls = {"match": 0, "upcoming": 0}
+
+    @app.get("/api/matches/upcoming")
+    async def upcoming(limit: int = 10):
+        calls["upcoming"] += 1
+        return {"limit": limit, "calls": calls["upcoming"]}
+
+    @app.get("/api/matches/{match_id}")
+    async def match(match_id: int):
+        calls["match"] += 1
+        return {"id": match_id, "calls": calls["match"]}
+
+    return app, calls
+
+
+def test_hit_etag_and_invalidation():
+    cache = MemoryCache()
+    events = EventBus()
+    register_invalidation(events, cache)
+    app, calls = make_app(cache)
+    client = TestClient(app)
+
+    first = client.get("/api/matches/1")
+    assert first.headers["x-cache"] == "MISS"
+    second = client.get("/api/matches/1")
+    assert second.headers["x-cache"] == "HIT" and second.json() == first.json()
+    assert calls["match"] == 1
+
+    not_modified = client.get("/api/matches/1", headers={"If-None-Match": first.headers["etag"]})
+    assert not_modified.status_code == 304 and not_modified.content == b""
+
+    # 쿼리 파라미터 순서와 무관하게 같은 키
+    client.get("/api/matches/upcoming?limit=5&x=1")
+    assert client.get("/api/matches/upcoming?x=1&limit=5").headers["x-cache"] == "HIT"
+
+    client.get("/api/matches/2")
+    asyncio.run(events.publish(ODDS_UPDATED, {"match_ids": [1]}))
+    assert client.get("/api/matches/1").headers["x-cache"] == "MISS"
+    assert client.get("/api/matches/2").headers["x-cache"] == "HIT"
+    assert client.get("/api/matches/upcoming?limit=5&x=1").headers["x-cache"] == "HIT"
+
+    asyncio.run(events.publish(MATCH_COMPLETED, {"id": 2}))
+    assert client.get("/api/matches/1").headers["x-cache"] == "HIT"
+    assert client.get("/api/matches/2").headers["x-cache"] == "MISS"
+    assert client.get("/api/matches/upcoming?limit=5&x=1").headers["x-cache"] == "MISS"
+
+    # 캐시 대상이 아닌 경로/오류 응답은 저장하지 않음
+    assert route_tags("/api/predictions/batching/metrics") is None
+    assert client.get("/api/matches/abc").status_code == 422
+    assert len(cache) == 3
+
+
+def test_invalidation_during_request_skips_store():
+    cache = MemoryCache()
+    events = EventBus()
+    register_invalidation(events, cache)
+    app = FastAPI()
+    app.add_middleware(ResponseCacheMiddleware, cache=cache)
+    odds = {"home": 1.8}
+
+    @app.get("/api/matches/{match_id}")
+    async def match(match_id: int):
+        body = {"id": match_id, "home_odds": odds["home"]}
+        # 응답을 만든 직후 배당률이 바뀜 (저장 전에 무효화 이벤트 도착)
+        if odds["home"] == 1.8:
+            odds["home"] = 2.1
+            await events.publish(ODDS_UPDATED, {"match_ids": [match_id]})
+        return body
+
+    client = TestClient(app)
+    stale = client.get("/api/matches/1")
+    assert stale.headers["x-cache"] == "MISS" and stale.json()["home_odds"] == 1.8
+    assert len(cache) == 0
+
+    fresh = client.get("/api/matches/1")
+    assert fresh.headers["x-cache"] == "MISS" and fresh.json()["home_odds"] == 2.1
+    assert client.get("/api/matches/1").headers["x-cache"] == "HIT"
+
+
+def test_memory_cache_ttl_and_lru():
+    now = [0.0]
+    cache = MemoryCache(ttl_seconds=10, max_entries=2, clock=lambda: now[0])
+
+    async def scenario():
+        entry = {"status": 200, "headers": [], "body": b"{}", "etag": '"x"'}
+        await cache.set("a", entry, ["t1"])
+        await cache.set("b", entry, ["t1", "t2"])
+        assert await cache.get("a") is entry  # a가 최근 사용으로 이동
+        await cache.set("c", entry, ["t2"])    # 가장 오래 안 쓴 b 제거
+        assert await cache.get("b") is None
+        assert await cache.invalidate(["t2"]) == 1  # b는 이미 없으므로 c만
+
+        now[0] = 11
+        assert await cache.get("a") is None
+        assert len(cache) == 0
+
+    asyncio.run(scenario())
+    assert cache_key("/api/x", b"b=2&a=1") == "/api/x?a=1&b=2"
@@ -0,0 +1,49 @@
+"""
+ROI 차트 시계열 테스트
+
+- 순서가 섞인 추가 후에도 기간 누적 ROI가 전수 계산과 같은지
+- LTTB가 점 수를 지키고 급등/급락 점을 남기는지
+"""
+from datetime import date, datetime, timedelta
+
+import numpy as np
+
+from app.services.roi_series import CumulativeSeries, chart_points, lttb
+
+
+def test_window_matches_brute_force_after_out_of_order_inserts():
+    rng = np.random.default_rng(0)
+    n = 2000
+    origin = datetime(2024, 3, 1)
+    placed_at = np.array([origin + timedelta(hours=int(h)) for h in rng.integers(0, 24 * 200, n)],
+                         dtype="datetime64[s]")
+    amount = rng.choice([10000.0, 50000.0], n)
+    profit = np.where(rng.random(n) < 0.55, amount * 0.9, -amount)
+
+    series = CumulativeSeries(capacity=16)
+    for chunk in np.array_split(np.arange(n), 40):  # 묶음마다 시각이 뒤섞여 들어옴
+        series.extend(placed_at[chunk], amount[chunk], profit[chunk])
+    assert len(series) == n
+
+    start, end = date(2024, 4, 1), date(2024, 6, 30)
+    order = np.argsort(placed_at, kind="stable")
+    days = placed_at[order].astype("datetime64[D]")
+    mask = (days >= np.datetime64(start)) & (days <= np.datetime64(end))
+    expected = np.cumsum(profit[order][mask]) / np.cumsum(amount[order][mask]) * 100
+
+    np.testing.assert_allclose(series.window(start, end), expected)
+    assert len(series.window(date(2025, 1, 1), date(2025, 1, 31))) == 0
+
+
+def test_lttb_keeps_shape():
+    y = np.sin(np.linspace(0, 20, 10000))
+    y[6543] = 5.0  # 급등 1점
+
+    indexes = lttb(y, 200)
+    assert len(indexes) == 200
+    assert indexes[0] == 0 and indexes[-1] == len(y) - 1
+    assert np.all(np.diff(indexes) > 0)
+    assert 6543 in indexes
+
+    labels, data = chart_points(np.array([1.0, 2.0, 3.0]), 100)
+    assert labels == ["베팅 1", "베팅 2", "베팅 3"] and data == [1.0, 2.0, 3.0]
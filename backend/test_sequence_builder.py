@@ -0,0 +1,136 @@
+"""
+시퀀스 텐서 생성 테스트 및 벤치마크
+
+- 벡터화 빌더가 기존 prepare_sequence_data와 같은 텐서를 만드는지 확인
+- python test_sequence_builder.py 로 실행하면 시즌 수에 따른 소요 시간 출력
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from app.ml.feature_store import TeamFeatureStore
+from app.ml.sequence_builder import build_sequence_tensor
+
+GAMES_PER_SEASON = 720
+
+
+def make_matches(num_matches: int, seed: int = 0) -> pd.DataFrame:
+    """임의의 완료된 경기 DataFrame 생성"""
+    rng = np.random.default_rng(seed)
+    home = rng.integers(1, 11, num_matches)
+    away = (home + rng.integers(1, 10, num_matches) - 1) % 10 + 1
+    home_score = rng.integers(0, 13, num_matches)
+    away_score = rng.integers(0, 13, num_matches)
+
+    return pd.DataFrame({
+        "id": np.arange(1, num_matches + 1),
+        "home_team_id": home,
+        "away_team_id": away,
+        "home_score": home_score,
+        "away_score": away_score,
+        "winner": np.where(home_score > away_score, "home", "away"),
+    })
+
+
+def reference_prepare_sequence_data(matches, window_size=10):
+    """기존 루프 구현 (docs/model_structure_example.py 원본)"""
+
+    def extract_team_features(matches, team_id, n_games=10):
+        team_matches = matches[
+            (matches['home_team_id'] == team_id) |
+            (matches['away_team_id'] == team_id)
+        ].tail(n_games)
+
+        wins = 0
+        scores = []
+        for _, match in team_matches.iterrows():
+            is_home = match['home_team_id'] == team_id
+            scores.append(match['home_score'] if is_home else match['away_score'])
+            if match['winner'] == ('home' if is_home else 'away'):
+                wins += 1
+
+        return {
+            'avg_score': np.mean(scores) if scores else 0.0,
+            'win_rate': wins / n_games if n_games > 0 else 0.0,
+        }
+
+    sequences = []
+    targets = []
+
+    for i in range(len(matches) - window_size):
+        window = matches.iloc[i:i+window_size]
+        features = []
+
+        for _, match in window.iterrows():
+            home_features = extract_team_features(matches, match['home_team_id'])
+            away_features = extract_team_features(matches, match['away_team_id'])
+            features.append([
+                home_features['win_rate'],
+                home_features['avg_score'],
+                away_features['win_rate'],
+                away_features['avg_score'],
+                1,
+            ])
+
+        sequences.append(features)
+        targets.append(1 if matches.iloc[i+window_size]['winner'] == 'home' else 0)
+
+    return np.array(sequences), np.array(targets)
+
+
+def test_parity_with_reference():
+    """기존 구현과 같은 텐서"""
+    for num_matches, window_size in [(60, 10), (150, 5), (40, 1)]:
+        matches = make_matches(num_matches, seed=num_matches)
+
+        X_ref, y_ref = reference_prepare_sequence_data(matches, window_size)
+        X, y = build_sequence_tensor(matches, window_size)
+
+        assert X.dtype == np.float32
+        assert X.shape == X_ref.shape
+        np.testing.assert_array_equal(X, X_ref.astype(np.float32))
+        np.testing.assert_array_equal(y, y_ref)
+
+
+def test_parity_with_feature_store():
+    """특성 저장소를 넘겨도 같은 텐서"""
+    matches = make_matches(300, seed=7)
+    store = TeamFeatureStore(n_games=10)
+    store.ingest(matches)
+
+    X_store, y_store = build_sequence_tensor(matches, 10, feature_store=store)
+    X, y = build_sequence_tensor(matches, 10)
+
+    np.testing.assert_array_equal(X_store, X)
+    np.testing.assert_array_equal(y_store, y)
+
+
+def test_too_few_matches():
+    """윈도우보다 경기가 적으면 빈 텐서"""
+    X, y = build_sequence_tensor(make_matches(5), window_size=10)
+    assert X.shape == (0, 10, 5)
+    assert y.shape == (0,)
+
+
+def run_benchmark(max_seasons: int = 12):
+    """시즌 수에 따른 소요 시간 (선형 증가 확인)"""
+    print(f"{'시즌':>4} {'경기 수':>8} {'소요(ms)':>10} {'경기당(us)':>10}")
+    for seasons in (1, 2, 4, 8, max_seasons):
+        matches = make_matches(seasons * GAMES_PER_SEASON, seed=seasons)
+
+        start = time.perf_counter()
+        build_sequence_tensor(matches, window_size=10)
+        elapsed = time.perf_counter() - start
+
+        print(f"{seasons:>4} {len(matches):>8} {elapsed * 1000:>10.1f} "
+              f"{elapsed / len(matches) * 1e6:>10.2f}")
+
+    matches = make_matches(GAMES_PER_SEASON)
+    start = time.perf_counter()
+    reference_prepare_sequence_data(matches, window_size=10)
+    print(f"\n기존 구현 1시즌: {(time.perf_counter() - start) * 1000:.1f}ms")
+
+
+if __name__ == "__main__":
+    run_benchmark()
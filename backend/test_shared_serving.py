@@ -0,0 +1,204 @@
+"""
+멀티 워커 공유 배열 서빙 테스트
+
+- 배열로 내보낸 모델/스케일러는 워커에서 메모리 매핑 그대로 사용하고 예측이 같음
+- to_arrays가 없는 모델은 내보내지 않고 워커가 각자 로드
+- python test_shared_serving.py [워커 수 ...] 로 실행하면 run.py 운영 모드(공유)와
+  uvicorn --workers(워커별 로드)의 전체 메모리(PSS 합)와 처리량 비교
+"""
+import os
+import pickle
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+
+from app.ml.registry import ModelManager, ModelRegistry
+from app.ml.shared_arrays import ArrayScaler, attach_object, process_memory, publish_object
+from app.ml.sequence_builder import SEQUENCE_FEATURES
+
+WINDOW = 10
+
+
+class DenseSequenceModel:
+    """벤치마크용 배열 모델: 시퀀스를 펼쳐 은닉층 1개를 거친 홈 승률"""
+
+    def __init__(self, W: np.ndarray, v: np.ndarray):
+        self.W = W
+        self.v = v
+
+    @classmethod
+    def random(cls, hidden: int, seed: int = 0) -> "DenseSequenceModel":
+        rng = np.random.default_rng(seed)
+        n_inputs = WINDOW * len(SEQUENCE_FEATURES)
+        W = rng.normal(0, 1 / np.sqrt(n_inputs), (n_inputs, hidden)).astype(np.float32)
+        return cls(W, rng.normal(0, 1 / np.sqrt(hidden), hidden).astype(np.float32))
+
+    def predict(self, X: np.ndarray, verbose=0) -> np.ndarray:
+        hidden = np.tanh(X.reshape(len(X), -1).astype(np.float32) @ self.W)
+        return (1 / (1 + np.exp(-(hidden @ self.v)))).reshape(-1, 1)
+
+    def to_arrays(self):
+        return {"W": self.W, "v": self.v}, {}
+
+    @classmethod
+    def from_arrays(cls, arrays, meta):
+        return cls(arrays["W"], arrays["v"])
+
+
+class _KerasLike:
+    """to_arrays가 없는 모델"""
+
+    def predict(self, X, verbose=0):
+        return np.full((len(X), 1), 0.5)
+
+
+class _Scaler:
+    """sklearn StandardScaler처럼 mean_/scale_만 가진 스케일러"""
+
+    def __init__(self):
+        self.mean_ = np.linspace(0, 1, len(SEQUENCE_FEATURES))
+        self.scale_ = np.full(len(SEQUENCE_FEATURES), 2.0)
+
+    def transform(self, X):
+        return (X - self.mean_) / self.scale_
+
+
+def make_registry(root: Path, hidden: int = 64) -> ModelRegistry:
+    registry = ModelRegistry(root / "registry")
+    for name, model in (("lstm_v1", DenseSequenceModel.random(hidden)), ("gru_v1", _KerasLike())):
+        with open(root / f"{name}.pkl", "wb") as f:
+            pickle.dump(model, f)
+        with open(root / f"{name}_scaler.pkl", "wb") as f:
+            pickle.dump(_Scaler(), f)
+        registry.register(name, root / f"{name}.pkl", scaler_path=root / f"{name}_scaler.pkl")
+    return registry
+
+
+def test_workers_attach_exported_arrays():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        registry = make_registry(root)
+        shared_dir = root / "shared"
+
+        assert ModelManager(registry).export_shared(shared_dir) == {"lstm_v1": True, "gru_v1": False}
+
+        private = ModelManager(registry)
+        worker = ModelManager(ModelRegistry(root / "registry"), shared_dir=shared_dir)
+        private.warm_up()
+        worker.warm_up()
+
+        shared_model = worker.get("lstm_v1")
+        assert isinstance(shared_model.model.W, np.memmap) and not shared_model.model.W.flags.writeable
+        assert isinstance(shared_model.scaler, ArrayScaler)
+        assert isinstance(worker.get("gru_v1").model, _KerasLike)  # 워커가 직접 로드
+
+        X = np.random.default_rng(1).normal(size=(4, WINDOW, len(SEQUENCE_FEATURES)))
+
+        def predict(loaded):
+            return loaded.model.predict(loaded.scaler.transform(X.reshape(-1, X.shape[-1])).reshape(X.shape))
+
+        np.testing.assert_allclose(predict(shared_model), predict(private.get("lstm_v1")), rtol=1e-6)
+
+        # 다시 내보내면 포인터만 교체, 이전 묶음 디렉토리 정리
+        publish_object(shared_dir, "probe", ArrayScaler(np.zeros(2), np.ones(2)))
+        publish_object(shared_dir, "probe", ArrayScaler(np.ones(2), np.ones(2)))
+        assert attach_object(shared_dir, "probe").mean_.tolist() == [1.0, 1.0]
+        assert len(list(shared_dir.glob("probe-*"))) == 1
+
+
+# ========================================
+# 벤치마크
+# ========================================
+
+def _descendants(pid: int) -> list:
+    children = []
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            children = [int(child) for child in f.read().split()]
+    except OSError:
+        pass
+    return children + [grandchild for child in children for grandchild in _descendants(child)]
+
+
+def _serve(command: list, env: dict, port: int, workers: int, seconds: float, batch: int) -> dict:
+    server = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        # 요청이 워커에 고르게 가도록 연속으로 준비 완료가 나올 때까지 대기
+        deadline = time.time() + 120
+        ready = 0
+        while ready < workers * 4 and time.time() < deadline:
+            try:
+                ok = httpx.get(f"http://127.0.0.1:{port}/health/ready", timeout=2).status_code == 200
+            except httpx.HTTPError:
+                ok = False
+            ready = ready + 1 if ok else 0
+            if not ok:
+                time.sleep(0.5)
+
+        counter = iter(range(1, 10 ** 9))
+        lock = threading.Lock()
+        done = []
+
+        def client():
+            with httpx.Client(timeout=30) as http:
+                stop = time.time() + seconds
+                while time.time() < stop:
+                    with lock:
+                        match_ids = [next(counter) for _ in range(batch)]
+                    http.post(f"http://127.0.0.1:{port}/api/predictions/bulk",
+                              json={"match_ids": match_ids, "model_names": ["lstm_v1"]})
+                    done.append(batch)
+
+        threads = [threading.Thread(target=client) for _ in range(workers * 4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        memory = [process_memory(pid) for pid in [server.pid] + _descendants(server.pid)]
+        return {
+            "predictions_per_second": round(sum(done) / seconds),
+            "pss_mb": round(sum(m["pss"] for m in memory) / 2 ** 20),
+            "rss_mb": round(sum(m["rss"] for m in memory) / 2 ** 20),
+        }
+    finally:
+        server.send_signal(signal.SIGINT)
+        server.wait(30)
+
+
+def run_benchmark():
+    """가중치 약 128MB 모델을 워커 1/2/4개로 서빙"""
+    worker_counts = [int(n) for n in sys.argv[1:]] or [1, 2, 4]
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        make_registry(root, hidden=640_000)
+        env = dict(os.environ, MODEL_REGISTRY_DIR=str(root / "registry"), MEMBER_OUTPUT_CACHE_SIZE="1")
+        print(f"CPU {os.cpu_count()}개")
+        for workers in worker_counts:
+            port = 8600 + workers
+            shared = _serve(
+                [sys.executable, "run.py", "--workers", str(workers), "--port", str(port),
+                 "--shared-dir", str(root / "shared")],
+                env, port, workers, seconds=10, batch=16,
+            ) if workers > 1 else None
+            private = _serve(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--workers", str(workers), "--port", str(port)],
+                env, port, workers, seconds=10, batch=16,
+            )
+            print(f"워커 {workers}개: 워커별 로드 {private}")
+            if shared:
+                print(f"         공유 배열     {shared}")
+
+
+
+if __name__ == "__main__":
+    # 워커가 모델 pickle을 풀 수 있도록 __main__이 아닌 모듈 이름으로 실행
+    import test_shared_serving
+    test_shared_serving.run_benchmark()
@@ -0,0 +1,75 @@
+"""
+시작 처리 테스트
+
+- 워밍업 단계는 백그라운드에서 순서대로 실행, 실패해도 다음 단계 진행
+- 준비 전 /health/ready는 503, /health/live는 200
+- -X importtime 출력 파싱
+"""
+import asyncio
+
+from fastapi.testclient import TestClient
+
+from app.startup import StartupWarmup, parse_importtime
+
+
+def test_background_warmup_steps():
+    async def scenario():
+        warmup = StartupWarmup()
+        gate = asyncio.Event()
+        calls = []
+
+        async def models():
+            await gate.wait()
+            calls.append("models")
+            return {"lstm_v1": 1}
+
+        def broken():
+            raise RuntimeError("집계 실패")
+
+        warmup.add_step("models", models)
+        warmup.add_step("performance", broken)
+        warmup.add_step("cache", lambda: calls.append("cache"))
+        task = warmup.start()
+
+        assert not warmup.ready
+        assert await warmup.wait_for("models", timeout=0.01) is False
+        assert warmup.status()["steps"]["models"]["status"] == "running"
+        assert await warmup.wait_for("unknown", timeout=0.01) is True
+
+        gate.set()
+        await task
+        assert warmup.ready and calls == ["models", "cache"]
+        steps = warmup.status()["steps"]
+        assert steps["models"]["result"] == {"lstm_v1": 1}
+        assert steps["performance"] == {"status": "failed", "error": "집계 실패", "seconds": steps["performance"]["seconds"]}
+
+    asyncio.run(scenario())
+
+
+def test_readiness_separate_from_liveness():
+    from app.main import app
+    from app.startup import startup
+
+    client = TestClient(app)
+    # lifespan 전 (워밍업 시작 전)
+    assert client.get("/health/live").status_code == 200
+    assert client.get("/health/ready").status_code == 503
+    assert client.get("/health").json() == {"status": "healthy", "ready": False}
+
+    with client:
+        client.portal.call(startup.wait_for, "response_cache")
+        ready = client.get("/health/ready")
+        assert ready.status_code == 200
+        assert list(ready.json()["steps"]) == ["models", "performance", "response_cache"]
+
+
+def test_parse_importtime():
+    output = "\n".join([
+        "import time: self [us] | cumulative | imported package",
+        "import time:       120 |        120 |     app.events",
+        "import time:      2500 |       2620 |   app.api",
+    ])
+    assert parse_importtime(output) == [
+        {"module": "app.events", "self_ms": 0.12, "cumulative_ms": 0.12, "depth": 2},
+        {"module": "app.api", "self_ms": 2.5, "cumulative_ms": 2.62, "depth": 1},
+    ]
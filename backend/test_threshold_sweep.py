@@ -0,0 +1,75 @@
+"""
+임계값 탐색 테스트
+
+- 파레토 판정이 전수 비교와 같은지
+- 공유 메모리 프로세스 풀 결과가 단일 프로세스 결과와 같은지
+- 프런트가 betting_models 후보 행으로 저장되는지
+"""
+import asyncio
+import os
+import tempfile
+
+import numpy as np
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.data.mock_data import generate_prediction_history
+from app.database import create_async_db_engine, init_async_db
+from app.repositories.betting_model_repository import BettingModelRepository
+from app.services.backtester import history_from_rows
+from app.services.threshold_sweep import candidate_models, pareto_mask, run_sweep
+
+SMALL_GRID = {
+    "min_confidence": [0.55, 0.65],
+    "min_ev": [0, 500, 1500],
+    "max_kelly": [0.05, 0.15],
+    "risk_multiplier": [0.5, 1.0],
+}
+
+
+def test_pareto_mask_matches_brute_force():
+    rng = np.random.default_rng(1)
+    roi = rng.integers(-20, 20, 300).astype(float)
+    drawdown = -rng.integers(0, 40, 300).astype(float)
+
+    mask = pareto_mask(roi, drawdown)
+
+    for i in range(len(roi)):
+        dominated = np.any(
+            (roi >= roi[i]) & (drawdown >= drawdown[i]) & ((roi > roi[i]) | (drawdown > drawdown[i]))
+        )
+        if dominated:
+            assert not mask[i]
+    # 비지배 점은 (값 기준으로) 하나씩 남음
+    front = {(r, d) for r, d, keep in zip(roi, drawdown, mask) if keep}
+    assert len(front) == mask.sum()
+
+
+def test_shared_memory_pool_matches_single_process():
+    history = history_from_rows(generate_prediction_history(num_seasons=2, days_per_season=60))
+
+    single = run_sweep(history, SMALL_GRID, workers=1, chunk_size=5, min_bets=10)
+    pooled = run_sweep(history, SMALL_GRID, workers=2, chunk_size=5, min_bets=10)
+
+    assert single["evaluated"] == pooled["evaluated"] == 24
+    assert single["front"] == pooled["front"]
+    assert single["front"]
+
+
+def test_candidates_saved_inactive():
+    history = history_from_rows(generate_prediction_history(num_seasons=1, days_per_season=60))
+    front = run_sweep(history, SMALL_GRID, workers=1, min_bets=10)["front"]
+
+    async def main():
+        with tempfile.TemporaryDirectory() as tmp:
+            engine = create_async_db_engine(f"sqlite+aiosqlite:///{os.path.join(tmp, 'sweep.db')}")
+            await init_async_db(engine)
+            repository = BettingModelRepository(async_sessionmaker(engine, expire_on_commit=False))
+            try:
+                saved = await repository.add_candidates(candidate_models(front, prefix="테스트"))
+                assert len(saved) == len(front)
+                assert saved[0]["name"] == "테스트-01" and not saved[0]["is_active"]
+                assert await repository.list_models(active_only=True) == []
+            finally:
+                await engine.dispose()
+
+    asyncio.run(main())
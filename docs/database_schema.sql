@@ -102,6 +102,25 @@ COMMENT ON COLUMN match_odds.odds_provider IS '배당 제공처 (sportstoto 등)
 CREATE INDEX idx_match ON match_odds(match_id);
 CREATE INDEX idx_captured_at ON match_odds(captured_at);
 
+-- ==============================================
+-- 4-1. 배당률 변동 이력 테이블 (추가 전용)
+-- ==============================================
+CREATE TABLE match_odds_movements (
+    id SERIAL PRIMARY KEY,
+    match_id INTEGER NOT NULL REFERENCES matches(id),
+    odds_provider VARCHAR(50) NOT NULL,
+    home_team_odds DECIMAL(5,2),
+    away_team_odds DECIMAL(5,2),
+    draw_odds DECIMAL(5,2),
+    
+    captured_at TIMESTAMP NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+COMMENT ON TABLE match_odds_movements IS '배당률 변동 이력 (수집 스냅샷 전체)';
+
+CREATE INDEX idx_match_captured ON match_odds_movements(match_id, captured_at);
+
 -- ==============================================
 -- 5. AI 예측 결과 테이블
 -- ==============================================
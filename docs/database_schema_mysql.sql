@@ -95,6 +95,24 @@ CREATE TABLE IF NOT EXISTS match_odds (
     INDEX idx_captured_at (captured_at)
 ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
 
+-- ==============================================
+-- 4-1. 배당률 변동 이력 테이블 (추가 전용)
+-- ==============================================
+CREATE TABLE IF NOT EXISTS match_odds_movements (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    match_id INT NOT NULL,
+    odds_provider VARCHAR(50) NOT NULL COMMENT '배당 제공처 (sportstoto 등)',
+    home_team_odds DECIMAL(5,2) COMMENT '홈팀 배당률',
+    away_team_odds DECIMAL(5,2) COMMENT '원정팀 배당률',
+    draw_odds DECIMAL(5,2) COMMENT '무승부 배당률',
+    
+    captured_at TIMESTAMP NOT NULL COMMENT '배당률 수집 시각',
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    
+    FOREIGN KEY (match_id) REFERENCES matches(id),
+    INDEX idx_match_captured (match_id, captured_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_unicode_ci;
+
 -- ==============================================
 -- 5. AI 예측 결과 테이블
 -- ==============================================
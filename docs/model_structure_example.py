@@ -17,6 +17,19 @@ from sklearn.preprocessing import StandardScaler
 from sklearn.calibration import CalibratedClassifierCV
 import joblib
 
+from backend.app.ml.asof_features import build_asof_sequence_tensor
+from backend.app.ml.ensemble import EnsembleModel, MemberOutputCache
+from backend.app.ml.match_history import MATCH_HISTORY_DIR, MatchHistoryStore
+from backend.app.ml.numpy_rnn import export_keras_model
+from backend.app.ml.registry import ModelRegistry
+from backend.app.ml.sequence_builder import SEQUENCE_FEATURES, build_sequence_tensor
+from backend.app.services.betting_engine import (
+    BETTING_MODELS,
+    evaluate_slate,
+    expected_value,
+    kelly_fraction,
+)
+
 
 # ==============================================
 # 1. 데이터 전처리 및 특성 추출
@@ -71,42 +84,31 @@ def extract_team_features(matches, team_id, n_games=10):
     return features
 
 
-def prepare_sequence_data(matches, window_size=10):
+def prepare_sequence_data(matches, window_size=10, feature_store=None, point_in_time=True):
     """
     시계열 시퀀스 데이터 준비
     
+    팀 특성은 경기마다 전체 경기를 다시 훑지 않고 그룹 누적합으로 한 번만 계산한다.
+    이미 구축된 TeamFeatureStore를 넘기면 저장소의 현재 특성을 그대로 사용한다.
+    
+    point_in_time=True(기본)이면 각 경기의 특성을 그 경기 날짜 이전 결과만으로
+    계산한다 (as-of merge). False면 전체 기간의 최근 N경기를 쓰는 기존 방식으로,
+    과거 경기 시퀀스에 미래 결과가 섞인다.
+    
     Args:
-        matches: 경기 데이터
+        matches: 경기 데이터 (match_date 포함)
         window_size: 시퀀스 윈도우 크기
+        feature_store: 이미 matches가 반영된 TeamFeatureStore (선택)
+        point_in_time: 경기 시점 기준 특성 사용 여부
     
     Returns:
         X, y: 입력 시퀀스와 타겟
     """
-    sequences = []
-    targets = []
-    
-    for i in range(len(matches) - window_size):
-        # 최근 N경기 특성 추출
-        window = matches.iloc[i:i+window_size]
-        features = []
-        
-        for _, match in window.iterrows():
-            home_features = extract_team_features(matches, match['home_team_id'])
-            away_features = extract_team_features(matches, match['away_team_id'])
-            
-            feature_vector = [
-                home_features['win_rate'],
-                home_features['avg_score'],
-                away_features['win_rate'],
-                away_features['avg_score'],
-                1 if match['home_team_id'] == match['home_team_id'] else 0,  # 홈/원정
-            ]
-            features.append(feature_vector)
-        
-        sequences.append(features)
-        targets.append(1 if matches.iloc[i+window_size]['winner'] == 'home' else 0)
+    if point_in_time and feature_store is None:
+        return build_asof_sequence_tensor(matches, window_size)
     
-    return np.array(sequences), np.array(targets)
+    # 팀별 롤링 통계를 한 번에 계산하고 윈도우를 float32 텐서 하나로 조립
+    return build_sequence_tensor(matches, window_size, feature_store=feature_store)
 
 
 # ==============================================
@@ -219,33 +221,13 @@ def calibrate_predictions(model, X_val, y_val, predictions):
 # 5. 앙상블 모델
 # ==============================================
 
-class EnsembleModel:
-    """
-    여러 모델의 앙상블
-    """
-    
-    def __init__(self, models, weights=None):
-        self.models = models
-        self.weights = weights if weights else [1.0 / len(models)] * len(models)
-    
-    def predict(self, X):
-        """
-        앙상블 예측
-        
-        Args:
-            X: 입력 데이터
-        
-        Returns:
-            predictions: 가중 평균된 예측
-        """
-        predictions = []
-        for model in self.models:
-            pred = model.predict(X)
-            predictions.append(pred)
-        
-        # 가중 평균
-        ensemble_pred = np.average(predictions, axis=0, weights=self.weights)
-        return ensemble_pred
+# 앙상블은 backend/app/ml/ensemble.py의 EnsembleModel 사용
+# - 멤버 출력을 (경기, 모델 버전, 특성 해시) 키로 캐시해 재사용
+# - 캐시에 없는 멤버만 스레드 풀에서 병렬 추론, 멤버별 소요 시간은 last_timings
+#
+# ensemble = EnsembleModel({'lstm_v1:v1': lstm_model, 'gru_v1:v1': gru_model},
+#                          weights=[0.5, 0.5], cache=MemberOutputCache())
+# predictions = ensemble.predict(X, keys=match_ids)
 
 
 # ==============================================
@@ -254,7 +236,7 @@ class EnsembleModel:
 
 def calculate_kelly_percentage(win_probability, odds):
     """
-    켈리 포뮬러로 베팅 비율 계산
+    켈리 포뮬러로 베팅 비율 계산 (음수이면 0, 배열 입력 가능)
     
     Args:
         win_probability: 승률 (0~1)
@@ -263,14 +245,12 @@ def calculate_kelly_percentage(win_probability, odds):
     Returns:
         kelly_percentage: 베팅 비율
     """
-    kelly = (win_probability * odds - 1) / (odds - 1)
-    # 음수이면 베팅하지 않음
-    return max(0, kelly)
+    return kelly_fraction(win_probability, odds)
 
 
 def calculate_expected_value(win_probability, odds, bet_amount):
     """
-    기대값 계산
+    기대값 계산 (배열 입력 가능)
     
     Args:
         win_probability: 승률
@@ -280,10 +260,7 @@ def calculate_expected_value(win_probability, odds, bet_amount):
     Returns:
         ev: 기대값
     """
-    expected_profit = win_probability * (odds - 1) * bet_amount
-    expected_loss = (1 - win_probability) * bet_amount
-    ev = expected_profit - expected_loss
-    return ev
+    return expected_value(win_probability, odds, bet_amount)
 
 
 # ==============================================
@@ -294,6 +271,9 @@ def decide_betting_strategy(prediction, odds, model_type='스탠다드'):
     """
     베팅 모델에 따른 베팅 결정
     
+    모델별 임계값은 BETTING_MODELS 한 곳에서 관리한다.
+    켈리 비율은 리스크 배수를 곱한 뒤 모델의 최대 켈리 비율로 제한한다.
+    
     Args:
         prediction: AI 예측 확률
         odds: 배당률
@@ -303,44 +283,45 @@ def decide_betting_strategy(prediction, odds, model_type='스탠다드'):
         decision: 베팅 결정 (bet/pass)
         kelly_pct: 켈리 비율
     """
-    # 베팅 모델별 임계값
-    thresholds = {
-        '하이리턴': {'min_confidence': 0.55, 'min_ev': 1000, 'max_kelly': 0.25},
-        '스탠다드': {'min_confidence': 0.60, 'min_ev': 500, 'max_kelly': 0.15},
-        '로우리스크': {'min_confidence': 0.70, 'min_ev': 300, 'max_kelly': 0.10},
-    }
-    
-    threshold = thresholds.get(model_type, thresholds['스탠다드'])
-    
-    # 켈리 비율 계산
-    kelly_pct = calculate_kelly_percentage(prediction['home_win_probability'], odds)
-    
-    # 기대값 계산
-    ev = calculate_expected_value(
-        prediction['home_win_probability'], 
-        odds, 
-        10000  # 기본 베팅 금액
+    result = evaluate_slate(
+        home_win_probability=[prediction['home_win_probability']],
+        confidence=[prediction['confidence_score']],
+        home_odds=[odds],
+        betting_models=[model_type if model_type in BETTING_MODELS else '스탠다드'],
     )
-    
-    # 베팅 결정
-    if (prediction['confidence_score'] >= threshold['min_confidence'] and
-        ev >= threshold['min_ev'] and
-        kelly_pct <= threshold['max_kelly']):
-        return 'bet', kelly_pct
-    else:
-        return 'pass', kelly_pct
+    decision = 'bet' if result['should_bet'][0, 0] else 'pass'
+    return decision, float(result['stake_fraction'][0, 0])
+
+
+# 하루 경기 전체를 한 번에 평가하는 예시
+# result = evaluate_slate(home_win_probability=probs, confidence=confidences,
+#                         home_odds=home_odds, away_odds=away_odds)
+# result['should_bet']  # (베팅 모델 수, 경기 수)
 
 
 # ==============================================
 # 8. 모델 학습 예시
 # ==============================================
 
+def load_matches(history_dir=MATCH_HISTORY_DIR, start_date=None, end_date=None):
+    """
+    학습용 완료 경기 로드
+    
+    MySQL 대신 경기 이력 컬럼 저장소(메모리 매핑 .npy)를 읽는다.
+    저장소는 python build_match_history.py로 한 번 적재하고, 이후 API 서버가 경기 종료 시 이어 쓴다.
+    
+    Returns:
+        DataFrame: id, match_date, season, home_team_id, away_team_id, home_score, away_score, winner
+    """
+    return MatchHistoryStore(history_dir).to_frame(start_date, end_date)
+
+
 def train_model_example():
     """
     모델 학습 예시
     """
     # 데이터 로드
-    matches = load_matches_from_db()
+    matches = load_matches()
     
     # 시퀀스 데이터 준비
     X, y = prepare_sequence_data(matches, window_size=10)
@@ -369,10 +350,21 @@ def train_model_example():
         ]
     )
     
-    # 모델 저장
+    # 모델 저장 (.h5는 재학습용, API 서버는 TensorFlow 없이 .npz 가중치로 추론)
     lstm_model.save('models/lstm_model.h5')
+    export_keras_model(lstm_model, 'models/lstm_model.npz')
     joblib.dump(scaler, 'models/scaler.pkl')
     
+    # 레지스트리에 새 버전으로 등록 (API 서버가 활성 버전을 읽어감)
+    registry = ModelRegistry('models')
+    registry.register(
+        'lstm_v1',
+        'models/lstm_model.npz',
+        scaler_path='models/scaler.pkl',
+        feature_schema=list(SEQUENCE_FEATURES),
+        metrics=evaluate_model(lstm_model, X_val, y_val),
+    )
+    
     return lstm_model
 
 